@@ -0,0 +1,84 @@
+"""
+Creates meshes from arrays in one bulk write per mesh as one undoable step.
+"""
+
+import maya.api.OpenMaya as om
+import fg_tools.mesh_buffer as mesh_buffer
+
+maya_useNewAPI = True
+
+
+# noinspection PyPep8Naming
+class FgCreateMesh_cmd(om.MPxCommand):
+    """
+    Creates the meshes that were queued by fg_tools.mesh_buffer.create_mesh() and returns their transforms. A command
+    can not take numpy arrays as arguments, so they are handed over through the queue. Undo deletes the meshes again.
+    """
+
+    cmdName = 'fgCreateMesh'
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        # [(points, face counts, face vertices, name)]
+        self._meshes = []
+        self._transforms = []
+
+    @staticmethod
+    def creator():
+        return FgCreateMesh_cmd()
+
+    @staticmethod
+    def createSyntax():
+        return om.MSyntax()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        self._meshes = mesh_buffer.pop_pending_meshes()
+        self.redoIt()
+
+    def redoIt(self):
+        self._transforms = [mesh_buffer.build_mesh(*mesh) for mesh in self._meshes]
+        self.clearResult()
+        for transform in self._transforms:
+            self.appendToResult(om.MFnDagNode(transform).fullPathName())
+
+    def undoIt(self):
+        dag_modifier = om.MDagModifier()
+        for transform in reversed(self._transforms):
+            dag_modifier.deleteNode(transform)
+        dag_modifier.doIt()
+        self._transforms = []
+
+
+def attach_command(mfn_plugin):
+    """
+    attaches the command to the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.registerCommand(FgCreateMesh_cmd.cmdName,
+                               FgCreateMesh_cmd.creator,
+                               FgCreateMesh_cmd.createSyntax)
+
+
+def remove_command(mfn_plugin):
+    """
+    Removes the command from the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.deregisterCommand(FgCreateMesh_cmd.cmdName)
+
+
+# noinspection PyPep8Naming
+def initializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    attach_command(pluginFn)
+
+
+# noinspection PyPep8Naming
+def uninitializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    remove_command(pluginFn)
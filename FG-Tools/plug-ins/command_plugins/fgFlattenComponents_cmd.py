@@ -0,0 +1,104 @@
+"""
+Flattens components onto a world axis plane, their best-fit plane or their best-fit line.
+"""
+
+import maya.api.OpenMaya as om
+import command_plugins.fgSetPoints_cmd as fgSetPoints_cmd
+import fg_tools.fitting as fitting
+import fg_tools.mesh_buffer as mesh_buffer
+import fg_tools.modeling as mdl
+
+maya_useNewAPI = True
+
+
+# noinspection PyPep8Naming
+class FgFlattenComponents_cmd(fgSetPoints_cmd.FgSetPoints_cmd):
+    """
+    Flattens the vertices of all given meshes together with one bulk read and one bulk write per mesh. The points are
+    written and undone like fgSetPoints does it, with the old positions from the read of the flattening.
+    """
+
+    cmdName = 'fgFlattenComponents'
+
+    modeFlag = '-m'
+    modeFlagLong = '-mode'
+    axisFlag = '-ax'
+    axisFlagLong = '-axis'
+
+    @staticmethod
+    def creator():
+        return FgFlattenComponents_cmd()
+
+    @staticmethod
+    def createSyntax():
+        syntax = om.MSyntax()
+        syntax.setObjectType(om.MSyntax.kSelectionList)
+        syntax.useSelectionAsDefault(True)
+        syntax.addFlag(FgFlattenComponents_cmd.modeFlag,
+                       FgFlattenComponents_cmd.modeFlagLong,
+                       om.MSyntax.kString)
+        syntax.addFlag(FgFlattenComponents_cmd.axisFlag,
+                       FgFlattenComponents_cmd.axisFlagLong,
+                       om.MSyntax.kString)
+        return syntax
+
+    def doIt(self, args):
+        try:
+            arguments = om.MArgDatabase(self.syntax(), args)
+        except RuntimeError:
+            om.MGlobal.displayError(('Error while parsing arguments:'
+                                     '    If passing in list of nodes, also check that node names exist in scene.'))
+            raise
+
+        selection = arguments.getObjectList()
+
+        if arguments.isFlagSet(FgFlattenComponents_cmd.modeFlag):
+            mode = arguments.flagArgumentString(FgFlattenComponents_cmd.modeFlag, 0)
+        else:
+            mode = fitting.PLANE
+
+        if arguments.isFlagSet(FgFlattenComponents_cmd.axisFlag):
+            axis = arguments.flagArgumentString(FgFlattenComponents_cmd.axisFlag, 0)
+        else:
+            axis = 'x'
+
+        try:
+            writes = mdl.get_flattened_points(selection.getSelectionStrings(), mode=mode, axis=axis)
+        except ValueError as error:
+            om.MGlobal.displayError(str(error))
+            raise
+
+        mesh_buffer.queue_points(writes)
+        fgSetPoints_cmd.FgSetPoints_cmd.doIt(self, args)
+
+
+def attach_command(mfn_plugin):
+    """
+    attaches the command to the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.registerCommand(FgFlattenComponents_cmd.cmdName,
+                               FgFlattenComponents_cmd.creator,
+                               FgFlattenComponents_cmd.createSyntax)
+
+
+def remove_command(mfn_plugin):
+    """
+    Removes the command from the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.deregisterCommand(FgFlattenComponents_cmd.cmdName)
+
+
+# noinspection PyPep8Naming
+def initializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    attach_command(pluginFn)
+
+
+# noinspection PyPep8Naming
+def uninitializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    remove_command(pluginFn)
@@ -0,0 +1,98 @@
+"""
+Sets the colors of a color set of meshes in one bulk write per mesh as one undoable step.
+"""
+
+import maya.api.OpenMaya as om
+import fg_tools.mesh_buffer as mesh_buffer
+
+maya_useNewAPI = True
+
+
+# noinspection PyPep8Naming
+class FgSetColors_cmd(om.MPxCommand):
+    """
+    Writes the colors that were queued by fg_tools.mesh_buffer.set_colors(), makes the color set the current one and
+    displays the colors. A command can not take numpy arrays as arguments, so they are handed over through the queue.
+    For undo a color set that did not exist gets deleted again, otherwise the old color of every face-vertex is kept.
+    """
+
+    cmdName = 'fgSetColors'
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        # [(dag path, color set, new colors, new color ids, old face-vertex colors or None, old current color set,
+        #   old display colors)]
+        self._writes = []
+
+    @staticmethod
+    def creator():
+        return FgSetColors_cmd()
+
+    @staticmethod
+    def createSyntax():
+        return om.MSyntax()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        for dag_path, color_set, colors, color_ids in mesh_buffer.pop_pending_color_writes():
+            mfn_mesh = om.MFnMesh(dag_path)
+            old_colors = None
+            if color_set in mfn_mesh.getColorSetNames():
+                old_colors = mfn_mesh.getFaceVertexColors(color_set)
+            display_colors = mfn_mesh.findPlug('displayColors', False).asBool()
+            self._writes.append((dag_path, color_set, colors, color_ids, old_colors, mfn_mesh.currentColorSetName(),
+                                 display_colors))
+        self.redoIt()
+
+    def redoIt(self):
+        for dag_path, color_set, colors, color_ids, _, _, _ in self._writes:
+            mesh_buffer.write_colors(dag_path, color_set, colors, color_ids)
+            mfn_mesh = om.MFnMesh(dag_path)
+            mfn_mesh.setCurrentColorSetName(color_set)
+            mfn_mesh.findPlug('displayColors', False).setBool(True)
+
+    def undoIt(self):
+        for dag_path, color_set, _, _, old_colors, old_color_set, display_colors in reversed(self._writes):
+            mfn_mesh = om.MFnMesh(dag_path)
+            if old_colors is None:
+                mfn_mesh.deleteColorSet(color_set)
+            else:
+                mfn_mesh.setColors(old_colors, color_set)
+                mfn_mesh.assignColors(om.MIntArray(range(len(old_colors))), color_set)
+            if old_color_set:
+                mfn_mesh.setCurrentColorSetName(old_color_set)
+            mfn_mesh.findPlug('displayColors', False).setBool(display_colors)
+
+
+def attach_command(mfn_plugin):
+    """
+    attaches the command to the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.registerCommand(FgSetColors_cmd.cmdName,
+                               FgSetColors_cmd.creator,
+                               FgSetColors_cmd.createSyntax)
+
+
+def remove_command(mfn_plugin):
+    """
+    Removes the command from the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.deregisterCommand(FgSetColors_cmd.cmdName)
+
+
+# noinspection PyPep8Naming
+def initializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    attach_command(pluginFn)
+
+
+# noinspection PyPep8Naming
+def uninitializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    remove_command(pluginFn)
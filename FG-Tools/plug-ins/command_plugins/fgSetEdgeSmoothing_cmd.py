@@ -0,0 +1,81 @@
+"""
+Sets edges of meshes soft or hard in one bulk write per mesh as one undoable step.
+"""
+
+import maya.api.OpenMaya as om
+import fg_tools.mesh_buffer as mesh_buffer
+
+maya_useNewAPI = True
+
+
+# noinspection PyPep8Naming
+class FgSetEdgeSmoothing_cmd(om.MPxCommand):
+    """
+    Writes the edge smoothing that was queued by fg_tools.mesh_buffer.set_edge_smoothing(). A command can not take
+    numpy arrays as arguments, so they are handed over through the queue. For undo only the old smoothing of the
+    given edges is kept.
+    """
+
+    cmdName = 'fgSetEdgeSmoothing'
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        # [(dag path, edges, old smoothing, new smoothing)]
+        self._writes = []
+
+    @staticmethod
+    def creator():
+        return FgSetEdgeSmoothing_cmd()
+
+    @staticmethod
+    def createSyntax():
+        return om.MSyntax()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        for dag_path, edges, smooth in mesh_buffer.pop_pending_smoothing_writes():
+            old_smooth = mesh_buffer.get_edge_smoothing(dag_path, edges)
+            self._writes.append((dag_path, edges, old_smooth, smooth))
+        self.redoIt()
+
+    def redoIt(self):
+        for dag_path, edges, _, new_smooth in self._writes:
+            mesh_buffer.write_edge_smoothing(dag_path, edges, new_smooth)
+
+    def undoIt(self):
+        for dag_path, edges, old_smooth, _ in reversed(self._writes):
+            mesh_buffer.write_edge_smoothing(dag_path, edges, old_smooth)
+
+
+def attach_command(mfn_plugin):
+    """
+    attaches the command to the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.registerCommand(FgSetEdgeSmoothing_cmd.cmdName,
+                               FgSetEdgeSmoothing_cmd.creator,
+                               FgSetEdgeSmoothing_cmd.createSyntax)
+
+
+def remove_command(mfn_plugin):
+    """
+    Removes the command from the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.deregisterCommand(FgSetEdgeSmoothing_cmd.cmdName)
+
+
+# noinspection PyPep8Naming
+def initializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    attach_command(pluginFn)
+
+
+# noinspection PyPep8Naming
+def uninitializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    remove_command(pluginFn)
@@ -0,0 +1,84 @@
+"""
+Sets the points of meshes in one bulk write per mesh as one undoable step.
+"""
+
+import maya.api.OpenMaya as om
+import fg_tools.mesh_buffer as mesh_buffer
+
+maya_useNewAPI = True
+
+
+# noinspection PyPep8Naming
+class FgSetPoints_cmd(om.MPxCommand):
+    """
+    Writes the points that were queued by fg_tools.mesh_buffer.set_points(). A command can not take numpy arrays as
+    arguments, so they are handed over through the queue. For undo only the old positions of the changed vertices
+    are kept, they are only read if the queue does not have them already.
+    """
+
+    cmdName = 'fgSetPoints'
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        # [(dag path, vertices, old points, new points)]
+        self._writes = []
+
+    @staticmethod
+    def creator():
+        return FgSetPoints_cmd()
+
+    @staticmethod
+    def createSyntax():
+        return om.MSyntax()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        for dag_path, points, vertices, old_points in mesh_buffer.pop_pending_writes():
+            if old_points is None:
+                old_points = mesh_buffer.get_points(dag_path)
+                if vertices is not None:
+                    old_points = old_points[vertices]
+            self._writes.append((dag_path, vertices, old_points, points))
+        self.redoIt()
+
+    def redoIt(self):
+        for dag_path, vertices, _, new_points in self._writes:
+            mesh_buffer.write_points(dag_path, new_points, vertices)
+
+    def undoIt(self):
+        for dag_path, vertices, old_points, _ in reversed(self._writes):
+            mesh_buffer.write_points(dag_path, old_points, vertices)
+
+
+def attach_command(mfn_plugin):
+    """
+    attaches the command to the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.registerCommand(FgSetPoints_cmd.cmdName,
+                               FgSetPoints_cmd.creator,
+                               FgSetPoints_cmd.createSyntax)
+
+
+def remove_command(mfn_plugin):
+    """
+    Removes the command from the given MFnPlugin.
+
+    :param OpenMaya.MFnPlugin mfn_plugin:
+    """
+    mfn_plugin.deregisterCommand(FgSetPoints_cmd.cmdName)
+
+
+# noinspection PyPep8Naming
+def initializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    attach_command(pluginFn)
+
+
+# noinspection PyPep8Naming
+def uninitializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    remove_command(pluginFn)
@@ -4,6 +4,11 @@ The main entry point plugin which collects and initializes all other custom comm
 import maya.api.OpenMaya as om
 
 import command_plugins.fgAverageComponents_cmd
+import command_plugins.fgCreateMesh_cmd
+import command_plugins.fgFlattenComponents_cmd
+import command_plugins.fgSetColors_cmd
+import command_plugins.fgSetEdgeSmoothing_cmd
+import command_plugins.fgSetPoints_cmd
 
 maya_useNewAPI = True
 
@@ -12,8 +17,18 @@ maya_useNewAPI = True
 def initializePlugin(plugin):
     pluginFn = om.MFnPlugin(plugin, vendor='Fabian Geisler', version='v0.1.0', apiVersion='Any')
     command_plugins.fgAverageComponents_cmd.attach_command(mfn_plugin=pluginFn)
+    command_plugins.fgCreateMesh_cmd.attach_command(mfn_plugin=pluginFn)
+    command_plugins.fgFlattenComponents_cmd.attach_command(mfn_plugin=pluginFn)
+    command_plugins.fgSetColors_cmd.attach_command(mfn_plugin=pluginFn)
+    command_plugins.fgSetEdgeSmoothing_cmd.attach_command(mfn_plugin=pluginFn)
+    command_plugins.fgSetPoints_cmd.attach_command(mfn_plugin=pluginFn)
 
 
 # noinspection PyPep8Naming
 def uninitializePlugin(plugin):
     command_plugins.fgAverageComponents_cmd.uninitializePlugin(plugin=plugin)
+    command_plugins.fgCreateMesh_cmd.uninitializePlugin(plugin=plugin)
+    command_plugins.fgFlattenComponents_cmd.uninitializePlugin(plugin=plugin)
+    command_plugins.fgSetColors_cmd.uninitializePlugin(plugin=plugin)
+    command_plugins.fgSetEdgeSmoothing_cmd.uninitializePlugin(plugin=plugin)
+    command_plugins.fgSetPoints_cmd.uninitializePlugin(plugin=plugin)
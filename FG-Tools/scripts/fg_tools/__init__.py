@@ -4,13 +4,24 @@ This module is the entry point for the fg_tools library.
 import os
 
 import maya.cmds as cmds
+import maya.mel as mel
 
+import cleanup
 import component
+import deviation
 import file_system
-import math_extended
+import hud
+import instancing
 import maya_runtime_command
+import mesh_qa
 import modeling
 import pivot
+import progress
+import qa
+import reference
+import render_check
+import texture
+import topology
 
 __fg_toolsInitialized = False
 
@@ -28,6 +39,8 @@ def __initialize():
 
         initialize_runtime_commands()
 
+        reference.add_load_callbacks()
+
         __fg_toolsInitialized = True
     else:
         cmds.warning('FG-Tools are already initialized')
@@ -51,6 +64,46 @@ def initialize_runtime_commands():
                                                          'fg_tools.reload_scene()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgSmartOpenDeferred',
+                                                annotation='Open a maya file without references, set the project '
+                                                           'and load the references one by one once Maya is idle.',
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.smart_open(mode="deferred")'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSmartOpenWithoutReferences',
+                                                annotation='Open a maya file without loading any references and set '
+                                                           'the project.',
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.smart_open(mode="none")'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSmartOpenPreview',
+                                                annotation='Open a maya file with only its top-level references and '
+                                                           'set the project.',
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.smart_open(mode="preview")'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgReloadSceneWithoutReferences',
+                                                annotation='Reload the currently open scene without loading any '
+                                                           'references.',
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.reload_scene(mode="none")'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgLoadReferences',
+                                                annotation=load_references.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.load_references()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgPrintReferenceLoadTimes',
+                                                annotation=print_reference_load_times.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.print_reference_load_times()'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgSaveIncremental',
                                                 annotation=save_incremental.__doc__,
                                                 command=('import fg_tools\n'
@@ -69,12 +122,30 @@ def initialize_runtime_commands():
                                                          'fg_tools.open_render_folder()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgVerifyRenderFolder',
+                                                annotation=verify_render_folder.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.verify_render_folder()'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgOpenTextureFolder',
                                                 annotation=open_texture_folder.__doc__,
                                                 command=('import fg_tools\n'
                                                          'fg_tools.open_texture_folder()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgAuditTextures',
+                                                annotation=audit_textures.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.audit_textures()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgPrintTextureMemory',
+                                                annotation=print_texture_memory.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.print_texture_memory()'),
+                                                category=category)
+
     category = main_category + '.Selection'
     maya_runtime_command.create_runtime_command(command_name='fgSelectTriangles',
                                                 annotation=select_triangles.__doc__,
@@ -94,24 +165,128 @@ def initialize_runtime_commands():
                                                          'fg_tools.select_lamina_faces()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgSelectZeroAreaFaces',
+                                                annotation=select_zero_area_faces.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_zero_area_faces()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectZeroLengthEdges',
+                                                annotation=select_zero_length_edges.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_zero_length_edges()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectConcaveFaces',
+                                                annotation=select_concave_faces.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_concave_faces()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectNonPlanarFaces',
+                                                annotation=select_non_planar_faces.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_non_planar_faces()'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgSelectNonManifoldVertices',
                                                 annotation=select_non_manifold_vertices.__doc__,
                                                 command=('import fg_tools\n'
                                                          'fg_tools.select_non_manifold_vertices()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgSelectFlippedFaces',
+                                                annotation=select_flipped_faces.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_flipped_faces()'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgSelectUVSeams',
                                                 annotation=select_uv_seams.__doc__,
                                                 command=('import fg_tools\n'
                                                          'fg_tools.select_uv_seams()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgSelectUVOverlaps',
+                                                annotation=select_uv_overlaps.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_uv_overlaps()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectUVShells',
+                                                annotation=select_uv_shells.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_uv_shells()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgPrintUVShellCounts',
+                                                annotation=print_uv_shell_counts.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.print_uv_shell_counts()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgPrintTexelDensities',
+                                                annotation=print_texel_densities.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.print_texel_densities()'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgSelectHardEdges',
                                                 annotation=select_hard_edges.__doc__,
                                                 command=('import fg_tools\n'
                                                          'fg_tools.select_hard_edges()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgSelectOverlappingVertices',
+                                                annotation=select_overlapping_vertices.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_overlapping_vertices()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectDeviatingVertices',
+                                                annotation=select_deviating_vertices.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_deviating_vertices()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgMirrorSelection',
+                                                annotation=mirror_selection.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.mirror_selection()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgGrowSelection',
+                                                annotation=grow_selection.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.grow_selection()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgShrinkSelection',
+                                                annotation=shrink_selection.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.shrink_selection()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectEdgeLoops',
+                                                annotation=select_edge_loops.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_edge_loops()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSelectEdgeRings',
+                                                annotation=select_edge_rings.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.select_edge_rings()'),
+                                                category=category)
+
+    for component_type, label in (('vertex', 'Vertices'), ('edge', 'Edges'), ('face', 'Faces')):
+        maya_runtime_command.create_runtime_command(command_name='fgConvertSelectionTo' + label,
+                                                    annotation='Convert the selection to {0:s}.'.format(label.lower()),
+                                                    command=('import fg_tools\n'
+                                                             'fg_tools.convert_selection("{0:s}")'
+                                                             '').format(component_type),
+                                                    category=category)
+
     category = main_category + '.Modeling'
     maya_runtime_command.create_runtime_command(command_name='fgSpherify',
                                                 annotation=spherify.__doc__,
@@ -119,6 +294,90 @@ def initialize_runtime_commands():
                                                          'fg_tools.spherify()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgRelax',
+                                                annotation=relax_components.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.relax_components()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgShrinkWrap',
+                                                annotation=shrink_wrap.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.shrink_wrap()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgDecimate',
+                                                annotation=decimate.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.decimate()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgHardenEdgesByAngle',
+                                                annotation=harden_edges_by_angle.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.harden_edges_by_angle()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgHardenEdgesByAngleAndUVSeams',
+                                                annotation=harden_edges_by_angle.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.harden_edges_by_angle(hard_uv_seams=True)'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgCleanUpMeshes',
+                                                annotation=clean_up_meshes.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.clean_up_meshes()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgCleanUpMeshesToQuads',
+                                                annotation=clean_up_meshes.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.clean_up_meshes(quadrangulate=True)'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgConformNormals',
+                                                annotation=conform_normals.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.conform_normals()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgWeldOverlappingVertices',
+                                                annotation=weld_overlapping_vertices.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.weld_overlapping_vertices()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSymmetrizePositiveToNegative',
+                                                annotation=symmetrize.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.symmetrize(positive=True)'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgSymmetrizeNegativeToPositive',
+                                                annotation=symmetrize.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.symmetrize(positive=False)'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgShowDeviations',
+                                                annotation=show_deviations.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.show_deviations()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgCopyPoints',
+                                                annotation=copy_points.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.copy_points()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgPastePoints',
+                                                annotation=paste_points.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.paste_points()'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgMoveComponentsToXAxis',
                                                 annotation='Move all selected components so they\'re aligned on the '
                                                            'x-axis.',
@@ -140,6 +399,20 @@ def initialize_runtime_commands():
                                                          'cmds.fgAverageComponents(axis="z")'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgFlattenComponentsToPlane',
+                                                annotation='Flatten all selected components onto the plane that fits '
+                                                           'them best.',
+                                                command=('import maya.cmds as cmds\n'
+                                                         'cmds.fgFlattenComponents(mode="plane")'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgFlattenComponentsToLine',
+                                                annotation='Line up all selected components on the line that fits '
+                                                           'them best.',
+                                                command=('import maya.cmds as cmds\n'
+                                                         'cmds.fgFlattenComponents(mode="line")'),
+                                                category=category)
+
     maya_runtime_command.create_runtime_command(command_name='fgAssignDefaultShaderToSelection',
                                                 annotation=assign_default_shader_to_selection.__doc__,
                                                 command=('import fg_tools\n'
@@ -152,6 +425,34 @@ def initialize_runtime_commands():
                                                          'fg_tools.toggle_x_ray_display_of_selection()'),
                                                 category=category)
 
+    maya_runtime_command.create_runtime_command(command_name='fgFindDuplicateMeshes',
+                                                annotation=find_duplicate_meshes.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.find_duplicate_meshes()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgInstanceDuplicateMeshes',
+                                                annotation=instance_duplicate_meshes.__doc__,
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.instance_duplicate_meshes()'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgToggleSelectionStatisticsHUD',
+                                                annotation='Show or hide a HUD with the number of triangles, quads, '
+                                                           'n-gons, lamina faces and non-manifold vertices of the '
+                                                           'selected meshes.',
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.toggle_mesh_statistics_hud(scope="selection")'),
+                                                category=category)
+
+    maya_runtime_command.create_runtime_command(command_name='fgToggleSceneStatisticsHUD',
+                                                annotation='Show or hide a HUD with the number of triangles, quads, '
+                                                           'n-gons, lamina faces and non-manifold vertices of all '
+                                                           'meshes in the scene.',
+                                                command=('import fg_tools\n'
+                                                         'fg_tools.toggle_mesh_statistics_hud(scope="scene")'),
+                                                category=category)
+
     category = main_category + '.Pivots'
     maya_runtime_command.create_runtime_command(command_name='fgCopyPivot',
                                                 annotation=copy_pivot.__doc__,
@@ -184,12 +485,26 @@ def initialize_runtime_commands():
                                                 category=category)
 
 
-def smart_open():
+def smart_open(mode='all'):
     """
     Open a maya file and tries to find and set the appropriate project.
+
+    :param str mode: How to load the references of the scene. One of "all", "deferred", "none" or "preview".
+                     See reference.OPEN_MODES for details.
     """
     file_before = cmds.file(q=True, sn=True)
-    cmds.OpenScene()
+    if mode == 'all':
+        cmds.OpenScene()
+    else:
+        file_path = cmds.fileDialog2(caption='Open ({0:s} references)'.format(mode),
+                                     fileFilter='Maya Files (*.ma *.mb);;Maya ASCII (*.ma);;Maya Binary (*.mb)',
+                                     fileMode=1,
+                                     okCaption='Open',
+                                     dialogStyle=2)
+        # "saveChanges" is Maya's own "Save changes to the current scene?" dialog. It returns 0 on cancel.
+        if file_path is None or not mel.eval('saveChanges("")'):
+            return
+        reference.open_scene(file_path[0], mode=mode)
     file_after = cmds.file(q=True, sn=True)
 
     if file_before != file_after:
@@ -201,9 +516,12 @@ def smart_open():
             cmds.warning('No Project-Directory found.')
 
 
-def reload_scene():
+def reload_scene(mode='all'):
     """
     Reload the currently open scene.
+
+    :param str mode: How to load the references of the scene. One of "all", "deferred", "none" or "preview".
+                     See reference.OPEN_MODES for details.
     """
     maya_file = cmds.file(q=True, sn=True)
     if maya_file:
@@ -214,11 +532,75 @@ def reload_scene():
                                        defaultButton='No',
                                        cancelButton='No',
                                        dismissString='No'):
-            cmds.file(maya_file, open=True, force=True)
+            reference.open_scene(maya_file, mode=mode)
     else:
         cmds.warning('Your scene has not been saved yet!')
 
 
+def load_references():
+    """
+    Load the references of the selected objects or reference nodes. If nothing that belongs to a reference is selected,
+    you can pick the references to load from a list of all unloaded references.
+    """
+    ref_nodes = reference.get_reference_nodes(cmds.ls(selection=True))
+    ref_nodes = [ref_node for ref_node in ref_nodes if not cmds.referenceQuery(ref_node, isLoaded=True)]
+    if not ref_nodes:
+        unloaded = reference.get_unloaded_references()
+        if not unloaded:
+            print 'All references are loaded.\n',
+            return
+        if cmds.about(batch=True):
+            ref_nodes = unloaded
+        else:
+            ref_nodes = _pick_references(unloaded)
+
+    for ref_node, duration in reference.load_references(ref_nodes):
+        print 'Loaded reference {0:s} in {1:.2f}s\n'.format(ref_node, duration),
+
+
+def _pick_references(reference_nodes):
+    """
+    Shows a dialog where the user can pick some of the given references.
+
+    :param list[str] reference_nodes:
+    :returns: The picked reference nodes.
+    :rtype: list[str]
+    """
+    labels = ['{0:s}  ({1:s})'.format(ref_node, os.path.basename(cmds.referenceQuery(ref_node, filename=True)))
+              for ref_node in reference_nodes]
+    picked = []
+
+    def build_dialog():
+        form = cmds.setParent(query=True)
+        cmds.formLayout(form, edit=True, width=400)
+        scroll_list = cmds.textScrollList(allowMultiSelection=True, append=labels, height=300)
+
+        def accept(*_):
+            picked.extend(reference_nodes[i - 1] for i in cmds.textScrollList(scroll_list,
+                                                                              query=True,
+                                                                              selectIndexedItem=True) or [])
+            cmds.layoutDialog(dismiss='Load')
+
+        load_button = cmds.button(label='Load', command=accept)
+        cancel_button = cmds.button(label='Cancel', command=lambda *_: cmds.layoutDialog(dismiss='Cancel'))
+        cmds.formLayout(form, edit=True,
+                        attachForm=[(scroll_list, 'top', 5), (scroll_list, 'left', 5), (scroll_list, 'right', 5),
+                                    (load_button, 'left', 5), (load_button, 'bottom', 5),
+                                    (cancel_button, 'right', 5), (cancel_button, 'bottom', 5)],
+                        attachControl=[(scroll_list, 'bottom', 5, load_button)],
+                        attachPosition=[(load_button, 'right', 2, 50), (cancel_button, 'left', 2, 50)])
+
+    cmds.layoutDialog(title='Load References', ui=build_dialog)
+    return picked
+
+
+def print_reference_load_times():
+    """
+    Print how long each reference took to load in this session, the slowest first.
+    """
+    reference.print_load_report()
+
+
 def save_incremental():
     """
     Save the current maya file under a new version. The last number found in the current scene name will be raised by 1.
@@ -248,6 +630,42 @@ def open_render_folder():
     print 'Opened Folder: ' + render_folder + '\n',
 
 
+def verify_render_folder():
+    """
+    Check all image sequences in the render folder for missing frames and empty or truncated files.
+    """
+    render_folder = file_system.get_render_folder()
+    frame_range = None
+    if cmds.getAttr('defaultRenderGlobals.animation'):
+        frame_range = (int(cmds.getAttr('defaultRenderGlobals.startFrame')),
+                       int(cmds.getAttr('defaultRenderGlobals.endFrame')),
+                       int(cmds.getAttr('defaultRenderGlobals.byFrameStep')))
+    report = render_check.verify_folder(render_folder, frame_range=frame_range)
+
+    print '{0:*^100}'.format(' Render folder ')
+    broken_sequences = 0
+    for pattern, sequence in sorted(report.items()):
+        print '{0:s}  [{1:d}-{2:d}]  {3:d} frames  {4:.1f} MB'.format(pattern,
+                                                                      sequence['first'],
+                                                                      sequence['last'],
+                                                                      sequence['count'],
+                                                                      sequence['bytes'] / 1024.0 ** 2)
+        if sequence['missing']:
+            print '    missing frames: ' + ', '.join(str(frame) for frame in sequence['missing'])
+        for file_path in sequence['empty']:
+            print '    empty: ' + file_path
+        for file_path in sequence['truncated']:
+            print '    truncated: ' + file_path
+        if sequence['missing'] or sequence['empty'] or sequence['truncated']:
+            broken_sequences += 1
+
+    if broken_sequences:
+        cmds.warning('{0:d} of {1:d} sequences are incomplete. '
+                     'See the script editor for details.'.format(broken_sequences, len(report)))
+    else:
+        print 'All {0:d} sequences in {1:s} are complete.\n'.format(len(report), render_folder),
+
+
 def open_texture_folder():
     """
     Open the texture folder.
@@ -259,18 +677,65 @@ def open_texture_folder():
     print 'Opened Folder: ' + tex_folder + '\n',
 
 
+def audit_textures():
+    """
+    Check whether all texture files of the scene exist and report missing, empty and out-of-project textures.
+    """
+    audit = texture.audit_textures()
+
+    print '{0:*^100}'.format(' Texture audit ')
+    for title, key in (('Missing', 'missing'), ('Empty', 'empty'), ('Outside of the project', 'outside_project')):
+        if audit[key]:
+            print '{0:s} ({1:d}):'.format(title, len(audit[key]))
+            for file_path in audit[key]:
+                print '    {0:s}  <- {1:s}'.format(file_path, ', '.join(audit['nodes'][file_path]))
+    print 'Checked {0:d} texture files with {1:.1f} MB in total.'.format(len(audit['sizes']),
+                                                                         audit['total_bytes'] / 1024.0 ** 2)
+
+    if audit['missing'] or audit['empty']:
+        cmds.warning('{0:d} textures are missing and {1:d} are empty. '
+                     'See the script editor for details.'.format(len(audit['missing']), len(audit['empty'])))
+    else:
+        print 'All textures resolve.\n',
+
+
+def print_texture_memory():
+    """
+    Print how much memory the textures of the scene take up once they are decoded, the largest first.
+    """
+    estimation = texture.estimate_texture_memory(mipmaps=True)
+
+    print '{0:*^100}'.format(' Texture memory ')
+    for file_path, size in sorted(estimation['sizes'].items(), key=lambda item: item[1], reverse=True):
+        header = texture.get_texture_index().get(file_path)
+        print '{0:10.1f} MB  {1:5d} x {2:<5d} {3:d}ch {4:2d}bit  {5:s}'.format(size / 1024.0 ** 2,
+                                                                           header['width'],
+                                                                           header['height'],
+                                                                           header['channels'],
+                                                                           header['bit_depth'],
+                                                                           file_path)
+    for file_path in estimation['unreadable']:
+        print '  unreadable  {0:s}'.format(file_path)
+    print 'The textures take up {0:.1f} MB once they are decoded (including mipmaps).\n'.format(
+        estimation['total_bytes'] / 1024.0 ** 2),
+
+
 def select_triangles():
     """
     Select all triangles of the currently selected objects.
     """
-    tris = component.get_triangles()
+    try:
+        tris = component.get_triangles()
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
     if tris:
         objects = list(set([tri.split('.')[0] for tri in tris]))
         cmds.select(tris)
         cmds.hilite(objects)
         cmds.selectMode(component=True)
         cmds.selectType(allComponents=False, polymeshFace=True)
-        print 'Selected {0:d} Triangles.\n'.format(cmds.polyEvaluate(objects, faceComponent=True)),
+        print 'Selected {0:d} Triangles.\n'.format(component.count_components(tris)),
     else:
         cmds.selectMode(object=True)
         print 'Selection does not contain Triangles!\n',
@@ -280,14 +745,18 @@ def select_n_gons():
     """
     Select all n-gons of the currently selected objects.
     """
-    ngons = component.get_ngons()
+    try:
+        ngons = component.get_ngons()
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
     if ngons:
         objects = list(set([ngon.split('.')[0] for ngon in ngons]))
         cmds.select(ngons)
         cmds.hilite(objects)
         cmds.selectMode(component=True)
         cmds.selectType(allComponents=False, polymeshFace=True)
-        print 'Selected {0:d} N-Gons.\n'.format(cmds.polyEvaluate(objects, faceComponent=True)),
+        print 'Selected {0:d} N-Gons.\n'.format(component.count_components(ngons)),
     else:
         cmds.selectMode(object=True)
         print 'Selection does not contain N-Gons!\n',
@@ -297,45 +766,122 @@ def select_lamina_faces():
     """
     Select all lamina faces of the currently selected objects.
     """
-    lamina = component.get_lamina_faces()
+    try:
+        lamina = component.get_lamina_faces()
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
     if lamina:
         objects = list(set([l.split('.')[0] for l in lamina]))
         cmds.select(lamina)
         cmds.hilite(objects)
         cmds.selectMode(component=True)
         cmds.selectType(allComponents=False, polymeshFace=True)
-        print 'Selected {0:d} lamina faces.\n'.format(cmds.polyEvaluate(objects, faceComponent=True)),
+        print 'Selected {0:d} lamina faces.\n'.format(component.count_components(lamina)),
     else:
         cmds.selectMode(object=True)
         print 'Selection does not contain lamina faces!\n',
 
 
+def select_zero_area_faces():
+    """
+    Select all faces without area of the currently selected objects.
+    """
+    _select_check_components(mesh_qa.ZERO_AREA_FACES, 'zero-area faces')
+
+
+def select_zero_length_edges():
+    """
+    Select all edges without length of the currently selected objects.
+    """
+    _select_check_components(mesh_qa.ZERO_LENGTH_EDGES, 'zero-length edges')
+
+
+def select_concave_faces():
+    """
+    Select all concave faces of the currently selected objects.
+    """
+    _select_check_components(mesh_qa.CONCAVE_FACES, 'concave faces')
+
+
+def select_non_planar_faces():
+    """
+    Select all non-planar faces of the currently selected objects.
+    """
+    _select_check_components(mesh_qa.NON_PLANAR_FACES, 'non-planar faces')
+
+
+def _select_check_components(check, description):
+    """
+    Runs a check on the selected objects and selects the components it finds.
+
+    :param str check: The check to run, see mesh_qa.CHECKS.
+    :param str description: What the check finds, for the messages.
+    """
+    try:
+        results = qa.analyze_meshes(checks=[check])
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
+    components = qa.get_components(results, check)
+    if components:
+        _select_components(components, mesh_qa.CHECKS[check])
+        print 'Selected {0:d} {1:s}.\n'.format(component.count_components(components), description),
+    else:
+        cmds.selectMode(object=True)
+        print 'Selection does not contain {0:s}.\n'.format(description),
+
+
 def select_non_manifold_vertices():
     """
     Select all non-manifold vertices of the currently selected objects.
     """
-    nmv = component.get_non_manifold_vertices()
+    try:
+        nmv = component.get_non_manifold_vertices()
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
     if nmv:
         objects = list(set([vertex.split('.')[0] for vertex in nmv]))
         cmds.select(nmv)
         cmds.hilite(objects)
         cmds.selectMode(component=True)
         cmds.selectType(allComponents=False, vertex=True)
-        print 'Selected {0:d} non-manifold vertices\n'.format(cmds.polyEvaluate(objects, vertexComponent=True)),
+        print 'Selected {0:d} non-manifold vertices\n'.format(component.count_components(nmv)),
     else:
         cmds.selectMode(object=True)
         print 'Selection does not contain non-manifold-vertices.\n',
 
 
+def select_flipped_faces():
+    """
+    Select the faces of all selected objects that are wound the other way than their neighbours, or inwards on closed
+    objects.
+    """
+    try:
+        results = qa.analyze_meshes(checks=[mesh_qa.FLIPPED_FACES])
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
+    faces = qa.get_components(results, mesh_qa.FLIPPED_FACES)
+    if faces:
+        _select_components(faces, topology.FACE)
+        print 'Selected {0:d} flipped faces.\n'.format(component.count_components(faces)),
+    else:
+        cmds.selectMode(object=True)
+        print 'Selection does not contain flipped faces.\n',
+
+
 def select_uv_seams():
     """
     Select the UV seams on all selected objects.
     """
-    cmds.selectMode(object=True)
-
-    seam_edges = []
-    for obj in cmds.ls(selection=True):
-        seam_edges += component.get_seam_edges(obj)
+    try:
+        results = qa.analyze_meshes(checks=[mesh_qa.UV_SEAMS])
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
+    seam_edges = qa.get_components(results, mesh_qa.UV_SEAMS)
     if seam_edges:
         objects = list(set([edge.split('.')[0] for edge in seam_edges]))
 
@@ -343,21 +889,82 @@ def select_uv_seams():
         cmds.hilite(objects)
         cmds.selectMode(component=True)
         cmds.selectType(allComponents=False, polymeshEdge=True)
-        print 'Selected {0:d} seam edges.\n'.format(cmds.polyEvaluate(objects, edgeComponent=True)),
+        print 'Selected {0:d} seam edges.\n'.format(component.count_components(seam_edges)),
     else:
         cmds.selectMode(object=True)
         print 'Selection does not seam edges.\n',
 
 
+def select_uv_overlaps():
+    """
+    Select the faces of all selected objects that overlap other faces in UV space.
+    """
+    try:
+        results = qa.analyze_meshes(checks=[mesh_qa.UV_OVERLAPS])
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
+    faces = qa.get_components(results, mesh_qa.UV_OVERLAPS)
+    if faces:
+        _select_components(faces, topology.FACE)
+        print 'Selected {0:d} overlapping faces.\n'.format(component.count_components(faces)),
+    else:
+        cmds.selectMode(object=True)
+        print 'Selection does not contain overlapping UVs.\n',
+
+
+def select_uv_shells():
+    """
+    Select all faces of the UV shells of the selected components.
+    """
+    faces = component.get_uv_shell_faces(cmds.ls(selection=True), flatten=False)
+    if faces:
+        _select_components(faces, topology.FACE)
+        print 'Selected {0:d} faces.\n'.format(component.count_components(faces)),
+    else:
+        print 'Selection does not contain faces with UVs.\n',
+
+
+def print_uv_shell_counts(maximum=None):
+    """
+    Print the number of UV shells of all selected objects, the most fragmented first.
+
+    :param int maximum: If this is given, the objects with more shells get selected.
+    """
+    counts = component.get_uv_shell_counts()
+    for mesh, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        print '{0:6d} UV shells  {1:s}'.format(count, mesh)
+    if maximum is not None:
+        over = [mesh for mesh, count in counts.items() if count > maximum]
+        cmds.select(over)
+        print '{0:d} of {1:d} objects have more than {2:d} UV shells.\n'.format(len(over), len(counts), maximum),
+
+
+def print_texel_densities(resolution=2048):
+    """
+    Print the lowest, average and highest texel density of the UV shells of all selected objects.
+
+    :param int resolution: The width of the texture in pixels.
+    """
+    for mesh in component.get_meshes():
+        densities = component.get_texel_densities(mesh, resolution)
+        if len(densities):
+            print '{0:s}: {1:d} shells, {2:.1f} / {3:.1f} / {4:.1f} px per unit (min / mean / max)'.format(
+                mesh, len(densities), densities.min(), densities.mean(), densities.max())
+        else:
+            print '{0:s}: no UVs'.format(mesh)
+
+
 def select_hard_edges():
     """
     Select the hard edges on all selected objects.
     """
-    cmds.selectMode(object=True)
-
-    hard_edges = []
-    for obj in cmds.ls(selection=True):
-        hard_edges += component.get_hard_edges(obj)
+    try:
+        results = qa.analyze_meshes(checks=[mesh_qa.HARD_EDGES])
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
+    hard_edges = qa.get_components(results, mesh_qa.HARD_EDGES)
     if hard_edges:
         objects = list(set([edge.split('.')[0] for edge in hard_edges]))
 
@@ -365,28 +972,323 @@ def select_hard_edges():
         cmds.hilite(objects)
         cmds.selectMode(component=True)
         cmds.selectType(allComponents=False, polymeshEdge=True)
-        print 'Selected {0:d} hard edges.\n'.format(cmds.polyEvaluate(objects, edgeComponent=True)),
+        print 'Selected {0:d} hard edges.\n'.format(component.count_components(hard_edges)),
     else:
         cmds.selectMode(object=True)
         print 'Selection does not hard edges.\n',
 
 
+def select_overlapping_vertices():
+    """
+    Select all vertices of the selected objects or components that lie on top of each other.
+    """
+    vertices = component.get_overlapping_vertices(flatten=False)
+    if vertices:
+        _select_components(vertices, topology.VERTEX)
+        print 'Selected {0:d} overlapping vertices.\n'.format(len(cmds.ls(vertices, flatten=True))),
+    else:
+        print 'Selection does not contain overlapping vertices.\n',
+
+
+def _get_compared_meshes():
+    """
+    :returns: The selected meshes except the last one and the last selected mesh, which is the reference.
+              None if less than two meshes are selected.
+    :rtype: tuple[list[str], str]
+    """
+    meshes = component.get_meshes()
+    if len(meshes) < 2:
+        cmds.warning('Select the meshes to compare and the reference mesh last.')
+        return None
+    return meshes[:-1], meshes[-1]
+
+
+def select_deviating_vertices(threshold=deviation.THRESHOLD):
+    """
+    Select the vertices of the selected meshes that moved away from the same vertex of the mesh that was selected
+    last (the reference).
+
+    :param float threshold: The distance a vertex has to move to get selected.
+    """
+    compared = _get_compared_meshes()
+    if compared is None:
+        return
+    meshes, reference = compared
+    vertices = []
+    for mesh in meshes:
+        try:
+            vertices += component.get_deviating_vertices(mesh, reference, threshold, flatten=False)
+        except ValueError as error:
+            cmds.warning('{0:s}: {1:s}'.format(mesh, str(error)))
+    if vertices:
+        _select_components(vertices, topology.VERTEX)
+        print 'Selected {0:d} vertices that moved.\n'.format(component.count_components(vertices)),
+    else:
+        print 'No vertices moved.\n',
+
+
+def show_deviations():
+    """
+    Color the vertices of the selected meshes by how far they moved away from the same vertex of the mesh that was
+    selected last (the reference), from green (did not move) to red (moved the most).
+    """
+    compared = _get_compared_meshes()
+    if compared is None:
+        return
+    meshes, reference = compared
+    for mesh in meshes:
+        try:
+            distances = component.get_deviations(mesh, reference)
+        except ValueError as error:
+            cmds.warning('{0:s}: {1:s}'.format(mesh, str(error)))
+            continue
+        modeling.show_deviations(mesh, distances)
+        print '{0:s}: {1:s}\n'.format(mesh, deviation.format_statistics(distances)),
+
+
+def mirror_selection():
+    """
+    Select the components on the other side of the plane of symmetry instead of the selected ones.
+    """
+    components = component.mirror_components(cmds.ls(selection=True), flatten=False)
+    if components:
+        cmds.select(components)
+    else:
+        print 'Selection has no mirrored components.\n',
+
+
+def _select_components(components, component_type):
+    """
+    Selects the given components and switches to the matching component selection mode.
+
+    :param list[str] components:
+    :param str component_type: "vertex", "edge" or "face".
+    """
+    objects = list(set([comp.split('.')[0] for comp in components]))
+    cmds.select(components)
+    cmds.hilite(objects)
+    cmds.selectMode(component=True)
+    if component_type == topology.VERTEX:
+        cmds.selectType(allComponents=False, vertex=True)
+    elif component_type == topology.EDGE:
+        cmds.selectType(allComponents=False, polymeshEdge=True)
+    else:
+        cmds.selectType(allComponents=False, polymeshFace=True)
+
+
+def convert_selection(component_type):
+    """
+    Convert the selection to vertices, edges or faces.
+
+    :param str component_type: "vertex", "edge" or "face".
+    """
+    components = component.convert_components(cmds.ls(selection=True), component_type, flatten=False)
+    if components:
+        _select_components(components, component_type)
+
+
+def grow_selection():
+    """
+    Grow the selected vertices, edges or faces by their neighbours.
+    """
+    components = component.grow_components(cmds.ls(selection=True), flatten=False)
+    if components:
+        cmds.select(components)
+
+
+def shrink_selection():
+    """
+    Shrink the selected vertices, edges or faces by the ones on the border of the selection.
+    """
+    components = component.shrink_components(cmds.ls(selection=True), flatten=False)
+    if components:
+        cmds.select(components)
+    else:
+        cmds.select(clear=True)
+
+
+def select_edge_loops():
+    """
+    Select the edge loops through all selected edges.
+    """
+    edges = component.get_edge_loops(cmds.ls(selection=True), flatten=False)
+    if edges:
+        _select_components(edges, topology.EDGE)
+    else:
+        print 'Selection does not contain edges.\n',
+
+
+def select_edge_rings():
+    """
+    Select the edge rings through all selected edges.
+    """
+    edges = component.get_edge_rings(cmds.ls(selection=True), flatten=False)
+    if edges:
+        _select_components(edges, topology.EDGE)
+    else:
+        print 'Selection does not contain edges.\n',
+
+
 def spherify():
     """
     Move all selected components to equal distance of each other.
     """
-    vertices = component.convert_to_vertices(cmds.ls(selection=True))
+    try:
+        modeling.spherify(cmds.ls(selection=True))
+    except progress.OperationCancelled as cancelled:
+        print '{0:s} Nothing has been changed.\n'.format(str(cancelled)),
+
+
+def relax_components(weights='uniform', iterations=10):
+    """
+    Relax the selected components (or whole selected objects) while their border stays in place.
+
+    :param str weights: "uniform" or "cotangent" (which keeps the shape of uneven meshes better).
+    :param int iterations:
+    """
+    try:
+        modeling.relax_components(cmds.ls(selection=True), weights=weights, iterations=iterations)
+    except progress.OperationCancelled as cancelled:
+        print '{0:s} Nothing has been changed.\n'.format(str(cancelled)),
+
+
+def shrink_wrap(mode='closest'):
+    """
+    Move the selected components (or whole selected objects) onto the surface of the object that was selected last.
+
+    :param str mode: "closest" moves them to the closest point, "normal" along their normal.
+    """
+    selection = cmds.ls(selection=True)
+    targets = cmds.ls(selection[-1:], objectsOnly=True)
+    if len(selection) < 2 or not targets:
+        cmds.warning('Select the components to wrap and the target object last.')
+        return
+    try:
+        modeling.shrink_wrap(selection[:-1], targets[0], mode=mode)
+    except progress.OperationCancelled as cancelled:
+        print '{0:s} Nothing has been changed.\n'.format(str(cancelled)),
+
+
+def decimate(ratio=0.25):
+    """
+    Build a lightweight proxy of every selected object. UV seams, hard edges and borders keep their shape.
+
+    :param float ratio: The number of triangles of the proxies, relative to the triangles of the objects.
+    """
+    meshes = component.get_meshes()
+    if not meshes:
+        cmds.warning('Select the objects to decimate.')
+        return
+    try:
+        proxies = modeling.decimate_meshes(meshes, ratio=ratio)
+    except progress.OperationCancelled as cancelled:
+        print '{0:s}\n'.format(str(cancelled)),
+        return
+    cmds.select(proxies)
+    print 'Built {0:d} proxies.\n'.format(len(proxies)),
+
+
+def harden_edges_by_angle(angle=30.0, hard_uv_seams=False):
+    """
+    Set the edges of the selected objects hard where their faces meet at a bigger angle and soft everywhere else,
+    without construction history.
 
-    positions = [cmds.pointPosition(vertex) for vertex in vertices]
-    midpoint = math_extended.midpoint(positions)
+    :param float angle: The angle in degrees between two faces above which their edge gets hard.
+    :param bool hard_uv_seams: Whether the edges on UV seams get hard regardless of their angle.
+    """
+    meshes = component.get_meshes()
+    if not meshes:
+        cmds.warning('Select the objects to harden.')
+        return
+    try:
+        changed = modeling.harden_edges_by_angle(meshes, angle=angle, hard_uv_seams=hard_uv_seams)
+    except progress.OperationCancelled as cancelled:
+        print '{0:s} Nothing has been changed.\n'.format(str(cancelled)),
+        return
+    print 'Changed {0:d} edges.\n'.format(changed),
+
+
+def clean_up_meshes(quadrangulate=False):
+    """
+    Clean up the selected objects in one undoable step: delete lamina faces, split n-gons, split non-manifold
+    vertices and merge coincident vertices. Prints what changed and how long it took for every object.
 
-    distances = [math_extended.distance(midpoint, position) for position in positions]
-    average_distance = math_extended.average(distances)
+    :param bool quadrangulate: Whether the n-gons get split into quads instead of triangles.
+    """
+    meshes = component.get_meshes()
+    if not meshes:
+        cmds.warning('Select the objects to clean up.')
+        return
+    try:
+        reports = modeling.clean_up_meshes(meshes,
+                                           ngons=cleanup.QUADRANGULATE if quadrangulate else cleanup.TRIANGULATE)
+    except progress.OperationCancelled as cancelled:
+        print '{0:s} Nothing has been changed.\n'.format(str(cancelled)),
+        return
+    for mesh, counts, timings in reports:
+        print '{0:s}: {1:s}\n'.format(mesh, cleanup.format_report(counts, timings)),
+    print 'Cleaned up {0:d} objects in {1:.3f}s.\n'.format(len(reports),
+                                                          sum(sum(timings.values()) for _, _, timings in reports)),
+
+
+def conform_normals():
+    """
+    Reverse the faces of the selected objects that are wound the other way than their neighbours, so closed objects
+    face outwards.
+    """
+    reversed_count = component.conform_normals()
+    print 'Reversed {0:d} faces.\n'.format(reversed_count),
 
-    new_positions = math_extended.spherify(positions, average_distance)
 
-    for vertex, position in zip(vertices, new_positions):
-        cmds.move(position[0], position[1], position[2], vertex, absolute=True)
+def weld_overlapping_vertices():
+    """
+    Merge all vertices of the selected objects or components that lie on top of each other.
+    """
+    removed = component.weld_overlapping_vertices()
+    print 'Merged {0:d} overlapping vertices.\n'.format(removed),
+
+
+def symmetrize(positive=True):
+    """
+    Mirror the positions of the selected vertices (or all vertices of the selected objects) from one side of the plane
+    of symmetry to the other.
+
+    :param bool positive: If this is True the positive side is mirrored onto the negative one, otherwise the negative
+                          side onto the positive one.
+    """
+    unmatched = component.symmetrize(positive=positive)
+    if unmatched:
+        cmds.warning('{0:d} vertices have no mirror vertex and did not move.'.format(unmatched))
+
+
+def copy_points():
+    """
+    Save the vertex positions of the selected mesh to apply them later with "paste points", also in other Maya sessions.
+    """
+    meshes = component.get_meshes()
+    if not meshes:
+        cmds.warning('Select a mesh to copy its points.')
+        return
+    modeling.copy_points(meshes[0])
+    print 'Copied points from:    {0:s}\n'.format(meshes[0]),
+
+
+def paste_points(weight=1.0):
+    """
+    Move the selected vertices (or all vertices of the selected meshes) to the positions that have been saved via
+    "copy points". The meshes need the same topology as the copied one.
+
+    :param float weight: How far the vertices move towards the copied positions (1.0 moves them all the way).
+    """
+    try:
+        meshes = modeling.paste_points(cmds.ls(selection=True), weight=weight)
+    except IOError:
+        cmds.warning('There are no copied points. Use "copy points" first.')
+        return
+    except ValueError as error:
+        cmds.warning(str(error))
+        return
+    print 'Pasted points to:    {0:s}\n'.format(str(meshes)),
 
 
 def copy_pivot():
@@ -454,5 +1356,61 @@ def toggle_x_ray_display_of_selection():
     modeling.toggle_x_ray_display(objects=sel)
 
 
-if not __fg_toolsInitialized:
+def find_duplicate_meshes():
+    """
+    Print which meshes of the scene are identical copies of each other and select the copies.
+    """
+    groups = instancing.find_duplicates()
+    if not groups:
+        print 'The scene has no duplicate meshes.\n',
+        return
+
+    print '{0:*^100}'.format(' Duplicate meshes ')
+    for group in groups:
+        print '{0:5d} copies of {1:s}'.format(len(group) - 1, group[0])
+    _print_saved_bytes(groups, 'would save')
+    cmds.select([mesh for group in groups for mesh in group[1:]])
+
+
+def instance_duplicate_meshes():
+    """
+    Replace all meshes of the scene that are identical copies of each other with instances of one shape.
+    """
+    groups = instancing.find_duplicates()
+    if not groups:
+        print 'The scene has no duplicate meshes.\n',
+        return
+
+    instanced, skipped = instancing.instance_duplicates(groups)
+    for mesh in skipped:
+        print 'Skipped {0:s}, it has history, per-face shading, instances or comes from a reference.'.format(mesh)
+    _print_saved_bytes(instanced, 'saved')
+
+
+def _print_saved_bytes(groups, verb):
+    """
+    :param list[list[str]] groups: Meshes that are copies of each other in groups.
+    :param str verb: How to phrase the saving, like "would save".
+    """
+    memory_bytes, file_bytes = instancing.estimate_saved_bytes(groups)
+    print ('{0:d} meshes are copies of {1:d} meshes. Instancing them {2:s} about {3:.1f} MB of memory and {4:.1f} MB '
+           'of file size.\n').format(sum(len(group) - 1 for group in groups),
+                                     len(groups),
+                                     verb,
+                                     memory_bytes / 1024.0 ** 2,
+                                     file_bytes / 1024.0 ** 2),
+
+
+def toggle_mesh_statistics_hud(scope=hud.SELECTION):
+    """
+    Show or hide a HUD with the number of triangles, quads, n-gons, lamina faces and non-manifold vertices.
+
+    :param str scope: "selection" to count the selected meshes or "scene" to count all meshes.
+    """
+    hud.toggle(scope)
+
+
+# Worker processes (see parallel.process_map) import this package without initializing Maya first.
+# "cmds" has no commands in that case, so there is nothing to initialize.
+if not __fg_toolsInitialized and hasattr(cmds, 'about'):
     __initialize()
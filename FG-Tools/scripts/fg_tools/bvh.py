@@ -0,0 +1,445 @@
+"""
+A bounding volume hierarchy over the triangles of a mesh, to find the closest points on the mesh or where lines hit it
+for many points at once.
+
+The triangles are sorted along a Morton curve over their centers and split into leaves of LEAF_SIZE consecutive
+triangles. The leaves are the bottom of a complete binary tree, so the tree needs no pointers: the children of node i
+are 2i + 1 and 2i + 2. Queries walk down the tree for all points together in batches of (point, node) pairs, keeping
+only the pairs that can still beat the best hit of their point. The batches are walked depth first, so the hits of one
+batch prune the next ones and the number of pairs stays bounded.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+
+CLOSEST = 'closest'
+NORMAL = 'normal'
+
+MODES = (CLOSEST, NORMAL)
+
+# The number of triangles in a leaf of the tree.
+LEAF_SIZE = 8
+
+# The most (point, node) pairs that are walked down the tree at once. More pairs are faster but need more memory.
+MAX_PAIRS = 1 << 18
+
+# The number of bits per axis of the Morton codes.
+MORTON_BITS = 10
+
+
+def _dot(a, b):
+    return np.einsum('ij,ij->i', a, b)
+
+
+def get_morton_codes(points, minimum, maximum):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param numpy.ndarray minimum: The lower corner of the bounding box of all points.
+    :param numpy.ndarray maximum: The upper corner of the bounding box of all points.
+    :returns: The position of every point along a Morton (Z-order) curve through the bounding box. Points that are
+              close to each other mostly get close codes.
+    :rtype: numpy.ndarray
+    """
+    size = np.maximum(maximum - minimum, 1e-12)
+    cells = np.clip((points - minimum) / size * (1 << MORTON_BITS), 0, (1 << MORTON_BITS) - 1).astype(np.int64)
+    codes = np.zeros(len(points), dtype=np.int64)
+    for bit in range(MORTON_BITS):
+        for axis in range(3):
+            codes |= ((cells[:, axis] >> bit) & 1) << (3 * bit + axis)
+    return codes
+
+
+def get_closest_points_on_triangles(points, a, b, c):
+    """
+    Finds the closest point on a triangle by the Voronoi region of the triangle the point lies in (see "Real-Time
+    Collision Detection" by Christer Ericson).
+
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param numpy.ndarray a: The first corner of the triangle of every point in the shape (n, 3).
+    :param numpy.ndarray b: The second corners.
+    :param numpy.ndarray c: The third corners.
+    :returns: The closest point on the triangle of every point.
+    :rtype: numpy.ndarray
+    """
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+    d1, d2 = _dot(ab, ap), _dot(ac, ap)
+    d3, d4 = _dot(ab, bp), _dot(ac, bp)
+    d5, d6 = _dot(ab, cp), _dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # inside the triangle
+        denominator = va + vb + vc
+        result = a + ab * (vb / denominator)[:, np.newaxis] + ac * (vc / denominator)[:, np.newaxis]
+        # the edge and corner regions in reverse order of precedence, so the ones that are checked first in the
+        # book win
+        regions = [((va <= 0) & (d4 >= d3) & (d5 >= d6),
+                    b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))[:, np.newaxis]),
+                   ((vb <= 0) & (d2 >= 0) & (d6 <= 0), a + ac * (d2 / (d2 - d6))[:, np.newaxis]),
+                   ((d6 >= 0) & (d5 <= d6), c),
+                   ((vc <= 0) & (d1 >= 0) & (d3 <= 0), a + ab * (d1 / (d1 - d3))[:, np.newaxis]),
+                   ((d3 >= 0) & (d4 <= d3), b),
+                   ((d1 <= 0) & (d2 <= 0), a)]
+        for mask, region_points in regions:
+            result[mask] = region_points[mask]
+    # degenerate triangles without a matching region
+    invalid = ~np.isfinite(result).all(axis=1)
+    result[invalid] = a[invalid]
+    return result
+
+
+def intersect_lines_with_triangles(origins, directions, a, b, c):
+    """
+    Intersects lines (which go in both directions) with triangles (Moeller-Trumbore).
+
+    :param numpy.ndarray origins: The origin of every line in the shape (n, 3).
+    :param numpy.ndarray directions: The direction of every line.
+    :param numpy.ndarray a: The first corner of the triangle of every line in the shape (n, 3).
+    :param numpy.ndarray b: The second corners.
+    :param numpy.ndarray c: The third corners.
+    :returns: The signed distance along the direction to the hit, NaN where the line misses the triangle.
+    :rtype: numpy.ndarray
+    """
+    edge_1 = b - a
+    edge_2 = c - a
+    p = np.cross(directions, edge_2)
+    determinants = _dot(edge_1, p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse = 1.0 / determinants
+        t = origins - a
+        u = _dot(t, p) * inverse
+        q = np.cross(t, edge_1)
+        v = _dot(directions, q) * inverse
+        distances = _dot(edge_2, q) * inverse
+        # triangles with NaN corners are never hit
+        hit = (np.abs(determinants) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1)
+    return np.where(hit, distances, np.nan)
+
+
+def get_vertex_normals(face_counts, face_vertices, points):
+    """
+    :param list[int] face_counts: The number of vertices of every face.
+    :param list[int] face_vertices: The vertices of all faces in winding order, concatenated.
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :returns: The area weighted average of the normals of the faces around every vertex (zero for loose vertices).
+    :rtype: numpy.ndarray
+    """
+    face_counts = np.asarray(face_counts)
+    face_vertices = np.asarray(face_vertices)
+    points = np.asarray(points, dtype=np.float64)
+    offsets = np.zeros(len(face_counts) + 1, dtype=np.int64)
+    np.cumsum(face_counts, out=offsets[1:])
+    # Newell's method: the sum of the cross products of the face edges is twice the area times the normal
+    next_face_vertices = np.arange(1, len(face_vertices) + 1)
+    next_face_vertices[offsets[1:] - 1] = offsets[:-1]
+    crosses = np.cross(points[face_vertices], points[face_vertices[next_face_vertices]])
+    faces = np.repeat(np.arange(len(face_counts)), face_counts)
+    face_normals = np.column_stack([np.bincount(faces, weights=crosses[:, axis], minlength=len(face_counts))
+                                    for axis in range(3)])
+    normals = np.column_stack([np.bincount(face_vertices, weights=face_normals[faces, axis], minlength=len(points))
+                               for axis in range(3)])
+    lengths = np.sqrt(_dot(normals, normals))
+    normals[lengths > 0] /= lengths[lengths > 0][:, np.newaxis]
+    return normals
+
+
+class TriangleBVH(object):
+    """
+    Usage::
+
+        bvh = TriangleBVH(points, triangles)
+        closest_points, distances, hit_triangles = bvh.find_closest(query_points)
+    """
+
+    def __init__(self, points, triangles, leaf_size=LEAF_SIZE):
+        """
+        :param numpy.ndarray points: The points of the mesh in the shape (vertices, 3).
+        :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+        :param int leaf_size: The number of triangles in a leaf.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self.triangle_count = len(triangles)
+        self.leaf_size = leaf_size
+
+        corners = points[triangles]
+        centers = corners.mean(axis=1)
+        if self.triangle_count:
+            self._minimum, self._maximum = centers.min(axis=0), centers.max(axis=0)
+        else:
+            self._minimum, self._maximum = np.zeros(3), np.zeros(3)
+        codes = get_morton_codes(centers, self._minimum, self._maximum)
+        self.order = np.argsort(codes)
+        self._codes = codes[self.order]
+
+        # the leaves are padded to a power of two, the padding triangles have no corners and never get hit
+        leaf_count = max(1, -(-self.triangle_count // leaf_size))
+        self.depth = int(np.ceil(np.log2(leaf_count)))
+        self.leaf_count = 1 << self.depth
+        padded = self.leaf_count * leaf_size
+        self.corners = np.full((padded, 3, 3), np.nan)
+        self.corners[:self.triangle_count] = corners[self.order]
+
+        # the bounds of all nodes, level by level from the root, padding nodes get empty bounds
+        leaf_corners = self.corners.reshape(self.leaf_count, leaf_size * 3, 3)
+        with np.errstate(invalid='ignore'):
+            level_minimum = np.where(np.isnan(leaf_corners), np.inf, leaf_corners).min(axis=1)
+            level_maximum = np.where(np.isnan(leaf_corners), -np.inf, leaf_corners).max(axis=1)
+        minimums = [level_minimum]
+        maximums = [level_maximum]
+        while len(level_minimum) > 1:
+            level_minimum = np.minimum(level_minimum[0::2], level_minimum[1::2])
+            level_maximum = np.maximum(level_maximum[0::2], level_maximum[1::2])
+            minimums.append(level_minimum)
+            maximums.append(level_maximum)
+        self.node_minimum = np.concatenate(minimums[::-1])
+        self.node_maximum = np.concatenate(maximums[::-1])
+
+    @property
+    def first_leaf(self):
+        """
+        :returns: The node index of the first leaf.
+        :rtype: int
+        """
+        return self.leaf_count - 1
+
+    def find_closest(self, points):
+        """
+        :param numpy.ndarray points: The query points in the shape (n, 3).
+        :returns: The closest point on the mesh, its distance and its triangle (in the order of the triangles that
+                  were given) for every query point. Without triangles the points are NaN and the triangles -1.
+        :rtype: tuple[numpy.ndarray]
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        closest = np.full(points.shape, np.nan)
+        distances = np.full(len(points), np.inf)
+        triangles = np.full(len(points), -1, dtype=np.int64)
+        if not self.triangle_count or not len(points):
+            return closest, distances, triangles
+        # the squared distances to beat. They can be lower than the best hits so far, see below.
+        bounds = np.full(len(points), np.inf)
+        queries = np.arange(len(points))
+        check = lambda queries_, leaves: self._check_closest(
+            points, queries_, leaves, distances, closest, triangles, bounds)
+
+        # a first guess from the triangles next to the point on the Morton curve makes the pruning effective early
+        codes = get_morton_codes(points, self._minimum, self._maximum)
+        positions = np.minimum(np.searchsorted(self._codes, codes), self.triangle_count - 1)
+        check(queries, positions // self.leaf_size + self.first_leaf)
+
+        stack = [(queries, np.zeros(len(points), dtype=np.int64))]
+        while stack:
+            queries, nodes = stack.pop()
+            query_points = points[queries]
+            minimum, maximum = self.node_minimum[nodes], self.node_maximum[nodes]
+            nearest = np.clip(query_points, minimum, maximum) - query_points
+            lower_bounds = _dot(nearest, nearest)
+            keep = lower_bounds <= bounds[queries]
+            if not keep.any():
+                continue
+            queries, nodes = queries[keep], nodes[keep]
+            if nodes[0] >= self.first_leaf:
+                _check_in_order(queries, nodes, lower_bounds[keep], bounds, check)
+                continue
+
+            # every triangle in a node is closer than the farthest corner of the node. The bound gets a little
+            # margin, so rounding can not prune the node of the closest triangle.
+            query_points = query_points[keep]
+            farthest = np.maximum(np.abs(query_points - minimum[keep]), np.abs(query_points - maximum[keep]))
+            _reduce_minimum(bounds, queries, _dot(farthest, farthest) * (1 + 1e-9) + 1e-12)
+            self._push_children(stack, queries, nodes)
+
+        return closest, np.sqrt(distances), self.order[triangles]
+
+    def _check_closest(self, points, queries, leaves, distances, closest, triangles, bounds):
+        """
+        Checks the triangles of the given leaves, one leaf per query, and keeps the closest ones that beat the best
+        hits so far.
+        """
+        leaf_triangles = self._get_leaf_triangles(leaves)
+        corners = self.corners[leaf_triangles.ravel()]
+        query_points = np.repeat(points[queries], self.leaf_size, axis=0)
+        leaf_closest = get_closest_points_on_triangles(query_points, corners[:, 0], corners[:, 1], corners[:, 2])
+        offsets = leaf_closest - query_points
+        leaf_distances = _dot(offsets, offsets).reshape(-1, self.leaf_size)
+        # padding triangles have no closest points
+        leaf_distances[np.isnan(leaf_distances)] = np.inf
+
+        rows = np.arange(len(queries))
+        columns = leaf_distances.argmin(axis=1)
+        leaf_distances = leaf_distances[rows, columns]
+        better = leaf_distances < distances[queries]
+        queries, rows, columns = queries[better], rows[better], columns[better]
+        distances[queries] = leaf_distances[better]
+        closest[queries] = leaf_closest.reshape(-1, self.leaf_size, 3)[rows, columns]
+        triangles[queries] = leaf_triangles[rows, columns]
+        bounds[queries] = np.minimum(bounds[queries], distances[queries])
+
+    def _push_children(self, stack, queries, nodes):
+        """
+        Puts the children of the given nodes on the stack, in parts of at most MAX_PAIRS pairs. The last part gets
+        walked down first, so its hits tighten the bounds for the other parts.
+        """
+        queries = np.repeat(queries, 2)
+        nodes = np.column_stack((2 * nodes + 1, 2 * nodes + 2)).ravel()
+        for start in range(0, len(nodes), MAX_PAIRS)[::-1]:
+            stack.append((queries[start:start + MAX_PAIRS], nodes[start:start + MAX_PAIRS]))
+
+    def _get_leaf_triangles(self, leaves):
+        """
+        :returns: The sorted index of every triangle in the given leaves in the shape (leaves, leaf size).
+        """
+        return (leaves - self.first_leaf)[:, np.newaxis] * self.leaf_size + np.arange(self.leaf_size)
+
+    def intersect(self, origins, directions, max_distance=np.inf):
+        """
+        Finds where lines through the given points hit the mesh. The lines go both ways, so points on either side of
+        the mesh find it.
+
+        :param numpy.ndarray origins: The origin of every line in the shape (n, 3).
+        :param numpy.ndarray directions: The unit direction of every line.
+        :param float max_distance: Hits farther away than this are ignored.
+        :returns: The nearest hit point, its signed distance along the direction and its triangle (in the order of the
+                  triangles that were given) for every line. Lines that miss get NaN and the triangle -1.
+        :rtype: tuple[numpy.ndarray]
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        hits = np.full(origins.shape, np.nan)
+        distances = np.full(len(origins), np.nan)
+        triangles = np.full(len(origins), -1, dtype=np.int64)
+        if not self.triangle_count or not len(origins):
+            return hits, distances, triangles
+        # the absolute distances to beat
+        bounds = np.full(len(origins), float(max_distance))
+        with np.errstate(divide='ignore'):
+            inverse_directions = 1.0 / directions
+
+        queries = np.arange(len(origins))
+        check = lambda queries_, leaves: self._check_hits(
+            origins, directions, queries_, leaves, distances, triangles, bounds)
+        get_lower_bounds = lambda queries_, nodes_: self._get_line_distances(
+            origins, inverse_directions, queries_, nodes_)
+
+        # a first hit in the leaf that the line reaches first makes the pruning effective early
+        check(queries, self._get_nearest_leaves(queries, get_lower_bounds))
+
+        stack = [(queries, np.zeros(len(origins), dtype=np.int64))]
+        while stack:
+            queries, nodes = stack.pop()
+            lower_bounds = get_lower_bounds(queries, nodes)
+            keep = np.isfinite(lower_bounds) & (lower_bounds <= bounds[queries])
+            if not keep.any():
+                continue
+            queries, nodes = queries[keep], nodes[keep]
+            if nodes[0] >= self.first_leaf:
+                _check_in_order(queries, nodes, lower_bounds[keep], bounds, check)
+            else:
+                self._push_children(stack, queries, nodes)
+
+        hit = triangles >= 0
+        hits[hit] = origins[hit] + directions[hit] * distances[hit][:, np.newaxis]
+        triangles[hit] = self.order[triangles[hit]]
+        return hits, distances, triangles
+
+    def _get_line_distances(self, origins, inverse_directions, queries, nodes):
+        """
+        :returns: The lowest absolute distance along the line of every query to the box of its node, inf for lines
+                  that miss the box.
+        :rtype: numpy.ndarray
+        """
+        # slab test: the range of the line parameter inside the box of the node
+        with np.errstate(invalid='ignore'):
+            t_1 = (self.node_minimum[nodes] - origins[queries]) * inverse_directions[queries]
+            t_2 = (self.node_maximum[nodes] - origins[queries]) * inverse_directions[queries]
+        # a line parallel to a slab is inside it (NaN) or misses it (both inf with the same sign)
+        t_1[np.isnan(t_1)] = -np.inf
+        t_2[np.isnan(t_2)] = np.inf
+        enter = np.minimum(t_1, t_2).max(axis=1)
+        leave = np.maximum(t_1, t_2).min(axis=1)
+        distances = np.where((enter <= 0) & (leave >= 0), 0.0, np.minimum(np.abs(enter), np.abs(leave)))
+        # the empty bounds of padding nodes would contain every line
+        distances[(enter > leave) | (self.node_minimum[nodes, 0] > self.node_maximum[nodes, 0])] = np.inf
+        return distances
+
+    def _get_nearest_leaves(self, queries, get_lower_bounds):
+        """
+        :returns: The leaf of every query that is reached by always going down to the nearer child.
+        :rtype: numpy.ndarray
+        """
+        nodes = np.zeros(len(queries), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes + 1
+            nodes = np.where(get_lower_bounds(queries, left + 1) < get_lower_bounds(queries, left), left + 1, left)
+        return nodes
+
+    def _check_hits(self, origins, directions, queries, leaves, distances, triangles, bounds):
+        """
+        Intersects the lines with the triangles of the given leaves, one leaf per line, and keeps the nearest hits
+        that beat the best hits so far.
+        """
+        leaf_triangles = self._get_leaf_triangles(leaves)
+        corners = self.corners[leaf_triangles.ravel()]
+        hit_distances = intersect_lines_with_triangles(np.repeat(origins[queries], self.leaf_size, axis=0),
+                                                       np.repeat(directions[queries], self.leaf_size, axis=0),
+                                                       corners[:, 0], corners[:, 1], corners[:, 2])
+        hit_distances = hit_distances.reshape(-1, self.leaf_size)
+        absolute_distances = np.abs(hit_distances)
+        absolute_distances[np.isnan(absolute_distances)] = np.inf
+
+        rows = np.arange(len(queries))
+        columns = absolute_distances.argmin(axis=1)
+        absolute_distances = absolute_distances[rows, columns]
+        better = np.isfinite(absolute_distances) & (absolute_distances <= bounds[queries])
+        queries, rows, columns = queries[better], rows[better], columns[better]
+        distances[queries] = hit_distances[rows, columns]
+        triangles[queries] = leaf_triangles[rows, columns]
+        bounds[queries] = absolute_distances[better]
+
+
+def _check_in_order(queries, leaves, lower_bounds, bounds, check):
+    """
+    Checks the leaves of every query from the nearest to the farthest, in rounds of one leaf per query. The hits of
+    every round tighten the bounds, so most of the farther leaves get skipped.
+
+    :param numpy.ndarray queries: The query of every pair.
+    :param numpy.ndarray leaves: The leaf of every pair.
+    :param numpy.ndarray lower_bounds: The lowest distance any triangle in the leaf can have to the query.
+    :param numpy.ndarray bounds: The distance to beat of every query, updated by the check.
+    :param function check: Gets called with the queries and leaves of every round.
+    """
+    order = np.lexsort((lower_bounds, queries))
+    queries, leaves, lower_bounds = queries[order], leaves[order], lower_bounds[order]
+    positions = np.arange(len(queries))
+    starts = np.concatenate(([True], queries[1:] != queries[:-1]))
+    ranks = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+    by_rank = np.argsort(ranks, kind='mergesort')
+    ends = np.searchsorted(ranks[by_rank], np.arange(ranks.max() + 1), side='right')
+    for start, end in zip(np.concatenate(([0], ends[:-1])), ends):
+        pairs = by_rank[start:end]
+        pairs = pairs[lower_bounds[pairs] <= bounds[queries[pairs]]]
+        if len(pairs):
+            check(queries[pairs], leaves[pairs])
+
+
+def _reduce_minimum(values, indices, candidates):
+    """
+    Lowers values[indices] to the candidates where they are smaller.
+
+    :param numpy.ndarray values: The values to lower in place.
+    :param numpy.ndarray indices: The sorted index of every candidate.
+    :param numpy.ndarray candidates:
+    """
+    if not len(indices):
+        return
+    starts = np.flatnonzero(np.concatenate(([True], indices[1:] != indices[:-1])))
+    minimums = np.minimum.reduceat(candidates, starts)
+    targets = indices[starts]
+    values[targets] = np.minimum(values[targets], minimums)
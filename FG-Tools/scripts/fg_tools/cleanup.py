@@ -0,0 +1,110 @@
+"""
+Plans the cleanup of a mesh in stages: delete lamina faces, split n-gons, split non-manifold vertices and merge
+coincident vertices. All stages are planned from one analysis of the mesh, with the indices every stage gets shifted by
+the stages that run before it, so the mesh does not have to be read again between the stages.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import mesh_stats
+import spatial
+import topology
+
+
+LAMINA_FACES = 'lamina_faces'
+NGONS = 'ngons'
+NON_MANIFOLD_VERTICES = 'non_manifold_vertices'
+COINCIDENT_VERTICES = 'coincident_vertices'
+
+# The stages in the order they run. Deleting the duplicates of lamina faces keeps all vertices and edges, splitting
+# n-gons keeps the vertices and splitting vertices only adds new ones, so only the n-gons have to be shifted. Merging
+# vertices renumbers them, so it runs last.
+STAGES = (LAMINA_FACES, NGONS, NON_MANIFOLD_VERTICES, COINCIDENT_VERTICES)
+
+# The key of the time the analysis took in the timings of a mesh.
+ANALYSIS = 'analysis'
+
+LABELS = {LAMINA_FACES: 'Lamina',
+          NGONS: 'N-Gons',
+          NON_MANIFOLD_VERTICES: 'Non-Manifold',
+          COINCIDENT_VERTICES: 'Merged',
+          ANALYSIS: 'Analysis'}
+
+# How n-gons get split.
+TRIANGULATE = 'triangulate'
+QUADRANGULATE = 'quadrangulate'
+
+# The highest distance of two vertices to get merged, like component.OVERLAP_TOLERANCE.
+MERGE_TOLERANCE = 0.0001
+
+
+def plan(topo, points, stages=STAGES, tolerance=MERGE_TOLERANCE):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param list[str] stages: The stages to plan, see STAGES.
+    :param float tolerance: The highest distance of two vertices to get merged.
+    :returns: The sorted components every stage changes, with the indices they have when the stage runs:
+              LAMINA_FACES: the faces to delete, one face of every group of lamina faces is kept.
+              NGONS: the n-gons to split, without the deleted lamina faces.
+              NON_MANIFOLD_VERTICES: the vertices to split, without the edges of the deleted lamina faces.
+              COINCIDENT_VERTICES: the vertices to merge. Non-manifold vertices are left out if they get split,
+              otherwise the split would be merged again.
+    :rtype: dict[str, numpy.ndarray]
+    :raises ValueError: If a stage is unknown.
+    """
+    for stage in stages:
+        if stage not in STAGES:
+            raise ValueError('Unknown stage "{0:s}". Use one of: {1:s}'.format(stage, ', '.join(STAGES)))
+
+    deleted = np.zeros(0, dtype=topology.INDEX_DTYPE)
+    if LAMINA_FACES in stages:
+        deleted = mesh_stats.get_lamina_duplicates(topo)
+    non_manifold = np.zeros(0, dtype=topology.INDEX_DTYPE)
+    if NON_MANIFOLD_VERTICES in stages:
+        non_manifold = mesh_stats.get_non_manifold_vertices(_delete_faces(topo, deleted))
+
+    results = {}
+    if LAMINA_FACES in stages:
+        results[LAMINA_FACES] = deleted
+    if NGONS in stages:
+        ngons = topo.face_counts > 4
+        ngons[deleted] = False
+        ngons = topology.to_indices(ngons)
+        # every deleted face moves the faces after it down by one
+        results[NGONS] = (ngons - np.searchsorted(deleted, ngons)).astype(topology.INDEX_DTYPE)
+    if NON_MANIFOLD_VERTICES in stages:
+        results[NON_MANIFOLD_VERTICES] = non_manifold
+    if COINCIDENT_VERTICES in stages:
+        coincident = spatial.find_overlapping_points(np.asarray(points, dtype=np.float64).reshape(-1, 3), tolerance)
+        results[COINCIDENT_VERTICES] = coincident[~topology.to_mask(non_manifold, topo.vertex_count)[coincident]]
+    return results
+
+
+def _delete_faces(topo, faces):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray faces: The faces to delete.
+    :returns: The topology without the given faces. The vertices keep their indices.
+    :rtype: topology.MeshTopology
+    """
+    if not len(faces):
+        return topo
+    kept = ~topology.to_mask(faces, topo.face_count)
+    return topology.MeshTopology(topo.face_counts[kept],
+                                 topo.face_vertices[np.repeat(kept, topo.face_counts)],
+                                 vertex_count=topo.vertex_count)
+
+
+def format_report(counts, timings):
+    """
+    :param dict[str, int] counts: The number of components every stage changed.
+    :param dict[str, float] timings: The seconds the analysis and every stage took.
+    :returns: The counts and the timings as one line of text, in the order of the stages.
+    :rtype: str
+    """
+    counts_text = '  '.join('{0:s}: {1:d}'.format(LABELS[stage], counts[stage]) for stage in STAGES if stage in counts)
+    timings_text = '  '.join('{0:s}: {1:.3f}s'.format(LABELS[key], timings[key])
+                             for key in (ANALYSIS,) + STAGES if key in timings)
+    return '{0:s}  ({1:s})'.format(counts_text, timings_text)
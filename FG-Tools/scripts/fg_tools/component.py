@@ -2,9 +2,173 @@
 This module collects all functions that have something to do with polygon object components.
 
 """
+import hashlib
+
+import maya.api.OpenMaya as om
 import maya.cmds as cmds
-import util
+import numpy as np
+
+import deviation
 import math_extended as mx
+import mesh_buffer
+import mesh_cache
+import mesh_stats
+import normals
+import progress
+import spatial
+import symmetry
+import topology
+import uv
+
+
+# The attribute names of the component types in Maya.
+COMPONENT_ATTRIBUTES = {topology.VERTEX: 'vtx',
+                        topology.EDGE: 'e',
+                        topology.FACE: 'f'}
+
+COMPONENT_API_TYPES = {om.MFn.kMeshVertComponent: topology.VERTEX,
+                       om.MFn.kMeshEdgeComponent: topology.EDGE,
+                       om.MFn.kMeshPolygonComponent: topology.FACE}
+
+# Vertices that are closer to each other than this count as overlapping.
+OVERLAP_TOLERANCE = 0.0001
+
+# A vertex is the mirror of another one if it is closer than this to its mirrored position.
+MIRROR_TOLERANCE = 0.001
+
+MIRROR_CACHE = mesh_cache.MeshCache()
+
+# The UV shells of every mesh. {uv set: (hash of the UV ids, UV shell of every face)}
+UV_SHELL_CACHE = mesh_cache.MeshCache()
+
+
+def get_component_indices(components=None):
+    """
+    Sorts the given components by mesh and component type. Objects without components count as all their faces,
+    other components (like UVs or vertex faces) count as their vertices.
+
+    :param list[str] components: Any mix of meshes and their components.
+                                 If this is None the current selection will be used.
+    :returns: The indices of the components in the format {mesh shape: {component type: numpy.ndarray}}.
+              The mesh shapes are full dag paths.
+    :rtype: dict[str, dict[str, numpy.ndarray]]
+    """
+    if components is None:
+        selection = om.MGlobal.getActiveSelectionList()
+    else:
+        selection = om.MSelectionList()
+        for comp in components:
+            selection.add(comp)
+
+    result = {}
+    for i in range(selection.length()):
+        try:
+            dag_path, comp = selection.getComponent(i)
+            dag_path = mesh_buffer.get_dag_path(dag_path)
+        except (TypeError, RuntimeError):
+            # dependency nodes and non-mesh objects
+            continue
+
+        topo = mesh_buffer.get_topology(dag_path)
+        if comp.isNull():
+            component_type = topology.FACE
+            indices = np.arange(topo.face_count, dtype=topology.INDEX_DTYPE)
+        elif comp.apiType() in COMPONENT_API_TYPES:
+            component_type = COMPONENT_API_TYPES[comp.apiType()]
+            mfn_component = om.MFnSingleIndexedComponent(comp)
+            if mfn_component.isComplete:
+                indices = np.arange(topo.get_count(component_type), dtype=topology.INDEX_DTYPE)
+            else:
+                indices = np.array(mfn_component.getElements(), dtype=topology.INDEX_DTYPE)
+        else:
+            # the topology only knows vertices, edges and faces, so UVs, vertex faces, ... count as their vertices
+            component_type = topology.VERTEX
+            indices = _get_converted_vertices(selection.getSelectionStrings(i))
+
+        mesh_indices = result.setdefault(dag_path.fullPathName(), {})
+        if component_type in mesh_indices:
+            indices = np.union1d(mesh_indices[component_type], indices)
+        mesh_indices[component_type] = indices
+    return result
+
+
+def _get_converted_vertices(components):
+    """
+    :param list[str] components: Components that Maya can convert to vertices, like UVs or vertex faces.
+    :returns: The sorted vertices of the given components, converted by polyListComponentConversion.
+    :rtype: numpy.ndarray
+    """
+    selection = om.MSelectionList()
+    for vertex in cmds.polyListComponentConversion(components, toVertex=True) or []:
+        selection.add(vertex)
+    indices = [np.zeros(0, dtype=topology.INDEX_DTYPE)]
+    for i in range(selection.length()):
+        _, comp = selection.getComponent(i)
+        indices.append(np.array(om.MFnSingleIndexedComponent(comp).getElements(), dtype=topology.INDEX_DTYPE))
+    return np.unique(np.concatenate(indices))
+
+
+def get_component_names(mesh, component_type, indices, flatten=True):
+    """
+    :param str mesh: The mesh shape or its transform.
+    :param str component_type: "vertex", "edge" or "face".
+    :param numpy.ndarray indices: The sorted indices of the components.
+    :param bool flatten: If this is False consecutive indices are combined into ranges (i.e. "pCube1.f[2:5]"),
+                         which is a lot faster to select.
+    :returns: The names of the given components (i.e. "pCube1.vtx[3]").
+    :rtype: list[str]
+    """
+    dag_path = mesh_buffer.get_dag_path(mesh)
+    # components are named after the transform, like ls(flatten=True) does.
+    dag_path.pop()
+    prefix = '{0:s}.{1:s}['.format(dag_path.partialPathName(), COMPONENT_ATTRIBUTES[component_type])
+
+    indices = np.asarray(indices)
+    if flatten or not len(indices):
+        return [prefix + str(index) + ']' for index in indices.tolist()]
+
+    breaks = np.flatnonzero(np.diff(indices) != 1)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1])).tolist()
+    ends = np.concatenate((indices[breaks], [indices[-1]])).tolist()
+    return [prefix + (str(start) if start == end else '{0:d}:{1:d}'.format(start, end)) + ']'
+            for start, end in zip(starts, ends)]
+
+
+def count_components(components):
+    """
+    :param list[str] components: Component names, single ones or ranges like "pCube1.f[0:5]".
+    :returns: The number of components. Unlike polyEvaluate this needs no selection and does not evaluate the meshes.
+    :rtype: int
+    """
+    selection = om.MSelectionList()
+    for comp in components:
+        selection.add(comp)
+    count = 0
+    for i in range(selection.length()):
+        _, comp = selection.getComponent(i)
+        if not comp.isNull():
+            count += om.MFnComponent(comp).elementCount
+    return count
+
+
+def convert_components(components, component_type, contained=False, flatten=True):
+    """
+    :param list[str] components: Any mix of meshes and their components, see get_component_indices().
+    :param str component_type: The type to convert to. "vertex", "edge" or "face".
+    :param bool contained: If this is True only components that are completely made up of the given components
+                           are returned (i.e. the faces whose vertices are all given). Otherwise every component
+                           that touches the given components is returned.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: The converted components.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        topo = mesh_buffer.get_topology(mesh)
+        converted = [topo.convert(indices, from_type, component_type, contained=contained)
+                     for from_type, indices in mesh_indices.items()]
+        result += get_component_names(mesh, component_type, np.unique(np.concatenate(converted)), flatten=flatten)
+    return result
 
 
 def convert_to_vertices(components):
@@ -13,100 +177,391 @@ def convert_to_vertices(components):
     :returns: converts any given component-list to vertices
     :rtype: list[str]
     """
-    vertices = cmds.polyListComponentConversion(components, tv=True)
-    return cmds.ls(vertices, flatten=True)
+    return convert_components(components, topology.VERTEX)
+
+
+def grow_components(components, steps=1, flatten=True):
+    """
+    :param list[str] components: The vertices, edges or faces to grow.
+    :param int steps: How often to grow.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: The given components together with their neighbours.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        topo = mesh_buffer.get_topology(mesh)
+        for component_type, indices in sorted(mesh_indices.items()):
+            result += get_component_names(mesh,
+                                          component_type,
+                                          topo.grow(indices, component_type, steps=steps),
+                                          flatten=flatten)
+    return result
+
+
+def shrink_components(components, steps=1, flatten=True):
+    """
+    :param list[str] components: The vertices, edges or faces to shrink.
+    :param int steps: How often to shrink.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: The given components without the ones on the border of the selection.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        topo = mesh_buffer.get_topology(mesh)
+        for component_type, indices in sorted(mesh_indices.items()):
+            result += get_component_names(mesh,
+                                          component_type,
+                                          topo.shrink(indices, component_type, steps=steps),
+                                          flatten=flatten)
+    return result
+
+
+def get_edge_loops(components, flatten=True):
+    """
+    :param list[str] components: Edges of one or more meshes.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: All edges of the loops through the given edges.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        if topology.EDGE in mesh_indices:
+            topo = mesh_buffer.get_topology(mesh)
+            result += get_component_names(mesh,
+                                          topology.EDGE,
+                                          topo.get_edge_loops(mesh_indices[topology.EDGE]),
+                                          flatten=flatten)
+    return result
+
+
+def get_edge_rings(components, flatten=True):
+    """
+    :param list[str] components: Edges of one or more meshes.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: All edges of the rings through the given edges.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        if topology.EDGE in mesh_indices:
+            topo = mesh_buffer.get_topology(mesh)
+            result += get_component_names(mesh,
+                                          topology.EDGE,
+                                          topo.get_edge_rings(mesh_indices[topology.EDGE]),
+                                          flatten=flatten)
+    return result
 
 
-def get_triangles(objects=None):
+def get_triangles(objects=None, chunk_size=progress.CHUNK_SIZE, callback=None):
     """
     This gets all Triangles from the given objList.
 
     :param list objects: List of objects you want the Triangles from.
                          If this is None the current selection will be used.
+    :param int chunk_size: The number of faces that are checked between two progress updates.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
     :returns: a list of triangle faces
     :rtype: list of str
+    :raises progress.OperationCancelled: If the user cancelled the search.
     """
-    if objects is None:
-        objects = []
-
-    with util.UserSelection():
-        if objects:
-            cmds.select(objects)
-        cmds.selectMode(component=True)
-        cmds.selectType(allComponents=0, polymeshFace=1)
-        cmds.polySelectConstraint(mode=3, type=0x0008, size=1)
-        cmds.polySelectConstraint(mode=0, size=0)
-        tris = cmds.ls(selection=True, long=True)
-    return tris
+    return _find_faces_by_size(objects, 3, 3, 'Finding triangles', chunk_size, callback)
 
 
-def get_ngons(objects=None):
+def get_ngons(objects=None, chunk_size=progress.CHUNK_SIZE, callback=None):
     """
     This gets all N-Gons from the given objList.
 
     :param list objects: List of objects you want the N-Gons from.
                          If this is None the current User-selection will be used.
+    :param int chunk_size: The number of faces that are checked between two progress updates.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
     :returns: a list of n-gons
     :rtype: list of str
+    :raises progress.OperationCancelled: If the user cancelled the search.
     """
-    if objects is None:
-        objects = []
-
-    with util.UserSelection():
-        if objects:
-            cmds.select(objects)
-        cmds.selectMode(component=True)
-        cmds.selectType(allComponents=0, polymeshFace=1)
-        cmds.polySelectConstraint(mode=3, type=0x0008, size=3)
-        cmds.polySelectConstraint(mode=0, size=0)
-        ngons = cmds.ls(selection=True, long=True)
-    return ngons
+    return _find_faces_by_size(objects, 5, None, 'Finding n-gons', chunk_size, callback)
 
 
-def get_lamina_faces(objects=None):
+def get_lamina_faces(objects=None, callback=None):
     """
     This gets all lamina faces from the given objList.
 
     :param list objects: List of objects you want the lamina faces from.
                          If this is None the current selection will be used.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
     :returns: a list of lamina faces
     :rtype: list of str
+    :raises progress.OperationCancelled: If the user cancelled the search.
     """
-    if objects is None:
-        objects = []
-
-    with util.UserSelection():
-        if objects:
-            cmds.select(objects)
-        cmds.selectMode(component=True)
-        cmds.selectType(allComponents=0, polymeshFace=1)
-        cmds.polySelectConstraint(mode=3, type=0x0008, topology=2)
-        cmds.polySelectConstraint(mode=0, topology=0)
-        lamina = cmds.ls(selection=True, long=True)
-    return lamina
+    return _find_in_topology(objects, topology.FACE, mesh_stats.get_lamina_faces, 'Finding lamina faces', callback)
 
 
-def get_non_manifold_vertices(objects=None):
+def get_non_manifold_vertices(objects=None, callback=None):
     """
     This gets all non-manifold vertices from the given objList.
 
     :param list objects: List of objects you want the non-manifold vertices from.
                          If this is None the current selection will be used.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
     :returns: a list of non-manifold-vertices
     :rtype: list of str
+    :raises progress.OperationCancelled: If the user cancelled the search.
+    """
+    return _find_in_topology(objects,
+                             topology.VERTEX,
+                             mesh_stats.get_non_manifold_vertices,
+                             'Finding non-manifold vertices',
+                             callback)
+
+
+def get_meshes(objects=None):
+    """
+    :param list[str] objects: Meshes, their transforms or their components. If this is None the current selection
+                              will be used.
+    :returns: The full paths of the mesh shapes of the given objects. Every mesh is only returned once.
+    :rtype: list[str]
     """
     if objects is None:
-        objects = []
+        selection = om.MGlobal.getActiveSelectionList()
+    else:
+        selection = om.MSelectionList()
+        for obj in objects:
+            selection.add(obj)
 
-    with util.UserSelection():
-        if objects:
-            cmds.select(objects)
-        cmds.selectMode(component=True)
-        cmds.selectType(allComponents=0, vertex=1)
-        cmds.polySelectConstraint(mode=3, type=0x0001, nonmanifold=1)
-        cmds.polySelectConstraint(mode=0, nonmanifold=0)
-        nmv = cmds.ls(selection=True, long=True)
-    return nmv
+    meshes = []
+    for i in range(selection.length()):
+        try:
+            mesh = mesh_buffer.get_dag_path(selection.getDagPath(i)).fullPathName()
+        except (TypeError, RuntimeError):
+            # dependency nodes and non-mesh objects
+            continue
+        if mesh not in meshes:
+            meshes.append(mesh)
+    return meshes
+
+
+def _find_faces_by_size(objects, minimum, maximum, status, chunk_size, callback):
+    """
+    :param int minimum: The lowest number of vertices of the faces to find.
+    :param int maximum: The highest number of vertices of the faces to find or None for no limit.
+    :returns: The faces of the meshes of the given objects with the given number of vertices.
+    :rtype: list[str]
+    """
+    meshes = get_meshes(objects)
+    face_counts = [mesh_buffer.get_face_arrays(mesh)[0] for mesh in meshes]
+
+    result = []
+    with progress.Progress(status, sum(len(counts) for counts in face_counts), callback) as current_progress:
+        for mesh, counts in zip(meshes, face_counts):
+            faces = [np.zeros(0, dtype=np.int64)]
+            for start, stop in current_progress.iterate_chunks(len(counts), chunk_size):
+                chunk = counts[start:stop]
+                matching = chunk >= minimum if maximum is None else (chunk >= minimum) & (chunk <= maximum)
+                faces.append(np.flatnonzero(matching) + start)
+            result += get_component_names(mesh, topology.FACE, np.concatenate(faces), flatten=False)
+    return result
+
+
+def _find_in_topology(objects, component_type, find, status, callback):
+    """
+    The checks that need the whole topology of a mesh run vectorized over all its components at once, so the
+    progress advances once per mesh.
+
+    :param str component_type: The type of the components the find function returns.
+    :param find: A function that takes a topology.MeshTopology and returns the sorted indices of the components.
+    :returns: The found components of the meshes of the given objects.
+    :rtype: list[str]
+    """
+    meshes = get_meshes(objects)
+    result = []
+    with progress.Progress(status, len(meshes), callback) as current_progress:
+        for mesh in meshes:
+            face_counts, face_vertices = mesh_buffer.get_face_arrays(mesh)
+            # the edge numbering of Maya is not needed to find faces or vertices, which saves the slow edge query
+            topo = topology.MeshTopology(face_counts,
+                                         face_vertices,
+                                         vertex_count=om.MFnMesh(mesh_buffer.get_dag_path(mesh)).numVertices)
+            result += get_component_names(mesh, component_type, find(topo), flatten=False)
+            current_progress.advance(1)
+    return result
+
+
+def get_overlapping_vertices(components=None, tolerance=OVERLAP_TOLERANCE, flatten=True):
+    """
+    Finds vertices that lie on top of each other with a spatial hash over the vertex positions.
+
+    :param list[str] components: Meshes or their components. Only the vertices of the given components are checked
+                                 against each other. If this is None the current selection will be used.
+    :param float tolerance: The highest distance of two vertices to count as overlapping.
+    :param bool flatten: Whether every vertex gets its own name or consecutive ones are combined into ranges.
+    :returns: All vertices that have at least one other vertex within the tolerance.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        result += get_component_names(mesh,
+                                      topology.VERTEX,
+                                      _find_overlapping_vertices(mesh, mesh_indices, tolerance),
+                                      flatten=flatten)
+    return result
+
+
+def weld_overlapping_vertices(components=None, tolerance=OVERLAP_TOLERANCE):
+    """
+    Merges the vertices that lie on top of each other. The overlapping vertices are found with a spatial hash and only
+    they are handed to polyMergeVertex, which is a lot faster than merging the whole mesh by distance.
+
+    :param list[str] components: Meshes or their components. If this is None the current selection will be used.
+    :param float tolerance: The highest distance of two vertices to get merged.
+    :returns: The number of vertices that were removed.
+    :rtype: int
+    """
+    removed = 0
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        vertices = _find_overlapping_vertices(mesh, mesh_indices, tolerance)
+        if len(vertices):
+            count = cmds.polyEvaluate(mesh, vertex=True)
+            cmds.polyMergeVertex(get_component_names(mesh, topology.VERTEX, vertices, flatten=False),
+                                 distance=tolerance)
+            removed += count - cmds.polyEvaluate(mesh, vertex=True)
+    return removed
+
+
+def conform_normals(objects=None):
+    """
+    Reverses the faces that are wound the other way than their connected part of the mesh, see
+    normals.get_flipped_faces(). Only the flipped faces of every mesh are handed to polyNormal, in one call per mesh.
+
+    :param list[str] objects: Meshes or their transforms. If this is None the current selection will be used.
+    :returns: The number of faces that were reversed.
+    :rtype: int
+    """
+    reversed_count = 0
+    for mesh in get_meshes(objects):
+        faces = normals.get_flipped_faces(mesh_buffer.get_topology(mesh), mesh_buffer.get_points(mesh))
+        if len(faces):
+            cmds.polyNormal(get_component_names(mesh, topology.FACE, faces, flatten=False),
+                            normalMode=0,
+                            userNormalMode=False,
+                            constructionHistory=False)
+            reversed_count += len(faces)
+    return reversed_count
+
+
+def _find_overlapping_vertices(mesh, mesh_indices, tolerance):
+    """
+    :param str mesh: The mesh shape.
+    :param dict[str, numpy.ndarray] mesh_indices: The component indices of the mesh by component type.
+    :param float tolerance:
+    :returns: The sorted indices of the vertices of the given components that overlap with each other.
+    :rtype: numpy.ndarray
+    """
+    topo = mesh_buffer.get_topology(mesh)
+    vertices = np.unique(np.concatenate([topo.convert(indices, component_type, topology.VERTEX)
+                                         for component_type, indices in mesh_indices.items()]))
+    points = mesh_buffer.get_points(mesh)[vertices]
+    return vertices[spatial.find_overlapping_points(points, tolerance)]
+
+
+def get_deviations(mesh, reference, space=om.MSpace.kObject):
+    """
+    :param str mesh: The mesh shape or its transform.
+    :param str reference: A mesh with the same topology to compare with.
+    :param int space: The space to compare the points in, like om.MSpace.kWorld.
+    :returns: The distance of every vertex of the mesh to the same vertex of the reference.
+    :rtype: numpy.ndarray
+    :raises ValueError: If the meshes have a different number of vertices.
+    """
+    return deviation.get_distances(mesh_buffer.get_points(mesh, space), mesh_buffer.get_points(reference, space))
+
+
+def get_deviating_vertices(mesh, reference, threshold=deviation.THRESHOLD, space=om.MSpace.kObject, flatten=True):
+    """
+    :param str mesh: The mesh shape or its transform.
+    :param str reference: A mesh with the same topology to compare with.
+    :param float threshold: The distance a vertex has to move away from the reference to be returned.
+    :param int space: The space to compare the points in, like om.MSpace.kWorld.
+    :param bool flatten: Whether every vertex gets its own name or consecutive ones are combined into ranges.
+    :returns: The vertices of the mesh that moved more than the threshold away from the same vertex of the reference.
+    :rtype: list[str]
+    :raises ValueError: If the meshes have a different number of vertices.
+    """
+    distances = get_deviations(mesh, reference, space)
+    return get_component_names(mesh, topology.VERTEX, topology.to_indices(distances > threshold), flatten=flatten)
+
+
+def get_mirror_map(mesh, axis=None):
+    """
+    :param str mesh: The mesh shape or its transform.
+    :param str axis: "x", "y" or "z". If this is None the plane of symmetry will be detected.
+    :returns: The mirror vertex of every vertex of the mesh in object space. It is built once per axis and cached until
+              the topology of the mesh changes.
+    :rtype: symmetry.MirrorMap
+    """
+    dag_path = mesh_buffer.get_dag_path(mesh)
+    mirror_maps = MIRROR_CACHE.get(dag_path, lambda _: {})
+    if axis not in mirror_maps:
+        mirror_maps[axis] = symmetry.MirrorMap.build(mesh_buffer.get_topology(dag_path),
+                                                     mesh_buffer.get_points(dag_path),
+                                                     MIRROR_TOLERANCE,
+                                                     axis=None if axis is None else symmetry.AXES.index(axis))
+    return mirror_maps[axis]
+
+
+def mirror_components(components=None, axis=None, flatten=True):
+    """
+    :param list[str] components: Meshes or their components. If this is None the current selection will be used.
+    :param str axis: "x", "y" or "z". If this is None the plane of symmetry will be detected per mesh.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: The components on the other side of the plane of symmetry.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        mirror_map = get_mirror_map(mesh, axis=axis)
+        for component_type, indices in sorted(mesh_indices.items()):
+            result += get_component_names(mesh,
+                                          component_type,
+                                          mirror_map.mirror(indices, component_type),
+                                          flatten=flatten)
+    return result
+
+
+def symmetrize(components=None, axis=None, positive=True):
+    """
+    Mirrors the vertex positions from one side of the plane of symmetry to the other in one undoable step.
+
+    :param list[str] components: Meshes or their components. Only the given vertices and their mirrors are moved.
+                                 If this is None the current selection will be used.
+    :param str axis: "x", "y" or "z". If this is None the plane of symmetry will be detected per mesh.
+    :param bool positive: If this is True the positive side is mirrored onto the negative one, otherwise the negative
+                          side onto the positive one.
+    :returns: The number of vertices without a mirror vertex. They did not move.
+    :rtype: int
+    """
+    writes = []
+    unmatched = 0
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        mirror_map = get_mirror_map(mesh, axis=axis)
+        topo = mesh_buffer.get_topology(mesh)
+        if mesh_indices.get(topology.FACE) is not None and len(mesh_indices[topology.FACE]) == topo.face_count:
+            vertices = None
+        else:
+            vertices = np.unique(np.concatenate([topo.convert(indices, component_type, topology.VERTEX)
+                                                 for component_type, indices in mesh_indices.items()]))
+            vertices = np.union1d(vertices, mirror_map.mirror(vertices, topology.VERTEX))
+        points = mesh_buffer.get_points(mesh)
+        new_points = mirror_map.symmetrize(points, positive=positive, vertices=vertices)
+        # only the moved vertices are written, so undo only has to keep them
+        moved = np.flatnonzero((new_points != points).any(axis=1))
+        if len(moved):
+            writes.append((mesh, new_points[moved], moved))
+        unmatched += len(mirror_map.unmatched_vertices)
+    if writes:
+        mesh_buffer.set_points(writes)
+    return unmatched
 
 
 def is_on_uv_seam(edge):
@@ -120,25 +575,101 @@ def is_on_uv_seam(edge):
     return len(flat_uv_points) > 2
 
 
-def get_seam_edges(obj):
+def get_seam_edges(obj, chunk_size=progress.CHUNK_SIZE, callback=None):
     """
     :param str obj: the polygon Object to get the edges from
+    :param int chunk_size: The number of edges that are checked between two progress updates.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
     :returns: all edges that lie on a uv-seam.
     :rtype: list
+    :raises progress.OperationCancelled: If the user cancelled the search.
     """
-    edges = cmds.ls(obj + '.e[*]', flatten=True)
-    return [edge for edge in edges if is_on_uv_seam(edge)]
+    topo = mesh_buffer.get_topology(obj)
+    layout = uv.UVLayout(topo, *mesh_buffer.get_uv_arrays(obj))
+    seam_edges = []
+    with progress.Progress('Finding UV seams', topo.edge_count, callback) as current_progress:
+        for start, stop in current_progress.iterate_chunks(topo.edge_count, chunk_size):
+            seam_edges += layout.get_seam_edges(start, stop).tolist()
+    return [obj + '.e[' + str(i) + ']' for i in seam_edges]
 
 
-def get_hard_edges(obj):
+def get_hard_edges(obj, flatten=True):
     """
-    :param str obj:
-    :returns: all hard edges from the given mesh in a flat list
-    :rtype: list of str
+    :param str obj: The mesh or its transform.
+    :param bool flatten: Whether every edge gets its own name or consecutive ones are combined into ranges.
+    :returns: The hard edges of the given mesh, read in bulk (see mesh_buffer.get_edge_smoothing()).
+    :rtype: list[str]
+    """
+    hard_edges = topology.to_indices(~mesh_buffer.get_edge_smoothing(obj))
+    return get_component_names(obj, topology.EDGE, hard_edges, flatten=flatten)
+
+
+def get_uv_layout(mesh, uv_set=None):
+    """
+    :param str mesh: The mesh shape or its transform.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :returns: The current UVs of the mesh. Their shells are cached per UV set until the UV ids of the mesh change.
+    :rtype: uv.UVLayout
+    """
+    dag_path = mesh_buffer.get_dag_path(mesh)
+    if uv_set is None:
+        uv_set = om.MFnMesh(dag_path).currentUVSetName()
+    uvs, uv_counts, uv_ids = mesh_buffer.get_uv_arrays(dag_path, uv_set)
+    digest = hashlib.sha1()
+    for array in (uv_counts, uv_ids):
+        digest.update(str(array.size).encode('ascii'))
+        digest.update(np.ascontiguousarray(array))
+    digest = digest.hexdigest()
+
+    shells_per_uv_set = UV_SHELL_CACHE.get(dag_path, lambda _: {})
+    cached = shells_per_uv_set.get(uv_set)
+    layout = uv.UVLayout(mesh_buffer.get_topology(dag_path), uvs, uv_counts, uv_ids,
+                         shells=cached[1] if cached is not None and cached[0] == digest else None)
+    shells_per_uv_set[uv_set] = (digest, layout.shells)
+    return layout
+
+
+def get_uv_shell_faces(components, uv_set=None, flatten=True):
+    """
+    :param list[str] components: Meshes or their components. If this is None the current selection will be used.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: All faces of the UV shells the given components are in.
+    :rtype: list[str]
+    """
+    result = []
+    for mesh, mesh_indices in sorted(get_component_indices(components).items()):
+        topo = mesh_buffer.get_topology(mesh)
+        layout = get_uv_layout(mesh, uv_set)
+        faces = np.unique(np.concatenate([topo.convert(indices, component_type, topology.FACE)
+                                          for component_type, indices in mesh_indices.items()]))
+        result += get_component_names(mesh,
+                                      topology.FACE,
+                                      layout.get_shell_faces(np.unique(layout.shells[faces])),
+                                      flatten=flatten)
+    return result
+
+
+def get_uv_shell_counts(objects=None, uv_set=None):
+    """
+    :param list[str] objects: Meshes or their transforms. If this is None the current selection will be used.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :returns: The number of UV shells of every mesh.
+    :rtype: dict[str, int]
+    """
+    return dict((mesh, get_uv_layout(mesh, uv_set).shell_count) for mesh in get_meshes(objects))
+
+
+def get_texel_densities(mesh, resolution, uv_set=None):
+    """
+    :param str mesh: The mesh shape or its transform.
+    :param int resolution: The width of the texture in pixels.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :returns: The pixels per world space unit of every UV shell of the mesh.
+    :rtype: numpy.ndarray
     """
-    return [obj + '.e[' + str(i) + ']'
-            for i, edgeInfo in enumerate(cmds.polyInfo(obj + '.e[*]', ev=True))
-            if edgeInfo.endswith('Hard\n')]
+    return get_uv_layout(mesh, uv_set).get_texel_densities(mesh_buffer.get_points(mesh, space=om.MSpace.kWorld),
+                                                           resolution)
 
 
 def get_midpoint(vertices):
@@ -0,0 +1,325 @@
+"""
+Simplifies triangle meshes by collapsing edges in the order of their quadric error (Garland and Heckbert, "Surface
+Simplification Using Quadric Error Metrics").
+
+Every vertex carries the sum of the squared distances to the planes of its triangles as a 4x4 quadric. Collapsing an
+edge merges the quadrics of both vertices and puts the remaining vertex where the merged quadric is lowest. The edges
+wait in a heap ordered by that error. Entries get outdated when a collapse changes one of their vertices; they are not
+removed from the heap but skipped once they come up, which is cheaper than updating the heap.
+
+This module does not depend on Maya.
+"""
+import heapq
+import itertools
+
+import numpy as np
+
+
+# Collapses that tilt a remaining triangle further than this (as the cosine between its old and new normal) are
+# rejected, they would fold the surface over.
+MIN_NORMAL_COSINE = 0.2
+
+# The number of collapses between two progress updates.
+CHUNK_SIZE = 1000
+
+
+def _cross(a, b):
+    # np.cross is slow for the few vectors of a single collapse
+    result = np.empty(np.broadcast(a, b).shape)
+    result[:, 0] = a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1]
+    result[:, 1] = a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2]
+    result[:, 2] = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    return result
+
+
+def get_triangle_quadrics(points, triangles):
+    """
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+    :returns: The quadric of the plane of every triangle, weighted by its area, in the shape (triangles, 4, 4).
+    :rtype: numpy.ndarray
+    """
+    corners = np.asarray(points, dtype=np.float64)[triangles]
+    crosses = _cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.sqrt(np.einsum('ij,ij->i', crosses, crosses))
+    planes = np.zeros((len(triangles), 4))
+    valid = lengths > 0
+    planes[valid, :3] = crosses[valid] / lengths[valid, np.newaxis]
+    planes[:, 3] = -np.einsum('ij,ij->i', planes[:, :3], corners[:, 0])
+    # the area is half the length of the cross product
+    return planes[:, :, np.newaxis] * planes[:, np.newaxis, :] * (0.5 * lengths)[:, np.newaxis, np.newaxis]
+
+
+def get_vertex_quadrics(points, triangles):
+    """
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+    :returns: The sum of the quadrics of the triangles around every vertex in the shape (vertices, 4, 4).
+    :rtype: numpy.ndarray
+    """
+    triangle_quadrics = get_triangle_quadrics(points, triangles).reshape(-1, 16)
+    vertices = np.asarray(triangles).ravel()
+    quadrics = np.column_stack([np.bincount(vertices, weights=np.repeat(triangle_quadrics[:, i], 3),
+                                            minlength=len(points))
+                                for i in range(16)])
+    return quadrics.reshape(-1, 4, 4)
+
+
+def get_edges(triangles):
+    """
+    :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+    :returns: The two vertices of every edge (the lower one first) in the shape (edges, 2) and the number of triangles
+              that use every edge.
+    :rtype: tuple[numpy.ndarray]
+    """
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    edges = np.sort(np.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]])), axis=1)
+    size = int(triangles.max()) + 1 if len(triangles) else 1
+    keys, counts = np.unique(edges[:, 0] * size + edges[:, 1], return_counts=True)
+    return np.column_stack((keys // size, keys % size)), counts
+
+
+def get_border_vertices(triangles):
+    """
+    :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+    :returns: The sorted vertices on edges that only one triangle uses.
+    :rtype: numpy.ndarray
+    """
+    edges, counts = get_edges(triangles)
+    return np.unique(edges[counts == 1])
+
+
+def get_collapses(quadrics, points, locked, vertices_a, vertices_b):
+    """
+    :param numpy.ndarray quadrics: The quadric of every vertex in the shape (vertices, 4, 4).
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param numpy.ndarray locked: Whether every vertex has to stay where it is.
+    :param numpy.ndarray vertices_a: The first vertex of every edge.
+    :param numpy.ndarray vertices_b: The second vertex of every edge.
+    :returns: The error of collapsing every edge (inf where both vertices are locked), the vertex that gets removed,
+              the vertex that remains and its new position.
+    :rtype: tuple[numpy.ndarray]
+    """
+    vertices_a = np.asarray(vertices_a, dtype=np.int64)
+    vertices_b = np.asarray(vertices_b, dtype=np.int64)
+    merged = quadrics[vertices_a] + quadrics[vertices_b]
+    count = len(vertices_a)
+
+    # the candidates: the point with the lowest error (if the quadric can be solved), both ends and the middle
+    candidates = np.empty((count, 4, 3))
+    candidates[:, 0] = np.nan
+    candidates[:, 1] = points[vertices_a]
+    candidates[:, 2] = points[vertices_b]
+    candidates[:, 3] = 0.5 * (candidates[:, 1] + candidates[:, 2])
+    if count:
+        systems = merged[:, :3, :3]
+        solvable = np.abs(np.linalg.det(systems)) > 1e-9 * np.abs(systems).max(axis=(1, 2)) ** 3
+        if solvable.any():
+            # the right hand sides are given as (n, 3, 1) matrices, a stack of vectors is ambiguous since numpy 2.0
+            candidates[solvable, 0] = np.linalg.solve(systems[solvable], -merged[solvable, :3, 3, np.newaxis])[..., 0]
+
+    homogeneous = np.concatenate((candidates, np.ones((count, 4, 1))), axis=2)
+    errors = np.einsum('eci,eij,ecj->ec', homogeneous, merged, homogeneous)
+    # a locked vertex stays where it is, so only its own position is a candidate
+    locked_a, locked_b = locked[vertices_a], locked[vertices_b]
+    allowed = np.ones((count, 4), dtype=bool)
+    allowed[locked_a | locked_b] = False
+    allowed[locked_a & ~locked_b, 1] = True
+    allowed[locked_b & ~locked_a, 2] = True
+    errors[~allowed | np.isnan(errors)] = np.inf
+
+    best = errors.argmin(axis=1)
+    rows = np.arange(count)
+    # the vertex b remains unless a is locked
+    removed = np.where(locked_a, vertices_b, vertices_a)
+    remaining = np.where(locked_a, vertices_a, vertices_b)
+    # rounding can make the error of a perfect fit slightly negative
+    return np.maximum(errors[rows, best], 0.0), removed, remaining, candidates[rows, best]
+
+
+class Decimator(object):
+    """
+    Collapses the edges of a triangle mesh until it has few enough triangles.
+
+    Usage::
+
+        decimator = Decimator(points, triangles, locked_vertices=seam_vertices)
+        for _ in decimator.iterate(face_count):
+            pass
+        points, triangles = decimator.get_mesh()
+    """
+
+    def __init__(self, points, triangles, locked_vertices=None, keep_border=True):
+        """
+        :param numpy.ndarray points: The points in the shape (vertices, 3).
+        :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+        :param numpy.ndarray locked_vertices: The vertices that have to stay where they are, like the vertices on UV
+                                              seams and hard edges.
+        :param bool keep_border: Whether the vertices on the border of the mesh stay where they are.
+        """
+        self.points = np.array(points, dtype=np.float64).reshape(-1, 3)
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self.quadrics = get_vertex_quadrics(self.points, triangles)
+        self.locked = np.zeros(len(self.points), dtype=bool)
+        if locked_vertices is not None:
+            self.locked[np.asarray(locked_vertices, dtype=np.int64)] = True
+        if keep_border:
+            self.locked[get_border_vertices(triangles)] = True
+        self.triangle_count = len(triangles)
+
+        # the mesh as plain lists, which are much faster than numpy arrays for the many small changes of the collapses:
+        # the vertices of every triangle (None once it is removed) and the triangles around every vertex
+        self._triangles = triangles.tolist()
+        self._vertex_triangles = [set() for _ in range(len(self.points))]
+        for triangle, vertices in enumerate(self._triangles):
+            for vertex in vertices:
+                self._vertex_triangles[vertex].add(triangle)
+        # every collapse of a vertex makes the heap entries of its edges outdated
+        self._versions = [0] * len(self.points)
+        # breaks ties in the heap before it gets to compare the positions
+        self._serial = itertools.count()
+
+        edges, _ = get_edges(triangles)
+        self._heap = self._get_entries(edges[:, 0], edges[:, 1])
+        heapq.heapify(self._heap)
+
+    def _get_entries(self, vertices_a, vertices_b):
+        """
+        :returns: The heap entries of the given edges, without the ones that can not collapse.
+        :rtype: list[tuple]
+        """
+        errors, removed, remaining, positions = get_collapses(self.quadrics, self.points, self.locked,
+                                                              vertices_a, vertices_b)
+        versions = self._versions
+        return [(error, next(self._serial), vertex, other, versions[vertex], versions[other], position)
+                for error, vertex, other, position in zip(errors.tolist(), removed.tolist(), remaining.tolist(),
+                                                          positions)
+                if error != np.inf]
+
+    def _get_neighbours(self, vertex):
+        triangles = self._triangles
+        return set(v for triangle in self._vertex_triangles[vertex] for v in triangles[triangle]) - {vertex}
+
+    def _can_collapse(self, vertex, other, position):
+        """
+        :returns: Whether the edge can collapse without making the mesh non-manifold or folding it over.
+        """
+        shared = self._vertex_triangles[vertex] & self._vertex_triangles[other]
+        # the link condition: the vertices may only share the neighbours of the triangles on their edge
+        if len(self._get_neighbours(vertex) & self._get_neighbours(other)) != len(shared):
+            return False
+
+        moved = (self._vertex_triangles[vertex] | self._vertex_triangles[other]) - shared
+        if not moved:
+            return True
+        triangles = np.array([self._triangles[triangle] for triangle in moved])
+        corners = self.points[triangles]
+        new_corners = corners.copy()
+        new_corners[(triangles == vertex) | (triangles == other)] = position
+        old_normals = _cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        new_normals = _cross(new_corners[:, 1] - new_corners[:, 0], new_corners[:, 2] - new_corners[:, 0])
+        dots = np.einsum('ij,ij->i', old_normals, new_normals)
+        lengths = np.sqrt(np.einsum('ij,ij->i', old_normals, old_normals) *
+                          np.einsum('ij,ij->i', new_normals, new_normals))
+        return bool((dots > MIN_NORMAL_COSINE * lengths).all())
+
+    def _collapse(self, vertex, other, position):
+        """
+        Removes the vertex and the triangles on its edge with the other vertex, and moves the other vertex to the
+        position.
+        """
+        triangles = self._triangles
+        vertex_triangles = self._vertex_triangles
+        shared = vertex_triangles[vertex] & vertex_triangles[other]
+        for triangle in shared:
+            for corner in triangles[triangle]:
+                vertex_triangles[corner].discard(triangle)
+            triangles[triangle] = None
+        self.triangle_count -= len(shared)
+
+        for triangle in vertex_triangles[vertex]:
+            triangles[triangle] = [other if corner == vertex else corner for corner in triangles[triangle]]
+        vertex_triangles[other] |= vertex_triangles[vertex]
+        vertex_triangles[vertex] = set()
+
+        self.points[other] = position
+        self.quadrics[other] += self.quadrics[vertex]
+        self._versions[vertex] += 1
+        self._versions[other] += 1
+
+    def iterate(self, face_count, chunk_size=CHUNK_SIZE):
+        """
+        Collapses edges until the mesh has the given number of triangles or no edge can collapse anymore.
+
+        :param int face_count: The number of triangles to keep.
+        :param int chunk_size: The number of collapses between two steps.
+        :returns: A generator that yields the number of removed triangles after every chunk of collapses.
+        :rtype: generator
+        """
+        heap = self._heap
+        versions = self._versions
+        collapses = 0
+        removed = 0
+        while heap and self.triangle_count > face_count:
+            _, _, vertex, other, vertex_version, other_version, position = heapq.heappop(heap)
+            if versions[vertex] != vertex_version or versions[other] != other_version:
+                continue
+            if not self._can_collapse(vertex, other, position):
+                continue
+            count = self.triangle_count
+            self._collapse(vertex, other, position)
+            removed += count - self.triangle_count
+
+            neighbours = list(self._get_neighbours(other))
+            for entry in self._get_entries([other] * len(neighbours), neighbours):
+                heapq.heappush(heap, entry)
+            collapses += 1
+            if collapses % chunk_size == 0:
+                yield removed
+                removed = 0
+        if removed:
+            yield removed
+
+    def get_mesh(self):
+        """
+        :returns: The points and triangles that are left, without the vertices that were removed.
+        :rtype: tuple[numpy.ndarray]
+        """
+        triangles = np.array([triangle for triangle in self._triangles if triangle is not None],
+                             dtype=np.int64).reshape(-1, 3)
+        vertices, triangles = np.unique(triangles, return_inverse=True)
+        return self.points[vertices], triangles.reshape(-1, 3)
+
+
+def get_face_count(face_count=None, ratio=None, triangle_count=None):
+    """
+    :param int face_count: The number of triangles to keep.
+    :param float ratio: The share of the current triangles to keep, between 0.0 and 1.0. Only used if no face count is
+                        given.
+    :param int triangle_count: The current number of triangles (not polygons). Only needed for a ratio.
+    :returns: The number of triangles to decimate to.
+    :rtype: int
+    :raises ValueError: If neither a face count nor a ratio is given.
+    """
+    if face_count is not None:
+        return max(int(face_count), 0)
+    if ratio is None:
+        raise ValueError('Give a face count or a ratio to decimate to.')
+    return int(round(min(max(ratio, 0.0), 1.0) * triangle_count))
+
+
+def decimate(points, triangles, face_count, locked_vertices=None, keep_border=True):
+    """
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param numpy.ndarray triangles: The three vertices of every triangle in the shape (triangles, 3).
+    :param int face_count: The number of triangles to keep. The result can have more triangles if no more edges can
+                           collapse without breaking the mesh.
+    :param numpy.ndarray locked_vertices: The vertices that have to stay where they are.
+    :param bool keep_border: Whether the vertices on the border of the mesh stay where they are.
+    :returns: The points and triangles of the decimated mesh.
+    :rtype: tuple[numpy.ndarray]
+    """
+    decimator = Decimator(points, triangles, locked_vertices, keep_border)
+    for _ in decimator.iterate(face_count):
+        pass
+    return decimator.get_mesh()
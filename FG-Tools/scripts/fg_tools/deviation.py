@@ -0,0 +1,88 @@
+"""
+Compares the points of meshes with the same topology, i.e. a fixed mesh with its reference.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+
+# Vertices that moved less than this do not count as moved.
+THRESHOLD = 0.001
+
+# The number of colors get_color_ids() splits the range from green to red into.
+COLOR_LEVELS = 256
+
+
+def get_distances(points, reference_points):
+    """
+    :param numpy.ndarray points: The points of the mesh in the shape (vertices, 3).
+    :param numpy.ndarray reference_points: The points of the reference mesh in the same shape.
+    :returns: The distance of every point to the same point of the reference.
+    :rtype: numpy.ndarray
+    :raises ValueError: If the meshes have a different number of points.
+    """
+    if len(points) != len(reference_points):
+        raise ValueError('The meshes have a different number of vertices ({0:d} and {1:d}).'.format(
+            len(points), len(reference_points)))
+    offsets = np.asarray(points, dtype=np.float64) - reference_points
+    return np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+
+
+def get_statistics(distances):
+    """
+    :param numpy.ndarray distances: The distances of the points, see get_distances().
+    :returns: The maximum, mean and root mean square distance.
+    :rtype: tuple[float]
+    """
+    if not len(distances):
+        return 0.0, 0.0, 0.0
+    rms = np.sqrt(np.dot(distances, distances) / len(distances))
+    return float(distances.max()), float(distances.mean()), float(rms)
+
+
+def format_statistics(distances, threshold=THRESHOLD):
+    """
+    :param numpy.ndarray distances: The distances of the points, see get_distances().
+    :param float threshold: Points that moved less than this do not count as moved.
+    :returns: A one line summary like "12 of 482 vertices moved. Max: 0.1200 Mean: 0.0010 RMS: 0.0080".
+    :rtype: str
+    """
+    maximum, mean, rms = get_statistics(distances)
+    return '{0:d} of {1:d} vertices moved. Max: {2:.4f} Mean: {3:.4f} RMS: {4:.4f}'.format(
+        int(np.count_nonzero(distances > threshold)), len(distances), maximum, mean, rms)
+
+
+def get_colors(distances, maximum=None):
+    """
+    :param numpy.ndarray distances: The distances of the points, see get_distances().
+    :param float maximum: The distance that gets full red. If this is None the largest distance is used.
+    :returns: A color from green (did not move) over yellow to red (moved the maximum or more) for every point in the
+              shape (points, 4) as RGBA.
+    :rtype: numpy.ndarray
+    """
+    if maximum is None:
+        maximum = distances.max() if len(distances) else 0.0
+    factors = distances / maximum if maximum > 0 else np.zeros(len(distances))
+    colors = np.ones((len(distances), 4))
+    colors[:, 0] = np.clip(2.0 * factors, 0.0, 1.0)
+    colors[:, 1] = np.clip(2.0 - 2.0 * factors, 0.0, 1.0)
+    colors[:, 2] = 0.0
+    return colors
+
+
+def get_color_ids(distances, maximum=None, levels=COLOR_LEVELS):
+    """
+    Like get_colors(), but the range from green to red is split into a few levels, so a mesh only needs a small color
+    table and one color id per point instead of one color per point.
+
+    :param numpy.ndarray distances: The distances of the points, see get_distances().
+    :param float maximum: The distance that gets full red. If this is None the largest distance is used.
+    :param int levels: The number of colors from green to red.
+    :returns: The colors in the shape (levels, 4) as RGBA and the index of the color of every point.
+    :rtype: tuple[numpy.ndarray]
+    """
+    if maximum is None:
+        maximum = distances.max() if len(distances) else 0.0
+    factors = distances / maximum if maximum > 0 else np.zeros(len(distances))
+    color_ids = np.rint(np.clip(factors, 0.0, 1.0) * (levels - 1)).astype(np.int64)
+    return get_colors(np.linspace(0.0, 1.0, levels), 1.0), color_ids
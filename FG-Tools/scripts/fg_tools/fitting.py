@@ -0,0 +1,102 @@
+"""
+Fits planes and lines through points with least squares and projects points onto them.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+
+AXIS = 'axis'
+PLANE = 'plane'
+LINE = 'line'
+
+MODES = (AXIS, PLANE, LINE)
+
+AXES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def get_principal_axes(points):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :returns: The centroid of the points and the directions they spread along, from the most to the least spread, as
+              rows of a (3, 3) matrix.
+    :rtype: tuple[numpy.ndarray]
+    """
+    points = np.asarray(points, dtype=np.float64)
+    centroid = points.mean(axis=0)
+    # the right singular vectors of the centered points are the eigenvectors of their covariance. SVD of the (3, 3)
+    # scatter matrix gives the same vectors as SVD of the (n, 3) points, without the cost of the big matrix.
+    offsets = points - centroid
+    _, _, axes = np.linalg.svd(offsets.T.dot(offsets))
+    return centroid, axes
+
+
+def fit_plane(points):
+    """
+    :param numpy.ndarray points: At least three points in the shape (n, 3).
+    :returns: A point on the plane (the centroid) and the unit normal of the plane that fits the points best.
+    :rtype: tuple[numpy.ndarray]
+    """
+    centroid, axes = get_principal_axes(points)
+    return centroid, axes[2]
+
+
+def fit_line(points):
+    """
+    :param numpy.ndarray points: At least two points in the shape (n, 3).
+    :returns: A point on the line (the centroid) and the unit direction of the line that fits the points best.
+    :rtype: tuple[numpy.ndarray]
+    """
+    centroid, axes = get_principal_axes(points)
+    return centroid, axes[0]
+
+
+def project_to_plane(points, origin, normal):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param numpy.ndarray origin: A point on the plane.
+    :param numpy.ndarray normal: The unit normal of the plane.
+    :returns: The closest points on the plane.
+    :rtype: numpy.ndarray
+    """
+    points = np.asarray(points, dtype=np.float64)
+    return points - np.outer((points - origin).dot(normal), normal)
+
+
+def project_to_line(points, origin, direction):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param numpy.ndarray origin: A point on the line.
+    :param numpy.ndarray direction: The unit direction of the line.
+    :returns: The closest points on the line.
+    :rtype: numpy.ndarray
+    """
+    points = np.asarray(points, dtype=np.float64)
+    return origin + np.outer((points - origin).dot(direction), direction)
+
+
+def flatten(points, mode=PLANE, axis='x'):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param str mode: AXIS flattens the points onto the plane through their centroid that is perpendicular to the
+                     given world axis, PLANE onto the plane that fits them best and LINE onto the line that fits them
+                     best.
+    :param str axis: "x", "y" or "z". Only used by the AXIS mode.
+    :returns: The flattened points.
+    :rtype: numpy.ndarray
+    :raises ValueError: If the mode or axis is unknown.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if not len(points):
+        return points
+    if mode == AXIS:
+        if axis not in AXES:
+            raise ValueError('Unknown axis "{0:s}". Use one of: x, y, z'.format(axis))
+        normal = np.zeros(3)
+        normal[AXES[axis]] = 1.0
+        return project_to_plane(points, points.mean(axis=0), normal)
+    if mode == PLANE:
+        return project_to_plane(points, *fit_plane(points))
+    if mode == LINE:
+        return project_to_line(points, *fit_line(points))
+    raise ValueError('Unknown mode "{0:s}". Use one of: {1:s}'.format(mode, ', '.join(MODES)))
@@ -0,0 +1,166 @@
+"""
+Checks for degenerate geometry: faces without area, edges without length, concave faces and non-planar faces.
+
+The checks share the edge vectors, areas and normals of the faces, which are computed once per mesh on first use.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import normals
+import topology
+
+
+# Faces with a smaller area are zero-area faces.
+AREA_TOLERANCE = 1e-8
+
+# Edges that are shorter are zero-length edges.
+LENGTH_TOLERANCE = 1e-6
+
+# A corner is concave if it turns against the normal of its face by more than this (the sine of the angle).
+CONCAVE_TOLERANCE = 1e-3
+
+# A face is non-planar if one of its vertices is further from the average plane of the face than this, relative to
+# the square root of the area of the face.
+PLANAR_TOLERANCE = 1e-3
+
+
+class MeshGeometry(object):
+    """
+    The geometry of the faces and edges of a mesh.
+
+    Usage::
+
+        geometry = MeshGeometry(topo, points)
+        geometry.get_zero_area_faces()
+        geometry.get_concave_faces()  # reuses the normals the first check computed
+    """
+
+    def __init__(self, topo, points):
+        """
+        :param topology.MeshTopology topo:
+        :param numpy.ndarray points: The points in the shape (vertices, 3).
+        """
+        self.topology = topo
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self._corners = None
+        self._edge_vectors = None
+        self._edge_lengths = None
+        self._newell_vectors = None
+        self._face_areas = None
+        self._face_normals = None
+
+    @property
+    def corners(self):
+        """
+        :returns: The point of every face-vertex in the shape (face-vertices, 3).
+        :rtype: numpy.ndarray
+        """
+        if self._corners is None:
+            self._corners = self.points[self.topology.face_vertices]
+        return self._corners
+
+    @property
+    def edge_vectors(self):
+        """
+        :returns: The vector from every face-vertex to the next one of its face in the shape (face-vertices, 3).
+        :rtype: numpy.ndarray
+        """
+        if self._edge_vectors is None:
+            self._edge_vectors = self.corners[self.topology.face_vertex_next] - self.corners
+        return self._edge_vectors
+
+    @property
+    def edge_lengths(self):
+        """
+        :returns: The length of the edge that starts at every face-vertex.
+        :rtype: numpy.ndarray
+        """
+        if self._edge_lengths is None:
+            self._edge_lengths = np.sqrt(np.einsum('ij,ij->i', self.edge_vectors, self.edge_vectors))
+        return self._edge_lengths
+
+    @property
+    def newell_vectors(self):
+        """
+        :returns: The Newell vector of every face, see normals.get_newell_vectors().
+        :rtype: numpy.ndarray
+        """
+        if self._newell_vectors is None:
+            self._newell_vectors = normals.get_newell_vectors(self.topology, self.points)
+        return self._newell_vectors
+
+    @property
+    def face_areas(self):
+        """
+        :returns: The area of every face, non-planar faces get the area of their average plane.
+        :rtype: numpy.ndarray
+        """
+        if self._face_areas is None:
+            self._face_areas = 0.5 * np.sqrt(np.einsum('ij,ij->i', self.newell_vectors, self.newell_vectors))
+        return self._face_areas
+
+    @property
+    def face_normals(self):
+        """
+        :returns: The unit normal of every face, 0 for faces without area.
+        :rtype: numpy.ndarray
+        """
+        if self._face_normals is None:
+            self._face_normals = self.newell_vectors.copy()
+            with_area = self.face_areas > 0
+            self._face_normals[with_area] /= 2.0 * self.face_areas[with_area, np.newaxis]
+        return self._face_normals
+
+    def get_zero_area_faces(self, tolerance=AREA_TOLERANCE):
+        """
+        :param float tolerance: Faces with a smaller area count.
+        :returns: The sorted faces without area.
+        :rtype: numpy.ndarray
+        """
+        return topology.to_indices(self.face_areas < tolerance)
+
+    def get_zero_length_edges(self, tolerance=LENGTH_TOLERANCE):
+        """
+        :param float tolerance: Shorter edges count.
+        :returns: The sorted edges without length.
+        :rtype: numpy.ndarray
+        """
+        short = np.zeros(self.topology.edge_count, dtype=bool)
+        short[self.topology.face_edges] = self.edge_lengths < tolerance
+        return topology.to_indices(short)
+
+    def get_concave_faces(self, tolerance=CONCAVE_TOLERANCE):
+        """
+        :param float tolerance: The sine of the angle a corner has to turn against the normal of its face by.
+        :returns: The sorted faces with more than three vertices that have a concave corner.
+        :rtype: numpy.ndarray
+        """
+        topo = self.topology
+        previous = np.empty_like(topo.face_vertex_next)
+        previous[topo.face_vertex_next] = np.arange(len(previous))
+        # the turn at every corner, positive if it turns around the normal of the face like the winding does
+        crosses = np.cross(self.edge_vectors[previous], self.edge_vectors)
+        turns = np.einsum('ij,ij->i', crosses, self.face_normals[topo.face_vertex_faces])
+        lengths = self.edge_lengths[previous] * self.edge_lengths
+        concave = turns < -tolerance * lengths
+        concave &= np.repeat(topo.face_counts > 3, topo.face_counts)
+        return topology.to_indices(topology.to_mask(topo.face_vertex_faces[concave], topo.face_count))
+
+    def get_non_planar_faces(self, tolerance=PLANAR_TOLERANCE):
+        """
+        :param float tolerance: The highest distance of a vertex to the average plane of its face, relative to the
+                                square root of the area of the face.
+        :returns: The sorted faces with more than three vertices that are not planar.
+        :rtype: numpy.ndarray
+        """
+        topo = self.topology
+        corners = self.corners
+        centers = np.column_stack([np.bincount(topo.face_vertex_faces, weights=corners[:, axis],
+                                               minlength=topo.face_count) for axis in range(3)])
+        centers /= np.maximum(topo.face_counts, 1)[:, np.newaxis]
+        faces = topo.face_vertex_faces
+        distances = np.abs(np.einsum('ij,ij->i', corners - centers[faces], self.face_normals[faces]))
+        non_planar = distances > tolerance * np.sqrt(self.face_areas[faces])
+        non_planar &= np.repeat(topo.face_counts > 3, topo.face_counts)
+        return topology.to_indices(topology.to_mask(faces[non_planar], topo.face_count))
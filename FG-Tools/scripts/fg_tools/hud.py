@@ -0,0 +1,292 @@
+"""
+A heads up display with the number of triangles, quads, n-gons, lamina faces and non-manifold vertices of the
+selected meshes or of all meshes in the scene.
+
+Nothing is computed while the scene does not change: callbacks only mark the meshes whose topology changed as dirty
+and schedule one update for the next idle time of Maya. Bursts of changes (like a multi-object edit) are combined into
+that one update, which recomputes the dirty meshes only and updates the totals by their difference.
+"""
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+
+import mesh_stats
+import topology
+
+
+HUD_NAME = 'fgMeshStatisticsHUD'
+
+SELECTION = 'selection'
+SCENE = 'scene'
+SCOPES = (SELECTION, SCENE)
+
+# The section of the viewport the HUD is shown in (top center).
+HUD_SECTION = 2
+
+# The statistics of every known mesh (keyed by uuid) and their total.
+_TOTALS = mesh_stats.StatisticsTotals()
+
+# The signature of every known mesh when its statistics were computed. {mesh uuid: signature}
+_SIGNATURES = {}
+
+# The meshes known to the HUD. {mesh uuid: om.MObjectHandle}
+_NODES = {}
+
+# The meshes whose statistics have to be computed again at the next update.
+_DIRTY = set()
+
+# The callbacks of every watched mesh. {mesh uuid: [callback id]}
+_MESH_CALLBACKS = {}
+
+# The meshes that are watched by a topology changed callback instead of a node dirty callback.
+_TOPOLOGY_WATCHED = set()
+
+# The callbacks for new and removed meshes, selection changes and new scenes.
+_SCENE_CALLBACKS = []
+
+_STATE = {'scope': SELECTION,
+          'update_pending': False,
+          'text': ''}
+
+
+def is_visible():
+    """
+    :returns: Whether the HUD is shown.
+    :rtype: bool
+    """
+    return bool(cmds.headsUpDisplay(HUD_NAME, exists=True))
+
+
+def show(scope=SELECTION):
+    """
+    Shows the HUD and starts watching the scene.
+
+    :param str scope: "selection" to show the statistics of the selected meshes or "scene" for all meshes.
+    """
+    if scope not in SCOPES:
+        raise ValueError('Unknown scope "{0:s}". Use one of: {1:s}'.format(scope, ', '.join(SCOPES)))
+    _STATE['scope'] = scope
+    if not _SCENE_CALLBACKS:
+        _add_scene_callbacks()
+        _watch_scene()
+    _update()
+
+    if is_visible():
+        cmds.headsUpDisplay(HUD_NAME, remove=True)
+    cmds.headsUpDisplay(HUD_NAME,
+                        section=HUD_SECTION,
+                        block=cmds.headsUpDisplay(nextFreeBlock=HUD_SECTION),
+                        label='Selection' if scope == SELECTION else 'Scene',
+                        labelFontSize='small',
+                        dataFontSize='small',
+                        command=get_text)
+
+
+def hide():
+    """
+    Removes the HUD and all callbacks and forgets the statistics.
+    """
+    if is_visible():
+        cmds.headsUpDisplay(HUD_NAME, remove=True)
+    for callback_id in _SCENE_CALLBACKS:
+        om.MMessage.removeCallback(callback_id)
+    del _SCENE_CALLBACKS[:]
+    _forget_meshes()
+
+
+def toggle(scope=SELECTION):
+    """
+    Shows the HUD with the given scope or hides it if it already shows that scope.
+
+    :param str scope: "selection" or "scene".
+    """
+    if is_visible() and _STATE['scope'] == scope:
+        hide()
+    else:
+        show(scope)
+
+
+def get_text():
+    """
+    :returns: The text of the HUD. This only returns the result of the last update, so refreshing the HUD is cheap.
+    :rtype: str
+    """
+    return _STATE['text']
+
+
+def get_statistics(scope=None):
+    """
+    Brings the statistics up to date and returns them.
+
+    :param str scope: "selection" or "scene". If this is None the scope of the HUD is used.
+    :returns: The totals in the order of mesh_stats.STATISTICS.
+    :rtype: tuple[int]
+    """
+    if not _SCENE_CALLBACKS:
+        # nothing watches the scene, so every mesh has to be counted now
+        _watch_scene()
+        _update_dirty_meshes()
+        statistics = _get_totals(scope or _STATE['scope'])
+        _forget_meshes()
+        return statistics
+    _update_dirty_meshes()
+    return _get_totals(scope or _STATE['scope'])
+
+
+def _get_totals(scope):
+    if scope == SCENE:
+        return _TOTALS.total
+    objects = cmds.ls(selection=True, objectsOnly=True, long=True)
+    meshes = cmds.ls(objects, dag=True, type='mesh', noIntermediate=True, long=True) if objects else []
+    keys = dict(zip(cmds.ls(meshes, uuid=True) if meshes else [], meshes))
+    for key, mesh in keys.items():
+        if key not in _NODES:
+            _watch_mesh(_get_node(mesh), key)
+            _update_mesh(key)
+    return _TOTALS.get_total(keys)
+
+
+def _update():
+    """
+    Computes the statistics of the dirty meshes and refreshes the HUD.
+    """
+    _STATE['update_pending'] = False
+    if not _SCENE_CALLBACKS:
+        return
+    _update_dirty_meshes()
+    _STATE['text'] = mesh_stats.format_statistics(_get_totals(_STATE['scope']))
+    if is_visible():
+        cmds.headsUpDisplay(HUD_NAME, refresh=True)
+
+
+def _schedule_update():
+    # evalDeferred with the lowest priority runs on idle, so all changes until then are combined into one update
+    if not _STATE['update_pending']:
+        _STATE['update_pending'] = True
+        cmds.evalDeferred(_update, lowestPriority=True)
+
+
+def _update_dirty_meshes():
+    for key in list(_DIRTY):
+        _update_mesh(key)
+    _DIRTY.clear()
+
+
+def _update_mesh(key):
+    handle = _NODES.get(key)
+    if handle is None or not handle.isValid():
+        _forget_mesh(key)
+        return
+    dag_path = om.MDagPath.getAPathTo(handle.object())
+    if om.MFnDagNode(dag_path).isIntermediateObject:
+        # like the original shape of a deformed mesh
+        _TOTALS.remove(key)
+        return
+    mfn_mesh = om.MFnMesh(dag_path)
+    signature = (mfn_mesh.numVertices, mfn_mesh.numEdges, mfn_mesh.numPolygons, mfn_mesh.numFaceVertices)
+    if key not in _TOPOLOGY_WATCHED and _SIGNATURES.get(key) == signature and key in _TOTALS:
+        # without a topology callback every change marks the mesh dirty, but only changed counts need a recompute
+        return
+    face_counts, face_vertices = mfn_mesh.getVertices()
+    topo = topology.MeshTopology(face_counts, face_vertices, vertex_count=mfn_mesh.numVertices)
+    _TOTALS.set(key, mesh_stats.get_statistics(topo))
+    _SIGNATURES[key] = signature
+
+
+def _get_node(mesh):
+    selection = om.MSelectionList()
+    selection.add(mesh)
+    return selection.getDependNode(0)
+
+
+def _watch_scene():
+    iterator = om.MItDependencyNodes(om.MFn.kMesh)
+    while not iterator.isDone():
+        node = iterator.thisNode()
+        if not om.MFnDagNode(node).isIntermediateObject:
+            key = om.MFnDependencyNode(node).uuid().asString()
+            _watch_mesh(node, key)
+            _DIRTY.add(key)
+        iterator.next()
+
+
+def _watch_mesh(node, key):
+    if key in _NODES:
+        if _NODES[key].isValid():
+            return
+        # the mesh was deleted and that got undone before the next update
+        _forget_mesh(key)
+    _NODES[key] = om.MObjectHandle(node)
+    try:
+        callback_ids = [om.MPolyMessage.addPolyTopologyChangedCallback(node, _on_mesh_changed, key)]
+        _TOPOLOGY_WATCHED.add(key)
+    except AttributeError:
+        # older Maya versions have no topology callback, so the mesh becomes dirty whenever its input changes
+        callback_ids = [om.MNodeMessage.addNodeDirtyPlugCallback(node, _on_mesh_dirty, key)]
+    _MESH_CALLBACKS[key] = callback_ids
+
+
+def _forget_mesh(key):
+    for callback_id in _MESH_CALLBACKS.pop(key, ()):
+        try:
+            om.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            # the node does not exist anymore
+            pass
+    _TOPOLOGY_WATCHED.discard(key)
+    _NODES.pop(key, None)
+    _SIGNATURES.pop(key, None)
+    _DIRTY.discard(key)
+    _TOTALS.remove(key)
+
+
+def _forget_meshes():
+    for key in list(_NODES):
+        _forget_mesh(key)
+    _TOTALS.clear()
+
+
+def _on_mesh_changed(*args):
+    # the client data (the uuid of the mesh) is always the last argument
+    _DIRTY.add(args[-1])
+    _schedule_update()
+
+
+def _on_mesh_dirty(node, plug, key):
+    if plug.partialName(useLongNames=True) == 'inMesh':
+        _DIRTY.add(key)
+        _schedule_update()
+
+
+def _on_mesh_added(node, *_):
+    key = om.MFnDependencyNode(node).uuid().asString()
+    _watch_mesh(node, key)
+    _DIRTY.add(key)
+    _schedule_update()
+
+
+def _on_mesh_removed(node, *_):
+    key = om.MFnDependencyNode(node).uuid().asString()
+    if key in _NODES:
+        # the callbacks of a removed node can not be removed from within its remove callback
+        _DIRTY.add(key)
+        _NODES[key] = om.MObjectHandle()
+        _schedule_update()
+
+
+def _on_selection_changed(*_):
+    if _STATE['scope'] == SELECTION:
+        _schedule_update()
+
+
+def _on_scene_opened(*_):
+    _forget_meshes()
+    _watch_scene()
+    _schedule_update()
+
+
+def _add_scene_callbacks():
+    _SCENE_CALLBACKS.append(om.MDGMessage.addNodeAddedCallback(_on_mesh_added, 'mesh'))
+    _SCENE_CALLBACKS.append(om.MDGMessage.addNodeRemovedCallback(_on_mesh_removed, 'mesh'))
+    _SCENE_CALLBACKS.append(om.MEventMessage.addEventCallback('SelectionChanged', _on_selection_changed))
+    for message in (om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen):
+        _SCENE_CALLBACKS.append(om.MSceneMessage.addCallback(message, _on_scene_opened))
@@ -0,0 +1,75 @@
+"""
+The background job scheduler of the Maya session (see scheduler.JobScheduler).
+
+In the GUI the work for the main thread runs in small slices whenever Maya is idle. In batch mode Maya never gets
+idle, so call SCHEDULER.run_until_complete() once all jobs are submitted.
+
+Usage::
+
+    import fg_tools.idle_jobs as idle_jobs
+    idle_jobs.SCHEDULER.submit(audit_textures, args=(paths,), callback=print_audit)
+    idle_jobs.warm_up_topology_caches()
+"""
+import maya.api.OpenMaya as om
+import maya.utils
+
+import instancing
+import mesh_buffer
+import scheduler
+
+
+_STATE = {'interactive': None}
+
+
+def _schedule_idle(func):
+    # this gets called from the threads of the pool as well, executeDeferred is safe for that
+    if _STATE['interactive'] is None:
+        _STATE['interactive'] = om.MGlobal.mayaState() == om.MGlobal.kInteractive
+    if _STATE['interactive']:
+        # in batch mode executeDeferred would call the function right away on the calling thread
+        maya.utils.executeDeferred(func)
+
+
+SCHEDULER = scheduler.JobScheduler(schedule_idle=_schedule_idle)
+
+
+def warm_up_topology_caches(meshes=None, priority=scheduler.LOW):
+    """
+    Builds the cached topology of the given meshes in the background, one mesh per step on the main thread.
+
+    :param list[str] meshes: The meshes to warm up. If this is None all meshes of the scene are used.
+    :param int priority: The priority of the job.
+    :returns: The job.
+    :rtype: scheduler.Job
+    """
+    return SCHEDULER.submit_main_thread(_warm_up_topology_caches,
+                                        args=(tuple(meshes) if meshes is not None else None,),
+                                        priority=priority)
+
+
+def _warm_up_topology_caches(meshes):
+    if meshes is None:
+        meshes = instancing.get_meshes()
+    for mesh in meshes:
+        try:
+            mesh_buffer.get_topology(mesh)
+        except (TypeError, RuntimeError):
+            # the mesh was deleted or renamed in the meantime
+            pass
+        yield mesh
+
+
+def print_metrics():
+    """
+    Prints how many jobs are queued and finished and how long they waited.
+    """
+    metrics = SCHEDULER.get_metrics()
+    print ('Jobs queued: {0:d} (threads), {1:d} (main thread), running: {2:d}, done: {3:d}, cancelled: {4:d}, '
+           'failed: {5:d}\n').format(metrics['thread_queue'],
+                                     metrics['main_thread_queue'],
+                                     metrics['running'],
+                                     metrics[scheduler.DONE],
+                                     metrics[scheduler.CANCELLED],
+                                     metrics[scheduler.FAILED]),
+    print 'Wait until start: {0:.3f}s average, {1:.3f}s max. Until finished: {2:.3f}s average, {3:.3f}s max.\n'.format(
+        metrics['average_wait'], metrics['max_wait'], metrics['average_latency'], metrics['max_latency']),
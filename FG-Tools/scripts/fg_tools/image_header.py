@@ -0,0 +1,224 @@
+"""
+Reads the resolution, channels and bit depth of image files from their headers only, without decoding any pixels.
+Supported are PNG, JPEG, TIFF, OpenEXR and TGA.
+
+This module does not depend on Maya.
+"""
+import os
+import struct
+
+
+# The number of bytes we read upfront. Every supported header except large EXR and JPEG headers fits into this.
+HEADER_SIZE = 4096
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+EXR_MAGIC = b'\x76\x2f\x31\x01'
+
+# PNG color type: number of channels
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+# EXR pixel type: bits per channel
+EXR_BIT_DEPTHS = {0: 32, 1: 16, 2: 32}
+
+# JPEG "start of frame" markers hold the image size. C4 (DHT), C8 (JPG) and CC (DAC) share the range but are no frames.
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def read_header(file_path):
+    """
+    :param str file_path: Path to a PNG, JPEG, TIFF, EXR or TGA file.
+    :returns: The image information in the format
+              {'format': str, 'width': int, 'height': int, 'channels': int, 'bit_depth': int}
+              or None if the file is no supported image or can not be read.
+              The bit depth is given per channel.
+    :rtype: dict|None
+    """
+    try:
+        with open(file_path, 'rb') as image_file:
+            data = image_file.read(HEADER_SIZE)
+            if data.startswith(PNG_SIGNATURE):
+                return _read_png(data)
+            elif data.startswith(b'\xff\xd8'):
+                return _read_jpeg(image_file)
+            elif data[:4] in (b'II*\x00', b'MM\x00*'):
+                return _read_tiff(image_file, data)
+            elif data.startswith(EXR_MAGIC):
+                return _read_exr(image_file)
+            elif os.path.splitext(file_path)[1].lower() in ('.tga', '.tpic', '.targa'):
+                # TGA has no magic number, so we have to trust the extension.
+                return _read_tga(data)
+    except (IOError, OSError, struct.error, ValueError, KeyError):
+        pass
+    return None
+
+
+def get_decoded_size(header, mipmaps=False):
+    """
+    :param dict header: The image information like read_header() returns it.
+    :param bool mipmaps: Whether to add the size of a full mipmap chain (about 1/3 of the base image).
+    :returns: The size in bytes the image takes up in memory once it is decoded.
+    :rtype: int
+    """
+    size = header['width'] * header['height'] * header['channels'] * header['bit_depth'] // 8
+    if mipmaps:
+        size = size * 4 // 3
+    return size
+
+
+def _image_info(image_format, width, height, channels, bit_depth):
+    if width <= 0 or height <= 0 or channels <= 0 or bit_depth <= 0:
+        raise ValueError('Invalid image header.')
+    return {'format': image_format, 'width': width, 'height': height, 'channels': channels, 'bit_depth': bit_depth}
+
+
+def _read_png(data):
+    # The IHDR chunk always comes first: length(4) type(4) width(4) height(4) bit_depth(1) color_type(1)
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', data[16:26])
+    if color_type == 3:
+        # palette images decode to 8 bit RGB
+        bit_depth = 8
+    return _image_info('png', width, height, PNG_CHANNELS[color_type], bit_depth)
+
+
+def _read_jpeg(image_file):
+    image_file.seek(2)
+    while True:
+        marker = image_file.read(2)
+        if len(marker) < 2 or marker[0:1] != b'\xff':
+            raise ValueError('Invalid JPEG marker.')
+        marker_type = ord(marker[1:2])
+        if marker_type == 0xFF:
+            # fill byte
+            image_file.seek(-1, 1)
+            continue
+        length, = struct.unpack('>H', image_file.read(2))
+        if marker_type in JPEG_SOF_MARKERS:
+            precision, height, width, channels = struct.unpack('>BHHB', image_file.read(6))
+            return _image_info('jpeg', width, height, channels, precision)
+        # skip the segment (the length includes its own 2 bytes)
+        image_file.seek(length - 2, 1)
+
+
+def _read_tiff(image_file, data):
+    endian, tags = read_tiff_tags(image_file, data)
+
+    channels = get_tiff_values(image_file, endian, tags, 277, [1])[0]
+    bit_depth = get_tiff_values(image_file, endian, tags, 258, [1])[0]
+    return _image_info('tiff',
+                       get_tiff_values(image_file, endian, tags, 256)[0],
+                       get_tiff_values(image_file, endian, tags, 257)[0],
+                       channels,
+                       bit_depth)
+
+
+def read_tiff_tags(image_file, data):
+    """
+    Reads the tags of the first image file directory of a TIFF.
+
+    :param file image_file: The opened TIFF file.
+    :param bytes data: At least the first 8 bytes of the file.
+    :returns: The byte order ("<" or ">") and the tags in the format {tag: (type, count, raw 4 value bytes)}.
+    :rtype: tuple[str, dict]
+    """
+    endian = '<' if data[:2] == b'II' else '>'
+    ifd_offset, = struct.unpack(endian + 'I', data[4:8])
+    image_file.seek(ifd_offset)
+    entry_count, = struct.unpack(endian + 'H', image_file.read(2))
+    entries = image_file.read(entry_count * 12)
+
+    tags = {}
+    for i in range(entry_count):
+        tag, tag_type, count = struct.unpack(endian + 'HHI', entries[i * 12:i * 12 + 8])
+        tags[tag] = (tag_type, count, entries[i * 12 + 8:i * 12 + 12])
+    return endian, tags
+
+
+def get_tiff_values(image_file, endian, tags, tag, default=None):
+    """
+    :param file image_file: The opened TIFF file.
+    :param str endian: The byte order like read_tiff_tags() returns it.
+    :param dict tags: The tags like read_tiff_tags() returns them.
+    :param int tag: The tag to get the values from.
+    :param list default: What to return if the tag does not exist.
+    :returns: All values of the given SHORT or LONG tag.
+    :rtype: list[int]
+    """
+    if tag not in tags:
+        if default is None:
+            raise KeyError('TIFF tag {0:d} does not exist.'.format(tag))
+        return default
+    tag_type, count, raw = tags[tag]
+    value_format = endian + ('H' if tag_type == 3 else 'I') * count
+    size = struct.calcsize(value_format)
+    if size > 4:
+        # values that do not fit into the 4 bytes of the entry are stored at an offset.
+        image_file.seek(struct.unpack(endian + 'I', raw)[0])
+        raw = image_file.read(size)
+    return list(struct.unpack(value_format, raw[:size]))
+
+
+def _read_null_terminated(image_file):
+    chars = []
+    while True:
+        char = image_file.read(1)
+        if not char:
+            raise ValueError('Unexpected end of file.')
+        if char == b'\x00':
+            return b''.join(chars)
+        chars.append(char)
+
+
+def read_exr_attributes(image_file):
+    """
+    Reads all header attributes of a single part EXR. Afterwards the file position is at the end of the header, where
+    the chunk offset table starts.
+
+    :param file image_file: The opened EXR file.
+    :returns: The version flags and the attributes in the format {name: raw value bytes}.
+    :rtype: tuple[int, dict[bytes, bytes]]
+    """
+    # magic(4) version(4) followed by the attributes: name\0 type\0 size(4) value
+    image_file.seek(4)
+    version, = struct.unpack('<i', image_file.read(4))
+    attributes = {}
+    while True:
+        name = _read_null_terminated(image_file)
+        if not name:
+            return version, attributes
+        _read_null_terminated(image_file)
+        size, = struct.unpack('<i', image_file.read(4))
+        attributes[name] = image_file.read(size)
+
+
+def _read_exr(image_file):
+    _, attributes = read_exr_attributes(image_file)
+
+    channels = []
+    value = attributes[b'channels']
+    position = 0
+    # every channel: name\0 pixel_type(4) pLinear(1) reserved(3) xSampling(4) ySampling(4)
+    while value[position:position + 1] != b'\x00':
+        position = value.index(b'\x00', position) + 1
+        channels.append(struct.unpack('<i', value[position:position + 4])[0])
+        position += 16
+
+    x_min, y_min, x_max, y_max = struct.unpack('<iiii', attributes[b'dataWindow'])
+    return _image_info('exr',
+                       x_max - x_min + 1,
+                       y_max - y_min + 1,
+                       len(channels),
+                       max(EXR_BIT_DEPTHS[pixel_type] for pixel_type in channels))
+
+
+def _read_tga(data):
+    color_map_type, image_type = struct.unpack('<BB', data[1:3])
+    width, height, pixel_depth = struct.unpack('<HHB', data[12:17])
+    if image_type not in (1, 2, 3, 9, 10, 11):
+        raise ValueError('Unknown TGA image type.')
+    if color_map_type or image_type in (1, 9):
+        channels = 3
+    elif image_type in (3, 11):
+        channels = 1
+    else:
+        channels = 4 if pixel_depth == 32 else 3
+    return _image_info('tga', width, height, channels, 8)
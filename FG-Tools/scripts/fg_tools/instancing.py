@@ -0,0 +1,109 @@
+"""
+Finds meshes in the scene that are identical copies of each other and replaces the copies with instances.
+"""
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+
+import mesh_buffer
+import mesh_fingerprint
+
+
+def get_meshes():
+    """
+    :returns: The full paths of all mesh shapes in the scene without intermediate objects. Instanced shapes are only
+              returned once.
+    :rtype: list[str]
+    """
+    meshes = []
+    iterator = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kMesh)
+    while not iterator.isDone():
+        dag_path = iterator.getPath()
+        if not om.MFnDagNode(dag_path).isIntermediateObject and dag_path.instanceNumber() == 0:
+            meshes.append(dag_path.fullPathName())
+        iterator.next()
+    return meshes
+
+
+def find_duplicates(meshes=None, precision=mesh_fingerprint.PRECISION):
+    """
+    Fingerprints the topology, the points in object space and the current UV set of every mesh. The arrays are read
+    from Maya first and hashed in a thread pool afterwards.
+
+    :param list[str] meshes: The mesh shapes to compare. If this is None all meshes of the scene are compared.
+    :param float precision: Points and UVs that differ less than this count as the same.
+    :returns: The meshes that are copies of each other in groups.
+    :rtype: list[list[str]]
+    """
+    if meshes is None:
+        meshes = get_meshes()
+
+    arrays = []
+    for mesh in meshes:
+        face_counts, face_vertices = mesh_buffer.get_face_arrays(mesh)
+        uvs, _, uv_ids = mesh_buffer.get_uv_arrays(mesh)
+        arrays.append((face_counts, face_vertices, mesh_buffer.get_points(mesh), uvs, uv_ids))
+    fingerprints = mesh_fingerprint.get_fingerprints(arrays, precision=precision)
+    return mesh_fingerprint.group_duplicates(meshes, fingerprints)
+
+
+def estimate_saved_bytes(groups):
+    """
+    :param list[list[str]] groups: Meshes that are copies of each other in groups, like find_duplicates() returns them.
+    :returns: A rough estimate of the memory and the file size in bytes that instancing all copies would save.
+    :rtype: tuple[int, int]
+    """
+    memory_bytes = file_bytes = 0
+    for group in groups:
+        mfn_mesh = om.MFnMesh(mesh_buffer.get_dag_path(group[0]))
+        counts = (mfn_mesh.numVertices, mfn_mesh.numEdges, mfn_mesh.numPolygons, mfn_mesh.numFaceVertices)
+        copies = len(group) - 1
+        memory_bytes += copies * mesh_fingerprint.estimate_bytes(*counts, element_bytes=mesh_fingerprint.MEMORY_BYTES)
+        file_bytes += copies * mesh_fingerprint.estimate_bytes(*counts, element_bytes=mesh_fingerprint.FILE_BYTES)
+    return memory_bytes, file_bytes
+
+
+def can_instance(mesh):
+    """
+    :param str mesh: A mesh shape.
+    :returns: Whether the shape can be replaced by an instance or be instanced. Shapes with history (like deformers),
+              per-face shading, other instances or that come from a reference can not.
+    :rtype: bool
+    """
+    if cmds.referenceQuery(mesh, isNodeReferenced=True):
+        return False
+    if cmds.listConnections(mesh + '.inMesh', source=True, destination=False):
+        return False
+    if len(cmds.listRelatives(mesh, allParents=True) or []) > 1:
+        return False
+    return not cmds.listConnections(mesh + '.instObjGroups[0].objectGroups', type='shadingEngine')
+
+
+def instance_duplicates(groups):
+    """
+    Replaces all copies in every group with instances of the first mesh of the group that can be instanced.
+    The instances keep the transform and the shading engine of the shape they replace.
+
+    :param list[list[str]] groups: Meshes that are copies of each other in groups, like find_duplicates() returns them.
+    :returns: The instanced groups in the format [original, replaced mesh, ...] and the meshes that were skipped,
+              because they can not be instanced.
+    :rtype: tuple[list[list[str]], list[str]]
+    """
+    instanced = []
+    skipped = []
+    for group in groups:
+        candidates = [mesh for mesh in group if can_instance(mesh)]
+        skipped += [mesh for mesh in group if mesh not in candidates]
+        if len(candidates) < 2:
+            skipped += candidates
+            continue
+
+        original = candidates[0]
+        for mesh in candidates[1:]:
+            transform = cmds.listRelatives(mesh, parent=True, fullPath=True)[0]
+            shading_engines = cmds.listConnections(mesh + '.instObjGroups[0]', type='shadingEngine') or []
+            cmds.delete(mesh)
+            instance = cmds.parent(original, transform, addObject=True, shape=True)[0]
+            if shading_engines:
+                cmds.sets(instance, edit=True, forceElement=shading_engines[0])
+        instanced.append(candidates)
+    return instanced, skipped
@@ -1,7 +1,7 @@
 """
 Short description of this module.
 """
-import pymel.core
+import maya.cmds as cmds
 
 
 def create_runtime_command(command_name, command, annotation='', category='', command_language='python', default=True):
@@ -21,14 +21,14 @@ def create_runtime_command(command_name, command, annotation='', category='', co
     if not annotation:
         annotation = command_name
 
-    if not pymel.core.runTimeCommand(command_name, exists=True):
-        pymel.core.runTimeCommand(command_name,
-                                  annotation=annotation,
-                                  command=command,
-                                  category=category,
-                                  commandLanguage=command_language,
-                                  default=default)
+    if not cmds.runTimeCommand(command_name, exists=True):
+        cmds.runTimeCommand(command_name,
+                            annotation=annotation,
+                            command=command,
+                            category=category,
+                            commandLanguage=command_language,
+                            default=default)
     else:
-        pymel.core.warning(('The runtime command "{0:s}" already exists and can not be overwritten. '
-                            'To change an established runtime command you need to restart maya and create it again.'
-                            '').format(command_name))
+        cmds.warning(('The runtime command "{0:s}" already exists and can not be overwritten. '
+                      'To change an established runtime command you need to restart maya and create it again.'
+                      '').format(command_name))
@@ -0,0 +1,480 @@
+"""
+Bulk access to the data of polygon meshes as numpy arrays.
+
+Points and normals are read straight from the memory of the mesh (through the raw pointers of the API 1.0), so they
+are not copied element by element into python objects first. The arrays of a mesh can be put into shared memory
+(see shared_arrays.SharedArrays), so worker processes can read them without pickling.
+"""
+import ctypes
+import itertools
+
+import maya.api.OpenMaya as om
+import maya.OpenMaya as om1
+import maya.cmds as cmds
+import numpy as np
+
+import mesh_cache
+import shared_arrays
+import topology
+
+
+TOPOLOGY_CACHE = mesh_cache.MeshCache()
+
+# The point writes the next fgSetPoints command executes. [(dag path, points, vertices, old points or None)]
+_PENDING_WRITES = []
+
+# The edge smoothing writes the next fgSetEdgeSmoothing command executes. [(dag path, edges, smooth)]
+_PENDING_SMOOTHING_WRITES = []
+
+# The meshes the next fgCreateMesh command creates. [(points, face counts, face vertices, name)]
+_PENDING_MESHES = []
+
+# The color writes the next fgSetColors command executes. [(dag path, color set, colors, color ids)]
+_PENDING_COLOR_WRITES = []
+
+
+def get_dag_path(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: The dag path of the mesh shape.
+    :rtype: om.MDagPath
+    """
+    if isinstance(mesh, om.MDagPath):
+        dag_path = om.MDagPath(mesh)
+    else:
+        selection = om.MSelectionList()
+        selection.add(mesh)
+        dag_path = selection.getDagPath(0)
+    if dag_path.apiType() == om.MFn.kTransform:
+        try:
+            dag_path.extendToShape()
+        except RuntimeError:
+            # no shape or more than one shape below the transform
+            pass
+    if dag_path.apiType() != om.MFn.kMesh:
+        raise TypeError('"{0:s}" is no polygon mesh.'.format(dag_path.fullPathName()))
+    return dag_path
+
+
+def get_face_arrays(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: The number of vertices of every face and the vertices of all faces concatenated.
+    :rtype: tuple[numpy.ndarray]
+    """
+    face_counts, face_vertices = om.MFnMesh(get_dag_path(mesh)).getVertices()
+    return _to_numpy(face_counts, topology.INDEX_DTYPE), _to_numpy(face_vertices, topology.INDEX_DTYPE)
+
+
+def get_topology_arrays(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: The face counts, the face vertices and the edge vertices (shape (edges, 2)) of the given mesh.
+    :rtype: tuple[numpy.ndarray]
+    """
+    dag_path = get_dag_path(mesh)
+    face_counts, face_vertices = get_face_arrays(dag_path)
+    mfn_mesh = om.MFnMesh(dag_path)
+    # there is no bulk query for the edges, but this only runs once per topology (see get_topology()).
+    # fromiter fills the array directly instead of building a list of tuples first.
+    edge_vertices = np.fromiter(itertools.chain.from_iterable(itertools.imap(mfn_mesh.getEdgeVertices,
+                                                                             xrange(mfn_mesh.numEdges))),
+                                dtype=topology.INDEX_DTYPE,
+                                count=2 * mfn_mesh.numEdges)
+    return face_counts, face_vertices, edge_vertices.reshape(-1, 2)
+
+
+def get_uv_arrays(mesh, uv_set=None):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :returns: The UVs in the shape (uvs, 2), the number of UVs of every face and the UV of every face-vertex of faces
+              that have UVs.
+    :rtype: tuple[numpy.ndarray]
+    """
+    mfn_mesh = om.MFnMesh(get_dag_path(mesh))
+    if uv_set is None:
+        uv_set = mfn_mesh.currentUVSetName()
+    us, vs = mfn_mesh.getUVs(uv_set)
+    uv_counts, uv_ids = mfn_mesh.getAssignedUVs(uv_set)
+    return (np.column_stack((_to_numpy(us, np.float64), _to_numpy(vs, np.float64))),
+            _to_numpy(uv_counts, topology.INDEX_DTYPE),
+            _to_numpy(uv_ids, topology.INDEX_DTYPE))
+
+
+def _to_numpy(maya_array, dtype):
+    """
+    :param maya_array: An array of the API 2.0, like om.MIntArray.
+    :returns: The values of the array. They are iterated straight into the numpy array without a list in between.
+    :rtype: numpy.ndarray
+    """
+    return np.fromiter(maya_array, dtype=dtype, count=len(maya_array))
+
+
+def get_topology(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: The topology of the given mesh. It is built once and cached until the topology of the mesh changes.
+    :rtype: topology.MeshTopology
+    """
+    return TOPOLOGY_CACHE.get(get_dag_path(mesh), _build_topology)
+
+
+def _build_topology(dag_path):
+    face_counts, face_vertices, edge_vertices = get_topology_arrays(dag_path)
+    return topology.MeshTopology(face_counts,
+                                 face_vertices,
+                                 edge_vertices=edge_vertices,
+                                 vertex_count=om.MFnMesh(dag_path).numVertices)
+
+
+def get_point_buffer(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: A read-only view of the points in object space in the shape (vertices, 3) (as float32), without copying
+              them. The view is only valid until the mesh changes or gets deleted, copy it before you change the scene.
+    :rtype: numpy.ndarray
+    """
+    mfn_mesh = _get_api1_mesh(get_dag_path(mesh))
+    return _view_raw_vectors(mfn_mesh.getRawPoints(None), mfn_mesh.numVertices())
+
+
+def get_points(mesh, space=om.MSpace.kObject):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param int space: The space of the points, like om.MSpace.kWorld.
+    :returns: The positions of all vertices in the shape (vertices, 3).
+    :rtype: numpy.ndarray
+    """
+    dag_path = get_dag_path(mesh)
+    points = get_point_buffer(dag_path).astype(np.float64)
+    if space == om.MSpace.kWorld:
+        points = transform_points(points, dag_path.inclusiveMatrix())
+    return points
+
+
+def get_normal_buffer(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: A read-only view of the normals in object space in the shape (normals, 3) (as float32), without copying
+              them. The view is only valid until the mesh changes or gets deleted.
+    :rtype: numpy.ndarray
+    """
+    mfn_mesh = _get_api1_mesh(get_dag_path(mesh))
+    return _view_raw_vectors(mfn_mesh.getRawNormals(None), mfn_mesh.numNormals())
+
+
+def get_normal_arrays(mesh):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :returns: The normals in object space in the shape (normals, 3) and the normal of every face-vertex.
+    :rtype: tuple[numpy.ndarray]
+    """
+    dag_path = get_dag_path(mesh)
+    _, normal_ids = om.MFnMesh(dag_path).getNormalIds()
+    return get_normal_buffer(dag_path).astype(np.float64), _to_numpy(normal_ids, topology.INDEX_DTYPE)
+
+
+def get_edge_smoothing(mesh, edges=None):
+    """
+    Reads the smoothing of all edges with one polyInfo call, MFnMesh can only query the edges one by one. That is only
+    done for the given edges, if there are any.
+
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param numpy.ndarray edges: The edges to read. If this is None all edges are read.
+    :returns: Whether every (given) edge is smooth.
+    :rtype: numpy.ndarray
+    """
+    dag_path = get_dag_path(mesh)
+    if edges is not None:
+        is_edge_smooth = om.MFnMesh(dag_path).isEdgeSmooth
+        return np.fromiter(itertools.imap(is_edge_smooth, np.asarray(edges, dtype=np.int64).tolist()),
+                           dtype=bool,
+                           count=len(edges))
+    lines = cmds.polyInfo(dag_path.fullPathName(), edgeToVertex=True) or []
+    # one line per edge in the order of the edges, like "EDGE      0:      0      1  Hard"
+    return np.array(['Hard' not in line for line in lines], dtype=bool)
+
+
+def transform_points(points, matrix):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param om.MMatrix matrix:
+    :returns: The transformed points.
+    :rtype: numpy.ndarray
+    """
+    # points are row vectors in Maya, so they are transformed by p * M
+    matrix = np.array(list(matrix), dtype=np.float64).reshape(4, 4)
+    return np.asarray(points, dtype=np.float64).dot(matrix[:3, :3]) + matrix[3, :3]
+
+
+def _get_api1_mesh(dag_path):
+    """
+    :param om.MDagPath dag_path:
+    :returns: The mesh function set of the API 1.0, which has access to the raw data of the mesh.
+    :rtype: om1.MFnMesh
+    """
+    selection = om1.MSelectionList()
+    selection.add(dag_path.fullPathName())
+    api1_dag_path = om1.MDagPath()
+    selection.getDagPath(0, api1_dag_path)
+    return om1.MFnMesh(api1_dag_path)
+
+
+def _view_raw_vectors(pointer, count):
+    """
+    :param pointer: A float pointer of the API 1.0 to count * 3 floats.
+    :param int count: The number of vectors.
+    :returns: A read-only view of the memory in the shape (count, 3).
+    :rtype: numpy.ndarray
+    """
+    if not count:
+        return np.zeros((0, 3), dtype=np.float32)
+    view = np.ctypeslib.as_array((ctypes.c_float * (3 * count)).from_address(int(pointer))).reshape(count, 3)
+    view.flags.writeable = False
+    return view
+
+
+def get_mesh_arrays(mesh, uv_set=None):
+    """
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :returns: The arrays of the mesh by name: "points", "face_counts", "face_vertices", "edge_vertices",
+              "edge_smooth", "normals", "normal_ids", "uvs", "uv_counts" and "uv_ids". Points and normals are in
+              object space.
+    :rtype: dict[str, numpy.ndarray]
+    """
+    dag_path = get_dag_path(mesh)
+    topo = get_topology(dag_path)
+    normals, normal_ids = get_normal_arrays(dag_path)
+    uvs, uv_counts, uv_ids = get_uv_arrays(dag_path, uv_set)
+    return {'points': get_points(dag_path),
+            'face_counts': topo.face_counts,
+            'face_vertices': topo.face_vertices,
+            'edge_vertices': topo.edge_vertices,
+            'edge_smooth': get_edge_smoothing(dag_path),
+            'normals': normals,
+            'normal_ids': normal_ids,
+            'uvs': uvs,
+            'uv_counts': uv_counts,
+            'uv_ids': uv_ids}
+
+
+def share_mesh_arrays(mesh, uv_set=None):
+    """
+    Puts the arrays of a mesh into shared memory, so worker processes can attach to them without pickling.
+    The points and normals are copied from the memory of the mesh into the shared memory directly.
+
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param str uv_set: The name of the UV set. If this is None the current UV set is used.
+    :returns: The shared arrays, named like get_mesh_arrays() names them. Call unlink() on them once all workers are
+              done.
+    :rtype: shared_arrays.SharedArrays
+    """
+    dag_path = get_dag_path(mesh)
+    topo = get_topology(dag_path)
+    _, normal_ids = om.MFnMesh(dag_path).getNormalIds()
+    uvs, uv_counts, uv_ids = get_uv_arrays(dag_path, uv_set)
+    return shared_arrays.SharedArrays.create({'points': get_point_buffer(dag_path),
+                                              'face_counts': topo.face_counts,
+                                              'face_vertices': topo.face_vertices,
+                                              'edge_vertices': topo.edge_vertices,
+                                              # the edge flags can only be read on the main thread
+                                              'edge_smooth': get_edge_smoothing(dag_path),
+                                              'normals': get_normal_buffer(dag_path),
+                                              'normal_ids': _to_numpy(normal_ids, topology.INDEX_DTYPE),
+                                              'uvs': uvs,
+                                              'uv_counts': uv_counts,
+                                              'uv_ids': uv_ids})
+
+
+def write_points(mesh, points, vertices=None):
+    """
+    Writes the points of a mesh in one bulk write. This can not be undone, use set_points() for that.
+
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param numpy.ndarray points: The new positions in object space in the shape (n, 3).
+    :param numpy.ndarray vertices: The vertices of the given points. If this is None all points are given.
+    """
+    dag_path = get_dag_path(mesh)
+    if vertices is not None:
+        all_points = get_points(dag_path)
+        all_points[vertices] = points
+        points = all_points
+    om.MFnMesh(dag_path).setPoints(om.MPointArray(np.asarray(points, dtype=np.float64).tolist()))
+
+
+def set_points(writes):
+    """
+    Writes the points of one or more meshes in one bulk write per mesh as a single undoable step.
+
+    :param list[tuple] writes: See queue_points().
+    """
+    queue_points(writes)
+    try:
+        cmds.fgSetPoints()
+    finally:
+        del _PENDING_WRITES[:]
+
+
+def queue_points(writes):
+    """
+    Queues point writes for the next fgSetPoints command (or a command built on it, like fgFlattenComponents).
+
+    :param list[tuple] writes: The mesh, its new points in object space in the shape (n, 3) and the vertices of the
+                               points (or None if all points are given) for every mesh to change. The old points of
+                               the vertices can be given as a fourth item, if they have been read already, otherwise
+                               the command reads them for undo.
+    """
+    for write in writes:
+        mesh, points, vertices = write[:3]
+        old_points = write[3] if len(write) > 3 else None
+        _PENDING_WRITES.append((get_dag_path(mesh),
+                                np.asarray(points, dtype=np.float64).reshape(-1, 3),
+                                None if vertices is None else np.asarray(vertices, dtype=np.int64),
+                                None if old_points is None else np.asarray(old_points, dtype=np.float64)))
+
+
+def pop_pending_writes():
+    """
+    :returns: The point writes that were queued by set_points() and removes them from the queue.
+    :rtype: list[tuple]
+    """
+    writes = list(_PENDING_WRITES)
+    del _PENDING_WRITES[:]
+    return writes
+
+
+def write_edge_smoothing(mesh, edges, smooth):
+    """
+    Sets the given edges of a mesh soft or hard in one bulk write. This can not be undone, use set_edge_smoothing()
+    for that.
+
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param numpy.ndarray edges: The edges to change.
+    :param numpy.ndarray smooth: Whether every given edge gets soft (True) or hard (False).
+    """
+    mfn_mesh = om.MFnMesh(get_dag_path(mesh))
+    mfn_mesh.setEdgeSmoothings(np.asarray(edges, dtype=np.int64).tolist(), np.asarray(smooth, dtype=bool).tolist())
+    mfn_mesh.cleanupEdgeSmoothing()
+    mfn_mesh.updateSurface()
+
+
+def set_edge_smoothing(writes):
+    """
+    Sets edges of one or more meshes soft or hard in one bulk write per mesh as a single undoable step. Unlike
+    polySoftEdge this adds no construction history.
+
+    :param list[tuple] writes: The mesh, the edges to change and whether every edge gets soft (True) or hard (False)
+                               for every mesh to change.
+    """
+    for mesh, edges, smooth in writes:
+        _PENDING_SMOOTHING_WRITES.append((get_dag_path(mesh),
+                                          np.asarray(edges, dtype=np.int64),
+                                          np.asarray(smooth, dtype=bool)))
+    try:
+        cmds.fgSetEdgeSmoothing()
+    finally:
+        del _PENDING_SMOOTHING_WRITES[:]
+
+
+def pop_pending_smoothing_writes():
+    """
+    :returns: The edge smoothing writes that were queued by set_edge_smoothing() and removes them from the queue.
+    :rtype: list[tuple]
+    """
+    writes = list(_PENDING_SMOOTHING_WRITES)
+    del _PENDING_SMOOTHING_WRITES[:]
+    return writes
+
+
+def write_colors(mesh, color_set, colors, color_ids):
+    """
+    Writes the color table of a color set and the color of every face-vertex in one bulk write. The color set is
+    created if it does not exist. This can not be undone, use set_colors() for that.
+
+    :param str|om.MDagPath mesh: A mesh shape or its transform.
+    :param str color_set: The name of the color set.
+    :param numpy.ndarray colors: The color table in the shape (colors, 4) as RGBA.
+    :param numpy.ndarray color_ids: The index of the color of every face-vertex.
+    """
+    mfn_mesh = om.MFnMesh(get_dag_path(mesh))
+    if color_set not in mfn_mesh.getColorSetNames():
+        mfn_mesh.createColorSet(color_set, False)
+    # the color table is small, only the ids have one value per face-vertex
+    mfn_mesh.setColors(om.MColorArray(np.asarray(colors, dtype=np.float64).tolist()), color_set)
+    mfn_mesh.assignColors(om.MIntArray(np.asarray(color_ids, dtype=np.int64).tolist()), color_set)
+
+
+def set_colors(writes):
+    """
+    Writes the colors of one or more meshes in one bulk write per mesh as a single undoable step. The written color set
+    becomes the current one and the colors get displayed.
+
+    :param list[tuple] writes: The mesh, the name of the color set, the color table in the shape (colors, 4) as RGBA
+                               and the index of the color of every face-vertex for every mesh to change.
+    """
+    for mesh, color_set, colors, color_ids in writes:
+        _PENDING_COLOR_WRITES.append((get_dag_path(mesh),
+                                      color_set,
+                                      np.asarray(colors, dtype=np.float64).reshape(-1, 4),
+                                      np.asarray(color_ids, dtype=np.int64)))
+    try:
+        cmds.fgSetColors()
+    finally:
+        del _PENDING_COLOR_WRITES[:]
+
+
+def pop_pending_color_writes():
+    """
+    :returns: The color writes that were queued by set_colors() and removes them from the queue.
+    :rtype: list[tuple]
+    """
+    writes = list(_PENDING_COLOR_WRITES)
+    del _PENDING_COLOR_WRITES[:]
+    return writes
+
+
+def build_mesh(points, face_counts, face_vertices, name):
+    """
+    Creates a new mesh from the given arrays in one bulk write. This can not be undone, use create_mesh() for that.
+
+    :param numpy.ndarray points: The points in object space in the shape (vertices, 3).
+    :param numpy.ndarray face_counts: The number of vertices of every face.
+    :param numpy.ndarray face_vertices: The vertices of all faces concatenated.
+    :param str name: The name of the new transform. Maya makes it unique.
+    :returns: The transform of the new mesh.
+    :rtype: om.MObject
+    """
+    transform = om.MFnMesh().create(om.MPointArray(np.asarray(points, dtype=np.float64).tolist()),
+                                    om.MIntArray(np.asarray(face_counts, dtype=np.int64).tolist()),
+                                    om.MIntArray(np.asarray(face_vertices, dtype=np.int64).tolist()))
+    om.MFnDagNode(transform).setName(name)
+    return transform
+
+
+def create_mesh(points, face_counts, face_vertices, name):
+    """
+    Creates a new mesh from the given arrays in one bulk write as an undoable step. See build_mesh().
+
+    :returns: The full path of the transform of the new mesh.
+    :rtype: str
+    """
+    _PENDING_MESHES.append((np.asarray(points, dtype=np.float64).reshape(-1, 3),
+                            np.asarray(face_counts, dtype=np.int64),
+                            np.asarray(face_vertices, dtype=np.int64),
+                            name))
+    try:
+        return cmds.fgCreateMesh()[0]
+    finally:
+        del _PENDING_MESHES[:]
+
+
+def pop_pending_meshes():
+    """
+    :returns: The meshes that were queued by create_mesh() and removes them from the queue.
+    :rtype: list[tuple]
+    """
+    meshes = list(_PENDING_MESHES)
+    del _PENDING_MESHES[:]
+    return meshes
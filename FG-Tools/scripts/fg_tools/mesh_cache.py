@@ -0,0 +1,131 @@
+"""
+Caches data that is expensive to compute per mesh (like its topology) until the topology of the mesh changes.
+"""
+import maya.api.OpenMaya as om
+
+
+# All caches, so a topology change can invalidate the entries of a mesh everywhere.
+_CACHES = []
+
+# The topology changed callback of every watched mesh. {mesh uuid: callback id}
+_CALLBACKS = {}
+
+# The callbacks that clear all caches before a new scene is created or opened.
+_SCENE_CALLBACKS = []
+
+
+class MeshCache(object):
+    """
+    Keeps one value per mesh. A value is built again once the topology of its mesh changes. That is detected by a
+    topology changed callback and, as a fallback, by the vertex, edge, face and face-vertex counts of the mesh.
+
+    Usage::
+
+        TOPOLOGY_CACHE = MeshCache()
+        topo = TOPOLOGY_CACHE.get(dag_path, build_topology)
+    """
+
+    def __init__(self):
+        # {mesh uuid: (signature, value)}
+        self._entries = {}
+        _CACHES.append(self)
+        _add_scene_callbacks()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, dag_path, build):
+        """
+        :param om.MDagPath dag_path: The dag path of the mesh shape.
+        :param build: A function that takes the dag path and returns the value to cache.
+        :returns: The cached value of the given mesh. It will be built if it does not exist or is outdated.
+        """
+        key = get_key(dag_path)
+        signature = get_signature(dag_path)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != signature:
+            entry = (signature, build(dag_path))
+            self._entries[key] = entry
+            _watch(dag_path.node(), key)
+        return entry[1]
+
+    def discard(self, key):
+        """
+        :param str key: The uuid of the mesh whose value should be removed.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all cached values.
+        """
+        self._entries.clear()
+
+
+def get_key(dag_path):
+    """
+    :param om.MDagPath dag_path:
+    :returns: The uuid of the given node. Unlike its name this does not change when the node gets renamed.
+    :rtype: str
+    """
+    return om.MFnDependencyNode(dag_path.node()).uuid().asString()
+
+
+def get_signature(dag_path):
+    """
+    :param om.MDagPath dag_path: The dag path of a mesh shape.
+    :returns: The vertex, edge, face and face-vertex counts of the mesh.
+    :rtype: tuple[int]
+    """
+    mfn_mesh = om.MFnMesh(dag_path)
+    return mfn_mesh.numVertices, mfn_mesh.numEdges, mfn_mesh.numPolygons, mfn_mesh.numFaceVertices
+
+
+def invalidate(key):
+    """
+    Removes the values of the given mesh from all caches.
+
+    :param str key: The uuid of the mesh.
+    """
+    for cache in _CACHES:
+        cache.discard(key)
+
+
+def clear():
+    """
+    Removes all values from all caches and stops watching the meshes.
+    """
+    for cache in _CACHES:
+        cache.clear()
+    for callback_id in _CALLBACKS.values():
+        try:
+            om.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            # the node does not exist anymore
+            pass
+    _CALLBACKS.clear()
+
+
+def _watch(node, key):
+    if key in _CALLBACKS:
+        return
+    try:
+        _CALLBACKS[key] = om.MPolyMessage.addPolyTopologyChangedCallback(node, _on_topology_changed, key)
+    except AttributeError:
+        # older Maya versions have no topology callback, so only the signature tells us about changes.
+        pass
+
+
+def _on_topology_changed(*args):
+    # the client data (the uuid of the mesh) is always the last argument
+    invalidate(args[-1])
+
+
+def _on_scene_change(*_):
+    clear()
+
+
+def _add_scene_callbacks():
+    if not _SCENE_CALLBACKS:
+        for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen):
+            _SCENE_CALLBACKS.append(om.MSceneMessage.addCallback(message, _on_scene_change))
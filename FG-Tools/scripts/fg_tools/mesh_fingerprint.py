@@ -0,0 +1,109 @@
+"""
+Fingerprints of meshes to find identical copies of the same mesh.
+
+A fingerprint is a hash over the topology arrays, the points quantized to a grid and optionally the UVs. Two meshes
+with the same topology whose points differ less than the precision get the same fingerprint (unless a point lies right
+on the border of two grid cells).
+
+This module does not depend on Maya.
+"""
+import hashlib
+
+import numpy as np
+
+import parallel
+
+
+# Points and UVs that differ less than this count as the same.
+PRECISION = 0.0001
+
+# Bytes per element of the geometry of a mesh in a Maya binary file: single precision points, edges with two vertices
+# and a smooth flag, and an edge and a UV id for every face-vertex.
+FILE_BYTES = {'vertex': 12, 'edge': 12, 'face_vertex': 8, 'face': 4}
+
+# In memory Maya keeps a normal for every face-vertex and the viewport keeps its own copy of the points, normals and
+# UVs of every face-vertex on top of the data that is saved.
+MEMORY_BYTES = {'vertex': 12, 'edge': 12, 'face_vertex': 8 + 12 + 32, 'face': 4}
+
+
+def quantize(values, precision=PRECISION):
+    """
+    :param numpy.ndarray values:
+    :param float precision: The size of the grid cells.
+    :returns: The index of the grid cell of every value.
+    :rtype: numpy.ndarray
+    """
+    return np.round(np.asarray(values, dtype=np.float64) / precision).astype(np.int64)
+
+
+def get_fingerprint(face_counts, face_vertices, points, uvs=None, uv_ids=None, precision=PRECISION):
+    """
+    :param list[int] face_counts: The number of vertices of every face.
+    :param list[int] face_vertices: The vertices of all faces in winding order, concatenated.
+    :param numpy.ndarray points: The points in object space in the shape (n, 3).
+    :param numpy.ndarray uvs: The UVs in the shape (n, 2).
+    :param list[int] uv_ids: The UV of every face-vertex.
+    :param float precision: Points and UVs that differ less than this count as the same.
+    :returns: A hash over the given arrays.
+    :rtype: str
+    """
+    arrays = [np.asarray(face_counts, dtype=np.int32),
+              np.asarray(face_vertices, dtype=np.int32),
+              quantize(points, precision)]
+    if uvs is not None:
+        arrays += [quantize(uvs, precision), np.asarray(uv_ids, dtype=np.int32)]
+
+    digest = hashlib.sha1()
+    for array in arrays:
+        # the lengths keep arrays from shifting into each other
+        digest.update(str(array.size).encode('ascii'))
+        digest.update(np.ascontiguousarray(array))
+    return digest.hexdigest()
+
+
+def get_fingerprints(meshes, precision=PRECISION, threads=parallel.CPU_THREADS):
+    """
+    Hashes many meshes at once in a pool of threads. hashlib releases the GIL, so this runs on all cores.
+
+    :param list[tuple] meshes: The arguments of get_fingerprint() for every mesh, like (face_counts, face_vertices,
+                               points) or (face_counts, face_vertices, points, uvs, uv_ids).
+    :param float precision: Points and UVs that differ less than this count as the same.
+    :param int threads: The maximum number of threads to use.
+    :returns: The fingerprint of every mesh.
+    :rtype: list[str]
+    """
+    return parallel.thread_map(lambda arrays: get_fingerprint(*arrays, precision=precision), meshes, threads=threads)
+
+
+def group_duplicates(names, fingerprints):
+    """
+    :param list[str] names: The name of every mesh.
+    :param list[str] fingerprints: The fingerprint of every mesh.
+    :returns: The names of the meshes that share their fingerprint with other meshes, grouped by fingerprint.
+              The groups and the names within them keep the order of the given names.
+    :rtype: list[list[str]]
+    """
+    groups = {}
+    order = []
+    for name, fingerprint in zip(names, fingerprints):
+        if fingerprint not in groups:
+            groups[fingerprint] = []
+            order.append(fingerprint)
+        groups[fingerprint].append(name)
+    return [groups[fingerprint] for fingerprint in order if len(groups[fingerprint]) > 1]
+
+
+def estimate_bytes(vertex_count, edge_count, face_count, face_vertex_count, element_bytes=FILE_BYTES):
+    """
+    :param int vertex_count:
+    :param int edge_count:
+    :param int face_count:
+    :param int face_vertex_count:
+    :param dict[str, int] element_bytes: The bytes per element, FILE_BYTES or MEMORY_BYTES.
+    :returns: A rough estimate of the bytes the geometry of a mesh takes up.
+    :rtype: int
+    """
+    return (vertex_count * element_bytes['vertex'] +
+            edge_count * element_bytes['edge'] +
+            face_count * element_bytes['face'] +
+            face_vertex_count * element_bytes['face_vertex'])
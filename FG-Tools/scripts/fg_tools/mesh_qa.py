@@ -0,0 +1,141 @@
+"""
+Quality checks of meshes on their raw arrays (see mesh_buffer.get_mesh_arrays()), so they can run in worker processes.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import geometry
+import mesh_stats
+import normals
+import shared_arrays
+import topology
+import uv
+
+
+TRIANGLES = 'triangles'
+NGONS = 'ngons'
+LAMINA_FACES = 'lamina_faces'
+NON_MANIFOLD_VERTICES = 'non_manifold_vertices'
+NON_MANIFOLD_EDGES = 'non_manifold_edges'
+ZERO_AREA_FACES = 'zero_area_faces'
+ZERO_LENGTH_EDGES = 'zero_length_edges'
+CONCAVE_FACES = 'concave_faces'
+NON_PLANAR_FACES = 'non_planar_faces'
+UV_SEAMS = 'uv_seams'
+UV_OVERLAPS = 'uv_overlaps'
+HARD_EDGES = 'hard_edges'
+FLIPPED_FACES = 'flipped_faces'
+
+# The component type every check finds.
+CHECKS = {TRIANGLES: topology.FACE,
+          NGONS: topology.FACE,
+          LAMINA_FACES: topology.FACE,
+          NON_MANIFOLD_VERTICES: topology.VERTEX,
+          NON_MANIFOLD_EDGES: topology.EDGE,
+          ZERO_AREA_FACES: topology.FACE,
+          ZERO_LENGTH_EDGES: topology.EDGE,
+          CONCAVE_FACES: topology.FACE,
+          NON_PLANAR_FACES: topology.FACE,
+          UV_SEAMS: topology.EDGE,
+          UV_OVERLAPS: topology.FACE,
+          HARD_EDGES: topology.EDGE,
+          FLIPPED_FACES: topology.FACE}
+
+
+def analyze(arrays, checks=tuple(CHECKS)):
+    """
+    :param dict[str, numpy.ndarray] arrays: The arrays of a mesh, like mesh_buffer.get_mesh_arrays() returns them.
+    :param list[str] checks: The checks to run, see CHECKS.
+    :returns: The sorted indices of the components every check found.
+    :rtype: dict[str, numpy.ndarray]
+    """
+    face_counts = arrays['face_counts']
+    topo = topology.MeshTopology(face_counts,
+                                 arrays['face_vertices'],
+                                 edge_vertices=arrays['edge_vertices'],
+                                 vertex_count=len(arrays['points']))
+    # the checks of one kind share their intermediate arrays
+    layout = None
+    if UV_SEAMS in checks or UV_OVERLAPS in checks:
+        layout = uv.UVLayout(topo, arrays['uvs'], arrays['uv_counts'], arrays['uv_ids'])
+    mesh_geometry = None
+    if any(check in checks for check in (ZERO_AREA_FACES, ZERO_LENGTH_EDGES, CONCAVE_FACES, NON_PLANAR_FACES)):
+        mesh_geometry = geometry.MeshGeometry(topo, arrays['points'])
+    results = {}
+    for check in checks:
+        if check == TRIANGLES:
+            results[check] = topology.to_indices(face_counts == 3)
+        elif check == NGONS:
+            results[check] = topology.to_indices(face_counts > 4)
+        elif check == LAMINA_FACES:
+            results[check] = mesh_stats.get_lamina_faces(topo)
+        elif check == NON_MANIFOLD_VERTICES:
+            results[check] = mesh_stats.get_non_manifold_vertices(topo)
+        elif check == NON_MANIFOLD_EDGES:
+            results[check] = mesh_stats.get_non_manifold_edges(topo)
+        elif check == ZERO_AREA_FACES:
+            results[check] = mesh_geometry.get_zero_area_faces()
+        elif check == ZERO_LENGTH_EDGES:
+            results[check] = mesh_geometry.get_zero_length_edges()
+        elif check == CONCAVE_FACES:
+            results[check] = mesh_geometry.get_concave_faces()
+        elif check == NON_PLANAR_FACES:
+            results[check] = mesh_geometry.get_non_planar_faces()
+        elif check == UV_SEAMS:
+            results[check] = layout.get_seam_edges()
+        elif check == UV_OVERLAPS:
+            results[check] = layout.get_overlapping_faces()
+        elif check == HARD_EDGES:
+            results[check] = topology.to_indices(~np.asarray(arrays['edge_smooth'], dtype=bool))
+        elif check == FLIPPED_FACES:
+            results[check] = normals.get_flipped_faces(topo, arrays['points'])
+        else:
+            raise ValueError('Unknown check "{0:s}". Use one of: {1:s}'.format(check, ', '.join(sorted(CHECKS))))
+    return results
+
+
+def analyze_shared(task):
+    """
+    Runs the checks on the arrays of a mesh in shared memory. This is what the worker processes run.
+
+    :param tuple task: The handle of the shared arrays (see shared_arrays.SharedArrays) and the checks to run.
+    :returns: The sorted indices of the components every check found.
+    :rtype: dict[str, numpy.ndarray]
+    """
+    handle, checks = task
+    with shared_arrays.SharedArrays.attach(handle) as shared:
+        # the results are new arrays, so they stay valid after the shared memory is closed
+        return analyze(shared.arrays, checks)
+
+
+def analyze_batch(tasks):
+    """
+    Runs the checks of several meshes in one call, so small meshes do not pay the cost of a task each.
+
+    :param list[tuple] tasks: The tasks like analyze_shared() takes them.
+    :returns: The results of every task.
+    :rtype: list[dict[str, numpy.ndarray]]
+    """
+    return [analyze_shared(task) for task in tasks]
+
+
+def split_into_batches(sizes, batch_size):
+    """
+    :param list[int] sizes: The size of every item (i.e. the number of face-vertices of a mesh).
+    :param int batch_size: The size a batch should not exceed. Bigger items get a batch on their own.
+    :returns: The indices of the items in batches of consecutive items.
+    :rtype: list[list[int]]
+    """
+    batches = []
+    current = []
+    current_size = 0
+    for index, size in enumerate(sizes):
+        if current and current_size + size > batch_size:
+            batches.append(current)
+            current, current_size = [], 0
+        current.append(index)
+        current_size += size
+    if current:
+        batches.append(current)
+    return batches
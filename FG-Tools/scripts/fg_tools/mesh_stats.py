@@ -0,0 +1,215 @@
+"""
+Topology statistics of meshes (triangles, quads, n-gons, lamina faces and non-manifold components) and their totals
+over many meshes that are kept up to date incrementally.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import topology
+
+
+# The names of the statistics in the order get_statistics() returns them.
+STATISTICS = ('triangles', 'quads', 'ngons', 'lamina', 'non_manifold')
+
+LABELS = {'triangles': 'Tris',
+          'quads': 'Quads',
+          'ngons': 'N-Gons',
+          'lamina': 'Lamina',
+          'non_manifold': 'Non-Manifold'}
+
+
+def get_non_manifold_edges(topo):
+    """
+    :param topology.MeshTopology topo:
+    :returns: The edges with more than two faces.
+    :rtype: numpy.ndarray
+    """
+    return topology.to_indices(topo.edge_face_counts > 2)
+
+
+def get_non_manifold_vertices(topo):
+    """
+    A vertex is non-manifold if it lies on a non-manifold edge or if its faces do not form a single fan, like the
+    vertex where two cones touch with their tips.
+
+    :param topology.MeshTopology topo:
+    :returns: The sorted non-manifold vertices.
+    :rtype: numpy.ndarray
+    """
+    edge_face_counts = topo.edge_face_counts
+    non_manifold = topology.to_mask(topo.edge_vertices[edge_face_counts > 2].ravel(), topo.vertex_count)
+    non_manifold[_count_fans(topo) > 1] = True
+    return topology.to_indices(non_manifold)
+
+
+def _count_fans(topo):
+    """
+    The corners (face-vertices) around a vertex belong to the same fan if their faces share one of the vertex's edges
+    with two faces. The corners are joined across those edges with a union-find.
+
+    :param topology.MeshTopology topo:
+    :returns: The number of fans of faces around every vertex.
+    :rtype: numpy.ndarray
+    """
+    # every face-vertex starts the face-edge to the next face-vertex of its face
+    offsets, face_edges = topology.build_csr(topo.face_edges, np.arange(len(topo.face_vertices)), topo.edge_count)
+    manifold = np.flatnonzero(np.diff(offsets) == 2)
+    first = face_edges[offsets[manifold]].astype(np.int64)
+    second = face_edges[offsets[manifold] + 1].astype(np.int64)
+    next_first = topo.face_vertex_next[first]
+    next_second = topo.face_vertex_next[second]
+    # faces that are wound the same way run along their shared edge in opposite directions
+    same_start = topo.face_vertices[first] == topo.face_vertices[second]
+    pairs = np.concatenate((np.column_stack((first, np.where(same_start, second, next_second))),
+                            np.column_stack((next_first, np.where(same_start, next_second, second)))))
+    labels = topology.get_connected_labels(pairs, len(topo.face_vertices))
+    # only corners of the same vertex get joined, so every fan has one root corner (the lowest one)
+    roots = labels == np.arange(len(labels))
+    return np.bincount(topo.face_vertices[roots], minlength=topo.vertex_count)
+
+
+def get_lamina_faces(topo):
+    """
+    Lamina faces share all their vertices with another face.
+
+    :param topology.MeshTopology topo:
+    :returns: The sorted lamina faces.
+    :rtype: numpy.ndarray
+    """
+    pairs = _get_lamina_pairs(topo)
+    return topology.to_indices(topology.to_mask(pairs.ravel(), topo.face_count))
+
+
+def get_lamina_duplicates(topo):
+    """
+    :param topology.MeshTopology topo:
+    :returns: The sorted lamina faces that share their vertices with a lower face. Deleting them keeps the lowest face
+              of every group of lamina faces, so no vertex or edge loses all its faces.
+    :rtype: numpy.ndarray
+    """
+    return topology.to_indices(topology.to_mask(_get_lamina_pairs(topo)[:, 1], topo.face_count))
+
+
+def _get_lamina_pairs(topo):
+    """
+    :param topology.MeshTopology topo:
+    :returns: Pairs of faces with the same vertices in the shape (pairs, 2). The first face of every pair is the
+              lowest face with these vertices.
+    :rtype: numpy.ndarray
+    """
+    # only faces whose edges all have more than one face can be lamina
+    shared_edges = topo.edge_face_counts[topo.face_edges] > 1
+    shared_counts = np.bincount(topo.face_vertex_faces, weights=shared_edges, minlength=topo.face_count)
+    candidates = np.flatnonzero(shared_counts == topo.face_counts)
+    if not len(candidates):
+        return np.zeros((0, 2), dtype=np.int64)
+
+    # faces with the same vertices have the same vertex count, sum and minimum. Only those get compared in python.
+    vertices = topo.face_vertices.astype(np.int64)
+    sums = np.add.reduceat(vertices, topo.face_offsets[:-1])[candidates]
+    minimums = np.minimum.reduceat(vertices, topo.face_offsets[:-1])[candidates]
+    keys = np.column_stack((topo.face_counts[candidates], sums, minimums))
+    order = np.lexsort(keys.T[::-1])
+    keys, candidates = keys[order], candidates[order]
+    same_as_next = (keys[1:] == keys[:-1]).all(axis=1)
+
+    # every face of a group of equal keys is compared with every other one, the lowest face of equal vertices first
+    pairs = []
+    group_starts = np.flatnonzero(np.concatenate(([True], ~same_as_next)))
+    group_ends = np.append(group_starts[1:], len(candidates))
+    shared = group_ends - group_starts > 1
+    for start, end in zip(group_starts[shared].tolist(), group_ends[shared].tolist()):
+        first_faces = {}
+        for face in sorted(candidates[start:end].tolist()):
+            face_vertices = frozenset(topo.face_vertices[topo.face_offsets[face]:topo.face_offsets[face + 1]].tolist())
+            if face_vertices in first_faces:
+                pairs.append((first_faces[face_vertices], face))
+            else:
+                first_faces[face_vertices] = face
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def get_statistics(topo):
+    """
+    :param topology.MeshTopology topo:
+    :returns: The number of triangles, quads, n-gons, lamina faces and non-manifold vertices in the order of
+              STATISTICS.
+    :rtype: tuple[int]
+    """
+    face_counts = topo.face_counts
+    return (int(np.count_nonzero(face_counts == 3)),
+            int(np.count_nonzero(face_counts == 4)),
+            int(np.count_nonzero(face_counts > 4)),
+            len(get_lamina_faces(topo)),
+            len(get_non_manifold_vertices(topo)))
+
+
+def format_statistics(statistics):
+    """
+    :param tuple[int] statistics: The statistics in the order of STATISTICS.
+    :returns: The statistics as one line of text.
+    :rtype: str
+    """
+    return '  '.join('{0:s}: {1:d}'.format(LABELS[name], count) for name, count in zip(STATISTICS, statistics))
+
+
+class StatisticsTotals(object):
+    """
+    Keeps the statistics of many meshes and their total. Changing the statistics of one mesh only updates the total
+    by the difference, so the total of thousands of meshes stays cheap to keep up to date.
+
+    Usage::
+
+        totals = StatisticsTotals()
+        totals.set('mesh_a', get_statistics(topo_a))
+        totals.set('mesh_b', get_statistics(topo_b))
+        totals.total               # the sum of both
+        totals.get_total(['mesh_a'])
+    """
+
+    def __init__(self):
+        self._statistics = {}
+        self.total = (0,) * len(STATISTICS)
+
+    def __contains__(self, key):
+        return key in self._statistics
+
+    def __len__(self):
+        return len(self._statistics)
+
+    def set(self, key, statistics):
+        """
+        :param str key: The key of the mesh.
+        :param tuple[int] statistics: The statistics of the mesh in the order of STATISTICS.
+        """
+        previous = self._statistics.get(key, (0,) * len(STATISTICS))
+        self._statistics[key] = tuple(statistics)
+        self.total = tuple(total - old + new for total, old, new in zip(self.total, previous, statistics))
+
+    def remove(self, key):
+        """
+        :param str key: The key of the mesh.
+        """
+        previous = self._statistics.pop(key, None)
+        if previous is not None:
+            self.total = tuple(total - old for total, old in zip(self.total, previous))
+
+    def clear(self):
+        """
+        Removes the statistics of all meshes.
+        """
+        self._statistics.clear()
+        self.total = (0,) * len(STATISTICS)
+
+    def get_total(self, keys):
+        """
+        :param list[str] keys: The keys of the meshes to sum up. Unknown keys are ignored.
+        :returns: The sum of the statistics of the given meshes.
+        :rtype: tuple[int]
+        """
+        total = [0] * len(STATISTICS)
+        for key in keys:
+            for index, count in enumerate(self._statistics.get(key, ())):
+                total[index] += count
+        return tuple(total)
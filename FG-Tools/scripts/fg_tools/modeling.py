@@ -1,8 +1,37 @@
 """
 This module collects functions that are handy for modeling.
 """
+import hashlib
+import time
+
+import maya.api.OpenMaya as om
 import maya.cmds as cmds
+import numpy as np
+
+import bvh
+import cleanup
 import component as com
+import decimation
+import deviation
+import fitting
+import mesh_buffer
+import mesh_cache
+import mesh_qa
+import normals
+import point_cache
+import progress
+import relax
+import topology
+
+
+# The color set that show_deviations() writes to.
+DEVIATION_COLOR_SET = 'fgDeviation'
+
+# The uniform relax matrices only depend on the topology, so they are kept until it changes.
+RELAX_CACHE = mesh_cache.MeshCache()
+
+# The BVH of every shrink wrap target in object space. {'digest': hash of the points, 'bvh': bvh.TriangleBVH}
+BVH_CACHE = mesh_cache.MeshCache()
 
 
 def move_components_to_axis(components, axis='x'):
@@ -20,6 +49,491 @@ def move_components_to_axis(components, axis='x'):
         cmds.move(aver[2], components, z=True)
 
 
+def spherify(components, chunk_size=progress.CHUNK_SIZE, callback=None):
+    """
+    Moves the vertices of the given components to the same distance from their midpoint in world space. The distance
+    is their average distance. All meshes are written in one bulk write each, as a single undoable step.
+
+    :param list[str] components: The components (and meshes) to spherify.
+    :param int chunk_size: The number of vertices that are processed between two progress updates.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :raises progress.OperationCancelled: If the user cancelled. Nothing has been changed in that case.
+    """
+    meshes = _get_vertices(components)
+    if not meshes:
+        return
+
+    old_points, positions = _read_points(meshes)
+    count = len(positions)
+    # three passes: the midpoint, the average distance and the new positions
+    with progress.Progress('Spherify', 3 * count, callback) as current_progress:
+        midpoint = np.zeros(3)
+        for start, stop in current_progress.iterate_chunks(count, chunk_size):
+            midpoint += positions[start:stop].sum(axis=0)
+        midpoint /= count
+
+        offsets = positions - midpoint
+        distances = np.zeros(count)
+        for start, stop in current_progress.iterate_chunks(count, chunk_size):
+            distances[start:stop] = np.sqrt(np.einsum('ij,ij->i', offsets[start:stop], offsets[start:stop]))
+        radius = distances.mean()
+
+        factors = np.ones(count)
+        for start, stop in current_progress.iterate_chunks(count, chunk_size):
+            chunk = distances[start:stop]
+            factors[start:stop][chunk > 0] = radius / chunk[chunk > 0]
+        positions = midpoint + offsets * factors[:, np.newaxis]
+
+    mesh_buffer.set_points(_get_writes(meshes, positions, old_points))
+
+
+def relax_components(components, weights=relax.UNIFORM, iterations=relax.ITERATIONS, strength=relax.STRENGTH,
+                     pin_border=True, callback=None):
+    """
+    Moves the vertices of the given components towards the weighted average of their neighbours. All other vertices
+    stay pinned. All meshes are written in one bulk write each, as a single undoable step.
+
+    :param list[str] components: The components (and meshes) to relax.
+    :param str weights: relax.UNIFORM or relax.COTANGENT (which keeps the shape of uneven meshes better).
+    :param int iterations:
+    :param float strength: How far the vertices move towards the average of their neighbours in every iteration.
+    :param bool pin_border: Whether the vertices on the border of the mesh stay pinned.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :raises progress.OperationCancelled: If the user cancelled. Nothing has been changed in that case.
+    :raises ValueError: If the weights are unknown.
+    """
+    meshes = _get_vertices(components)
+    if not meshes:
+        return
+
+    writes = []
+    with progress.Progress('Relax', iterations * len(meshes), callback) as current_progress:
+        for mesh, vertices in meshes:
+            dag_path = mesh_buffer.get_dag_path(mesh)
+            topo = mesh_buffer.get_topology(dag_path)
+            points = mesh_buffer.get_points(dag_path)
+            if pin_border:
+                vertices = np.setdiff1d(vertices, topo.get_border_vertices(), assume_unique=True)
+            if weights == relax.UNIFORM:
+                matrix = RELAX_CACHE.get(dag_path, _build_relax_matrix)
+            else:
+                matrix = relax.get_matrix(topo, points, weights)
+
+            moving = None if len(vertices) == topo.vertex_count else vertices
+            for _ in relax.iterate_relax(points, matrix, moving, iterations, strength):
+                current_progress.advance(1)
+            writes.append((mesh, points[vertices], vertices))
+    mesh_buffer.set_points(writes)
+
+
+def _build_relax_matrix(dag_path):
+    return relax.get_uniform_matrix(mesh_buffer.get_topology(dag_path))
+
+
+def shrink_wrap(components, target, mode=bvh.CLOSEST, chunk_size=progress.CHUNK_SIZE, callback=None):
+    """
+    Moves the vertices of the given components onto the surface of the target mesh. All vertices are projected
+    together against a BVH over the triangles of the target, which is cached until the target changes. All meshes are
+    written in one bulk write each, as a single undoable step.
+
+    :param list[str] components: The components (and meshes) to wrap. Components of the target itself are ignored.
+    :param str target: The mesh shape or its transform to wrap onto.
+    :param str mode: bvh.CLOSEST moves the vertices to the closest point on the target, bvh.NORMAL moves them along
+                     their normal (in both directions) to the nearest hit. Vertices whose normal misses the target
+                     stay where they are.
+    :param int chunk_size: The number of vertices that are projected between two progress updates.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :raises progress.OperationCancelled: If the user cancelled. Nothing has been changed in that case.
+    :raises ValueError: If the mode is unknown.
+    """
+    if mode not in bvh.MODES:
+        raise ValueError('Unknown mode "{0:s}". Use one of: {1:s}'.format(mode, ', '.join(bvh.MODES)))
+    target_path = mesh_buffer.get_dag_path(target)
+    meshes = [(mesh, vertices) for mesh, vertices in _get_vertices(components)
+              if mesh_buffer.get_dag_path(mesh).fullPathName() != target_path.fullPathName()]
+    if not meshes:
+        return
+
+    tree = get_target_bvh(target_path)
+    # the queries run in the object space of the target, so its BVH stays valid when it gets moved
+    to_target = target_path.inclusiveMatrixInverse()
+    old_points, positions = _read_points(meshes)
+    positions = mesh_buffer.transform_points(positions, to_target)
+    if mode == bvh.NORMAL:
+        normals = np.concatenate([_get_target_space_normals(mesh, to_target)[vertices] for mesh, vertices in meshes])
+
+    count = len(positions)
+    with progress.Progress('Shrink Wrap', count, callback) as current_progress:
+        for start, stop in current_progress.iterate_chunks(count, chunk_size):
+            if mode == bvh.CLOSEST:
+                positions[start:stop] = tree.find_closest(positions[start:stop])[0]
+            else:
+                hits = tree.intersect(positions[start:stop], normals[start:stop])[0]
+                hit = ~np.isnan(hits[:, 0])
+                positions[start:stop][hit] = hits[hit]
+
+    positions = mesh_buffer.transform_points(positions, target_path.inclusiveMatrix())
+    mesh_buffer.set_points(_get_writes(meshes, positions, old_points))
+
+
+def get_target_bvh(target):
+    """
+    :param str|om.MDagPath target: A mesh shape or its transform.
+    :returns: The BVH over the triangles of the given mesh in object space. It is built again when the topology or the
+              points of the mesh change.
+    :rtype: bvh.TriangleBVH
+    """
+    dag_path = mesh_buffer.get_dag_path(target)
+    point_buffer = mesh_buffer.get_point_buffer(dag_path)
+    # hashing the points is much cheaper than building the BVH again
+    digest = hashlib.sha1(np.ascontiguousarray(point_buffer)).hexdigest()
+    entry = BVH_CACHE.get(dag_path, lambda _: {})
+    if entry.get('digest') != digest:
+        triangles, _ = mesh_buffer.get_topology(dag_path).get_fan_triangles()
+        entry['bvh'] = bvh.TriangleBVH(point_buffer, triangles)
+        entry['digest'] = digest
+    return entry['bvh']
+
+
+def _get_target_space_normals(mesh, to_target):
+    """
+    :returns: The unit vertex normals of the given mesh in the object space of the target (zero for loose vertices).
+    :rtype: numpy.ndarray
+    """
+    topo = mesh_buffer.get_topology(mesh)
+    points = mesh_buffer.transform_points(mesh_buffer.get_points(mesh, space=om.MSpace.kWorld), to_target)
+    return bvh.get_vertex_normals(topo.face_counts, topo.face_vertices, points)
+
+
+def decimate_meshes(meshes, face_count=None, ratio=None, keep_uv_seams=True, keep_hard_edges=True, callback=None):
+    """
+    Builds a lightweight proxy of every given mesh by collapsing its edges in the order of their quadric error. The
+    proxies are triangulated, have no UVs and get the world transform of their mesh. The meshes stay untouched. All
+    proxies are built in one undoable step.
+
+    :param list[str] meshes: The meshes (or their transforms) to decimate.
+    :param int face_count: The number of triangles every proxy should have.
+    :param float ratio: The number of triangles every proxy should have, relative to the triangles of its mesh (a quad
+                        counts as two). Only used if no face count is given.
+    :param bool keep_uv_seams: Whether the vertices on UV seams stay where they are.
+    :param bool keep_hard_edges: Whether the vertices on hard edges stay where they are.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :returns: The transforms of the proxies.
+    :rtype: list[str]
+    :raises progress.OperationCancelled: If the user cancelled. Proxies that were built until then are kept.
+    :raises ValueError: If neither a face count nor a ratio is given.
+    """
+    if face_count is None and ratio is None:
+        raise ValueError('Give a face count or a ratio to decimate to.')
+    checks = [check for check, keep in ((mesh_qa.UV_SEAMS, keep_uv_seams), (mesh_qa.HARD_EDGES, keep_hard_edges))
+              if keep]
+    decimators = []
+    for mesh in com.get_meshes(meshes):
+        topo = mesh_buffer.get_topology(mesh)
+        results = mesh_qa.analyze(mesh_buffer.get_mesh_arrays(mesh), checks)
+        locked_edges = np.concatenate([results[check] for check in checks]) if checks else []
+        triangles, _ = topo.get_fan_triangles()
+        decimator = decimation.Decimator(mesh_buffer.get_points(mesh), triangles,
+                                         locked_vertices=topo.edge_vertices[locked_edges].ravel())
+        target = decimation.get_face_count(face_count, ratio, decimator.triangle_count)
+        decimators.append((mesh, decimator, target))
+
+    proxies = []
+    total = sum(max(decimator.triangle_count - target, 0) for _, decimator, target in decimators)
+    cmds.undoInfo(openChunk=True, chunkName='fgDecimateMeshes')
+    try:
+        with progress.Progress('Decimate', total, callback) as current_progress:
+            for mesh, decimator, target in decimators:
+                for removed in decimator.iterate(target):
+                    current_progress.advance(removed)
+                proxies.append(_create_proxy(mesh, *decimator.get_mesh()))
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return proxies
+
+
+def _create_proxy(mesh, points, triangles):
+    """
+    :returns: The transform of a new triangle mesh with the world transform of the given mesh.
+    :rtype: str
+    """
+    transform = cmds.listRelatives(mesh, parent=True, fullPath=True)[0]
+    proxy = mesh_buffer.create_mesh(points, np.full(len(triangles), 3), triangles, transform.split('|')[-1] + '_proxy')
+    cmds.xform(proxy, worldSpace=True, matrix=cmds.xform(transform, query=True, worldSpace=True, matrix=True))
+    cmds.sets(proxy, edit=True, forceElement='initialShadingGroup')
+    return proxy
+
+
+def harden_edges_by_angle(meshes, angle=normals.HARD_ANGLE, hard_uv_seams=False, callback=None):
+    """
+    Sets the edges of the given meshes hard where their faces meet at a bigger angle than the given one and soft
+    everywhere else. The angles of all edges of a mesh are computed at once and only the edges that change get written,
+    in one bulk write per mesh as a single undoable step without construction history.
+
+    :param list[str] meshes: The meshes (or their transforms) to change.
+    :param float angle: The angle in degrees between the normals of two faces above which their edge gets hard.
+    :param bool hard_uv_seams: Whether the edges on UV seams get hard regardless of their angle.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :returns: The number of edges that changed.
+    :rtype: int
+    :raises progress.OperationCancelled: If the user cancelled. Nothing has been changed in that case.
+    """
+    meshes = com.get_meshes(meshes)
+    writes = []
+    with progress.Progress('Harden edges', len(meshes), callback) as current_progress:
+        for mesh in meshes:
+            topo = mesh_buffer.get_topology(mesh)
+            arrays = mesh_buffer.get_mesh_arrays(mesh)
+            hard = topology.to_mask(normals.get_sharp_edges(topo, arrays['points'], angle), topo.edge_count)
+            if hard_uv_seams:
+                hard[mesh_qa.analyze(arrays, [mesh_qa.UV_SEAMS])[mesh_qa.UV_SEAMS]] = True
+            # the smoothing flags of the edges, not their normals, which can be split or locked on their own
+            changed = topology.to_indices(hard == np.asarray(arrays['edge_smooth'], dtype=bool))
+            if len(changed):
+                writes.append((mesh, changed, ~hard[changed]))
+            current_progress.advance(1)
+    if writes:
+        mesh_buffer.set_edge_smoothing(writes)
+    return sum(len(edges) for _, edges, _ in writes)
+
+
+def clean_up_meshes(meshes, stages=cleanup.STAGES, ngons=cleanup.TRIANGULATE, tolerance=cleanup.MERGE_TOLERANCE,
+                    callback=None):
+    """
+    Deletes the duplicates of lamina faces, splits the n-gons, splits the non-manifold vertices and merges the
+    coincident vertices of the given meshes. Every mesh is analyzed once before anything changes (see cleanup.plan())
+    and all stages of all meshes run as a single undoable step without construction history.
+
+    :param list[str] meshes: The meshes (or their transforms) to clean up.
+    :param list[str] stages: The stages to run, see cleanup.STAGES. They always run in that order.
+    :param str ngons: How the n-gons get split, cleanup.TRIANGULATE or cleanup.QUADRANGULATE.
+    :param float tolerance: The highest distance of two vertices to get merged.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :returns: Every mesh with the number of components every stage changed and the seconds the analysis
+              (cleanup.ANALYSIS) and every stage took.
+    :rtype: list[tuple[str, dict[str, int], dict[str, float]]]
+    :raises progress.OperationCancelled: If the user cancelled. Nothing has been changed in that case.
+    """
+    meshes = com.get_meshes(meshes)
+    plans = []
+    with progress.Progress('Analyze meshes', len(meshes), callback) as current_progress:
+        for mesh in meshes:
+            start = time.time()
+            mesh_plan = cleanup.plan(mesh_buffer.get_topology(mesh), mesh_buffer.get_points(mesh), stages, tolerance)
+            plans.append((mesh, mesh_plan, time.time() - start))
+            current_progress.advance(1)
+
+    reports = []
+    # the cleanup commands that ran, an aborted cleanup is only undone if there are any. Otherwise the chunk is empty
+    # and the undo would revert whatever ran before.
+    commands = []
+    finished = False
+    cmds.undoInfo(openChunk=True, chunkName='fgCleanUpMeshes')
+    try:
+        with progress.Progress('Clean up meshes', len(plans), callback) as current_progress:
+            for mesh, mesh_plan, seconds in plans:
+                counts, timings = {}, {cleanup.ANALYSIS: seconds}
+                for stage in cleanup.STAGES:
+                    if stage in mesh_plan:
+                        start = time.time()
+                        counts[stage] = _run_cleanup_stage(mesh, stage, mesh_plan[stage], ngons, tolerance, commands)
+                        timings[stage] = time.time() - start
+                reports.append((mesh, counts, timings))
+                current_progress.advance(1)
+        finished = True
+    finally:
+        cmds.undoInfo(closeChunk=True)
+        if not finished and commands and cmds.undoInfo(query=True, state=True):
+            # the meshes that were cleaned up until then are restored in one step
+            cmds.undo()
+    return reports
+
+
+def _run_cleanup_stage(mesh, stage, indices, ngons, tolerance, commands):
+    """
+    :param str stage: The stage to run, see cleanup.STAGES.
+    :param numpy.ndarray indices: The components the stage changes, see cleanup.plan().
+    :param list[str] commands: Gets the name of every command that ran.
+    :returns: The number of components that changed. For merged vertices that is the number of vertices that were
+              removed.
+    :rtype: int
+    :raises RuntimeError: If the triangles of the n-gons can not be found to quadrangulate them.
+    """
+    if not len(indices):
+        return 0
+    if stage == cleanup.LAMINA_FACES:
+        cmds.polyDelFacet(com.get_component_names(mesh, topology.FACE, indices, flatten=False),
+                          constructionHistory=False)
+        commands.append('polyDelFacet')
+    elif stage == cleanup.NGONS:
+        face_count = cmds.polyEvaluate(mesh, face=True)
+        cmds.polyTriangulate(com.get_component_names(mesh, topology.FACE, indices, flatten=False),
+                             constructionHistory=False)
+        commands.append('polyTriangulate')
+        if ngons == cleanup.QUADRANGULATE:
+            # the first triangle of every n-gon takes its place, the others are appended. Only these get
+            # quadrangulated, not the triangles the mesh had before.
+            triangles = np.concatenate((indices, np.arange(face_count, cmds.polyEvaluate(mesh, face=True))))
+            face_counts, _ = mesh_buffer.get_face_arrays(mesh)
+            if (face_counts[triangles] != 3).any():
+                raise RuntimeError('The triangles of the n-gons of {0:s} can not be found.'.format(mesh))
+            cmds.polyQuad(com.get_component_names(mesh, topology.FACE, triangles, flatten=False),
+                          constructionHistory=False)
+            commands.append('polyQuad')
+    elif stage == cleanup.NON_MANIFOLD_VERTICES:
+        cmds.polySplitVertex(com.get_component_names(mesh, topology.VERTEX, indices, flatten=False),
+                             constructionHistory=False)
+        commands.append('polySplitVertex')
+    elif stage == cleanup.COINCIDENT_VERTICES:
+        count = cmds.polyEvaluate(mesh, vertex=True)
+        cmds.polyMergeVertex(com.get_component_names(mesh, topology.VERTEX, indices, flatten=False),
+                             distance=tolerance,
+                             constructionHistory=False)
+        commands.append('polyMergeVertex')
+        return count - cmds.polyEvaluate(mesh, vertex=True)
+    return len(indices)
+
+
+def get_flattened_points(components, mode=fitting.PLANE, axis='x'):
+    """
+    Flattens the vertices of the given components of all meshes together in world space, with one bulk read per mesh.
+
+    :param list[str] components: The components (and meshes) to flatten.
+    :param str mode: fitting.AXIS flattens onto the plane through the midpoint of the vertices that is perpendicular
+                     to the given world axis, fitting.PLANE onto the plane that fits the vertices best and fitting.LINE
+                     onto the line that fits them best.
+    :param str axis: "x", "y" or "z". Only used by the fitting.AXIS mode.
+    :returns: The new and the old points of the changed vertices in object space like mesh_buffer.set_points() takes
+              them.
+    :rtype: list[tuple]
+    :raises ValueError: If the mode or axis is unknown.
+    """
+    meshes = _get_vertices(components)
+    if not meshes:
+        return []
+    old_points, positions = _read_points(meshes)
+    return _get_writes(meshes, fitting.flatten(positions, mode, axis), old_points)
+
+
+def flatten_components(components, mode=fitting.PLANE, axis='x'):
+    """
+    Flattens the vertices of the given components onto a world axis plane, the best-fit plane or the best-fit line.
+    All meshes are written in one bulk write each, as a single undoable step. See get_flattened_points().
+
+    :param list[str] components: The components (and meshes) to flatten.
+    :param str mode: fitting.AXIS, fitting.PLANE or fitting.LINE.
+    :param str axis: "x", "y" or "z". Only used by the fitting.AXIS mode.
+    """
+    writes = get_flattened_points(components, mode, axis)
+    if writes:
+        mesh_buffer.set_points(writes)
+
+
+def _read_points(meshes):
+    """
+    :param list[tuple[str, numpy.ndarray]] meshes: The mesh shapes and their vertices, see _get_vertices().
+    :returns: The object space positions of the vertices of every mesh and the world space positions of the vertices
+              of all meshes, concatenated. Every mesh is read once.
+    :rtype: tuple[list[numpy.ndarray], numpy.ndarray]
+    """
+    old_points = [mesh_buffer.get_points(mesh)[vertices] for mesh, vertices in meshes]
+    positions = np.concatenate([mesh_buffer.transform_points(points, mesh_buffer.get_dag_path(mesh).inclusiveMatrix())
+                                for (mesh, _), points in zip(meshes, old_points)])
+    return old_points, positions
+
+
+def _get_writes(meshes, positions, old_points):
+    """
+    :param list[tuple[str, numpy.ndarray]] meshes: The mesh shapes and their vertices, see _get_vertices().
+    :param numpy.ndarray positions: The new world space positions of the vertices of all meshes, concatenated.
+    :param list[numpy.ndarray] old_points: The object space positions the vertices of every mesh have now, see
+                                           _read_points().
+    :returns: The new and the old points in object space like mesh_buffer.set_points() takes them.
+    :rtype: list[tuple]
+    """
+    writes = []
+    start = 0
+    for (mesh, vertices), mesh_old_points in zip(meshes, old_points):
+        world_points = positions[start:start + len(vertices)]
+        start += len(vertices)
+        inverse_matrix = mesh_buffer.get_dag_path(mesh).inclusiveMatrixInverse()
+        writes.append((mesh, mesh_buffer.transform_points(world_points, inverse_matrix), vertices, mesh_old_points))
+    return writes
+
+
+def _get_vertices(components):
+    """
+    :param list[str] components: Components and meshes. If this is None the current selection will be used.
+    :returns: The mesh shapes and the sorted vertices of the given components on them.
+    :rtype: list[tuple[str, numpy.ndarray]]
+    """
+    meshes = []
+    for mesh, indices in com.get_component_indices(components).items():
+        topo = mesh_buffer.get_topology(mesh)
+        vertices = np.zeros(topo.vertex_count, dtype=bool)
+        for component_type, component_indices in indices.items():
+            vertices[topo.convert(component_indices, component_type, topology.VERTEX)] = True
+        meshes.append((mesh, np.flatnonzero(vertices)))
+    return meshes
+
+
+def copy_points(mesh, file_path=point_cache.FILE_PATH):
+    """
+    Writes the points of the given mesh in object space into a point cache, to paste them later with paste_points().
+
+    :param str mesh: The mesh shape or its transform.
+    :param str file_path: The cache file.
+    """
+    topo = mesh_buffer.get_topology(mesh)
+    point_cache.write_cache(mesh_buffer.get_point_buffer(mesh),
+                            point_cache.get_topology_signature(topo.face_counts, topo.face_vertices),
+                            file_path)
+
+
+def paste_points(components, file_path=point_cache.FILE_PATH, weight=1.0):
+    """
+    Moves the vertices of the given components towards the points of a point cache that was written by copy_points().
+    All meshes are written in one bulk write each, as a single undoable step.
+
+    :param list[str] components: The components (and meshes) to paste the points onto. Meshes without components get
+                                 all their points pasted. If this is None the current selection will be used.
+    :param str file_path: The cache file.
+    :param float weight: How far the vertices move towards the cached points. 0.0 keeps them where they are,
+                         1.0 moves them onto the cached points.
+    :returns: The meshes that got the points pasted.
+    :rtype: list[str]
+    :raises ValueError: If a mesh has a different topology than the mesh the points were copied from.
+    """
+    cached_points, signature = point_cache.read_cache(file_path)
+    writes = []
+    for mesh, vertices in _get_vertices(components):
+        topo = mesh_buffer.get_topology(mesh)
+        if point_cache.get_topology_signature(topo.face_counts, topo.face_vertices) != signature:
+            raise ValueError('{0:s} does not have the same topology as the copied points.'.format(mesh))
+        if len(vertices) == topo.vertex_count:
+            vertices = None
+        points = point_cache.blend_points(mesh_buffer.get_point_buffer(mesh), cached_points, vertices, weight)
+        writes.append((mesh, points, vertices))
+    if writes:
+        mesh_buffer.set_points(writes)
+    return [mesh for mesh, _, _ in writes]
+
+
+def show_deviations(mesh, distances, maximum=None):
+    """
+    Colors the vertices of a mesh by how far they moved, from green (did not move) to red (moved the maximum), in the
+    color set DEVIATION_COLOR_SET. The colors are written in one bulk write as one undoable step.
+
+    :param str mesh: The mesh shape or its transform.
+    :param numpy.ndarray distances: The distance every vertex moved, see component.get_deviations().
+    :param float maximum: The distance that gets full red. If this is None the largest distance is used.
+    """
+    colors, color_ids = deviation.get_color_ids(distances, maximum)
+    # every face-vertex gets the color of its vertex
+    face_color_ids = color_ids[mesh_buffer.get_topology(mesh).face_vertices]
+    mesh_buffer.set_colors([(mesh, DEVIATION_COLOR_SET, colors, face_color_ids)])
+
+
 def freeze_transforms():
     """
     Tries to freeze the transforms of the current selection.
@@ -0,0 +1,162 @@
+"""
+Face normals and the angles between them, computed for all faces and edges of a mesh at once.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import topology
+
+
+# Edges whose faces meet at a bigger angle (in degrees) are hard by default, like the default of Maya's soften/harden.
+HARD_ANGLE = 30.0
+
+
+def get_face_normals(topo, points):
+    """
+    The normals are the normalized Newell vectors of the faces, so non-planar faces get the normal of their average
+    plane.
+
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :returns: The unit normal of every face in the shape (faces, 3), 0 for faces without area.
+    :rtype: numpy.ndarray
+    """
+    normals = get_newell_vectors(topo, points)
+    lengths = np.sqrt(np.einsum('ij,ij->i', normals, normals))
+    normals[lengths > 0] /= lengths[lengths > 0, np.newaxis]
+    return normals
+
+
+def get_newell_vectors(topo, points):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :returns: The Newell vector of every face in the shape (faces, 3). It points along the normal of the face and is
+              twice as long as its area.
+    :rtype: numpy.ndarray
+    """
+    points = np.asarray(points, dtype=np.float64)
+    corners = points[topo.face_vertices]
+    crosses = np.cross(corners, corners[topo.face_vertex_next])
+    return np.column_stack([np.bincount(topo.face_vertex_faces, weights=crosses[:, axis], minlength=topo.face_count)
+                            for axis in range(3)])
+
+
+def get_edge_angles(topo, face_normals):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray face_normals: The unit normal of every face, see get_face_normals().
+    :returns: The biggest angle in degrees between the normal of the first face of every edge and the normals of its
+              other faces. Border edges get 0.
+    :rtype: numpy.ndarray
+    """
+    offsets, faces = topo.edge_face_offsets, topo.edge_faces
+    counts = np.diff(offsets)
+    if not len(faces):
+        return np.zeros(topo.edge_count)
+    first_faces = np.repeat(faces[offsets[:-1][counts > 0]], counts[counts > 0])
+    cosines = np.einsum('ij,ij->i', face_normals[faces], face_normals[first_faces])
+    # every edge has at least one face (on a mesh that Maya built), reduceat can not handle empty rows
+    minimums = np.ones(topo.edge_count)
+    minimums[counts > 0] = np.minimum.reduceat(cosines, offsets[:-1][counts > 0])
+    return np.degrees(np.arccos(np.clip(minimums, -1.0, 1.0)))
+
+
+def get_sharp_edges(topo, points, angle=HARD_ANGLE):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param float angle: The angle in degrees between the normals of two faces above which their edge is sharp.
+    :returns: The sorted edges whose faces meet at a bigger angle than the given one.
+    :rtype: numpy.ndarray
+    """
+    return topology.to_indices(get_edge_angles(topo, get_face_normals(topo, points)) > angle)
+
+
+def get_face_neighbours(topo):
+    """
+    Two faces that share a manifold edge are wound the same way if they run along the edge in opposite directions.
+
+    :param topology.MeshTopology topo:
+    :returns: The offsets and the neighbour faces of every face across its manifold edges as CSR adjacency, and
+              whether every neighbour is wound the other way.
+    :rtype: tuple[numpy.ndarray]
+    """
+    offsets, face_vertices = topology.build_csr(topo.face_edges, np.arange(len(topo.face_vertices)), topo.edge_count)
+    manifold = np.flatnonzero(np.diff(offsets) == 2)
+    face_vertices_a = face_vertices[offsets[manifold]]
+    face_vertices_b = face_vertices[offsets[manifold] + 1]
+    forward = topo.face_vertices == topo.edge_vertices[topo.face_edges, 0]
+    faces_a = topo.face_vertex_faces[face_vertices_a]
+    faces_b = topo.face_vertex_faces[face_vertices_b]
+    # a face that uses an edge twice is no neighbour of itself
+    different = faces_a != faces_b
+    faces_a, faces_b = faces_a[different], faces_b[different]
+    flipped = (forward[face_vertices_a] == forward[face_vertices_b])[different]
+
+    rows = np.concatenate((faces_a, faces_b))
+    order = np.argsort(rows, kind='stable')
+    neighbour_offsets = np.zeros(topo.face_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=topo.face_count), out=neighbour_offsets[1:])
+    return neighbour_offsets, np.concatenate((faces_b, faces_a))[order], np.concatenate((flipped, flipped))[order]
+
+
+def get_relative_winding(topo):
+    """
+    Walks the faces of every connected part of the mesh breadth first, starting at its lowest face. The queue holds
+    the whole next ring of faces, so every step is vectorized over the ring.
+
+    :param topology.MeshTopology topo:
+    :returns: Whether every face is wound the other way than the first face of its part, and the part of every face
+              (the lowest face of the part). On non-orientable parts (like a Moebius strip) the faces are wound like
+              the first path that reached them.
+    :rtype: tuple[numpy.ndarray]
+    """
+    offsets, neighbours, flips = get_face_neighbours(topo)
+    rows = np.repeat(np.arange(topo.face_count), np.diff(offsets))
+    labels = topology.get_connected_labels(np.column_stack((rows, neighbours)), topo.face_count)
+
+    flipped = np.zeros(topo.face_count, dtype=bool)
+    queue = np.flatnonzero(labels == np.arange(topo.face_count))
+    visited = topology.to_mask(queue, topo.face_count)
+    while len(queue):
+        lengths = offsets[queue + 1] - offsets[queue]
+        sources = np.repeat(queue, lengths)
+        next_faces = topology.gather(offsets, neighbours, queue)
+        next_flips = topology.gather(offsets, flips, queue)
+        new = ~visited[next_faces]
+        # a face that is reached from several faces of the ring takes the winding of the first one
+        queue, first = np.unique(next_faces[new], return_index=True)
+        flipped[queue] = flipped[sources[new][first]] ^ next_flips[new][first]
+        visited[queue] = True
+    return flipped, labels
+
+
+def get_flipped_faces(topo, points):
+    """
+    Finds the faces that are wound the other way than their connected part of the mesh. The winding of closed parts
+    is chosen so their normals point outwards (their signed volume is positive), open parts keep the winding of the
+    bigger area.
+
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :returns: The sorted faces that have to be reversed to conform the normals.
+    :rtype: numpy.ndarray
+    """
+    flipped, labels = get_relative_winding(topo)
+    newell_vectors = get_newell_vectors(topo, points)
+    signs = np.where(flipped, -1.0, 1.0)
+
+    # the signed volume of every part if all its faces were wound like its first face
+    first_points = np.asarray(points, dtype=np.float64)[topo.face_vertices[topo.face_offsets[:-1]]]
+    volumes = np.bincount(labels, weights=signs * np.einsum('ij,ij->i', newell_vectors, first_points),
+                          minlength=topo.face_count)
+    # the area of every part that is wound like its first face minus the area that is wound the other way
+    areas = np.bincount(labels, weights=signs * np.sqrt(np.einsum('ij,ij->i', newell_vectors, newell_vectors)),
+                        minlength=topo.face_count)
+
+    border_faces = topo.edge_faces[np.repeat(topo.edge_face_counts == 1, topo.edge_face_counts)]
+    closed = ~topology.to_mask(labels[border_faces], topo.face_count)
+    first_is_right = np.where(closed, volumes >= 0, areas >= 0)
+    return topology.to_indices(flipped == first_is_right[labels])
@@ -0,0 +1,119 @@
+"""
+Helpers to spread work over several threads or processes.
+"""
+import atexit
+import multiprocessing
+import os
+import sys
+from multiprocessing.pool import ThreadPool
+
+
+# Most of the threaded work waits for (network-) storage and not for the CPU, so we can use a lot more threads than
+# there are cores. 32 threads keep a file server with ~10ms latency busy without flooding it.
+IO_THREADS = 32
+
+# CPU bound work goes to processes. One core is left for Maya itself.
+PROCESSES = max(1, multiprocessing.cpu_count() - 1)
+
+# hashlib and most numpy functions release the GIL while they work on big buffers, so work like that can run in
+# threads on all cores without the cost of sending the buffers to other processes.
+CPU_THREADS = multiprocessing.cpu_count()
+
+# Starting processes is expensive (especially on Windows, where every worker is a new mayapy), so the process pool
+# is created once and reused.
+_PROCESS_POOL = None
+_PROCESS_POOL_SIZE = 0
+
+
+def thread_map(func, items, threads=IO_THREADS):
+    """
+    Calls the given function for every item in a pool of threads.
+
+    :param func: A function that takes one item as argument.
+    :param list items:
+    :param int threads: The maximum number of threads to use.
+    :returns: The results of the function in the same order as the given items.
+    :rtype: list
+    """
+    items = list(items)
+    threads = min(threads, len(items))
+    if threads < 2:
+        return [func(item) for item in items]
+
+    pool = ThreadPool(threads)
+    try:
+        # small chunks keep all threads busy when some items take a lot longer than others (i.e. slow network shares)
+        return pool.map(func, items, chunksize=max(1, len(items) // (threads * 8)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def process_map(func, items, processes=PROCESSES, chunksize=None):
+    """
+    Calls the given function for every item in a pool of processes.
+    The function has to be defined at module level and must not call any Maya commands, since the worker processes
+    do not initialize Maya. The items and results have to be picklable.
+
+    :param func: A function that takes one item as argument.
+    :param list items:
+    :param int processes: The maximum number of processes to use.
+    :param int chunksize: How many items are sent to a worker at once. By default every worker gets about 4 chunks.
+    :returns: The results of the function in the same order as the given items.
+    :rtype: list
+    """
+    items = list(items)
+    processes = min(processes, len(items))
+    if processes < 2:
+        return [func(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (processes * 4))
+    return get_process_pool(processes).map(func, items, chunksize=chunksize)
+
+
+def get_process_pool(processes=PROCESSES):
+    """
+    :param int processes: The number of worker processes.
+    :returns: The shared process pool. It will be (re-)created if it does not exist or has a different size.
+    :rtype: multiprocessing.pool.Pool
+    """
+    global _PROCESS_POOL
+    global _PROCESS_POOL_SIZE
+
+    if _PROCESS_POOL is None or _PROCESS_POOL_SIZE != processes:
+        close_process_pool()
+        if hasattr(multiprocessing, 'set_executable'):
+            # only platforms that spawn new interpreters instead of forking have this (i.e. Windows with python 2).
+            multiprocessing.set_executable(get_python_executable())
+        _PROCESS_POOL = multiprocessing.Pool(processes)
+        _PROCESS_POOL_SIZE = processes
+    return _PROCESS_POOL
+
+
+def close_process_pool():
+    """
+    Shuts down the shared process pool. This will be called automatically when Maya exits.
+    """
+    global _PROCESS_POOL
+
+    if _PROCESS_POOL is not None:
+        _PROCESS_POOL.terminate()
+        _PROCESS_POOL.join()
+        _PROCESS_POOL = None
+
+
+def get_python_executable():
+    """
+    :returns: The python interpreter for worker processes. Inside of a Maya GUI session sys.executable is Maya itself,
+              so we use the mayapy next to it.
+    :rtype: str
+    """
+    executable = sys.executable
+    name = os.path.basename(executable).lower()
+    if name.startswith('maya') and not name.startswith('mayapy'):
+        return os.path.join(os.path.dirname(executable), 'mayapy' + ('.exe' if os.name == 'nt' else ''))
+    return executable
+
+
+atexit.register(close_process_pool)
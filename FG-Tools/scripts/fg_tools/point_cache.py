@@ -0,0 +1,107 @@
+"""
+Point caches: the points of a mesh in a binary file, to paste them onto meshes with the same topology later. Since the
+cache is a file it works across Maya sessions and batch jobs.
+
+A cache file is a header of HEADER_SIZE bytes followed by the points as little endian float64 in the shape
+(vertices, 3). The file is memory mapped, so only the pages of the points that are read get loaded.
+
+This module does not depend on Maya.
+"""
+import hashlib
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+
+# The cache of the "copy points" and "paste points" tools.
+FILE_PATH = os.path.join(tempfile.gettempdir(), 'fg_tools_points.bin')
+
+MAGIC = b'FGPOINTS'
+VERSION = 1
+
+# magic, version, vertex count and the topology signature as hex string
+HEADER_FORMAT = '<8sIQ40s'
+
+# The points start at this offset, which keeps them aligned.
+HEADER_SIZE = 64
+
+POINT_DTYPE = np.dtype('<f8')
+
+
+def get_topology_signature(face_counts, face_vertices):
+    """
+    :param list[int] face_counts: The number of vertices of every face.
+    :param list[int] face_vertices: The vertices of all faces in winding order, concatenated.
+    :returns: A hash over the topology. Meshes with the same vertex order and faces get the same signature.
+    :rtype: str
+    """
+    digest = hashlib.sha1()
+    for array in (np.asarray(face_counts, dtype='<i4'), np.asarray(face_vertices, dtype='<i4')):
+        # the lengths keep arrays from shifting into each other
+        digest.update(str(array.size).encode('ascii'))
+        digest.update(np.ascontiguousarray(array))
+    return digest.hexdigest()
+
+
+def write_cache(points, signature, file_path=FILE_PATH):
+    """
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param str signature: The topology signature of the mesh, see get_topology_signature().
+    :param str file_path: The cache file. It will be overwritten.
+    """
+    points = np.asarray(points).reshape(-1, 3)
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, len(points), signature.encode('ascii'))
+    with open(file_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.truncate(HEADER_SIZE + len(points) * 3 * POINT_DTYPE.itemsize)
+    if len(points):
+        cache = np.memmap(file_path, dtype=POINT_DTYPE, mode='r+', offset=HEADER_SIZE, shape=points.shape)
+        cache[...] = points
+        cache.flush()
+        del cache
+
+
+def read_cache(file_path=FILE_PATH):
+    """
+    :param str file_path: The cache file.
+    :returns: The points as read-only memory map in the shape (vertices, 3) and the topology signature.
+    :rtype: tuple[numpy.ndarray, str]
+    :raises IOError: If the file does not exist.
+    :raises ValueError: If the file is not a point cache.
+    """
+    with open(file_path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError('"{0:s}" is not a point cache.'.format(file_path))
+    _, version, vertex_count, signature = struct.unpack(HEADER_FORMAT, header[:struct.calcsize(HEADER_FORMAT)])
+    if version != VERSION:
+        raise ValueError('The point cache "{0:s}" has the unsupported version {1:d}.'.format(file_path, version))
+    if os.path.getsize(file_path) < HEADER_SIZE + vertex_count * 3 * POINT_DTYPE.itemsize:
+        raise ValueError('The point cache "{0:s}" is truncated.'.format(file_path))
+
+    if not vertex_count:
+        points = np.zeros((0, 3), dtype=POINT_DTYPE)
+    else:
+        points = np.memmap(file_path, dtype=POINT_DTYPE, mode='r', offset=HEADER_SIZE, shape=(vertex_count, 3))
+    return points, signature.decode('ascii')
+
+
+def blend_points(points, cached_points, vertices=None, weight=1.0):
+    """
+    :param numpy.ndarray points: The current points of the mesh in the shape (vertices, 3).
+    :param numpy.ndarray cached_points: The cached points of the mesh in the same shape.
+    :param numpy.ndarray vertices: The vertices to change. If this is None all vertices change.
+    :param float weight: How far the vertices move towards their cached position. 0.0 keeps them where they are,
+                         1.0 moves them onto it.
+    :returns: The new points of the given vertices (or all points).
+    :rtype: numpy.ndarray
+    """
+    if vertices is not None:
+        points = points[vertices]
+        cached_points = cached_points[vertices]
+    points = np.asarray(points, dtype=np.float64)
+    if weight == 1.0:
+        return np.array(cached_points, dtype=np.float64)
+    return points + (np.asarray(cached_points, dtype=np.float64) - points) * weight
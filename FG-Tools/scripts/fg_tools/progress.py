@@ -0,0 +1,91 @@
+"""
+Progress and cancellation for operations that run over many components.
+
+The work is split into chunks of a fixed size. After every chunk the progress is reported and the user gets a chance to
+cancel: in the GUI through the main progress bar of Maya (press ESC), in batch mode through a callback. A cancelled
+operation raises OperationCancelled before it changed anything in the scene.
+"""
+import maya.cmds as cmds
+import maya.mel as mel
+
+
+# The number of components that are processed between two progress updates.
+CHUNK_SIZE = 20000
+
+
+class OperationCancelled(Exception):
+    """
+    Raised when the user cancels an operation.
+    """
+
+
+class Progress(object):
+    """
+    Reports the progress of an operation and raises OperationCancelled once the user cancels it.
+
+    Usage::
+
+        with Progress('Finding seam edges', edge_count) as progress:
+            for start, stop in progress.iterate_chunks(edge_count):
+                ...
+
+    In batch mode (or whenever a callback is given) the callback gets the number of processed components and the
+    total number. The operation gets cancelled if it returns False.
+    """
+
+    def __init__(self, status, total, callback=None):
+        """
+        :param str status: What the operation does, it will be shown next to the progress bar.
+        :param int total: The number of components the operation processes.
+        :param callback: A function that takes the number of processed components and the total number.
+                         If this is None the main progress bar is used in the GUI and nothing is reported in batch mode.
+        """
+        self.status = status
+        self.total = total
+        self.callback = callback
+        self.done = 0
+        self._progress_bar = None
+
+    def __enter__(self):
+        if self.callback is None and not cmds.about(batch=True):
+            self._progress_bar = mel.eval('$fg_tools_tmp = $gMainProgressBar')
+            cmds.progressBar(self._progress_bar,
+                             edit=True,
+                             beginProgress=True,
+                             isInterruptable=True,
+                             status=self.status,
+                             maxValue=max(self.total, 1))
+        return self
+
+    def __exit__(self, *_):
+        if self._progress_bar is not None:
+            cmds.progressBar(self._progress_bar, edit=True, endProgress=True)
+            self._progress_bar = None
+
+    def advance(self, amount):
+        """
+        :param int amount: The number of components that were processed since the last call.
+        :raises OperationCancelled: If the user cancelled the operation.
+        """
+        self.done += amount
+        if self._progress_bar is not None:
+            if cmds.progressBar(self._progress_bar, query=True, isCancelled=True):
+                raise OperationCancelled('{0:s} was cancelled.'.format(self.status))
+            cmds.progressBar(self._progress_bar, edit=True, step=amount)
+        elif self.callback is not None and self.callback(self.done, self.total) is False:
+            raise OperationCancelled('{0:s} was cancelled.'.format(self.status))
+
+    def iterate_chunks(self, count, chunk_size=CHUNK_SIZE):
+        """
+        Splits the given number of components into chunks and advances the progress after every chunk.
+
+        :param int count: The number of components.
+        :param int chunk_size: The number of components per chunk.
+        :returns: The start and the end (exclusive) of every chunk.
+        :rtype: iterator[tuple[int, int]]
+        :raises OperationCancelled: If the user cancelled the operation.
+        """
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            yield start, stop
+            self.advance(stop - start)
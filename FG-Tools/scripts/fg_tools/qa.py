@@ -0,0 +1,140 @@
+"""
+Runs quality checks (see mesh_qa) on many meshes in two stages: the main thread reads the arrays of the meshes into
+shared memory and a pool of worker processes runs the checks on them. While the workers check one batch of meshes,
+the main thread reads the next one.
+"""
+import component
+import mesh_buffer
+import mesh_qa
+import parallel
+import progress
+
+
+# The number of meshes that are read and submitted to the workers at once.
+SUBMIT_SIZE = 32
+
+# The number of face-vertices one worker task should have at most. Small meshes are checked together in one task, so
+# they do not pay the overhead of a task each.
+TASK_SIZE = 500000
+
+
+class AnalysisPipeline(object):
+    """
+    Usage::
+
+        pipeline = AnalysisPipeline(checks=[mesh_qa.UV_SEAMS, mesh_qa.HARD_EDGES])
+        pipeline.submit(meshes[:32])
+        pipeline.submit(meshes[32:])
+        results = pipeline.collect()  # {mesh: {check: indices}}
+    """
+
+    def __init__(self, checks=tuple(mesh_qa.CHECKS), processes=parallel.PROCESSES):
+        """
+        :param list[str] checks: The checks to run, see mesh_qa.CHECKS.
+        :param int processes: The number of worker processes. With less than 2 the checks run in this process.
+        """
+        self.checks = tuple(checks)
+        self.processes = processes
+        self.results = {}
+        # [(meshes in the order of the results, shared arrays, async result)]
+        self._pending = []
+
+    def submit(self, meshes):
+        """
+        Reads the arrays of the given meshes into shared memory and submits them to the workers. This returns once the
+        arrays are read, without waiting for the workers.
+
+        :param list[str] meshes: The mesh shapes to check.
+        """
+        if self.processes < 2:
+            for mesh in meshes:
+                self.results[mesh] = mesh_qa.analyze(mesh_buffer.get_mesh_arrays(mesh), self.checks)
+            return
+
+        shared = []
+        try:
+            for mesh in meshes:
+                shared.append(mesh_buffer.share_mesh_arrays(mesh))
+        except Exception:
+            for arrays in shared:
+                arrays.unlink()
+            raise
+
+        batches = mesh_qa.split_into_batches([len(arrays['face_vertices']) for arrays in shared], TASK_SIZE)
+        tasks = [[(shared[index].handle, self.checks) for index in batch] for batch in batches]
+        ordered_meshes = [meshes[index] for batch in batches for index in batch]
+        async_result = parallel.get_process_pool(self.processes).map_async(mesh_qa.analyze_batch, tasks, chunksize=1)
+        self._pending.append((ordered_meshes, shared, async_result))
+
+    def collect(self, keep_pending=0):
+        """
+        Waits for the workers and merges their results.
+
+        :param int keep_pending: The number of submissions that may still be in work when this returns. This lets the
+                                 main thread read the next meshes while the workers are busy.
+        :returns: The sorted indices of the components every check found, by mesh.
+        :rtype: dict[str, dict[str, numpy.ndarray]]
+        """
+        while len(self._pending) > keep_pending:
+            meshes, shared, async_result = self._pending.pop(0)
+            try:
+                results = [result for batch in async_result.get() for result in batch]
+            except Exception:
+                # the other submissions are discarded as well, so their shared memory does not stay behind
+                self.cancel()
+                raise
+            finally:
+                for arrays in shared:
+                    arrays.unlink()
+            self.results.update(zip(meshes, results))
+        return self.results
+
+    def cancel(self):
+        """
+        Discards all submissions. Tasks that already run in the workers are waited for, since the shared memory
+        must not go away under them.
+        """
+        for _, shared, async_result in self._pending:
+            async_result.wait()
+            for arrays in shared:
+                arrays.unlink()
+        self._pending = []
+
+
+def analyze_meshes(meshes=None, checks=tuple(mesh_qa.CHECKS), processes=parallel.PROCESSES, callback=None):
+    """
+    :param list[str] meshes: Meshes, their transforms or their components. If this is None the current selection will
+                             be used.
+    :param list[str] checks: The checks to run, see mesh_qa.CHECKS.
+    :param int processes: The number of worker processes.
+    :param callback: Gets the progress in batch mode, see progress.Progress.
+    :returns: The sorted indices of the components every check found, by mesh shape.
+    :rtype: dict[str, dict[str, numpy.ndarray]]
+    :raises progress.OperationCancelled: If the user cancelled.
+    """
+    meshes = component.get_meshes(meshes)
+    pipeline = AnalysisPipeline(checks, processes)
+    with progress.Progress('Checking meshes', len(meshes), callback) as current_progress:
+        try:
+            for start, stop in current_progress.iterate_chunks(len(meshes), SUBMIT_SIZE):
+                pipeline.submit(meshes[start:stop])
+                pipeline.collect(keep_pending=1)
+        except progress.OperationCancelled:
+            pipeline.cancel()
+            raise
+        return pipeline.collect()
+
+
+def get_components(results, check, flatten=False):
+    """
+    :param dict[str, dict[str, numpy.ndarray]] results: The results of analyze_meshes().
+    :param str check: The check to get the components of.
+    :param bool flatten: Whether every component gets its own name or consecutive ones are combined into ranges.
+    :returns: The names of the components the check found in all meshes.
+    :rtype: list[str]
+    """
+    component_type = mesh_qa.CHECKS[check]
+    components = []
+    for mesh in sorted(results):
+        components += component.get_component_names(mesh, component_type, results[mesh][check], flatten=flatten)
+    return components
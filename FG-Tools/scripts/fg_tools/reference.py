@@ -0,0 +1,222 @@
+"""
+Functions for opening scenes with deferred or selective reference loading.
+"""
+import os
+import time
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+
+
+# The modes a scene can be opened with and the matching "loadReferenceDepth" of the file command.
+#   all:      Load every reference right away (Maya default).
+#   deferred: Open the scene without references and load them one after another once Maya is idle.
+#   none:     Open the scene without references. They can be loaded later via load_references().
+#   preview:  Load only the top-level references and skip everything that is nested inside them.
+OPEN_MODES = {'all': 'all',
+              'deferred': 'none',
+              'none': 'none',
+              'preview': 'topOnly'}
+
+# The time in seconds each reference took to load in the current session. {reference_node: seconds}
+LOAD_TIMES = {}
+
+# The callbacks that record the load times, see add_load_callbacks().
+_LOAD_CALLBACKS = []
+
+# When the references that are being loaded started loading. {resolved file path: [start time]}
+_LOAD_STARTS = {}
+
+
+def open_scene(file_path, mode='all'):
+    """
+    Opens the given Maya scene with the given reference loading mode.
+
+    :param str file_path: The Maya scene to open.
+    :param str mode: One of "all", "deferred", "none" or "preview". See OPEN_MODES.
+    """
+    if mode not in OPEN_MODES:
+        raise ValueError('Unknown open mode "{0:s}". Use one of: {1:s}'.format(mode, ', '.join(sorted(OPEN_MODES))))
+
+    LOAD_TIMES.clear()
+    cmds.file(file_path, open=True, force=True, loadReferenceDepth=OPEN_MODES[mode])
+
+    if mode == 'deferred':
+        load_references_deferred(get_unloaded_references())
+
+
+def get_references(loaded=None):
+    """
+    :param bool|None loaded: If True only loaded references will be returned, if False only unloaded references.
+                             None returns all references.
+    :returns: The reference nodes of the current scene.
+    :rtype: list[str]
+    """
+    reference_nodes = []
+    for ref_node in cmds.ls(type='reference'):
+        # shared reference nodes and the like are no "real" references and can not be loaded.
+        try:
+            cmds.referenceQuery(ref_node, filename=True)
+        except RuntimeError:
+            continue
+        if loaded is None or cmds.referenceQuery(ref_node, isLoaded=True) == loaded:
+            reference_nodes.append(ref_node)
+    return reference_nodes
+
+
+def get_unloaded_references():
+    """
+    :returns: All reference nodes that are currently not loaded.
+    :rtype: list[str]
+    """
+    return get_references(loaded=False)
+
+
+def get_reference_nodes(objects):
+    """
+    :param list[str] objects: Any mix of reference nodes and referenced objects.
+    :returns: The reference nodes the given objects belong to.
+    :rtype: list[str]
+    """
+    reference_nodes = []
+    for obj in objects:
+        if cmds.nodeType(obj) == 'reference':
+            ref_node = obj
+        elif cmds.referenceQuery(obj, isNodeReferenced=True):
+            ref_node = cmds.referenceQuery(obj, referenceNode=True)
+        else:
+            continue
+        if ref_node not in reference_nodes:
+            reference_nodes.append(ref_node)
+    return reference_nodes
+
+
+def add_load_callbacks():
+    """
+    Records the load time of every reference in LOAD_TIMES from now on, also of the references that Maya loads while
+    it opens a scene or when all references get loaded from the reference editor.
+    """
+    if _LOAD_CALLBACKS:
+        return
+    # references that are loaded while a scene opens are created, the ones that get loaded later are loaded
+    for before, after in ((om.MSceneMessage.kBeforeCreateReference, om.MSceneMessage.kAfterCreateReference),
+                          (om.MSceneMessage.kBeforeLoadReference, om.MSceneMessage.kAfterLoadReference)):
+        _LOAD_CALLBACKS.append(om.MSceneMessage.addReferenceCallback(before, _on_before_load))
+        _LOAD_CALLBACKS.append(om.MSceneMessage.addReferenceCallback(after, _on_after_load))
+
+
+def remove_load_callbacks():
+    """
+    Stops recording the load times of the references, see add_load_callbacks().
+    """
+    for callback_id in _LOAD_CALLBACKS:
+        om.MMessage.removeCallback(callback_id)
+    del _LOAD_CALLBACKS[:]
+    _LOAD_STARTS.clear()
+
+
+def _on_before_load(_, file_object, *args):
+    # nested references of the same file start and end like a stack
+    _LOAD_STARTS.setdefault(file_object.resolvedFullName(), []).append(time.time())
+
+
+def _on_after_load(reference_object, file_object, *args):
+    starts = _LOAD_STARTS.get(file_object.resolvedFullName())
+    if not starts:
+        return
+    start = starts.pop()
+    if reference_object.isNull():
+        return
+    ref_node = om.MFnDependencyNode(reference_object).name()
+    # references that are created unloaded took no time to load
+    if cmds.referenceQuery(ref_node, isLoaded=True):
+        LOAD_TIMES[ref_node] = time.time() - start
+
+
+def load_reference(reference_node):
+    """
+    Loads the given reference and records how long that took in LOAD_TIMES.
+
+    :param str reference_node:
+    :returns: The time in seconds it took to load the reference.
+    :rtype: float
+    """
+    start = time.time()
+    cmds.file(loadReference=reference_node)
+    duration = time.time() - start
+    LOAD_TIMES[reference_node] = duration
+    return duration
+
+
+def load_references(reference_nodes):
+    """
+    Loads the given references one after another.
+
+    :param list[str] reference_nodes:
+    :returns: The load time for each reference in the format [(reference_node, seconds), ...].
+    :rtype: list[tuple[str, float]]
+    """
+    return [(ref_node, load_reference(ref_node))
+            for ref_node in reference_nodes
+            if not cmds.referenceQuery(ref_node, isLoaded=True)]
+
+
+def load_references_deferred(reference_nodes):
+    """
+    Loads the given references one by one whenever Maya is idle, so the scene stays usable in the meantime.
+    In batch mode there is no idle queue, so the references are loaded right away.
+
+    :param list[str] reference_nodes:
+    """
+    pending = list(reference_nodes)
+    if not pending:
+        return
+
+    if cmds.about(batch=True):
+        load_references(pending)
+        print_load_report()
+        return
+
+    def load_next():
+        ref_node = pending.pop(0)
+        if cmds.objExists(ref_node) and not cmds.referenceQuery(ref_node, isLoaded=True):
+            print 'Loaded reference {0:s} in {1:.2f}s ({2:d} left)\n'.format(ref_node,
+                                                                             load_reference(ref_node),
+                                                                             len(pending)),
+        if pending:
+            cmds.evalDeferred(load_next, lowestPriority=True)
+        else:
+            print_load_report()
+
+    cmds.evalDeferred(load_next, lowestPriority=True)
+
+
+def get_load_report():
+    """
+    :returns: All loaded references of this session, sorted from the slowest to the fastest,
+              in the format [(reference_node, file_path, seconds), ...].
+    :rtype: list[tuple[str, str, float]]
+    """
+    report = []
+    for ref_node, duration in LOAD_TIMES.items():
+        if cmds.objExists(ref_node):
+            file_path = cmds.referenceQuery(ref_node, filename=True, withoutCopyNumber=True)
+        else:
+            file_path = ''
+        report.append((ref_node, file_path, duration))
+    return sorted(report, key=lambda entry: entry[2], reverse=True)
+
+
+def print_load_report():
+    """
+    Prints how long each reference took to load, the slowest first.
+    """
+    report = get_load_report()
+    if not report:
+        print 'No references have been loaded yet.\n',
+        return
+
+    print '{0:*^100}'.format(' Reference load times ')
+    for ref_node, file_path, duration in report:
+        print '{0:8.2f}s  {1:s}  ({2:s})'.format(duration, ref_node, os.path.basename(file_path))
+    print 'Loaded {0:d} references in {1:.2f}s.\n'.format(len(report), sum(entry[2] for entry in report)),
@@ -0,0 +1,236 @@
+"""
+Laplacian relax of meshes. Every iteration moves the vertices towards the weighted average of their neighbours, as one
+sparse matrix product over the whole point array.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import topology
+
+
+UNIFORM = 'uniform'
+COTANGENT = 'cotangent'
+
+WEIGHTS = (UNIFORM, COTANGENT)
+
+# How far the vertices move towards the average of their neighbours in every iteration.
+STRENGTH = 0.5
+
+ITERATIONS = 10
+
+# Cotangent weights get negative at obtuse angles and huge at nearly degenerate triangles, both let the relax
+# overshoot. They are clamped to this range.
+COTANGENT_RANGE = (0.0, 1000.0)
+
+
+class SparseMatrix(object):
+    """
+    A sparse matrix in CSR format, just enough for relaxing: numpy has no sparse matrices and scipy is not available
+    in every Maya.
+    """
+
+    def __init__(self, offsets, columns, values, column_count):
+        """
+        Use from_entries() instead.
+
+        :param numpy.ndarray offsets: Where the entries of every row start, with the end as last value.
+        :param numpy.ndarray columns: The column of every entry, sorted by row.
+        :param numpy.ndarray values: The value of every entry, sorted by row.
+        :param int column_count:
+        """
+        self.offsets = offsets
+        self.columns = columns
+        self.values = values
+        self.column_count = column_count
+        # the products of unit weights do not need to be multiplied
+        self._unit_values = bool((values == 1).all())
+        # reduceat can not handle empty rows, they keep their zeros
+        self._filled_rows = offsets[1:] > offsets[:-1]
+        self._all_filled = bool(self._filled_rows.all())
+
+    @classmethod
+    def from_entries(cls, rows, columns, values, shape):
+        """
+        :param numpy.ndarray rows: The row of every entry.
+        :param numpy.ndarray columns: The column of every entry.
+        :param numpy.ndarray values: The value of every entry. The values of duplicate entries are added up.
+        :param tuple[int] shape: The number of rows and columns.
+        :rtype: SparseMatrix
+        """
+        row_count, column_count = shape
+        keys, inverse = np.unique(np.asarray(rows, dtype=np.int64) * column_count + columns, return_inverse=True)
+        values = np.bincount(inverse, weights=values, minlength=len(keys))
+        rows = keys // column_count
+        offsets = np.zeros(row_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=row_count), out=offsets[1:])
+        return cls(offsets, (keys % column_count).astype(topology.INDEX_DTYPE), values, column_count)
+
+    @property
+    def row_count(self):
+        """
+        :rtype: int
+        """
+        return len(self.offsets) - 1
+
+    @property
+    def row_sums(self):
+        """
+        :returns: The sum of the values of every row.
+        :rtype: numpy.ndarray
+        """
+        sums = np.zeros(self.row_count)
+        self._reduce_rows(self.values, sums)
+        return sums
+
+    def take_rows(self, rows):
+        """
+        :param numpy.ndarray rows: The rows to keep.
+        :returns: A matrix of the given rows only, with all columns.
+        :rtype: SparseMatrix
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = self.offsets[rows + 1] - self.offsets[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return SparseMatrix(offsets,
+                            topology.gather(self.offsets, self.columns, rows),
+                            topology.gather(self.offsets, self.values, rows),
+                            self.column_count)
+
+    def dot(self, vectors):
+        """
+        :param numpy.ndarray vectors: One value or vector per column, like points in the shape (columns, 3).
+        :returns: The product of this matrix with the given vectors, one value or vector per row.
+        :rtype: numpy.ndarray
+        """
+        products = np.take(vectors, self.columns, axis=0)
+        if not self._unit_values:
+            products *= self.values.reshape((-1,) + (1,) * (vectors.ndim - 1))
+        if self._all_filled and self.row_count:
+            return np.add.reduceat(products, self.offsets[:-1], axis=0)
+        result = np.zeros((self.row_count,) + vectors.shape[1:])
+        self._reduce_rows(products, result)
+        return result
+
+    def _reduce_rows(self, values, out):
+        if self._filled_rows.any():
+            out[self._filled_rows] = np.add.reduceat(values, self.offsets[:-1][self._filled_rows], axis=0)
+
+
+def get_uniform_matrix(topo):
+    """
+    :param topology.MeshTopology topo:
+    :returns: The adjacency of the vertices, every edge has the weight 1.
+    :rtype: SparseMatrix
+    """
+    vertices_a, vertices_b = topo.edge_vertices[:, 0], topo.edge_vertices[:, 1]
+    return SparseMatrix.from_entries(np.concatenate((vertices_a, vertices_b)),
+                                     np.concatenate((vertices_b, vertices_a)),
+                                     np.ones(2 * topo.edge_count),
+                                     (topo.vertex_count, topo.vertex_count))
+
+
+def get_cotangent_matrix(topo, points):
+    """
+    Polygons are split into triangle fans for the weights, so the vertices of an n-gon are connected across the fan
+    diagonals as well.
+
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :returns: The adjacency of the vertices, weighted by the cotangents of the angles opposite of the edges.
+    :rtype: SparseMatrix
+    """
+    points = np.asarray(points, dtype=np.float64)
+    triangles, _ = topo.get_fan_triangles()
+
+    rows = []
+    columns = []
+    weights = []
+    for corner in range(3):
+        a, b, c = (triangles[:, (corner + i) % 3] for i in range(3))
+        edge_b = points[b] - points[a]
+        edge_c = points[c] - points[a]
+        cross = np.cross(edge_b, edge_c)
+        area = np.sqrt(np.einsum('ij,ij->i', cross, cross))
+        dot = np.einsum('ij,ij->i', edge_b, edge_c)
+        cotangent = np.where(area > 0, dot / np.where(area > 0, area, 1.0), 0.0)
+        rows += [b, c]
+        columns += [c, b]
+        weights += [0.5 * cotangent, 0.5 * cotangent]
+
+    matrix = SparseMatrix.from_entries(np.concatenate(rows),
+                                       np.concatenate(columns),
+                                       np.concatenate(weights),
+                                       (topo.vertex_count, topo.vertex_count))
+    np.clip(matrix.values, COTANGENT_RANGE[0], COTANGENT_RANGE[1], out=matrix.values)
+    return matrix
+
+
+def get_matrix(topo, points, weights=UNIFORM):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3). Only used by cotangent weights.
+    :param str weights: UNIFORM or COTANGENT.
+    :rtype: SparseMatrix
+    :raises ValueError: If the weights are unknown.
+    """
+    if weights == UNIFORM:
+        return get_uniform_matrix(topo)
+    if weights == COTANGENT:
+        return get_cotangent_matrix(topo, points)
+    raise ValueError('Unknown weights "{0:s}". Use one of: {1:s}'.format(weights, ', '.join(WEIGHTS)))
+
+
+def iterate_relax(points, matrix, vertices=None, iterations=ITERATIONS, strength=STRENGTH):
+    """
+    Relaxes the points in place, one iteration per step.
+
+    :param numpy.ndarray points: The points in the shape (vertices, 3) as float64. They are changed in place.
+    :param SparseMatrix matrix: The weighted adjacency of the vertices, see get_matrix().
+    :param numpy.ndarray vertices: The vertices that move. All others are pinned. If this is None all vertices move.
+    :param int iterations:
+    :param float strength: How far the vertices move towards the average of their neighbours in every iteration.
+    :returns: A generator that yields after every iteration.
+    :rtype: generator
+    """
+    sums = matrix.row_sums
+    if vertices is None and (sums > 0).all():
+        # all vertices move, which saves picking them out of the points in every iteration
+        factors = (strength / sums)[:, np.newaxis]
+        for _ in range(iterations):
+            steps = matrix.dot(points)
+            steps *= factors
+            points *= 1.0 - strength
+            points += steps
+            yield
+        return
+
+    vertices = np.arange(len(points)) if vertices is None else np.asarray(vertices, dtype=np.int64)
+    sums = sums[vertices]
+    # vertices without (weighted) neighbours have nowhere to go
+    vertices, sums = vertices[sums > 0], sums[sums > 0]
+    factors = (strength / sums)[:, np.newaxis]
+    matrix = matrix.take_rows(vertices)
+    for _ in range(iterations):
+        steps = matrix.dot(points)
+        steps *= factors
+        steps += (1.0 - strength) * points[vertices]
+        points[vertices] = steps
+        yield
+
+
+def relax(points, matrix, vertices=None, iterations=ITERATIONS, strength=STRENGTH):
+    """
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :param SparseMatrix matrix: The weighted adjacency of the vertices, see get_matrix().
+    :param numpy.ndarray vertices: The vertices that move. All others are pinned. If this is None all vertices move.
+    :param int iterations:
+    :param float strength: How far the vertices move towards the average of their neighbours in every iteration.
+    :returns: The relaxed points.
+    :rtype: numpy.ndarray
+    """
+    points = np.array(points, dtype=np.float64)
+    for _ in iterate_relax(points, matrix, vertices, iterations, strength):
+        pass
+    return points
@@ -0,0 +1,217 @@
+"""
+Finds image sequences in a folder and checks them for missing frames and empty or truncated files.
+The files are only checked by their headers and trailers, no image is decoded.
+
+This module does not depend on Maya.
+"""
+import math
+import os
+import re
+import struct
+
+import image_header
+import parallel
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.exr', '.tga', '.iff', '.dpx', '.hdr')
+
+# name.0001.exr, name_0001.exr, name0001.exr, ... A minus is the sign of a negative frame only after a "." or "_" or
+# at the start (name.-001.exr), otherwise it belongs to the name (shot-0001.exr is frame 1).
+SEQUENCE_PATTERN = re.compile(r'^(?P<name>.*?)(?P<frame>(?:(?<=[._])|^)-?\d+|\d+)(?P<ext>\.[A-Za-z0-9]+)$')
+
+PNG_TRAILER = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+JPEG_TRAILER = b'\xff\xd9'
+
+# EXR compression: scan lines per chunk
+EXR_LINES_PER_CHUNK = {0: 1, 1: 1, 2: 1, 3: 16, 4: 32, 5: 16, 6: 32, 7: 32, 8: 32, 9: 256}
+# EXR version flags of files whose chunk layout we do not check: tiled, deep and multi part
+EXR_UNCHECKED_FLAGS = 0x200 | 0x800 | 0x1000
+
+# The number of bytes at the end of a file we look at for trailers.
+TRAILER_SIZE = 64
+
+
+def find_sequences(folder):
+    """
+    :param str folder: The folder to search in (including all sub folders).
+    :returns: All image sequences in the given folder in the format {pattern: {frame: path}}.
+              The pattern is the path with the frame number replaced by "#" characters, i.e. "/render/beauty.####.exr".
+    :rtype: dict[str, dict[int, str]]
+    """
+    sequences = {}
+    for root, _, file_names in os.walk(folder):
+        root = root.replace('\\', '/')
+        for file_name in file_names:
+            if os.path.splitext(file_name)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+            match = SEQUENCE_PATTERN.match(file_name)
+            if match is None:
+                continue
+            frame = match.group('frame')
+            pattern = '{0:s}/{1:s}{2:s}{3:s}'.format(root, match.group('name'), '#' * len(frame), match.group('ext'))
+            sequences.setdefault(pattern, {})[int(frame)] = root + '/' + file_name
+    return sequences
+
+
+def get_missing_frames(frames, frame_range=None):
+    """
+    :param list[int] frames: The frames that exist.
+    :param tuple[int] frame_range: The expected frames as (start, end, step). If this is None the range between the
+                                   first and the last existing frame with a step of 1 will be used.
+    :returns: All frames of the range that do not exist.
+    :rtype: list[int]
+    """
+    if frame_range is None:
+        if not frames:
+            return []
+        frame_range = (min(frames), max(frames), 1)
+    start, end, step = frame_range
+    return sorted(set(range(start, end + 1, max(step, 1))) - set(frames))
+
+
+def check_image(file_path):
+    """
+    Checks whether the given image is complete by looking at its header and trailer.
+
+    :param str file_path:
+    :returns: None if the image is fine, otherwise "missing", "empty", "unreadable" (broken or unknown header)
+              or "truncated".
+    :rtype: str|None
+    """
+    return _check_file(file_path)[1]
+
+
+def check_images(file_paths, processes=parallel.PROCESSES):
+    """
+    Checks all given images in a pool of processes.
+
+    :param list[str] file_paths:
+    :param int processes: The number of processes to check the images with.
+    :returns: The size in bytes and the problem (see check_image()) of every image in the format
+              {path: (size, problem)}.
+    :rtype: dict[str, tuple[int, str|None]]
+    """
+    return dict(zip(file_paths, parallel.process_map(_check_file, file_paths, processes=processes)))
+
+
+def verify_folder(folder, frame_range=None, processes=parallel.PROCESSES):
+    """
+    Finds all image sequences in the given folder and checks them for missing frames and broken files.
+
+    :param str folder:
+    :param tuple[int] frame_range: The expected frames as (start, end, step). If this is None the frames between the
+                                   first and the last file of each sequence are expected.
+    :param int processes: The number of processes to check the images with.
+    :returns: A report for every sequence in the format:
+              {pattern: {'first': int, 'last': int, 'count': int,
+                         'missing': [frame, ...],
+                         'empty': [path, ...],
+                         'truncated': [path, ...],   # truncated or broken headers
+                         'bytes': int}}
+    :rtype: dict[str, dict]
+    """
+    sequences = find_sequences(folder)
+    # sorted per sequence, so the chunks of every process stay in one folder
+    file_paths = [file_path
+                  for pattern in sorted(sequences)
+                  for _, file_path in sorted(sequences[pattern].items())]
+    results = check_images(file_paths, processes=processes)
+
+    report = {}
+    for pattern, frames in sequences.items():
+        file_results = [results[frames[frame]] + (frames[frame],) for frame in sorted(frames)]
+        report[pattern] = {'first': min(frames),
+                           'last': max(frames),
+                           'count': len(frames),
+                           'missing': get_missing_frames(list(frames), frame_range),
+                           'empty': [file_path for _, problem, file_path in file_results if problem == 'empty'],
+                           'truncated': [file_path for _, problem, file_path in file_results
+                                         if problem in ('truncated', 'unreadable')],
+                           'bytes': sum(size for size, _, _ in file_results)}
+    return report
+
+
+def _check_file(file_path):
+    """
+    :param str file_path:
+    :returns: The size of the file and its problem like check_image() returns it.
+    :rtype: tuple[int, str|None]
+    """
+    try:
+        file_size = os.stat(file_path).st_size
+    except OSError:
+        return 0, 'missing'
+    if file_size == 0:
+        return 0, 'empty'
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.exr', '.tga'):
+        # we can only check for empty files in formats we do not know
+        return file_size, None
+
+    header = image_header.read_header(file_path)
+    if header is None:
+        return file_size, 'unreadable'
+
+    try:
+        with open(file_path, 'rb') as image_file:
+            if header['format'] == 'png':
+                complete = _read_trailer(image_file, file_size).endswith(PNG_TRAILER)
+            elif header['format'] == 'jpeg':
+                complete = JPEG_TRAILER in _read_trailer(image_file, file_size)
+            elif header['format'] == 'tiff':
+                complete = _get_tiff_data_end(image_file) <= file_size
+            elif header['format'] == 'exr':
+                complete = _get_exr_data_end(image_file, file_size) <= file_size
+            else:
+                complete = _get_tga_data_end(image_file, header) <= file_size
+    except (IOError, struct.error, ValueError, KeyError):
+        return file_size, 'truncated'
+    return file_size, (None if complete else 'truncated')
+
+
+def _read_trailer(image_file, file_size):
+    image_file.seek(max(0, file_size - TRAILER_SIZE))
+    return image_file.read(TRAILER_SIZE)
+
+
+def _get_tiff_data_end(image_file):
+    data = image_file.read(8)
+    endian, tags = image_header.read_tiff_tags(image_file, data)
+    # strips (273, 279) or tiles (324, 325)
+    offset_tag, count_tag = (324, 325) if 324 in tags else (273, 279)
+    offsets = image_header.get_tiff_values(image_file, endian, tags, offset_tag)
+    counts = image_header.get_tiff_values(image_file, endian, tags, count_tag)
+    return max(offset + count for offset, count in zip(offsets, counts))
+
+
+def _get_exr_data_end(image_file, file_size):
+    version, attributes = image_header.read_exr_attributes(image_file)
+    if version & EXR_UNCHECKED_FLAGS:
+        return 0
+
+    _, y_min, _, y_max = struct.unpack('<iiii', attributes[b'dataWindow'])
+    lines_per_chunk = EXR_LINES_PER_CHUNK[ord(attributes[b'compression'][0:1])]
+    chunk_count = int(math.ceil((y_max - y_min + 1) / float(lines_per_chunk)))
+
+    # the offset table follows right after the header and points to every chunk: y(4) data_size(4) data
+    offsets = struct.unpack('<{0:d}Q'.format(chunk_count), image_file.read(8 * chunk_count))
+    last_offset = max(offsets)
+    if last_offset + 8 > file_size:
+        return last_offset + 8
+    image_file.seek(last_offset)
+    _, data_size = struct.unpack('<ii', image_file.read(8))
+    return last_offset + 8 + data_size
+
+
+def _get_tga_data_end(image_file, header):
+    image_file.seek(0)
+    id_length, color_map_type, image_type = struct.unpack('<BBB', image_file.read(3))
+    if image_type > 8:
+        # run length encoded images have no fixed size
+        return 0
+    _, color_map_length, color_map_depth = struct.unpack('<HHB', image_file.read(5))
+    image_file.seek(16)
+    pixel_depth, = struct.unpack('<B', image_file.read(1))
+    color_map_size = color_map_length * ((color_map_depth + 7) // 8) if color_map_type else 0
+    return 18 + id_length + color_map_size + header['width'] * header['height'] * ((pixel_depth + 7) // 8)
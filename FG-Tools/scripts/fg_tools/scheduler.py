@@ -0,0 +1,440 @@
+"""
+A job scheduler that runs work in the background without blocking the main thread.
+
+Pure python work runs in a pool of threads. Work that has to run on the main thread (like Maya API calls) is queued and
+run in small time slices whenever the main thread is idle. Functions for the main thread may be generators: they run
+one step (up to the next yield) at a time, so long work is spread over many idle slices.
+
+Jobs have priorities, can be cancelled and identical pending jobs are only queued once.
+
+This module does not depend on Maya.
+"""
+import collections
+import heapq
+import inspect
+import itertools
+import sys
+import threading
+import time
+import traceback
+
+
+# Lower numbers run first.
+HIGH = 0
+NORMAL = 1
+LOW = 2
+
+# Pure python work holds the GIL, so more threads would not finish it faster but take time from the main thread.
+# A few threads keep jobs that wait for files from blocking the others.
+THREADS = 4
+
+# How long the main thread works on the queued work in one idle slice (in seconds). Longer slices make the UI stutter.
+SLICE_SECONDS = 0.01
+
+# How many finished jobs the latency metrics are computed from.
+METRICS_HISTORY = 1000
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+
+class Job(object):
+    """
+    A function that the JobScheduler runs, either in a thread or on the main thread.
+    """
+
+    def __init__(self, func, args, kwargs, priority, key, callback, main_thread):
+        """
+        :param func: The function of the job.
+        :param tuple args: The positional arguments of the function.
+        :param dict kwargs: The keyword arguments of the function.
+        :param int priority: HIGH, NORMAL or LOW.
+        :param key: Jobs with the same key are only queued once. None disables that for this job.
+        :param callback: A function that gets the result of the job on the main thread or None.
+        :param bool main_thread: Whether the function runs on the main thread instead of a thread of the pool.
+        """
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.callback = callback
+        self.main_thread = main_thread
+        self.name = getattr(func, '__name__', repr(func))
+
+        self.state = PENDING
+        self.result = None
+        self.error = None
+        self.submit_time = time.time()
+        self.start_time = None
+        self.end_time = None
+
+        self._cancelled = False
+        self._generator = None
+        self._finished = threading.Event()
+
+    def __repr__(self):
+        return '<Job {0:s} {1:s}>'.format(self.name, self.state)
+
+    @property
+    def is_cancelled(self):
+        """
+        Long running thread functions can check this to stop early.
+
+        :rtype: bool
+        """
+        return self._cancelled
+
+    @property
+    def is_finished(self):
+        """
+        :returns: Whether the job is done, failed or was cancelled.
+        :rtype: bool
+        """
+        return self._finished.is_set()
+
+    def cancel(self):
+        """
+        Cancels the job. A pending job will not run anymore, a running job will not get its callback called and
+        a function on the main thread will not get another step.
+        """
+        self._cancelled = True
+
+    def wait(self, timeout=None):
+        """
+        Waits until the job is finished. Do not call this from the main thread for jobs that need the main thread.
+
+        :param float timeout: The maximum time to wait in seconds or None to wait forever.
+        :returns: Whether the job is finished.
+        :rtype: bool
+        """
+        return self._finished.wait(timeout)
+
+    def _finish(self, state, result=None, error=None):
+        self.state = state
+        self.result = result
+        self.error = error
+        self.end_time = time.time()
+        self._finished.set()
+
+
+class JobScheduler(object):
+    """
+    Runs jobs in a pool of threads and on the main thread whenever it is idle.
+
+    Usage::
+
+        scheduler = JobScheduler(schedule_idle=maya.utils.executeDeferred)
+        job = scheduler.submit(read_texture_headers, args=(paths,), callback=print_texture_report)
+        scheduler.submit_main_thread(warm_up_topology_caches, priority=LOW)
+        job.cancel()
+    """
+
+    def __init__(self, threads=THREADS, schedule_idle=None, slice_seconds=SLICE_SECONDS):
+        """
+        :param int threads: The number of threads of the pool.
+        :param schedule_idle: A function that takes a function and calls it once the main thread is idle. It has to
+                              work from any thread. If this is None run_main_thread_slice() has to be called
+                              manually (i.e. in batch mode).
+        :param float slice_seconds: How long the main thread works on the queue in one idle slice.
+        """
+        self.threads = threads
+        self.slice_seconds = slice_seconds
+        self._schedule_idle = schedule_idle
+
+        self._lock = threading.Condition()
+        self._counter = itertools.count()
+        # heaps of (priority, order, job)
+        self._thread_queue = []
+        self._main_thread_queue = []
+        self._pending_keys = {}
+        self._running = 0
+        self._idle_scheduled = False
+        self._workers = []
+        self._shutdown = False
+
+        self._completed = collections.Counter()
+        self._waits = collections.deque(maxlen=METRICS_HISTORY)
+        self._latencies = collections.deque(maxlen=METRICS_HISTORY)
+
+    def submit(self, func, args=(), kwargs=None, priority=NORMAL, key=None, callback=None):
+        """
+        Runs the given function in a thread of the pool. It must not call Maya commands or the Maya API.
+
+        :param func: The function to run.
+        :param tuple args: The positional arguments of the function.
+        :param dict kwargs: The keyword arguments of the function.
+        :param int priority: HIGH, NORMAL or LOW.
+        :param key: Identical pending jobs are only queued once. If this is None the function and its arguments are
+                    the key (if they can be hashed).
+        :param callback: A function that gets the result on the main thread, i.e. to apply it to the scene.
+        :returns: The job, or the identical job that is already pending.
+        :rtype: Job
+        """
+        return self._submit(Job(func, args, kwargs or {}, priority, key, callback, main_thread=False))
+
+    def submit_main_thread(self, func, args=(), kwargs=None, priority=NORMAL, key=None, callback=None):
+        """
+        Runs the given function on the main thread once it is idle. If the function is a generator, it runs one step
+        at a time and its last yielded value is the result.
+
+        :param func: The function to run.
+        :param tuple args: The positional arguments of the function.
+        :param dict kwargs: The keyword arguments of the function.
+        :param int priority: HIGH, NORMAL or LOW.
+        :param key: Identical pending jobs are only queued once. If this is None the function and its arguments are
+                    the key (if they can be hashed).
+        :param callback: A function that gets the result on the main thread.
+        :returns: The job, or the identical job that is already pending.
+        :rtype: Job
+        """
+        return self._submit(Job(func, args, kwargs or {}, priority, key, callback, main_thread=True))
+
+    def _submit(self, job):
+        if job.key is None:
+            job.key = _get_default_key(job)
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('The scheduler has been shut down.')
+            pending = self._pending_keys.get(job.key) if job.key is not None else None
+            if pending is not None and not pending.is_cancelled:
+                if job.priority < pending.priority:
+                    # the old heap entry gets skipped, since its priority does not match anymore
+                    pending.priority = job.priority
+                    self._push(pending)
+                return pending
+
+            if job.key is not None:
+                self._pending_keys[job.key] = job
+            self._push(job)
+        return job
+
+    def _push(self, job):
+        """
+        Queues a job where it has to run next. The lock has to be held.
+        """
+        if job.main_thread or job.state == RUNNING:
+            heapq.heappush(self._main_thread_queue, (job.priority, next(self._counter), job))
+            self._request_idle_slice()
+        else:
+            heapq.heappush(self._thread_queue, (job.priority, next(self._counter), job))
+            self._start_workers()
+            # run_until_complete() waits on the same condition, so all waiting threads have to be woken
+            self._lock.notify_all()
+
+    def _request_idle_slice(self):
+        if not self._idle_scheduled and self._schedule_idle is not None:
+            self._idle_scheduled = True
+            self._schedule_idle(self.run_main_thread_slice)
+
+    def _start_workers(self):
+        while len(self._workers) < self.threads:
+            worker = threading.Thread(target=self._work, name='fg_tools job worker {0:d}'.format(len(self._workers)))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def _pop(self, queue):
+        """
+        :returns: The next job of the given queue that should run or None. The lock has to be held.
+        :rtype: Job
+        """
+        while queue:
+            priority, _, job = heapq.heappop(queue)
+            if job.priority != priority or job.is_finished:
+                # an outdated entry of a job whose priority was raised
+                continue
+            if job.state == PENDING:
+                if self._pending_keys.get(job.key) is job:
+                    del self._pending_keys[job.key]
+                if job.is_cancelled:
+                    self._record(job, CANCELLED)
+                    continue
+            return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job = self._pop(self._thread_queue)
+                while job is None and not self._shutdown:
+                    self._lock.wait()
+                    job = self._pop(self._thread_queue)
+                if job is None:
+                    return
+                job.state = RUNNING
+                job.start_time = time.time()
+                self._running += 1
+
+            try:
+                result = job.func(*job.args, **job.kwargs)
+                error = None
+            except Exception:
+                result = None
+                error = traceback.format_exc()
+
+            with self._lock:
+                self._running -= 1
+                if error is not None:
+                    self._record(job, FAILED, error=error)
+                elif job.is_cancelled:
+                    self._record(job, CANCELLED)
+                elif job.callback is not None:
+                    # the callback runs on the main thread
+                    job.result = result
+                    self._push(job)
+                else:
+                    self._record(job, DONE, result)
+
+    def run_main_thread_slice(self):
+        """
+        Works on the queued main thread work for one time slice. This has to be called from the main thread.
+        Once the slice is used up and work is left, the next idle slice is requested.
+        """
+        with self._lock:
+            self._idle_scheduled = False
+        end_time = time.time() + self.slice_seconds
+        while True:
+            with self._lock:
+                job = self._pop(self._main_thread_queue)
+            if job is None:
+                break
+            self._run_step(job)
+            if time.time() >= end_time:
+                break
+
+        with self._lock:
+            if self._main_thread_queue:
+                self._request_idle_slice()
+
+    def _run_step(self, job):
+        """
+        Runs the next step of a job on the main thread.
+        """
+        if job.is_cancelled:
+            if job._generator is not None:
+                job._generator.close()
+            with self._lock:
+                self._record(job, CANCELLED)
+            return
+
+        try:
+            if not job.main_thread:
+                finished, result = True, job.result
+            elif job._generator is None:
+                job.state = RUNNING
+                job.start_time = time.time()
+                result = job.func(*job.args, **job.kwargs)
+                finished = not inspect.isgenerator(result)
+                if not finished:
+                    job._generator, result = result, None
+            else:
+                result = job.result
+                finished = False
+            if not finished:
+                try:
+                    result = next(job._generator)
+                except StopIteration:
+                    finished = True
+            if finished and job.callback is not None:
+                job.callback(result)
+        except Exception:
+            with self._lock:
+                self._record(job, FAILED, error=traceback.format_exc())
+            return
+
+        with self._lock:
+            if finished:
+                self._record(job, DONE, result)
+            else:
+                job.result = result
+                self._push(job)
+
+    def _record(self, job, state, result=None, error=None):
+        """
+        Finishes a job and records it in the metrics. The lock has to be held.
+        """
+        job._finish(state, result, error)
+        self._completed[state] += 1
+        if job.start_time is not None:
+            self._waits.append(job.start_time - job.submit_time)
+            self._latencies.append(job.end_time - job.submit_time)
+        if error is not None:
+            sys.stderr.write('Job {0:s} failed:\n{1:s}'.format(job.name, error))
+
+    def run_until_complete(self, timeout=None):
+        """
+        Runs the main thread work and waits for the threads until no work is left. This has to be called from the main
+        thread, i.e. in batch mode where nothing gets idle.
+
+        :param float timeout: The maximum time to wait in seconds or None to wait forever.
+        :returns: Whether all work is done.
+        :rtype: bool
+        """
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            self.run_main_thread_slice()
+            with self._lock:
+                if not self._thread_queue and not self._main_thread_queue and not self._running:
+                    return True
+                if end_time is not None and time.time() >= end_time:
+                    return False
+                if not self._main_thread_queue:
+                    # wake up once a thread finished or queued work for the main thread
+                    self._lock.wait(self.slice_seconds)
+
+    def cancel_all(self):
+        """
+        Cancels all pending and running jobs.
+        """
+        with self._lock:
+            for _, _, job in self._thread_queue + self._main_thread_queue:
+                job.cancel()
+
+    def get_metrics(self):
+        """
+        :returns: The number of queued jobs ("thread_queue" and "main_thread_queue"), the number of jobs running in
+                  threads ("running"), how many jobs finished in which state ("done", "cancelled", "failed") and the
+                  average and maximum seconds the recent jobs waited until they started ("average_wait",
+                  "max_wait") and until they were finished ("average_latency", "max_latency").
+        :rtype: dict
+        """
+        with self._lock:
+            metrics = {'thread_queue': len(set(job for _, _, job in self._thread_queue if not job.is_finished)),
+                       'main_thread_queue': len(set(job for _, _, job in self._main_thread_queue
+                                                    if not job.is_finished)),
+                       'running': self._running}
+            for state in (DONE, CANCELLED, FAILED):
+                metrics[state] = self._completed[state]
+            for name, values in (('wait', self._waits), ('latency', self._latencies)):
+                metrics['average_' + name] = sum(values) / len(values) if values else 0.0
+                metrics['max_' + name] = max(values) if values else 0.0
+        return metrics
+
+    def shutdown(self):
+        """
+        Cancels all jobs and stops the threads.
+        """
+        self.cancel_all()
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+        for worker in self._workers:
+            worker.join()
+        del self._workers[:]
+
+
+def _get_default_key(job):
+    """
+    :returns: The function and its arguments, or None if they can not be hashed.
+    """
+    key = (job.func, job.args, tuple(sorted(job.kwargs.items())), job.main_thread)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
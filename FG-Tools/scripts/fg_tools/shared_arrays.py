@@ -0,0 +1,192 @@
+"""
+Named numpy arrays in one block of shared memory, so worker processes can read them without pickling.
+
+The creating process copies the arrays into the block once. Worker processes only get a small handle (the name of the
+block and the layout of the arrays) and attach to the block. The arrays they get are views on the shared memory.
+
+multiprocessing.shared_memory is used where it exists (python 3.8+). Older pythons (like the python 2 of Maya) use a
+memory mapped temporary file instead, which the operating system keeps in memory as long as there is enough of it.
+
+This module does not depend on Maya.
+"""
+import mmap
+import os
+import tempfile
+import uuid
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+# Every array starts at a multiple of this many bytes, so vectorized code can read it aligned.
+ALIGNMENT = 64
+
+
+class SharedArrays(object):
+    """
+    Usage::
+
+        # in the main process
+        shared = SharedArrays.create({'points': points, 'face_counts': face_counts})
+        parallel.process_map(analyze, [shared.handle])
+        shared.unlink()
+
+        # in the worker process
+        def analyze(handle):
+            with SharedArrays.attach(handle) as shared:
+                return shared.arrays['points'].mean(axis=0)
+    """
+
+    def __init__(self, block, layout, owner):
+        """
+        Use create() or attach() instead.
+
+        :param block: The shared memory block.
+        :param dict layout: The offset, dtype and shape of every array by name.
+        :param bool owner: Whether this process created the block and has to unlink it.
+        """
+        self._block = block
+        self.layout = layout
+        self.owner = owner
+        buffer_ = block.buffer
+        self.arrays = {}
+        for name, (offset, dtype, shape) in layout.items():
+            count = int(np.prod(shape))
+            self.arrays[name] = np.frombuffer(buffer_, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    @classmethod
+    def create(cls, arrays):
+        """
+        :param dict[str, numpy.ndarray] arrays: The arrays to share by name.
+        :returns: The shared arrays. They are copies of the given arrays in shared memory.
+        :rtype: SharedArrays
+        """
+        layout = {}
+        size = 0
+        for name in sorted(arrays):
+            array = np.asarray(arrays[name])
+            layout[name] = (size, array.dtype.str, array.shape)
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        block = _create_block(max(size, 1))
+        shared = cls(block, layout, owner=True)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        :param tuple handle: The handle of shared arrays that were created in another process.
+        :rtype: SharedArrays
+        """
+        name, layout = handle
+        return cls(_attach_block(name), layout, owner=False)
+
+    @property
+    def handle(self):
+        """
+        :returns: A small picklable handle that other processes can attach() to.
+        :rtype: tuple
+        """
+        return self._block.name, self.layout
+
+    @property
+    def nbytes(self):
+        """
+        :returns: The size of the shared memory block.
+        :rtype: int
+        """
+        return self._block.size
+
+    def close(self):
+        """
+        Releases the arrays of this process. The block stays alive for other processes until it gets unlinked.
+        """
+        # the views have to go before the memory is unmapped
+        self.arrays = {}
+        self._block.close()
+
+    def unlink(self):
+        """
+        Closes and removes the shared memory block. This should only be called by the process that created it, once
+        all workers are done.
+        """
+        self.close()
+        self._block.unlink()
+
+
+class _SharedMemoryBlock(object):
+    """
+    A block of multiprocessing.shared_memory (python 3.8+).
+    """
+
+    def __init__(self, memory):
+        self._memory = memory
+        self.name = memory.name
+        self.size = memory.size
+        self.buffer = memory.buf
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer = None
+            self._memory.close()
+
+    def unlink(self):
+        self._memory.unlink()
+
+
+class _FileBlock(object):
+    """
+    A memory mapped temporary file, for pythons without multiprocessing.shared_memory.
+    """
+
+    def __init__(self, file_path, size=None):
+        self.name = file_path
+        with open(file_path, 'r+b') as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), size)
+        self.size = size
+        self.buffer = self._map
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer = None
+            self._map.close()
+
+    def unlink(self):
+        try:
+            os.remove(self.name)
+        except OSError:
+            # another process still has it open (on Windows) or it is gone already
+            pass
+
+
+def _create_block(size):
+    if shared_memory is not None:
+        return _SharedMemoryBlock(shared_memory.SharedMemory(create=True, size=size))
+
+    file_path = os.path.join(tempfile.gettempdir(), 'fg_tools_shared_{0:s}'.format(uuid.uuid4().hex))
+    with open(file_path, 'wb') as f:
+        f.truncate(size)
+    return _FileBlock(file_path, size)
+
+
+def _attach_block(name):
+    if shared_memory is not None:
+        return _SharedMemoryBlock(shared_memory.SharedMemory(name=name))
+    return _FileBlock(name)
@@ -0,0 +1,252 @@
+"""
+A uniform grid spatial hash over point arrays to find points that are close to each other.
+
+The points are sorted by the key of the grid cell they fall into, so every cell is a slice of the sorted points. Pairs
+are searched per neighbour direction for all cells at once, which keeps the search near-linear and vectorized even
+for meshes with millions of vertices.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import topology
+
+
+# The keys of all cells have to fit into an int64, so the grid has at most this many cells per axis. If the tolerance
+# is tiny compared to the size of the points the cells just get bigger, which only means more candidate pairs.
+MAX_CELLS_PER_AXIS = 2 ** 20
+
+# The offsets of a cell and its 26 neighbour cells.
+NEIGHBOURS = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)]
+
+# The cell itself and the 13 neighbour cells that come after it. Every pair of neighbouring cells is visited once.
+HALF_NEIGHBOURS = [offset for offset in NEIGHBOURS if offset >= (0, 0, 0)]
+
+
+class SpatialHash(object):
+    """
+    Usage::
+
+        spatial_hash = SpatialHash(points, 0.001)
+        pairs = spatial_hash.find_pairs()  # all point pairs that are closer than 0.001
+    """
+
+    def __init__(self, points, cell_size):
+        """
+        :param numpy.ndarray points: The points in the shape (n, 3).
+        :param float cell_size: The size of the grid cells. This is the highest tolerance the hash can be searched with.
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.minimum = self.points.min(axis=0) if len(self.points) else np.zeros(3)
+        extent = self.points.max(axis=0) - self.minimum if len(self.points) else np.zeros(3)
+        self.cell_size = max(float(cell_size), float(extent.max()) / MAX_CELLS_PER_AXIS, 1e-12)
+
+        # +1 so the neighbours of the cells at the border still have valid (empty) keys
+        cells = self._get_cells(self.points) + 1
+        self.dimensions = (cells.max(axis=0) + 2) if len(cells) else np.ones(3, dtype=np.int64)
+        keys = self._get_keys(cells)
+
+        self.order = np.argsort(keys)
+        sorted_keys = keys[self.order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))[:len(keys)]
+        self.cell_keys = sorted_keys[starts]
+        self.cell_offsets = np.append(starts, len(keys))
+
+    @property
+    def cell_count(self):
+        """
+        :returns: The number of cells that contain at least one point.
+        :rtype: int
+        """
+        return len(self.cell_keys)
+
+    def _get_cells(self, points):
+        return np.floor((points - self.minimum) / self.cell_size).astype(np.int64)
+
+    def _get_keys(self, cells):
+        return (cells[..., 0] * self.dimensions[1] + cells[..., 1]) * self.dimensions[2] + cells[..., 2]
+
+    def find_pairs(self, tolerance=None):
+        """
+        :param float tolerance: The highest distance of two points to count as a pair. It may not be bigger than the
+                                cell size. If this is None the cell size is used.
+        :returns: All pairs of points that are not further apart than the tolerance in the shape (pairs, 2).
+                  The first index of every pair is the smaller one.
+        :rtype: numpy.ndarray
+        """
+        if tolerance is None:
+            tolerance = self.cell_size
+        elif tolerance > self.cell_size:
+            raise ValueError('The tolerance {0:g} is bigger than the cell size {1:g}.'.format(tolerance,
+                                                                                             self.cell_size))
+
+        result = [np.zeros((0, 2), dtype=topology.INDEX_DTYPE)]
+        cells = np.arange(self.cell_count)
+        for offset in HALF_NEIGHBOURS:
+            if offset == (0, 0, 0):
+                # only cells with more than one point can contain pairs
+                cells_a = cells_b = np.flatnonzero(np.diff(self.cell_offsets) > 1)
+            else:
+                neighbour_keys = self.cell_keys + self._get_keys(np.array(offset, dtype=np.int64))
+                # the neighbour keys are sorted as well, which makes searchsorted a lot faster
+                found = np.minimum(np.searchsorted(self.cell_keys, neighbour_keys), self.cell_count - 1)
+                exists = self.cell_keys[found] == neighbour_keys
+                cells_a, cells_b = cells[exists], found[exists]
+            points_a, points_b = self._get_cell_pairs(cells_a, cells_b, same_cell=offset == (0, 0, 0))
+
+            distances = np.sum((self.points[points_a] - self.points[points_b]) ** 2, axis=1)
+            close = distances <= tolerance ** 2
+            points_a, points_b = points_a[close], points_b[close]
+            result.append(np.column_stack((np.minimum(points_a, points_b),
+                                           np.maximum(points_a, points_b))).astype(topology.INDEX_DTYPE))
+        return np.concatenate(result)
+
+    def find_nearest(self, query_points, tolerance=None):
+        """
+        :param numpy.ndarray query_points: The points to search for in the shape (n, 3).
+        :param float tolerance: The highest distance of a point to the query point. It may not be bigger than the
+                                cell size. If this is None the cell size is used.
+        :returns: The index of the nearest point of every query point (or -1 if there is none within the tolerance)
+                  and the number of points within the tolerance of every query point.
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if tolerance is None:
+            tolerance = self.cell_size
+        elif tolerance > self.cell_size:
+            raise ValueError('The tolerance {0:g} is bigger than the cell size {1:g}.'.format(tolerance,
+                                                                                             self.cell_size))
+
+        query_points = np.asarray(query_points, dtype=np.float64).reshape(-1, 3)
+        if not self.cell_count:
+            return (np.full(len(query_points), -1, dtype=topology.INDEX_DTYPE),
+                    np.zeros(len(query_points), dtype=topology.INDEX_DTYPE))
+
+        scaled = (query_points - self.minimum) / self.cell_size
+        query_cells = np.floor(scaled).astype(np.int64) + 1
+        # query points outside of the grid have no points around them and would get the keys of wrong cells
+        queries = np.flatnonzero(((query_cells >= 0) & (query_cells < self.dimensions)).all(axis=1))
+        query_keys = self._get_keys(query_cells[queries])
+        # sorted keys make searchsorted a lot faster and every subset of them is still sorted
+        order = np.argsort(query_keys)
+        queries, query_keys = queries[order], query_keys[order]
+        query_cells = query_cells[queries]
+
+        # a neighbour cell only has to be searched if the query point is within the tolerance of the shared border,
+        # so with cells that are a few times bigger than the tolerance most query points only search their own cell
+        border_distances = (scaled[queries] - (query_cells - 1)) * self.cell_size
+        near = {-1: (border_distances <= tolerance) & (query_cells > 0),
+                0: np.ones(query_cells.shape, dtype=bool),
+                1: (self.cell_size - border_distances <= tolerance) & (query_cells < self.dimensions - 1)}
+
+        cell_sizes = np.diff(self.cell_offsets)
+        all_queries, all_points = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for offset in NEIGHBOURS:
+            search = near[offset[0]][:, 0] & near[offset[1]][:, 1] & near[offset[2]][:, 2]
+            keys = query_keys[search] + self._get_keys(np.array(offset, dtype=np.int64))
+            found = np.minimum(np.searchsorted(self.cell_keys, keys), self.cell_count - 1)
+            exists = self.cell_keys[found] == keys
+            found = found[exists]
+            points = topology.gather(self.cell_offsets, self.order, found)
+            found_queries = np.repeat(queries[search][exists], cell_sizes[found])
+
+            close = np.sum((query_points[found_queries] - self.points[points]) ** 2, axis=1) <= tolerance ** 2
+            all_queries.append(found_queries[close])
+            all_points.append(points[close])
+
+        queries = np.concatenate(all_queries)
+        points = np.concatenate(all_points)
+        distances = np.sum((query_points[queries] - self.points[points]) ** 2, axis=1)
+        # sorted by query and distance, the first point of every query is its nearest one
+        order = np.lexsort((distances, queries))
+        queries, points = queries[order], points[order]
+        first = np.concatenate(([True], queries[1:] != queries[:-1]))[:len(queries)]
+
+        nearest = np.full(len(query_points), -1, dtype=topology.INDEX_DTYPE)
+        nearest[queries[first]] = points[first]
+        return nearest, np.bincount(queries, minlength=len(query_points)).astype(topology.INDEX_DTYPE)
+
+    def _get_cell_pairs(self, cells_a, cells_b, same_cell):
+        """
+        :returns: The point indices of every combination of a point in cells_a with a point in the matching cells_b.
+                  Within the same cell every pair is returned once.
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        starts_a = self.cell_offsets[cells_a]
+        starts_b = self.cell_offsets[cells_b]
+        counts_a = self.cell_offsets[cells_a + 1] - starts_a
+        counts_b = self.cell_offsets[cells_b + 1] - starts_b
+        sizes = counts_a * counts_b
+
+        cell_pair = np.repeat(np.arange(len(cells_a)), sizes)
+        local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        positions_a = starts_a[cell_pair] + local // counts_b[cell_pair]
+        positions_b = starts_b[cell_pair] + local % counts_b[cell_pair]
+        if same_cell:
+            keep = positions_a < positions_b
+            positions_a, positions_b = positions_a[keep], positions_b[keep]
+        return self.order[positions_a], self.order[positions_b]
+
+
+def find_overlapping_points(points, tolerance):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param float tolerance: The highest distance of two points to count as overlapping.
+    :returns: The sorted indices of all points that have at least one other point within the tolerance.
+    :rtype: numpy.ndarray
+    """
+    pairs = SpatialHash(points, tolerance).find_pairs(tolerance)
+    return topology.to_indices(topology.to_mask(pairs.ravel(), len(points)))
+
+
+def get_weld_map(points, tolerance):
+    """
+    Points are welded if they are within the tolerance of each other, also over several steps (a chain of points that
+    are each close to the next one ends up as one point).
+
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param float tolerance:
+    :returns: The index of the point every point gets welded into, which is the lowest index of its group.
+    :rtype: numpy.ndarray
+    """
+    pairs = SpatialHash(points, tolerance).find_pairs(tolerance)
+    return topology.get_connected_labels(pairs, len(points))
+
+
+def weld(face_counts, face_vertices, points, tolerance):
+    """
+    Welds all vertices within the tolerance of each other. Every welded vertex is moved to the center of its group.
+    Faces lose the face-vertices that fall together with their neighbour and faces with less than 3 vertices left
+    are removed.
+
+    :param list[int] face_counts: The number of vertices of every face.
+    :param list[int] face_vertices: The vertices of all faces in winding order, concatenated.
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param float tolerance:
+    :returns: The new face counts, face vertices and points and the new index of every old vertex.
+    :rtype: tuple[numpy.ndarray]
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    face_counts = np.asarray(face_counts, dtype=topology.INDEX_DTYPE)
+    face_vertices = np.asarray(face_vertices, dtype=topology.INDEX_DTYPE)
+
+    labels = get_weld_map(points, tolerance)
+    kept, vertex_map = np.unique(labels, return_inverse=True)
+    group_sizes = np.bincount(vertex_map, minlength=len(kept)).astype(np.float64)
+    new_points = np.column_stack([np.bincount(vertex_map, weights=points[:, axis], minlength=len(kept))
+                                  for axis in range(3)]) / group_sizes[:, np.newaxis]
+
+    new_face_vertices = vertex_map[face_vertices]
+    faces = np.repeat(np.arange(len(face_counts)), face_counts)
+    face_offsets = np.cumsum(face_counts) - face_counts
+    # drop every face-vertex that falls onto the previous face-vertex of its face
+    previous = np.arange(-1, len(face_vertices) - 1)
+    previous[face_offsets[face_counts > 0]] = (face_offsets + face_counts - 1)[face_counts > 0]
+    keep = new_face_vertices != new_face_vertices[previous]
+    new_face_counts = np.bincount(faces[keep], minlength=len(face_counts))
+
+    valid_faces = new_face_counts >= 3
+    keep &= valid_faces[faces]
+    return (new_face_counts[valid_faces].astype(topology.INDEX_DTYPE),
+            new_face_vertices[keep].astype(topology.INDEX_DTYPE),
+            new_points,
+            vertex_map.astype(topology.INDEX_DTYPE))
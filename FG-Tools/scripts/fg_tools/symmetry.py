@@ -0,0 +1,240 @@
+"""
+Mirror symmetry of meshes: finding the symmetry plane and the mirror vertex of every vertex.
+
+The mirror vertices are found with a spatial hash over the mirrored positions. Vertices without a unique match (i.e.
+the mesh is slightly asymmetric or vertices overlap) are matched over the topology afterwards: the mirror of a vertex
+has to be a neighbour of the mirrors of its neighbours.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import spatial
+import topology
+
+
+AXES = ('x', 'y', 'z')
+
+# How many points are used to score the candidate planes in find_symmetry_plane().
+SAMPLE_COUNT = 10000
+
+# The cells of the spatial hash are this many times bigger than the tolerance, so most mirrored points only have to be
+# searched in their own cell.
+CELL_SCALE = 4
+
+
+def mirror_points(points, axis, center):
+    """
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param int axis: 0, 1 or 2 for the x-, y- or z-axis.
+    :param float center: The position of the mirror plane on the axis.
+    :returns: The points mirrored on the plane.
+    :rtype: numpy.ndarray
+    """
+    mirrored = np.array(points, dtype=np.float64).reshape(-1, 3)
+    mirrored[:, axis] = 2 * center - mirrored[:, axis]
+    return mirrored
+
+
+def find_symmetry_plane(points, tolerance, axes=(0, 1, 2), spatial_hash=None):
+    """
+    Tries planes along the given axes through the center of the bounding box and through the origin and scores them by
+    how many points have a mirrored counterpart.
+
+    :param numpy.ndarray points: The points in the shape (n, 3).
+    :param float tolerance: The highest distance of a mirrored point to its counterpart.
+    :param tuple[int] axes: The axes to try.
+    :param spatial.SpatialHash spatial_hash: A spatial hash of the points with a cell size of at least the tolerance.
+                                             If this is None it will be built.
+    :returns: The axis, the position of the plane on the axis and the fraction of points that have a counterpart.
+    :rtype: tuple[int, float, float]
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if not len(points):
+        return axes[0], 0.0, 0.0
+    if spatial_hash is None:
+        spatial_hash = spatial.SpatialHash(points, tolerance * CELL_SCALE)
+    samples = points[::max(len(points) // SAMPLE_COUNT, 1)]
+
+    best = None
+    for axis in axes:
+        for center in ((points[:, axis].min() + points[:, axis].max()) / 2.0, 0.0):
+            nearest, _ = spatial_hash.find_nearest(mirror_points(samples, axis, center), tolerance)
+            score = np.mean(nearest >= 0)
+            if best is None or score > best[2]:
+                best = (axis, float(center), float(score))
+    return best
+
+
+class MirrorMap(object):
+    """
+    The mirror vertex of every vertex of a mesh.
+
+    Usage::
+
+        mirror_map = MirrorMap.build(topo, points, tolerance=0.001)
+        mirror_map.mirror([0, 1], topology.FACE)  # -> the faces on the other side
+        new_points = mirror_map.symmetrize(points)
+    """
+
+    def __init__(self, topo, vertex_map, axis, center):
+        """
+        :param topology.MeshTopology topo:
+        :param numpy.ndarray vertex_map: The mirror vertex of every vertex or -1 for vertices without a mirror.
+                                         Vertices on the mirror plane are their own mirror.
+        :param int axis: 0, 1 or 2 for the x-, y- or z-axis.
+        :param float center: The position of the mirror plane on the axis.
+        """
+        self.topology = topo
+        self.vertex_map = np.asarray(vertex_map, dtype=topology.INDEX_DTYPE)
+        self.axis = axis
+        self.center = center
+
+    @classmethod
+    def build(cls, topo, points, tolerance, axis=None):
+        """
+        :param topology.MeshTopology topo:
+        :param numpy.ndarray points: The points in the shape (n, 3).
+        :param float tolerance: The highest distance of a mirrored point to its counterpart.
+        :param int axis: 0, 1 or 2 for the x-, y- or z-axis. If this is None the axis will be detected.
+        :rtype: MirrorMap
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        spatial_hash = spatial.SpatialHash(points, tolerance * CELL_SCALE)
+        axis, center, _ = find_symmetry_plane(points,
+                                              tolerance,
+                                              axes=(0, 1, 2) if axis is None else (axis,),
+                                              spatial_hash=spatial_hash)
+        mirrored = mirror_points(points, axis, center)
+
+        nearest, counts = spatial_hash.find_nearest(mirrored, tolerance)
+        # ambiguous matches are left to the topology
+        vertex_map = np.where(counts == 1, nearest, -1)
+        # a match is only valid if it goes both ways
+        matched = vertex_map >= 0
+        matched[matched] = vertex_map[vertex_map[matched]] == np.flatnonzero(matched)
+        vertex_map[~matched] = -1
+
+        _match_over_topology(topo, mirrored, points, vertex_map)
+        return cls(topo, vertex_map, axis, center)
+
+    @property
+    def axis_name(self):
+        """
+        :returns: "x", "y" or "z".
+        :rtype: str
+        """
+        return AXES[self.axis]
+
+    @property
+    def unmatched_vertices(self):
+        """
+        :returns: The vertices without a mirror vertex.
+        :rtype: numpy.ndarray
+        """
+        return topology.to_indices(self.vertex_map < 0)
+
+    def mirror(self, indices, component_type):
+        """
+        :param numpy.ndarray indices: The component indices.
+        :param str component_type: "vertex", "edge" or "face".
+        :returns: The sorted indices of the mirrored components. Components without a mirror are left out.
+        :rtype: numpy.ndarray
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        topo = self.topology
+        if component_type == topology.VERTEX:
+            mirrored = self.vertex_map[indices]
+        elif component_type == topology.EDGE:
+            vertices = self.vertex_map[topo.edge_vertices[indices]]
+            mirrored = topo.find_edges(vertices[:, 0], vertices[:, 1])
+        else:
+            # the mirrored face is the one the mirrors of its first two edges share
+            starts = topo.face_offsets[indices]
+            vertices = [self.vertex_map[topo.face_vertices[starts + i]] for i in range(3)]
+            edges_a = topo.find_edges(vertices[0], vertices[1])
+            edges_b = topo.find_edges(vertices[1], vertices[2])
+            faces_a = self._get_first_and_last_faces(edges_a)
+            faces_b = self._get_first_and_last_faces(edges_b)
+            mirrored = np.full(len(indices), -1, dtype=np.int64)
+            for faces in faces_a:
+                shared = (faces >= 0) & ((faces == faces_b[0]) | (faces == faces_b[1])) & (mirrored < 0)
+                mirrored[shared] = faces[shared]
+        return topology.to_indices(topology.to_mask(mirrored[mirrored >= 0], topo.get_count(component_type)))
+
+    def _get_first_and_last_faces(self, edges):
+        """
+        :returns: The first and the last face of every edge (which are the two faces of a manifold edge) or -1 for
+                  edges that do not exist or have no faces.
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        edges = np.asarray(edges, dtype=np.int64)
+        offsets = self.topology.edge_face_offsets
+        has_faces = np.zeros(len(edges), dtype=bool)
+        has_faces[edges >= 0] = np.diff(offsets)[edges[edges >= 0]] > 0
+        first = np.full(len(edges), -1, dtype=np.int64)
+        last = np.full(len(edges), -1, dtype=np.int64)
+        first[has_faces] = self.topology.edge_faces[offsets[edges[has_faces]]]
+        last[has_faces] = self.topology.edge_faces[offsets[edges[has_faces] + 1] - 1]
+        return first, last
+
+    def symmetrize(self, points, positive=True, vertices=None):
+        """
+        Mirrors the points of one side of the plane onto their mirror vertices on the other side. Points on the plane
+        are moved onto it.
+
+        :param numpy.ndarray points: The points in the shape (n, 3).
+        :param bool positive: If this is True the positive side is mirrored onto the negative one, otherwise the
+                              negative side onto the positive one.
+        :param numpy.ndarray vertices: Only these vertices are moved. If this is None all vertices can be moved.
+        :returns: The symmetric points.
+        :rtype: numpy.ndarray
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        result = points.copy()
+        offsets = points[:, self.axis] - self.center
+        sources = np.flatnonzero((self.vertex_map >= 0) & ((offsets >= 0) if positive else (offsets <= 0)))
+        targets = self.vertex_map[sources]
+        if vertices is not None:
+            movable = topology.to_mask(vertices, len(points))
+            sources, targets = sources[movable[targets]], targets[movable[targets]]
+
+        result[targets] = mirror_points(points[sources], self.axis, self.center)
+        on_plane = targets[targets == sources]
+        result[on_plane, self.axis] = self.center
+        return result
+
+
+def _match_over_topology(topo, mirrored, points, vertex_map):
+    """
+    Matches the vertices without a mirror vertex over their neighbours: the mirror of a vertex has to be a neighbour of
+    the mirrors of all its matched neighbours. If that leaves more than one candidate the one closest to the mirrored
+    position wins. This repeats until no more vertices can be matched.
+
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray mirrored: The mirrored points.
+    :param numpy.ndarray points: The points.
+    :param numpy.ndarray vertex_map: The mirror vertex of every vertex or -1. It will be filled in place.
+    """
+    unmatched = np.flatnonzero(vertex_map < 0).tolist()
+    while unmatched:
+        left = []
+        for vertex in unmatched:
+            if vertex_map[vertex] >= 0:
+                continue
+            candidates = None
+            for neighbour in topo.get_neighbour_vertices(vertex).tolist():
+                if vertex_map[neighbour] >= 0:
+                    neighbours = set(topo.get_neighbour_vertices(vertex_map[neighbour]).tolist())
+                    candidates = neighbours if candidates is None else candidates & neighbours
+            candidates = [candidate for candidate in candidates or () if vertex_map[candidate] < 0]
+            if not candidates:
+                left.append(vertex)
+                continue
+            distances = np.sum((points[candidates] - mirrored[vertex]) ** 2, axis=1)
+            candidate = candidates[int(np.argmin(distances))]
+            vertex_map[vertex] = candidate
+            vertex_map[candidate] = vertex
+        if len(left) == len(unmatched):
+            return
+        unmatched = left
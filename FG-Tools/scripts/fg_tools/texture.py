@@ -0,0 +1,185 @@
+"""
+Functions to collect and check the textures a scene depends on.
+"""
+import os
+
+import maya.cmds as cmds
+
+import file_system
+import image_header
+import parallel
+import texture_index
+import texture_tokens
+
+
+# The texture node types we know of and the attribute that holds their file path.
+# "computedFileTextureNamePattern" keeps the <UDIM> and <f> tokens of file nodes with tiling or frame extensions.
+TEXTURE_ATTRIBUTES = {'file': 'computedFileTextureNamePattern',
+                      'aiImage': 'filename'}
+
+# The header index is shared by all texture functions and persisted in the temp folder of the Maya user.
+TEXTURE_INDEX = None
+
+
+def get_texture_paths():
+    """
+    :returns: The file paths (with unexpanded UDIM and frame tokens) of all texture nodes in the scene and the nodes
+              that use them in the format {path: [node, ...]}.
+    :rtype: dict[str, list[str]]
+    """
+    texture_paths = {}
+    for node_type, attr in TEXTURE_ATTRIBUTES.items():
+        if node_type not in cmds.allNodeTypes():
+            continue
+        for node in cmds.ls(type=node_type):
+            file_path = cmds.getAttr(node + '.' + attr)
+            if not file_path and node_type == 'file':
+                file_path = cmds.getAttr(node + '.fileTextureName')
+            if file_path:
+                texture_paths.setdefault(resolve_path(file_path), []).append(node)
+    return texture_paths
+
+
+def resolve_path(file_path):
+    """
+    :param str file_path: A texture path as Maya stores it. It can be relative to the project or contain environment
+                          variables.
+    :returns: The absolute texture path.
+    :rtype: str
+    """
+    file_path = os.path.expandvars(file_path)
+    if not os.path.isabs(file_path):
+        file_path = cmds.workspace(expandName=file_path)
+    return file_path.replace('\\', '/')
+
+
+def get_file_size(file_path):
+    """
+    :param str file_path:
+    :returns: The size of the given file in bytes or None if the file does not exist.
+    :rtype: int|None
+    """
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return None
+
+
+def is_inside_folder(file_path, folder):
+    """
+    :param str file_path:
+    :param str folder:
+    :returns: Whether the given file lies somewhere below the given folder.
+    :rtype: bool
+    """
+    folder = os.path.normcase(os.path.abspath(folder)).rstrip('\\/') + os.sep
+    return os.path.normcase(os.path.abspath(file_path)).startswith(folder)
+
+
+def audit_textures(texture_paths=None, project_folder=None, threads=parallel.IO_THREADS):
+    """
+    Checks whether all given texture paths resolve. The token expansion and the file stats run in a thread pool,
+    since on network storage the latency of every single request is the bottleneck.
+
+    :param dict[str, list[str]] texture_paths: {path: [node, ...]} like get_texture_paths() returns it.
+                                               If this is None the textures of the current scene will be used.
+    :param str project_folder: The folder all textures should be in. If this is None the current project is used.
+    :param int threads: The number of threads to stat the files with.
+    :returns: The audit in the format:
+              {'missing': [path, ...],          # paths (or token patterns) that resolve to no file
+               'empty': [path, ...],            # zero-byte files
+               'outside_project': [path, ...],  # existing files that live outside the project folder
+               'sizes': {path: bytes, ...},     # every existing file
+               'total_bytes': int,
+               'nodes': {path: [node, ...]}}    # the texture nodes for every path or token pattern
+    :rtype: dict
+    """
+    if texture_paths is None:
+        texture_paths = get_texture_paths()
+    if project_folder is None:
+        project_folder = cmds.workspace(query=True, rootDirectory=True)
+
+    patterns = sorted(texture_paths)
+    expanded = parallel.thread_map(texture_tokens.expand_path, patterns, threads=threads)
+
+    nodes = {}
+    missing = []
+    for pattern, file_paths in zip(patterns, expanded):
+        if not file_paths:
+            missing.append(pattern)
+        for file_path in file_paths:
+            nodes.setdefault(file_path, []).extend(texture_paths[pattern])
+    for pattern in missing:
+        nodes[pattern] = texture_paths[pattern]
+
+    file_paths = sorted(set(file_path for file_paths in expanded for file_path in file_paths))
+    sizes = dict(zip(file_paths, parallel.thread_map(get_file_size, file_paths, threads=threads)))
+
+    missing.extend(file_path for file_path in file_paths if sizes[file_path] is None)
+    sizes = dict((file_path, size) for file_path, size in sizes.items() if size is not None)
+
+    return {'missing': sorted(missing),
+            'empty': sorted(file_path for file_path, size in sizes.items() if size == 0),
+            'outside_project': sorted(file_path for file_path in sizes
+                                      if not is_inside_folder(file_path, project_folder)),
+            'sizes': sizes,
+            'total_bytes': sum(sizes.values()),
+            'nodes': nodes}
+
+
+def get_texture_index():
+    """
+    :returns: The texture index of this session. It will be loaded from the Maya user temp folder on first use.
+    :rtype: texture_index.TextureIndex
+    """
+    global TEXTURE_INDEX
+
+    if TEXTURE_INDEX is None:
+        TEXTURE_INDEX = texture_index.TextureIndex(os.path.join(cmds.internalVar(userTmpDir=True),
+                                                                'fg_texture_index.json'))
+    return TEXTURE_INDEX
+
+
+def index_sourceimages_folder(threads=parallel.IO_THREADS):
+    """
+    Reads the headers of all images in the sourceimages folder of the current project into the texture index.
+
+    :param int threads: The number of threads to read the headers with.
+    :returns: The headers of all images in the format {path: header}.
+    :rtype: dict[str, dict|None]
+    """
+    index = get_texture_index()
+    headers = index.update_folder(file_system.get_sourceimages_folder(), threads=threads)
+    index.save()
+    return headers
+
+
+def estimate_texture_memory(texture_paths=None, mipmaps=False, threads=parallel.IO_THREADS):
+    """
+    Estimates the memory the textures of the scene take up once they are decoded. Only the image headers are read and
+    they are cached in the texture index, so only new or changed files are read again.
+
+    :param dict[str, list[str]] texture_paths: {path: [node, ...]} like get_texture_paths() returns it.
+                                               If this is None the textures of the current scene will be used.
+    :param bool mipmaps: Whether to add the memory for a full mipmap chain of every texture.
+    :param int threads: The number of threads to read the headers with.
+    :returns: The estimation in the format:
+              {'sizes': {path: bytes, ...},  # the decoded size of every readable texture
+               'unreadable': [path, ...],    # missing files or unsupported formats
+               'total_bytes': int}
+    :rtype: dict
+    """
+    if texture_paths is None:
+        texture_paths = get_texture_paths()
+
+    expanded = parallel.thread_map(texture_tokens.expand_path, texture_paths, threads=threads)
+    file_paths = sorted(set(file_path for file_paths in expanded for file_path in file_paths))
+    index = get_texture_index()
+    headers = index.update(file_paths, threads=threads)
+    index.save()
+
+    sizes = dict((file_path, image_header.get_decoded_size(header, mipmaps=mipmaps))
+                 for file_path, header in headers.items() if header is not None)
+    return {'sizes': sizes,
+            'unreadable': sorted(file_path for file_path, header in headers.items() if header is None),
+            'total_bytes': sum(sizes.values())}
@@ -0,0 +1,142 @@
+"""
+An index of image headers that is cached by path and modification time.
+
+This module does not depend on Maya.
+"""
+import json
+import os
+
+import image_header
+import parallel
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.exr', '.tga')
+
+
+class TextureIndex(object):
+    """
+    Keeps the header information of image files, so only new or changed files have to be read again.
+    The headers are read in a pool of threads, which keeps tens of thousands of files per minute going even on
+    network storage.
+
+    Usage::
+
+        index = TextureIndex('/tmp/texture_index.json')
+        index.update_folder('/project/sourceimages')
+        print index.get_decoded_size(['/project/sourceimages/wood.exr'])
+        index.save()
+    """
+
+    def __init__(self, cache_file=None):
+        """
+        :param str cache_file: A json file to persist the index between sessions. It will be loaded if it exists.
+        """
+        # {path: [mtime, header]}
+        self._entries = {}
+        self.cache_file = cache_file
+        if cache_file is not None and os.path.exists(cache_file):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, file_path):
+        return file_path in self._entries
+
+    def get(self, file_path):
+        """
+        :param str file_path:
+        :returns: The cached header of the given file (see image_header.read_header()).
+                  None if the file is not indexed or no readable image.
+        :rtype: dict|None
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def update(self, file_paths, threads=parallel.IO_THREADS):
+        """
+        Reads the headers of all given files that are new or changed since they were indexed.
+
+        :param list[str] file_paths:
+        :param int threads: The number of threads to read the files with.
+        :returns: The headers of the given files in the format {path: header}. Unreadable files have None as header.
+        :rtype: dict[str, dict|None]
+        """
+        file_paths = list(file_paths)
+        jobs = [(file_path, self._entries.get(file_path)) for file_path in file_paths]
+        for file_path, entry in zip(file_paths, parallel.thread_map(_index_file, jobs, threads=threads)):
+            if entry is None:
+                self._entries.pop(file_path, None)
+            else:
+                self._entries[file_path] = entry
+        return dict((file_path, self.get(file_path)) for file_path in file_paths)
+
+    def update_folder(self, folder, threads=parallel.IO_THREADS):
+        """
+        Indexes all images in the given folder and its sub folders.
+
+        :param str folder:
+        :param int threads: The number of threads to read the files with.
+        :returns: The headers of all images in the folder in the format {path: header}.
+        :rtype: dict[str, dict|None]
+        """
+        return self.update(find_images(folder), threads=threads)
+
+    def get_decoded_size(self, file_paths, mipmaps=False):
+        """
+        :param list[str] file_paths: Files that have been indexed with update() before.
+        :param bool mipmaps: Whether to add the memory for a full mipmap chain of every texture.
+        :returns: The memory in bytes the given images take up once they are decoded.
+        :rtype: int
+        """
+        headers = [self.get(file_path) for file_path in file_paths]
+        return sum(image_header.get_decoded_size(header, mipmaps=mipmaps) for header in headers if header)
+
+    def load(self):
+        """
+        Loads the index from the cache file.
+        """
+        with open(self.cache_file, 'r') as cache:
+            self._entries = json.load(cache)
+
+    def save(self):
+        """
+        Saves the index to the cache file.
+        """
+        folder = os.path.dirname(self.cache_file)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(self.cache_file, 'w') as cache:
+            json.dump(self._entries, cache)
+
+
+def find_images(folder):
+    """
+    :param str folder:
+    :returns: All images with a supported extension in the given folder and its sub folders.
+    :rtype: list[str]
+    """
+    images = []
+    for root, _, file_names in os.walk(folder):
+        images.extend(os.path.join(root, file_name).replace('\\', '/')
+                      for file_name in file_names
+                      if file_name.lower().endswith(IMAGE_EXTENSIONS))
+    return images
+
+
+def _index_file(job):
+    """
+    :param tuple job: The file path and its current index entry (or None) in the format (path, [mtime, header]).
+    :returns: The up to date entry in the format [mtime, header] or None if the file does not exist.
+    :rtype: list|None
+    """
+    file_path, entry = job
+    try:
+        mtime = os.stat(file_path).st_mtime
+    except OSError:
+        return None
+    if entry is not None and entry[0] == mtime:
+        return entry
+    return [mtime, image_header.read_header(file_path)]
@@ -0,0 +1,57 @@
+"""
+Expands the UDIM, tile and frame tokens of texture paths to the files that exist on disk.
+
+This module does not depend on Maya.
+"""
+import os
+import re
+
+
+# UDIM, ZBrush/Mudbox tiles (<u>, <v>), frame numbers (<f>, <f4>), hashes (####) and printf (%04d) style tokens.
+TOKEN_PATTERN = re.compile(r'<udim>|<tile>|<u>|<v>|<f\d*>|#+|%0?\d*d', re.IGNORECASE)
+
+
+def has_tokens(file_path):
+    """
+    :param str file_path:
+    :returns: Whether the file name contains UDIM, tile or frame tokens.
+    :rtype: bool
+    """
+    return TOKEN_PATTERN.search(os.path.basename(file_path)) is not None
+
+
+def get_token_regex(file_name):
+    """
+    :param str file_name: A file name with UDIM, tile or frame tokens, i.e. "diffuse.<UDIM>.tif".
+    :returns: A regex that matches all file names the given tokens could expand to.
+    :rtype: re.RegexObject
+    """
+    regex = ''
+    last_end = 0
+    for match in TOKEN_PATTERN.finditer(file_name):
+        regex += re.escape(file_name[last_end:match.start()])
+        regex += r'\d{4}' if match.group().lower() == '<udim>' else r'\d+'
+        last_end = match.end()
+    regex += re.escape(file_name[last_end:]) + '$'
+    return re.compile(regex, re.IGNORECASE if os.name == 'nt' else 0)
+
+
+def expand_path(file_path):
+    """
+    Expands the UDIM, tile and frame tokens of the given path to the files that exist on disk.
+
+    :param str file_path:
+    :returns: All files the given path refers to. A path without tokens is returned as is, even if it does not exist.
+              A path with tokens that matches no files returns an empty list.
+    :rtype: list[str]
+    """
+    if not has_tokens(file_path):
+        return [file_path]
+
+    folder, file_name = os.path.split(file_path)
+    regex = get_token_regex(file_name)
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    return sorted(folder + '/' + name for name in names if regex.match(name))
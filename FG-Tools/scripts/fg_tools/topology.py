@@ -0,0 +1,483 @@
+"""
+Mesh connectivity as compressed sparse row (CSR) arrays.
+
+A MeshTopology is built once from the face counts and face vertices of a mesh (the same arrays MFnMesh.getVertices()
+returns). Everything else is derived from that with vectorized numpy operations: the edges, vertex<->edge,
+edge<->face and face<->vertex adjacency. Component conversion, growing/shrinking and edge loops/rings work on index
+arrays and never go through component names.
+
+Every adjacency is stored as a pair of arrays: "<a>_<b>_offsets" and "<a>_<b>s". The <b>s of the <a> with the index i
+are <a>_<b>s[<a>_<b>_offsets[i]:<a>_<b>_offsets[i + 1]].
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+
+INDEX_DTYPE = np.int32
+
+VERTEX = 'vertex'
+EDGE = 'edge'
+FACE = 'face'
+COMPONENT_TYPES = (VERTEX, EDGE, FACE)
+
+
+def build_csr(rows, columns, row_count):
+    """
+    :param numpy.ndarray rows: The row index of every entry.
+    :param numpy.ndarray columns: The column index of every entry.
+    :param int row_count:
+    :returns: The offsets and the columns sorted by row. The order of the columns within a row is not defined.
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    rows = np.asarray(rows)
+    # a stable sort would keep the order within the rows, but it is about 3 times slower
+    order = np.argsort(rows)
+    offsets = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=row_count), out=offsets[1:])
+    return offsets, np.asarray(columns)[order].astype(INDEX_DTYPE)
+
+
+def gather(offsets, values, rows):
+    """
+    :param numpy.ndarray offsets: The offsets of a CSR adjacency.
+    :param numpy.ndarray values: The values of a CSR adjacency.
+    :param numpy.ndarray rows: The rows to gather.
+    :returns: The values of all given rows concatenated.
+    :rtype: numpy.ndarray
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    total = lengths.sum()
+    if not total:
+        return np.zeros(0, dtype=values.dtype)
+    # the position of every gathered value: its row start plus its position within the row
+    row_begins = np.cumsum(lengths) - lengths
+    positions = np.arange(total) - np.repeat(row_begins, lengths) + np.repeat(starts, lengths)
+    return values[positions]
+
+
+def to_mask(indices, count):
+    """
+    :param numpy.ndarray indices:
+    :param int count: The length of the mask.
+    :returns: A boolean array that is True for all given indices.
+    :rtype: numpy.ndarray
+    """
+    mask = np.zeros(count, dtype=bool)
+    mask[np.asarray(indices, dtype=np.int64)] = True
+    return mask
+
+
+def to_indices(mask):
+    """
+    :param numpy.ndarray mask: A boolean array.
+    :returns: The sorted indices of all True values.
+    :rtype: numpy.ndarray
+    """
+    return np.flatnonzero(mask).astype(INDEX_DTYPE)
+
+
+def get_connected_labels(pairs, count):
+    """
+    Finds the connected components of a graph with a vectorized union-find: the root of every pair with the higher
+    index gets hooked onto the lower one and the paths are compressed, until all pairs share the same root.
+
+    :param numpy.ndarray pairs: The connected elements in the shape (pairs, 2).
+    :param int count: The number of elements.
+    :returns: The label of every element, which is the lowest element index of its connected component.
+    :rtype: numpy.ndarray
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    labels = np.arange(count, dtype=np.int64)
+    while True:
+        labels_a = labels[pairs[:, 0]]
+        labels_b = labels[pairs[:, 1]]
+        differ = labels_a != labels_b
+        if not differ.any():
+            return labels.astype(INDEX_DTYPE)
+        pairs = pairs[differ]
+        labels_a, labels_b = labels_a[differ], labels_b[differ]
+        np.minimum.at(labels, np.maximum(labels_a, labels_b), np.minimum(labels_a, labels_b))
+        while True:
+            compressed = labels[labels]
+            if (compressed == labels).all():
+                break
+            labels = compressed
+
+
+class MeshTopology(object):
+    """
+    The connectivity of a polygon mesh.
+
+    Usage::
+
+        # two quads sharing the edge 1-4
+        topology = MeshTopology([4, 4], [0, 1, 4, 3, 1, 2, 5, 4])
+        topology.convert([0], FACE, VERTEX)  # -> [0, 1, 3, 4]
+        topology.grow([0], FACE)             # -> [0, 1]
+    """
+
+    def __init__(self, face_counts, face_vertices, edge_vertices=None, vertex_count=None):
+        """
+        :param list[int] face_counts: The number of vertices of every face.
+        :param list[int] face_vertices: The vertices of all faces in winding order, concatenated.
+        :param list[list[int]] edge_vertices: The two vertices of every edge, to keep the edge numbering of an
+                                              existing mesh. If this is None the edges are derived from the faces.
+        :param int vertex_count: The number of vertices. If this is None the highest vertex index + 1 will be used.
+        """
+        self.face_counts = np.asarray(face_counts, dtype=INDEX_DTYPE)
+        self.face_vertices = np.asarray(face_vertices, dtype=INDEX_DTYPE)
+        if vertex_count is None:
+            vertex_count = int(self.face_vertices.max()) + 1 if len(self.face_vertices) else 0
+        self.vertex_count = vertex_count
+        self.face_count = len(self.face_counts)
+
+        self.face_offsets = np.zeros(self.face_count + 1, dtype=np.int64)
+        np.cumsum(self.face_counts, out=self.face_offsets[1:])
+
+        # the face of every face-vertex
+        self.face_vertex_faces = np.repeat(np.arange(self.face_count, dtype=INDEX_DTYPE), self.face_counts)
+
+        # every face-vertex starts the edge to the next face-vertex of its face
+        next_face_vertex = np.arange(1, len(self.face_vertices) + 1, dtype=np.int64)
+        next_face_vertex[self.face_offsets[1:] - 1] = self.face_offsets[:-1]
+        self.face_vertex_next = next_face_vertex
+        edge_keys = self._get_edge_keys(self.face_vertices, self.face_vertices[next_face_vertex])
+
+        if edge_vertices is None:
+            unique_keys, self.face_edges = np.unique(edge_keys, return_inverse=True)
+            self.edge_vertices = np.column_stack((unique_keys // max(vertex_count, 1),
+                                                  unique_keys % max(vertex_count, 1))).astype(INDEX_DTYPE)
+            self._sorted_edge_keys = unique_keys
+            self._edge_key_order = np.arange(len(unique_keys))
+        else:
+            self.edge_vertices = np.asarray(edge_vertices, dtype=INDEX_DTYPE).reshape(-1, 2)
+            keys = self._get_edge_keys(self.edge_vertices[:, 0], self.edge_vertices[:, 1])
+            self._edge_key_order = np.argsort(keys)
+            self._sorted_edge_keys = keys[self._edge_key_order]
+            self.face_edges = self._edge_key_order[np.searchsorted(self._sorted_edge_keys, edge_keys)]
+        self.face_edges = self.face_edges.astype(INDEX_DTYPE)
+        self.edge_count = len(self.edge_vertices)
+
+        self.vertex_edge_offsets, self.vertex_edges = build_csr(self.edge_vertices.ravel(),
+                                                                np.repeat(np.arange(self.edge_count), 2),
+                                                                self.vertex_count)
+        self.edge_face_offsets, self.edge_faces = build_csr(self.face_edges,
+                                                            self.face_vertex_faces,
+                                                            self.edge_count)
+        self.vertex_face_offsets, self.vertex_faces = build_csr(self.face_vertices,
+                                                                self.face_vertex_faces,
+                                                                self.vertex_count)
+
+    def _get_edge_keys(self, vertices_a, vertices_b):
+        vertices_a = vertices_a.astype(np.int64)
+        vertices_b = vertices_b.astype(np.int64)
+        return np.minimum(vertices_a, vertices_b) * self.vertex_count + np.maximum(vertices_a, vertices_b)
+
+    def get_count(self, component_type):
+        """
+        :param str component_type: "vertex", "edge" or "face".
+        :returns: The number of components of the given type.
+        :rtype: int
+        """
+        return {VERTEX: self.vertex_count, EDGE: self.edge_count, FACE: self.face_count}[component_type]
+
+    @property
+    def edge_face_counts(self):
+        """
+        :returns: The number of faces of every edge.
+        :rtype: numpy.ndarray
+        """
+        return np.diff(self.edge_face_offsets)
+
+    @property
+    def vertex_valences(self):
+        """
+        :returns: The number of edges of every vertex.
+        :rtype: numpy.ndarray
+        """
+        return np.diff(self.vertex_edge_offsets)
+
+    def find_edges(self, vertices_a, vertices_b):
+        """
+        :param numpy.ndarray vertices_a:
+        :param numpy.ndarray vertices_b:
+        :returns: The edge between every pair of the given vertices or -1 where they share no edge.
+        :rtype: numpy.ndarray
+        """
+        vertices_a = np.asarray(vertices_a, dtype=np.int64)
+        vertices_b = np.asarray(vertices_b, dtype=np.int64)
+        if not self.edge_count:
+            return np.full(len(vertices_a), -1, dtype=INDEX_DTYPE)
+        keys = self._get_edge_keys(vertices_a, vertices_b)
+        positions = np.minimum(np.searchsorted(self._sorted_edge_keys, keys), self.edge_count - 1)
+        valid = (self._sorted_edge_keys[positions] == keys) & (vertices_a >= 0) & (vertices_b >= 0)
+        return np.where(valid, self._edge_key_order[positions], -1).astype(INDEX_DTYPE)
+
+    def get_neighbour_vertices(self, vertex):
+        """
+        :param int vertex:
+        :returns: The vertices that share an edge with the given vertex.
+        :rtype: numpy.ndarray
+        """
+        edges = self.vertex_edges[self.vertex_edge_offsets[vertex]:self.vertex_edge_offsets[vertex + 1]]
+        vertices = self.edge_vertices[edges].ravel()
+        return vertices[vertices != vertex]
+
+    def get_border_edges(self):
+        """
+        :returns: All edges with only one face.
+        :rtype: numpy.ndarray
+        """
+        return to_indices(self.edge_face_counts == 1)
+
+    def get_border_vertices(self):
+        """
+        :returns: All vertices that lie on a border edge.
+        :rtype: numpy.ndarray
+        """
+        return np.unique(self.edge_vertices[self.get_border_edges()].ravel())
+
+    def get_fan_triangles(self):
+        """
+        Splits every face into a fan of triangles around its first vertex.
+
+        :returns: The three vertices of every triangle in the shape (triangles, 3) and the face of every triangle.
+        :rtype: tuple[numpy.ndarray]
+        """
+        triangles, faces = self.get_fan_face_vertices()
+        return self.face_vertices[triangles], faces
+
+    def get_fan_face_vertices(self):
+        """
+        Like get_fan_triangles(), but the triangles are made of face-vertices, so they can look up per face-vertex
+        data like UVs.
+
+        :returns: The three face-vertices of every triangle in the shape (triangles, 3) and the face of every triangle.
+        :rtype: tuple[numpy.ndarray]
+        """
+        starts = self.face_offsets[self.face_vertex_faces]
+        positions = np.arange(len(self.face_vertices)) - starts
+        # every face-vertex except the first and the last of its face starts a triangle
+        fans = to_indices((positions >= 1) & (positions <= self.face_counts[self.face_vertex_faces] - 2))
+        return np.column_stack((starts[fans], fans, fans + 1)), self.face_vertex_faces[fans]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # conversion
+
+    def convert(self, indices, from_type, to_type, contained=False):
+        """
+        Converts components of one type to another.
+
+        :param numpy.ndarray indices: The component indices.
+        :param str from_type: "vertex", "edge" or "face".
+        :param str to_type: "vertex", "edge" or "face".
+        :param bool contained: If this is True only components that are completely made up of the given components
+                               are returned (i.e. the faces whose vertices are all given). Otherwise every component
+                               that touches the given components is returned.
+        :returns: The sorted indices of the converted components.
+        :rtype: numpy.ndarray
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if from_type == to_type:
+            return to_indices(to_mask(indices, self.get_count(to_type)))
+
+        if contained and from_type == EDGE and to_type == FACE:
+            # a face is contained if all its edges are, all its vertices are not enough
+            edges = to_mask(indices, self.edge_count)
+            return to_indices(np.bincount(self.face_vertex_faces,
+                                          weights=edges[self.face_edges],
+                                          minlength=self.face_count) == self.face_counts)
+        if contained and COMPONENT_TYPES.index(to_type) > COMPONENT_TYPES.index(from_type):
+            # a face (or edge) is contained if all its vertices are
+            vertices = to_mask(self.convert(indices, from_type, VERTEX), self.vertex_count)
+            if to_type == EDGE:
+                return to_indices(vertices[self.edge_vertices].all(axis=1))
+            return to_indices(np.bincount(self.face_vertex_faces,
+                                          weights=vertices[self.face_vertices],
+                                          minlength=self.face_count) == self.face_counts)
+
+        if from_type == VERTEX:
+            if to_type == EDGE:
+                converted = gather(self.vertex_edge_offsets, self.vertex_edges, indices)
+            else:
+                converted = gather(self.vertex_face_offsets, self.vertex_faces, indices)
+        elif from_type == EDGE:
+            if to_type == VERTEX:
+                converted = self.edge_vertices[indices].ravel()
+            else:
+                converted = gather(self.edge_face_offsets, self.edge_faces, indices)
+        else:
+            if to_type == VERTEX:
+                converted = gather(self.face_offsets, self.face_vertices, indices)
+            else:
+                converted = gather(self.face_offsets, self.face_edges, indices)
+        # a mask is a lot faster than sorting the (many duplicate) indices
+        return to_indices(to_mask(converted, self.get_count(to_type)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # grow / shrink
+
+    def grow(self, indices, component_type, steps=1):
+        """
+        Grows the given components by their neighbours. Vertices and faces grow over faces (like Maya's
+        "Grow Selection"), edges grow over their vertices.
+
+        :param numpy.ndarray indices: The component indices.
+        :param str component_type: "vertex", "edge" or "face".
+        :param int steps: How often to grow.
+        :returns: The sorted indices of the grown selection.
+        :rtype: numpy.ndarray
+        """
+        via = VERTEX if component_type in (EDGE, FACE) else FACE
+        indices = np.unique(np.asarray(indices, dtype=INDEX_DTYPE))
+        for _ in range(steps):
+            indices = self.convert(self.convert(indices, component_type, via), via, component_type)
+        return indices
+
+    def shrink(self, indices, component_type, steps=1):
+        """
+        Removes all components from the given selection that are next to an unselected component or lie on the border
+        of the mesh.
+
+        :param numpy.ndarray indices: The component indices.
+        :param str component_type: "vertex", "edge" or "face".
+        :param int steps: How often to shrink.
+        :returns: The sorted indices of the shrunk selection.
+        :rtype: numpy.ndarray
+        """
+        via = VERTEX if component_type in (EDGE, FACE) else FACE
+        selected = to_mask(indices, self.get_count(component_type))
+        border = self.convert(self.get_border_vertices(), VERTEX, component_type)
+        for _ in range(steps):
+            outside = self.convert(to_indices(~selected), component_type, via)
+            selected[self.convert(outside, via, component_type)] = False
+            selected[border] = False
+        return to_indices(selected)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # loops / rings
+
+    def _get_faces(self, edge):
+        return self.edge_faces[self.edge_face_offsets[edge]:self.edge_face_offsets[edge + 1]]
+
+    def _get_face_edges(self, face):
+        return self.face_edges[self.face_offsets[face]:self.face_offsets[face + 1]]
+
+    def _next_loop_edge(self, edge, vertex):
+        """
+        :returns: The edge that continues the loop of the given edge over the given vertex or -1 if the loop ends.
+                  The loop goes on over every vertex where exactly one edge does not share a face with the given edge
+                  (i.e. vertices with 4 edges inside of a mesh or 3 edges on its border).
+        :rtype: int
+        """
+        face_edges = set()
+        for face in self._get_faces(edge):
+            face_edges.update(self._get_face_edges(face).tolist())
+        candidates = [other for other in
+                      self.vertex_edges[self.vertex_edge_offsets[vertex]:self.vertex_edge_offsets[vertex + 1]].tolist()
+                      if other not in face_edges]
+        if len(candidates) != 1:
+            return -1
+        return candidates[0]
+
+    def _next_ring_edge(self, edge, face):
+        """
+        :returns: The edge opposite to the given edge in the given quad or -1 if the face is no quad.
+        :rtype: int
+        """
+        face_edges = self._get_face_edges(face)
+        if len(face_edges) != 4:
+            return -1
+        position = int(np.flatnonzero(face_edges == edge)[0])
+        return int(face_edges[(position + 2) % 4])
+
+    def _walk(self, edge, step, direction):
+        """
+        Walks from the given edge in one direction until the walk ends or comes back to the start.
+
+        :returns: The edges of the walk (without the start edge) and whether it came back to the start.
+        :rtype: tuple[list[int], bool]
+        """
+        walked = []
+        visited = {edge}
+        current, through = edge, direction
+        while True:
+            current, through = step(current, through)
+            if current < 0:
+                return walked, False
+            if current in visited:
+                return walked, current == edge
+            visited.add(current)
+            walked.append(current)
+
+    def get_edge_loop(self, edge):
+        """
+        :param int edge:
+        :returns: All edges of the loop through the given edge in order.
+        :rtype: numpy.ndarray
+        """
+        edge = int(edge)
+
+        def step(current, vertex):
+            next_edge = self._next_loop_edge(current, vertex)
+            if next_edge < 0:
+                return -1, -1
+            vertex_a, vertex_b = self.edge_vertices[next_edge].tolist()
+            return next_edge, vertex_b if vertex_a == vertex else vertex_a
+
+        vertex_a, vertex_b = self.edge_vertices[edge].tolist()
+        forward, closed = self._walk(edge, step, vertex_b)
+        backward = [] if closed else self._walk(edge, step, vertex_a)[0]
+        return np.array(backward[::-1] + [edge] + forward, dtype=INDEX_DTYPE)
+
+    def get_edge_ring(self, edge):
+        """
+        :param int edge:
+        :returns: All edges of the ring through the given edge in order.
+        :rtype: numpy.ndarray
+        """
+        edge = int(edge)
+
+        def step(current, face):
+            if face < 0:
+                return -1, -1
+            next_edge = self._next_ring_edge(current, face)
+            if next_edge < 0:
+                return -1, -1
+            # cross over to the neighbour face of the opposite edge, a border ends the ring after this edge
+            other_faces = [other for other in self._get_faces(next_edge).tolist() if other != face]
+            return next_edge, other_faces[0] if other_faces else -1
+
+        faces = self._get_faces(edge).tolist()
+        if not faces:
+            return np.array([edge], dtype=INDEX_DTYPE)
+        forward, closed = self._walk(edge, step, faces[0])
+        backward = [] if closed or len(faces) < 2 else self._walk(edge, step, faces[1])[0]
+        return np.array(backward[::-1] + [edge] + forward, dtype=INDEX_DTYPE)
+
+    def get_edge_loops(self, edges):
+        """
+        :param numpy.ndarray edges:
+        :returns: The sorted edges of the loops through all given edges.
+        :rtype: numpy.ndarray
+        """
+        return self._union_of_walks(edges, self.get_edge_loop)
+
+    def get_edge_rings(self, edges):
+        """
+        :param numpy.ndarray edges:
+        :returns: The sorted edges of the rings through all given edges.
+        :rtype: numpy.ndarray
+        """
+        return self._union_of_walks(edges, self.get_edge_ring)
+
+    def _union_of_walks(self, edges, walk):
+        selected = np.zeros(self.edge_count, dtype=bool)
+        for edge in np.asarray(edges).tolist():
+            # an edge that lies on an already walked loop/ring would walk the very same one again
+            if not selected[edge]:
+                selected[walk(edge)] = True
+        return to_indices(selected)
@@ -28,6 +28,34 @@ class FgMenu(object):
                                  '}'),
                         annotation=('Open File and set Project if possible.\n'
                                     'Shift: Reload the current Scene.'))
+            with pm.subMenuItem(tearOff=True, label='Open References'):
+                pm.menuItem(label='Smart Open Deferred',
+                            sourceType='mel',
+                            command='fgSmartOpenDeferred;',
+                            annotation='Open File without references and load them one by one once Maya is idle.')
+                pm.menuItem(label='Smart Open Without References',
+                            sourceType='mel',
+                            command=('int $mods = `getModifiers`;\n'
+                                     'if ($mods % 2) { // Shift\n'
+                                     '    fgReloadSceneWithoutReferences;\n'
+                                     '} else {\n'
+                                     '    fgSmartOpenWithoutReferences;\n'
+                                     '}'),
+                            annotation=('Open File without loading any references.\n'
+                                        'Shift: Reload the current Scene without references.'))
+                pm.menuItem(label='Smart Open Preview',
+                            sourceType='mel',
+                            command='fgSmartOpenPreview;',
+                            annotation='Open File with only the top-level references loaded.')
+                pm.menuItem(divider=True)
+                pm.menuItem(label='Load References',
+                            sourceType='mel',
+                            command='fgLoadReferences;',
+                            annotation='Load the references of the selection or pick them from a list.')
+                pm.menuItem(label='Print Reference Load Times',
+                            sourceType='mel',
+                            command='fgPrintReferenceLoadTimes;',
+                            annotation='Print how long each reference took to load, the slowest first.')
             pm.menuItem(label='Save Incremental',
                         sourceType='mel',
                         command='fgSaveIncremental;',
@@ -51,6 +79,19 @@ class FgMenu(object):
                             sourceType='mel',
                             command='fgOpenTextureFolder;',
                             annotation='Open the folder that is defined as "Source images" in the workspace.')
+            pm.menuItem(label='Verify Render Folder',
+                        sourceType='mel',
+                        command='fgVerifyRenderFolder;',
+                        annotation='Check the image sequences in the render folder for missing frames and broken '
+                                   'files.')
+            pm.menuItem(label='Audit Textures',
+                        sourceType='mel',
+                        command='fgAuditTextures;',
+                        annotation='Check whether all textures of the scene exist and print a report.')
+            pm.menuItem(label='Print Texture Memory',
+                        sourceType='mel',
+                        command='fgPrintTextureMemory;',
+                        annotation='Print how much memory the textures of the scene take up once they are decoded.')
 
             pm.menuItem(dividerLabel='Select', divider=True)
             pm.menuItem(label='Select Triangles',
@@ -71,24 +112,133 @@ class FgMenu(object):
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Select lamina faces from all polygon objects you selected.')
+            pm.menuItem(label='Select Zero-Area Faces',
+                        imageOverlayLabel='ZeroA',
+                        command='fgSelectZeroAreaFaces;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select the faces without area from all polygon objects you selected.')
+            pm.menuItem(label='Select Zero-Length Edges',
+                        imageOverlayLabel='ZeroL',
+                        command='fgSelectZeroLengthEdges;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select the edges without length from all polygon objects you selected.')
+            pm.menuItem(label='Select Concave Faces',
+                        imageOverlayLabel='Conc',
+                        command='fgSelectConcaveFaces;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select concave faces from all polygon objects you selected.')
+            pm.menuItem(label='Select Non-Planar Faces',
+                        imageOverlayLabel='NonPla',
+                        command='fgSelectNonPlanarFaces;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select non-planar faces from all polygon objects you selected.')
             pm.menuItem(label='Select Non-Manifold Vertices',
                         imageOverlayLabel='NonMani',
                         command='fgSelectNonManifoldVertices;',
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Select non-manifold vertices from all polygon objects you selected.')
+            pm.menuItem(label='Select Flipped Faces',
+                        imageOverlayLabel='Flip',
+                        command='fgSelectFlippedFaces;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select the faces that are wound the other way than their neighbours.')
             pm.menuItem(label='Select UV-Seams',
                         imageOverlayLabel='UVSeam',
                         command='fgSelectUVSeams;',
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Select UV-seams from all polygon objects you selected.')
+            pm.menuItem(label='Select UV Overlaps',
+                        imageOverlayLabel='UVOvr',
+                        command='fgSelectUVOverlaps;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select the faces that overlap other faces in UV space.')
+            pm.menuItem(label='Select UV Shells',
+                        imageOverlayLabel='Shell',
+                        command='fgSelectUVShells;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select all faces of the UV shells of the components you selected.')
+            pm.menuItem(label='Print UV Shell Counts',
+                        imageOverlayLabel='Shells',
+                        command='fgPrintUVShellCounts;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Print the number of UV shells of all polygon objects you selected.')
+            pm.menuItem(label='Print Texel Densities',
+                        imageOverlayLabel='Texel',
+                        command='fgPrintTexelDensities;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Print the texel density of the UV shells of all polygon objects you selected.')
             pm.menuItem(label='Select Hard Edges',
                         imageOverlayLabel='HardE',
                         command='fgSelectHardEdges;',
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Select hard edges in polygon objects you selected.')
+            pm.menuItem(label='Select Overlapping Vertices',
+                        imageOverlayLabel='Overlap',
+                        command='fgSelectOverlappingVertices;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select vertices that lie on top of each other in the objects you selected.')
+            pm.menuItem(label='Select Moved Vertices',
+                        imageOverlayLabel='Moved',
+                        command='fgSelectDeviatingVertices;',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select the vertices of the selected meshes that moved away from the mesh you '
+                                   'selected last.')
+            with pm.subMenuItem(tearOff=True, label='Topology'):
+                pm.menuItem(label='Grow Selection',
+                            command='fgGrowSelection;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Grow the selected components by their neighbours.')
+                pm.menuItem(label='Shrink Selection',
+                            command='fgShrinkSelection;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Shrink the selected components by the ones on the border of the selection.')
+                pm.menuItem(label='Select Edge Loops',
+                            command='fgSelectEdgeLoops;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Select the edge loops through all selected edges.')
+                pm.menuItem(label='Select Edge Rings',
+                            command='fgSelectEdgeRings;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Select the edge rings through all selected edges.')
+                pm.menuItem(label='Mirror Selection',
+                            command='fgMirrorSelection;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Select the components on the other side of the plane of symmetry.')
+                pm.menuItem(divider=True)
+                pm.menuItem(label='Convert to Vertices',
+                            command='fgConvertSelectionToVertices;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Convert the selection to vertices.')
+                pm.menuItem(label='Convert to Edges',
+                            command='fgConvertSelectionToEdges;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Convert the selection to edges.')
+                pm.menuItem(label='Convert to Faces',
+                            command='fgConvertSelectionToFaces;',
+                            sourceType='mel',
+                            echoCommand=True,
+                            annotation='Convert the selection to faces.')
 
             pm.menuItem(dividerLabel='Modeling', divider=True)
             pm.menuItem(label='Spherify',
@@ -97,6 +247,97 @@ class FgMenu(object):
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Move all selected components to equal distance.')
+            pm.menuItem(label='Relax',
+                        command='fgRelax;',
+                        imageOverlayLabel='Relax',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Relax the selected components while the border of the mesh stays in place.')
+            pm.menuItem(label='Shrink Wrap',
+                        command='fgShrinkWrap;',
+                        imageOverlayLabel='Wrap',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Move the selected components onto the surface of the object you selected last.')
+            pm.menuItem(label='Decimate',
+                        command='fgDecimate;',
+                        imageOverlayLabel='Deci',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Build a lightweight proxy of every selected object.')
+            pm.menuItem(label='Harden Edges by Angle',
+                        command='fgHardenEdgesByAngle;',
+                        imageOverlayLabel='Hard',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Set the edges of the selected objects hard or soft by the angle of their faces.')
+            pm.menuItem(label='Harden Edges by Angle and UV Seams',
+                        command='fgHardenEdgesByAngleAndUVSeams;',
+                        imageOverlayLabel='HardUV',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Set the edges of the selected objects hard or soft by the angle of their faces, '
+                                   'the UV seams get hard.')
+            pm.menuItem(label='Clean Up Meshes',
+                        command='fgCleanUpMeshes;',
+                        imageOverlayLabel='Clean',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Delete lamina faces, triangulate n-gons, split non-manifold vertices and merge '
+                                   'coincident vertices of the selected objects in one undoable step.')
+            pm.menuItem(label='Clean Up Meshes to Quads',
+                        command='fgCleanUpMeshesToQuads;',
+                        imageOverlayLabel='CleanQ',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Like Clean Up Meshes, but the n-gons get split into quads.')
+            pm.menuItem(label='Conform Normals',
+                        command='fgConformNormals;',
+                        imageOverlayLabel='Conf',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Reverse the faces that are wound the other way than their neighbours.')
+            pm.menuItem(label='Weld Overlapping Vertices',
+                        command='fgWeldOverlappingVertices;',
+                        imageOverlayLabel='Weld',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Merge the vertices that lie on top of each other in the objects you selected.')
+            pm.menuItem(label='Symmetrize +/-',
+                        command='fgSymmetrizePositiveToNegative;',
+                        imageOverlayLabel='Sym+',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Mirror the selected vertices from the positive to the negative side of the plane '
+                                   'of symmetry.')
+            pm.menuItem(label='Symmetrize -/+',
+                        command='fgSymmetrizeNegativeToPositive;',
+                        imageOverlayLabel='Sym-',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Mirror the selected vertices from the negative to the positive side of the plane '
+                                   'of symmetry.')
+            pm.menuItem(label='Show Deviations',
+                        command='fgShowDeviations;',
+                        imageOverlayLabel='Dev',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Color the vertices of the selected meshes by how far they moved away from the mesh '
+                                   'you selected last.')
+            pm.menuItem(label='Copy Points',
+                        command='fgCopyPoints;',
+                        imageOverlayLabel='CpPt',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Copy the vertex positions of the selected mesh. They stay available in other '
+                                   'Maya sessions.')
+            pm.menuItem(label='Paste Points',
+                        command='fgPastePoints;',
+                        imageOverlayLabel='PsPt',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Move the selected vertices (or all vertices of the selected meshes) to the copied '
+                                   'positions. The meshes need the same topology as the copied one.')
             pm.menuItem(label='Move Components to X-Axis',
                         command='fgAverageComponents -axis "x";',
                         image='fg_average_selection_x.png',
@@ -115,6 +356,18 @@ class FgMenu(object):
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Move all selected components so they are aligned on the z-axis.')
+            pm.menuItem(label='Flatten to Best-Fit Plane',
+                        command='fgFlattenComponents -mode "plane";',
+                        imageOverlayLabel='Flat',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Flatten all selected components onto the plane that fits them best.')
+            pm.menuItem(label='Flatten to Best-Fit Line',
+                        command='fgFlattenComponents -mode "line";',
+                        imageOverlayLabel='Line',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Line up all selected components on the line that fits them best.')
             pm.menuItem(label='Assign Default Shader',
                         command='fgAssignDefaultShaderToSelection;',
                         image='fg_lambert1.png',
@@ -127,6 +380,33 @@ class FgMenu(object):
                         sourceType='mel',
                         echoCommand=True,
                         annotation='Toggle X-Ray display in the viewport on all selected objects.')
+            pm.menuItem(label='Find Duplicate Meshes',
+                        command='fgFindDuplicateMeshes;',
+                        imageOverlayLabel='Dupl',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Select and print the meshes of the scene that are identical copies of each other.')
+            pm.menuItem(label='Instance Duplicate Meshes',
+                        command='fgInstanceDuplicateMeshes;',
+                        imageOverlayLabel='Inst',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Replace the meshes of the scene that are identical copies of each other with '
+                                   'instances.')
+            pm.menuItem(label='Toggle Selection Statistics HUD',
+                        command='fgToggleSelectionStatisticsHUD;',
+                        imageOverlayLabel='HUD',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Show or hide the number of triangles, quads, n-gons, lamina faces and '
+                                   'non-manifold vertices of the selected meshes in the viewport.')
+            pm.menuItem(label='Toggle Scene Statistics HUD',
+                        command='fgToggleSceneStatisticsHUD;',
+                        imageOverlayLabel='HUD',
+                        sourceType='mel',
+                        echoCommand=True,
+                        annotation='Show or hide the number of triangles, quads, n-gons, lamina faces and '
+                                   'non-manifold vertices of all meshes in the scene in the viewport.')
 
             pm.menuItem(dividerLabel='Pivots', divider=True)
             pm.menuItem(label='Copy Pivot',
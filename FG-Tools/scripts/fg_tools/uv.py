@@ -0,0 +1,322 @@
+"""
+The UV layout of polygon meshes on top of their topology.
+
+This module does not depend on Maya.
+"""
+import numpy as np
+
+import topology
+
+
+# Triangles that overlap by less than this (in UV space) only touch, like the triangles on both sides of an edge.
+OVERLAP_TOLERANCE = 1e-6
+
+# The number of candidate triangle pairs that get tested at once, this bounds the memory of the overlap test.
+MAX_PAIRS = 1000000
+
+# The grid of the overlap test has at most this many cells per triangle on average. Bigger triangles make the cells
+# bigger, so a few huge triangles can not fill the memory with cells.
+MAX_CELLS_PER_TRIANGLE = 8
+
+
+class UVLayout(object):
+    """
+    The UVs of one UV set of a mesh and which UV every face-vertex uses.
+
+    Usage::
+
+        layout = UVLayout(topo, uvs, uv_counts, uv_ids)
+        layout.get_seam_edges()
+        layout.shells  # -> the UV shell of every face
+    """
+
+    def __init__(self, topo, uvs, uv_counts, uv_ids, shells=None):
+        """
+        :param topology.MeshTopology topo:
+        :param numpy.ndarray uvs: The UVs in the shape (n, 2).
+        :param numpy.ndarray uv_counts: The number of UVs of every face, this is 0 for faces without UVs.
+        :param numpy.ndarray uv_ids: The UV of every face-vertex of the faces with UVs.
+        :param numpy.ndarray shells: The UV shell of every face, if it is known already (see shells). The shells only
+                                     depend on the UV ids, so they stay valid while the UVs move.
+        """
+        self.topology = topo
+        self.uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)
+        self.uv_count = len(self.uvs)
+
+        # the UV of every face-vertex or -1 if its face has no UVs
+        self.face_vertex_uvs = np.full(len(topo.face_vertices), -1, dtype=topology.INDEX_DTYPE)
+        has_uvs = np.repeat(np.asarray(uv_counts) > 0, topo.face_counts)
+        self.face_vertex_uvs[has_uvs] = uv_ids
+        self._edge_face_vertices = None
+        self._shells = shells
+
+    @property
+    def edge_face_vertices(self):
+        """
+        :returns: The offsets and the face-vertices that start every edge (one per face of the edge) as CSR adjacency.
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if self._edge_face_vertices is None:
+            topo = self.topology
+            self._edge_face_vertices = topology.build_csr(topo.face_edges,
+                                                          np.arange(len(topo.face_vertices)),
+                                                          topo.edge_count)
+        return self._edge_face_vertices
+
+    def get_seam_edges(self, start=0, stop=None):
+        """
+        An edge lies on a UV seam if its faces use more than two UVs for its vertices.
+
+        :param int start: The first edge to check.
+        :param int stop: The edge after the last one to check. If this is None all edges from the start are checked.
+        :returns: The sorted seam edges in the given range.
+        :rtype: numpy.ndarray
+        """
+        if stop is None:
+            stop = self.topology.edge_count
+        offsets, face_vertices = self.edge_face_vertices
+        face_vertices = face_vertices[offsets[start]:offsets[stop]]
+        edges = np.repeat(np.arange(start, stop, dtype=np.int64), np.diff(offsets[start:stop + 1]))
+
+        # the UVs of both ends of every face-edge
+        edges = np.concatenate((edges, edges))
+        uvs = np.concatenate((self.face_vertex_uvs[face_vertices],
+                              self.face_vertex_uvs[self.topology.face_vertex_next[face_vertices]]))
+        has_uv = uvs >= 0
+        keys = np.unique(edges[has_uv] * max(self.uv_count, 1) + uvs[has_uv])
+        uvs_per_edge = np.bincount(keys // max(self.uv_count, 1) - start, minlength=stop - start)
+        return (np.flatnonzero(uvs_per_edge > 2) + start).astype(topology.INDEX_DTYPE)
+
+    @property
+    def shells(self):
+        """
+        Two faces are in the same UV shell if they are connected through shared UVs.
+
+        :returns: The UV shell of every face, numbered from 0 in the order of their first face. Faces without UVs
+                  are -1.
+        :rtype: numpy.ndarray
+        """
+        if self._shells is None:
+            topo = self.topology
+            # union-find over the UVs: consecutive UVs of a face are in the same shell
+            uvs = self.face_vertex_uvs
+            next_uvs = uvs[topo.face_vertex_next]
+            labels = topology.get_connected_labels(np.column_stack((uvs, next_uvs))[(uvs >= 0) & (next_uvs >= 0)],
+                                                   self.uv_count)
+
+            # every face takes the shell of its first UV, the shells are numbered in the order of their first face
+            first_uvs = uvs[topo.face_offsets[:-1]]
+            with_uvs = first_uvs >= 0
+            _, first_faces, shells = np.unique(labels[first_uvs[with_uvs]], return_index=True, return_inverse=True)
+            self._shells = np.full(topo.face_count, -1, dtype=topology.INDEX_DTYPE)
+            self._shells[with_uvs] = np.argsort(np.argsort(first_faces))[shells]
+        return self._shells
+
+    @property
+    def shell_count(self):
+        """
+        :rtype: int
+        """
+        return int(self.shells.max()) + 1 if len(self.shells) else 0
+
+    def get_shell_faces(self, shells):
+        """
+        :param list[int] shells: The UV shells.
+        :returns: The sorted faces of the given shells.
+        :rtype: numpy.ndarray
+        """
+        return topology.to_indices(np.isin(self.shells, shells) & (self.shells >= 0))
+
+    def get_face_areas(self):
+        """
+        :returns: The area of every face in UV space, 0 for faces without UVs.
+        :rtype: numpy.ndarray
+        """
+        topo = self.topology
+        uvs = self.uvs[np.maximum(self.face_vertex_uvs, 0)]
+        next_uvs = uvs[topo.face_vertex_next]
+        # the shoelace formula
+        crosses = uvs[:, 0] * next_uvs[:, 1] - uvs[:, 1] * next_uvs[:, 0]
+        crosses[self.face_vertex_uvs < 0] = 0.0
+        return 0.5 * np.abs(np.bincount(topo.face_vertex_faces, weights=crosses, minlength=topo.face_count))
+
+    def get_shell_areas(self):
+        """
+        :returns: The area of every UV shell in UV space.
+        :rtype: numpy.ndarray
+        """
+        with_uvs = self.shells >= 0
+        return np.bincount(self.shells[with_uvs], weights=self.get_face_areas()[with_uvs],
+                           minlength=self.shell_count)
+
+    def get_shell_bounds(self):
+        """
+        :returns: The lower and the upper corner of the UV bounding box of every shell, both in the shape (shells, 2).
+        :rtype: tuple[numpy.ndarray]
+        """
+        if not self.shell_count:
+            return np.zeros((0, 2)), np.zeros((0, 2))
+        face_vertex_shells = self.shells[self.topology.face_vertex_faces]
+        used = (face_vertex_shells >= 0) & (self.face_vertex_uvs >= 0)
+        # ufunc.at is slow, sorting the UVs by shell lets reduceat do the work
+        order = np.argsort(face_vertex_shells[used], kind='stable')
+        uvs = self.uvs[self.face_vertex_uvs[used][order]]
+        starts = np.searchsorted(face_vertex_shells[used][order], np.arange(self.shell_count))
+        return np.minimum.reduceat(uvs, starts), np.maximum.reduceat(uvs, starts)
+
+    def get_texel_densities(self, points, resolution):
+        """
+        :param numpy.ndarray points: The points of the mesh in the shape (vertices, 3).
+        :param int resolution: The width of the texture in pixels.
+        :returns: The pixels per unit of every UV shell, 0 for shells without area.
+        :rtype: numpy.ndarray
+        """
+        with_uvs = self.shells >= 0
+        areas = np.bincount(self.shells[with_uvs], weights=get_face_areas(self.topology, points)[with_uvs],
+                            minlength=self.shell_count)
+        uv_areas = self.get_shell_areas()
+        densities = np.zeros(self.shell_count)
+        valid = areas > 0
+        densities[valid] = resolution * np.sqrt(uv_areas[valid] / areas[valid])
+        return densities
+
+    def get_overlapping_faces(self, tolerance=OVERLAP_TOLERANCE):
+        """
+        Finds the faces that overlap other faces in UV space. The UV triangles are hashed into a uniform grid and only
+        the triangles that share a grid cell are tested against each other.
+
+        :param float tolerance: Triangles that overlap by less than this only touch.
+        :returns: The sorted faces that overlap at least one other face, including folded faces of the same shell.
+        :rtype: numpy.ndarray
+        """
+        triangles, faces = self.topology.get_fan_face_vertices()
+        triangles = self.face_vertex_uvs[triangles]
+        corners = self.uvs[triangles]
+        edges = np.roll(corners, -1, axis=1) - corners
+        doubled_areas = np.abs(edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0])
+        # triangles without UVs or without area can not overlap anything
+        valid = (triangles >= 0).all(axis=1) & (doubled_areas > tolerance ** 2)
+        corners, edges, faces = corners[valid], edges[valid], faces[valid]
+        if not len(faces):
+            return np.zeros(0, dtype=topology.INDEX_DTYPE)
+
+        # the unit normals of the edges are the axes of the separating axis test
+        lengths = np.sqrt(np.einsum('ijk,ijk->ij', edges, edges))[..., np.newaxis]
+        axes = np.concatenate((-edges[..., 1:], edges[..., :1]), axis=2) / lengths
+
+        grid = _TriangleGrid(corners.min(axis=1), corners.max(axis=1), tolerance)
+        overlapping = []
+        for first, second in grid.iterate_pairs(faces):
+            corners_a, corners_b = corners[first], corners[second]
+            separated = np.zeros(len(first), dtype=bool)
+            # the triangles overlap unless the edge normal of one of them separates them
+            for triangle_axes in (axes[first], axes[second]):
+                for edge in range(3):
+                    minimum_a, maximum_a = _project(corners_a, triangle_axes[:, edge])
+                    minimum_b, maximum_b = _project(corners_b, triangle_axes[:, edge])
+                    separated |= np.minimum(maximum_a, maximum_b) - np.maximum(minimum_a, minimum_b) <= tolerance
+            overlapping += [faces[first[~separated]], faces[second[~separated]]]
+        return np.unique(np.concatenate(overlapping)).astype(topology.INDEX_DTYPE)
+
+
+def _project(corners, axes):
+    """
+    :returns: The lowest and the highest projection of the corners of every triangle onto its axis.
+    :rtype: tuple[numpy.ndarray]
+    """
+    projections = [corners[:, corner, 0] * axes[:, 0] + corners[:, corner, 1] * axes[:, 1] for corner in range(3)]
+    return (np.minimum(np.minimum(projections[0], projections[1]), projections[2]),
+            np.maximum(np.maximum(projections[0], projections[1]), projections[2]))
+
+
+class _TriangleGrid(object):
+    """
+    A uniform grid over the bounding boxes of triangles in UV space to find the triangles whose boxes overlap.
+    """
+
+    def __init__(self, lower, upper, tolerance):
+        """
+        :param numpy.ndarray lower: The lower corner of the bounding box of every triangle in the shape (n, 2).
+        :param numpy.ndarray upper: The upper corner of the bounding box of every triangle in the shape (n, 2).
+        :param float tolerance: Boxes that overlap by less than this only touch.
+        """
+        self.lower = lower
+        self.upper = upper
+        self.tolerance = tolerance
+        self.minimum = lower.min(axis=0)
+        self.cell_size = max(float(np.median((upper - lower).max(axis=1))), 1e-12)
+
+        # the boxes shrink by half the tolerance, so boxes that only touch do not share cells
+        while True:
+            cells_lower = self._get_cells(lower + 0.5 * tolerance)
+            cells_upper = self._get_cells(upper - 0.5 * tolerance)
+            spans = np.maximum(cells_upper - cells_lower + 1, 0)
+            cell_counts = spans[:, 0] * spans[:, 1]
+            if cell_counts.sum() <= MAX_CELLS_PER_TRIANGLE * len(lower):
+                break
+            self.cell_size *= 2.0
+
+        # one entry for every cell a triangle covers
+        triangles = np.repeat(np.arange(len(lower)), cell_counts)
+        positions = np.arange(len(triangles)) - np.repeat(np.cumsum(cell_counts) - cell_counts, cell_counts)
+        offsets = np.column_stack((positions // spans[triangles, 1], positions % spans[triangles, 1]))
+        height = int(cells_upper[:, 1].max()) + 1
+        keys = (cells_lower[triangles, 0] + offsets[:, 0]) * height + cells_lower[triangles, 1] + offsets[:, 1]
+        order = np.argsort(keys, kind='stable')
+        self.triangles = triangles[order]
+        self.keys = keys[order]
+        # whether the cell of an entry is the lowest cell of its triangle along each axis
+        self.at_lower = (offsets[order] == 0)
+
+    def _get_cells(self, points):
+        return np.floor((points - self.minimum) / self.cell_size).astype(np.int64)
+
+    def iterate_pairs(self, faces):
+        """
+        Yields the pairs of triangles of different faces whose bounding boxes overlap by more than the tolerance.
+        Every pair is yielded once, from the cell that holds the lower corner of the overlap of their boxes.
+
+        :param numpy.ndarray faces: The face of every triangle.
+        :returns: The first and the second triangle of every pair, in chunks of up to MAX_PAIRS pairs.
+        :rtype: generator[tuple[numpy.ndarray]]
+        """
+        # every entry pairs with the entries after it in its cell
+        starts = np.flatnonzero(np.concatenate(([True], self.keys[1:] != self.keys[:-1])))
+        cell_sizes = np.diff(np.append(starts, len(self.keys)))
+        pair_counts = np.repeat(starts + cell_sizes, cell_sizes) - np.arange(len(self.keys)) - 1
+        pair_offsets = np.concatenate(([0], np.cumsum(pair_counts)))
+
+        entry = 0
+        while entry < len(self.keys):
+            stop = max(int(np.searchsorted(pair_offsets, pair_offsets[entry] + MAX_PAIRS, side='right')) - 1,
+                       entry + 1)
+            counts = pair_counts[entry:stop]
+            first = np.repeat(np.arange(entry, stop), counts)
+            second = first + 1 + np.arange(len(first)) - np.repeat(pair_offsets[entry:stop] - pair_offsets[entry],
+                                                                   counts)
+            entry = stop
+
+            # the lower corner of the overlap of both boxes is in the lowest cell of one of them on each axis
+            at_lower = self.at_lower[first] | self.at_lower[second]
+            keep = at_lower[:, 0] & at_lower[:, 1]
+            first, second = self.triangles[first[keep]], self.triangles[second[keep]]
+            keep = ((faces[first] != faces[second]) &
+                    ((np.minimum(self.upper[first], self.upper[second]) -
+                      np.maximum(self.lower[first], self.lower[second])) > self.tolerance).all(axis=1))
+            yield first[keep], second[keep]
+
+
+def get_face_areas(topo, points):
+    """
+    :param topology.MeshTopology topo:
+    :param numpy.ndarray points: The points in the shape (vertices, 3).
+    :returns: The area of every face, non-planar faces get the area of their average plane.
+    :rtype: numpy.ndarray
+    """
+    points = np.asarray(points, dtype=np.float64)
+    corners = points[topo.face_vertices]
+    next_corners = points[topo.face_vertices[topo.face_vertex_next]]
+    crosses = np.cross(corners, next_corners)
+    sums = np.column_stack([np.bincount(topo.face_vertex_faces, weights=crosses[:, axis], minlength=topo.face_count)
+                            for axis in range(3)])
+    return 0.5 * np.sqrt(np.einsum('ij,ij->i', sums, sums))
@@ -0,0 +1,297 @@
+'''
+Benchmarks for the fg_tools modules that do not depend on Maya. They run with any python that has numpy installed.
+
+Usage::
+
+    python benchmark.py            # run all benchmarks
+    python benchmark.py topology   # run only the topology benchmarks
+'''
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import bvh
+import cleanup
+import decimation
+import deviation
+import geometry
+import mesh_fingerprint
+import mesh_qa
+import mesh_stats
+import normals
+import parallel
+import relax
+import scheduler
+import shared_arrays
+import spatial
+import symmetry
+import topology
+import uv
+from test_bvh import create_sphere
+from test_mesh_qa import create_arrays
+from test_symmetry import create_symmetric_grid
+from test_topology import create_grid
+from test_uv import create_grid_uvs
+
+
+def timed(label, func, *args, **kwargs):
+    '''
+    Calls the given function and prints how long it took.
+
+    :returns: The result of the function.
+    '''
+    start = time.time()
+    result = func(*args, **kwargs)
+    print('{0:<50s} {1:8.3f}s'.format(label, time.time() - start))
+    return result
+
+
+def benchmark_topology(sizes=(100, 500, 1000)):
+    for size in sizes:
+        face_counts, face_vertices, _ = create_grid(size, size)
+        print('--- grid with {0:d} faces'.format(size * size))
+        topo = timed('build topology', topology.MeshTopology, face_counts, face_vertices)
+        faces = np.arange(0, topo.face_count, 7)
+        timed('convert every 7th face to vertices', topo.convert, faces, topology.FACE, topology.VERTEX)
+        timed('convert every 7th face to contained edges',
+              topo.convert, faces, topology.FACE, topology.EDGE, contained=True)
+        timed('grow every 7th face 3 times', topo.grow, faces, topology.FACE, steps=3)
+        timed('shrink all faces', topo.shrink, np.arange(topo.face_count), topology.FACE)
+        timed('edge loops of 10 edges', topo.get_edge_loops, np.arange(0, topo.edge_count, topo.edge_count // 10))
+
+
+def benchmark_uv_shells(sizes=(100, 500, 1000)):
+    for size in sizes:
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(size, size, split_column=size // 2)
+        print('--- grid with {0:d} faces'.format(size * size))
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        timed('find shells', lambda: layout.shells)
+        timed('shell areas', layout.get_shell_areas)
+        timed('shell bounds', layout.get_shell_bounds)
+        # the right half lies on top of the left half
+        layout.uvs[len(layout.uvs) // 2:, 0] -= size // 2
+        timed('overlapping faces', layout.get_overlapping_faces)
+
+
+def benchmark_cleanup(sizes=(100, 500, 1000)):
+    for size in sizes:
+        face_counts, face_vertices, points = create_grid(size, size)
+        # every 100th face again with the opposite winding
+        face_vertices = np.array(face_vertices).reshape(-1, 4)
+        lamina = face_vertices[::100, ::-1]
+        topo = topology.MeshTopology(face_counts + [4] * len(lamina), np.concatenate((face_vertices, lamina)).ravel())
+        print('--- grid with {0:d} faces and {1:d} lamina faces'.format(size * size, len(lamina)))
+        timed('plan', cleanup.plan, topo, points)
+
+
+def benchmark_geometry(sizes=(100, 500, 1000)):
+    for size in sizes:
+        face_counts, face_vertices, points = create_grid(size, size)
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        points[:, 1] = np.random.RandomState(0).rand(len(points)) * 0.01
+        print('--- grid with {0:d} faces'.format(size * size))
+        mesh_geometry = geometry.MeshGeometry(topo, points)
+        timed('zero-area faces', mesh_geometry.get_zero_area_faces)
+        timed('zero-length edges', mesh_geometry.get_zero_length_edges)
+        timed('concave faces', mesh_geometry.get_concave_faces)
+        timed('non-planar faces', mesh_geometry.get_non_planar_faces)
+
+
+def benchmark_normals(sizes=(100, 500, 1000)):
+    for size in sizes:
+        face_counts, face_vertices, points = create_grid(size, size)
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        points[:, 1] = np.random.RandomState(0).rand(len(points))
+        print('--- grid with {0:d} faces'.format(size * size))
+        face_normals = timed('face normals', normals.get_face_normals, topo, points)
+        timed('edge angles', normals.get_edge_angles, topo, face_normals)
+        timed('sharp edges', normals.get_sharp_edges, topo, points)
+        # every 7th face is reversed
+        face_vertices = np.array(face_vertices).reshape(-1, 4)
+        face_vertices[::7] = face_vertices[::7, ::-1]
+        topo = topology.MeshTopology(face_counts, face_vertices.ravel())
+        timed('flipped faces', normals.get_flipped_faces, topo, points)
+
+
+def benchmark_spatial(sizes=(100000, 1000000, 5000000)):
+    random = np.random.RandomState(0)
+    for size in sizes:
+        # a scan-like cloud where every 10th point has a (nearly) coincident twin
+        points = random.rand(size, 3) * 100
+        twins = np.arange(0, size, 10)
+        points[twins + 1] = points[twins] + random.rand(len(twins), 3) * 1e-5
+        print('--- {0:d} points'.format(size))
+        spatial_hash = timed('build spatial hash', spatial.SpatialHash, points, 0.0001)
+        timed('find pairs', spatial_hash.find_pairs)
+        timed('find overlapping points', spatial.find_overlapping_points, points, 0.0001)
+
+        # two grids next to each other that share the vertices along one border
+        columns = int((size / 2) ** 0.5)
+        face_counts, face_vertices, grid_points = create_grid(columns, columns)
+        face_vertices = np.concatenate((face_vertices, np.array(face_vertices) + len(grid_points)))
+        grid_points = np.concatenate((grid_points, grid_points + [columns, 0, 0]))
+        timed('weld two grids with {0:d} vertices'.format(len(grid_points)),
+              spatial.weld, face_counts * 2, face_vertices, grid_points, 0.0001)
+
+
+def benchmark_symmetry(sizes=(100, 500, 1000)):
+    for size in sizes:
+        topo, points = create_symmetric_grid(size, size)
+        print('--- symmetric grid with {0:d} vertices'.format(len(points)))
+        timed('find symmetry plane', symmetry.find_symmetry_plane, points, 0.001)
+        mirror_map = timed('build mirror map', symmetry.MirrorMap.build, topo, points, 0.001)
+        faces = np.arange(0, topo.face_count, 3)
+        timed('mirror every 3rd face', mirror_map.mirror, faces, topology.FACE)
+        timed('mirror all edges', mirror_map.mirror, np.arange(topo.edge_count), topology.EDGE)
+        timed('symmetrize all points', mirror_map.symmetrize, points)
+
+
+def benchmark_bvh(sizes=(100, 300, 700), query_count=100000):
+    random = np.random.RandomState(0)
+    for size in sizes:
+        points, triangles = create_sphere(size)
+        # like the vertices of a mesh that gets wrapped onto a similar one
+        queries = points[random.randint(len(points), size=query_count)] * random.uniform(0.95, 1.05, (query_count, 1))
+        directions = queries / np.linalg.norm(queries, axis=1)[:, np.newaxis]
+        tree = timed('build over {0:d} triangles'.format(len(triangles)), bvh.TriangleBVH, points, triangles)
+        timed('{0:d} closest points'.format(query_count), tree.find_closest, queries)
+        timed('{0:d} line hits'.format(query_count), tree.intersect, queries, directions)
+
+
+def benchmark_decimation(sizes=(50, 100, 200), ratio=0.1):
+    for size in sizes:
+        points, triangles = create_sphere(size)
+        decimator = timed('prepare {0:d} triangles'.format(len(triangles)), decimation.Decimator, points, triangles)
+        timed('collapse to {0:.0%}'.format(ratio), decimation.decimate, points, triangles, int(ratio * len(triangles)))
+        del decimator
+
+
+def benchmark_deviation(sizes=(100000, 1000000, 5000000)):
+    for size in sizes:
+        # the points of a mesh come from Maya as float32
+        reference = np.random.RandomState(0).rand(size, 3).astype(np.float32)
+        points = reference + np.random.RandomState(1).normal(0, 0.001, (size, 3)).astype(np.float32)
+        distances = timed('compare {0:d} points'.format(size),
+                          deviation.get_distances, points.astype(np.float64), reference.astype(np.float64))
+        timed('statistics of {0:d} points'.format(size), deviation.format_statistics, distances)
+        timed('colors of {0:d} points'.format(size), deviation.get_colors, distances)
+
+
+def benchmark_fingerprints(mesh_count=2000, size=100):
+    face_counts, face_vertices, points = create_grid(size, size)
+    face_counts, face_vertices = np.array(face_counts), np.array(face_vertices)
+    meshes = [(face_counts, face_vertices, points + (index % 50)) for index in range(mesh_count)]
+    print('--- {0:d} meshes with {1:d} vertices'.format(mesh_count, len(points)))
+    for threads in sorted(set([1, parallel.CPU_THREADS])):
+        fingerprints = timed('fingerprints with {0:d} threads'.format(threads),
+                             mesh_fingerprint.get_fingerprints, meshes, threads=threads)
+    groups = timed('group duplicates', mesh_fingerprint.group_duplicates, range(mesh_count), fingerprints)
+    print('{0:d} groups'.format(len(groups)))
+
+
+def benchmark_mesh_stats(sizes=(100, 500, 1000), mesh_count=5000):
+    for size in sizes:
+        face_counts, face_vertices, _ = create_grid(size, size)
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        timed('statistics of {0:d} faces'.format(size * size), mesh_stats.get_statistics, topo)
+
+    totals = mesh_stats.StatisticsTotals()
+    for index in range(mesh_count):
+        totals.set(index, (index, 1, 2, 3, 4))
+    keys = range(mesh_count)
+    timed('update totals of {0:d} meshes by one mesh'.format(mesh_count), totals.set, 0, (1, 1, 1, 1, 1))
+    timed('sum up {0:d} selected meshes'.format(mesh_count), totals.get_total, keys)
+
+
+def benchmark_relax(sizes=(100, 500, 1000), iterations=10):
+    for size in sizes:
+        face_counts, face_vertices, points = create_grid(size, size)
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        points += np.random.RandomState(0).normal(0, 0.1, points.shape)
+        for weights in relax.WEIGHTS:
+            matrix = timed('{0:s} weights of {1:d} vertices'.format(weights, len(points)),
+                           relax.get_matrix, topo, points, weights)
+            timed('{0:d} iterations on {1:d} vertices'.format(iterations, len(points)),
+                  relax.relax, points, matrix, iterations=iterations)
+
+
+def benchmark_scheduler(job_count=10000):
+    job_scheduler = scheduler.JobScheduler()
+    for index in range(job_count):
+        job_scheduler.submit(abs, args=(index,), callback=abs if index % 2 else None)
+    timed('{0:d} thread jobs, half with a callback'.format(job_count), job_scheduler.run_until_complete)
+    metrics = job_scheduler.get_metrics()
+    print('average wait {0:.4f}s, max latency {1:.4f}s'.format(metrics['average_wait'], metrics['max_latency']))
+    job_scheduler.shutdown()
+
+
+def _sum_shared_points(handle):
+    with shared_arrays.SharedArrays.attach(handle) as shared:
+        return float(shared['points'].sum())
+
+
+def _sum_points(points):
+    return float(points.sum())
+
+
+def benchmark_shared_arrays(sizes=(100000, 1000000, 5000000)):
+    pool = parallel.get_process_pool(2)
+    for size in sizes:
+        points = np.random.RandomState(0).rand(size, 3)
+        timed('send {0:d} points pickled'.format(size), pool.apply, _sum_points, (points,))
+        shared = timed('copy {0:d} points into shared memory'.format(size),
+                       shared_arrays.SharedArrays.create, {'points': points})
+        timed('send {0:d} points shared'.format(size), pool.apply, _sum_shared_points, (shared.handle,))
+        shared.unlink()
+    parallel.close_process_pool()
+
+
+def benchmark_mesh_qa(mesh_count=200, size=100):
+    shared = [shared_arrays.SharedArrays.create(create_arrays(*create_grid(size, size))) for _ in range(mesh_count)]
+    batches = mesh_qa.split_into_batches([len(mesh['face_vertices']) for mesh in shared], 100000)
+    tasks = [[(shared[index].handle, tuple(mesh_qa.CHECKS)) for index in batch] for batch in batches]
+
+    processes = [count for count in (1, 2, 4, 8, 16) if count < multiprocessing.cpu_count()]
+    processes.append(multiprocessing.cpu_count())
+    single = None
+    for count in processes:
+        if count > 1:
+            # start the workers before timing them
+            parallel.get_process_pool(count).map(abs, range(count))
+        start = time.time()
+        timed('check {0:d} meshes of {1:d} faces in {2:d} processes'.format(mesh_count, size * size, count),
+              parallel.process_map, mesh_qa.analyze_batch, tasks, processes=count, chunksize=1)
+        duration = time.time() - start
+        single = single or duration
+        print('{0:<50s} {1:8.2f}x'.format('speedup', single / duration))
+    parallel.close_process_pool()
+    for mesh in shared:
+        mesh.unlink()
+
+
+BENCHMARKS = {'bvh': benchmark_bvh,
+              'cleanup': benchmark_cleanup,
+              'decimation': benchmark_decimation,
+              'deviation': benchmark_deviation,
+              'fingerprints': benchmark_fingerprints,
+              'geometry': benchmark_geometry,
+              'mesh_qa': benchmark_mesh_qa,
+              'mesh_stats': benchmark_mesh_stats,
+              'normals': benchmark_normals,
+              'relax': benchmark_relax,
+              'scheduler': benchmark_scheduler,
+              'shared_arrays': benchmark_shared_arrays,
+              'spatial': benchmark_spatial,
+              'symmetry': benchmark_symmetry,
+              'topology': benchmark_topology,
+              'uv_shells': benchmark_uv_shells}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or sorted(BENCHMARKS):
+        BENCHMARKS[name]()
@@ -0,0 +1,16 @@
+'''
+This module makes the fg_tools modules that do not depend on Maya importable from a regular python interpreter.
+'''
+import os
+import sys
+
+FG_TOOLS_PATH = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', 'FG-Tools', 'scripts', 'fg_tools'))
+
+
+def add_fg_tools_to_path():
+    '''
+    Adds the fg_tools folder to sys.path, so the pure python modules (like "topology" or "image_header") can be
+    imported directly without initializing Maya.
+    '''
+    if FG_TOOLS_PATH not in sys.path:
+        sys.path.insert(0, FG_TOOLS_PATH)
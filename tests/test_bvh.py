@@ -0,0 +1,105 @@
+'''
+Tests for closest point and line queries with a bounding volume hierarchy.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import bvh
+import topology
+from test_topology import create_cube, create_grid
+
+
+def create_sphere(segments=16):
+    '''
+    :returns: The points and triangles of a bumpy sphere (so no points are equally close to two triangles).
+    '''
+    theta, phi = np.meshgrid(np.linspace(0.1, np.pi - 0.1, segments), np.linspace(0, 2 * np.pi, 2 * segments,
+                                                                                   endpoint=False))
+    theta, phi = theta.ravel(), phi.ravel()
+    radius = 1 + 0.1 * np.sin(5 * phi) * np.sin(3 * theta)
+    points = np.column_stack((np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi))) * \
+        radius[:, np.newaxis]
+    triangles = []
+    for i in range(2 * segments):
+        for j in range(segments - 1):
+            a, b = i * segments + j, ((i + 1) % (2 * segments)) * segments + j
+            triangles += [[a, b, b + 1], [a, b + 1, a + 1]]
+    return points, np.array(triangles)
+
+
+def find_closest_brute_force(points, triangles, query_points):
+    corners = points[triangles]
+    result = []
+    for point in query_points:
+        closest = bvh.get_closest_points_on_triangles(np.tile(point, (len(triangles), 1)),
+                                                      corners[:, 0], corners[:, 1], corners[:, 2])
+        distances = np.sqrt(((closest - point) ** 2).sum(axis=1))
+        result.append(distances.min())
+    return np.array(result)
+
+
+class TestBVH(unittest.TestCase):
+
+    def setUp(self):
+        self.points, self.triangles = create_sphere()
+        self.queries = np.random.RandomState(0).uniform(-2, 2, (300, 3))
+
+    def test_closest_point_on_triangle(self):
+        a, b, c = np.array([[0.0, 0, 0]]), np.array([[1.0, 0, 0]]), np.array([[0.0, 1, 0]])
+        cases = [([0.2, 0.2, 1], [0.2, 0.2, 0]),   # inside
+                 ([-1, -1, 0], [0, 0, 0]),         # corner a
+                 ([2, -1, 0], [1, 0, 0]),          # corner b
+                 ([0.5, -1, 0], [0.5, 0, 0]),      # edge ab
+                 ([1, 1, 0], [0.5, 0.5, 0]),       # edge bc
+                 ([-1, 0.5, 3], [0, 0.5, 0])]      # edge ac
+        for point, expected in cases:
+            closest = bvh.get_closest_points_on_triangles(np.array([point], dtype=float), a, b, c)
+            self.assertTrue(np.allclose(closest, [expected]), (point, closest))
+
+    def test_find_closest(self):
+        tree = bvh.TriangleBVH(self.points, self.triangles, leaf_size=4)
+        closest, distances, triangles = tree.find_closest(self.queries)
+        expected = find_closest_brute_force(self.points, self.triangles, self.queries)
+        self.assertTrue(np.allclose(distances, expected))
+        self.assertTrue(np.allclose(np.sqrt(((closest - self.queries) ** 2).sum(axis=1)), expected))
+        # the closest points lie on the returned triangles
+        corners = self.points[self.triangles[triangles]]
+        on_triangle = bvh.get_closest_points_on_triangles(closest, corners[:, 0], corners[:, 1], corners[:, 2])
+        self.assertTrue(np.allclose(on_triangle, closest))
+
+    def test_intersect(self):
+        face_counts, face_vertices, points = create_grid(4, 4)
+        triangles, faces = topology.MeshTopology(face_counts, face_vertices).get_fan_triangles()
+        tree = bvh.TriangleBVH(points, triangles, leaf_size=2)
+        origins = np.array([[0.5, 1, 0.5], [1.5, -2, 3.2], [7, 1, 1], [2, 0.5, 2]])
+        directions = np.array([[0, 1, 0], [0, 1, 0], [0, 1, 0], [1, 0, 0]], dtype=float)
+        hits, distances, hit_triangles = tree.intersect(origins, directions)
+        # the lines go both ways
+        self.assertTrue(np.allclose(distances[:2], [-1, 2]))
+        self.assertTrue(np.allclose(hits[:2], [[0.5, 0, 0.5], [1.5, 0, 3.2]]))
+        self.assertEqual(faces[hit_triangles[:2]].tolist(), [0, 13])
+        # outside the grid and parallel to it
+        self.assertEqual(hit_triangles[2:].tolist(), [-1, -1])
+        self.assertTrue(np.isnan(distances[2:]).all())
+
+        _, _, hit_triangles = tree.intersect(origins[:2], directions[:2], max_distance=1.5)
+        self.assertEqual(hit_triangles.tolist(), [int(hit_triangles[0]), -1])
+
+    def test_vertex_normals(self):
+        face_counts, face_vertices, points = create_cube()
+        normals = bvh.get_vertex_normals(face_counts, face_vertices, points)
+        # the cube has outward facing normals, so they point away from its center
+        self.assertTrue(np.allclose(normals, points / np.linalg.norm(points, axis=1)[:, np.newaxis]))
+
+    def test_empty(self):
+        tree = bvh.TriangleBVH(np.zeros((0, 3)), np.zeros((0, 3)))
+        closest, distances, triangles = tree.find_closest(self.queries[:3])
+        self.assertEqual(triangles.tolist(), [-1, -1, -1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+'''
+Tests for the planning of the mesh cleanup.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import cleanup
+import topology
+from test_topology import create_grid
+
+
+class TestCleanup(unittest.TestCase):
+
+    def setUp(self):
+        face_counts, face_vertices, points = create_grid(2, 1)
+        # face 2 is face 0 again with the opposite winding, face 3 is a pentagon whose first vertex lies on vertex 2
+        # and face 4 is a triangle that only touches the grid at vertex 5
+        face_counts = face_counts + [4, 5, 3]
+        face_vertices = face_vertices + face_vertices[3::-1] + [6, 7, 8, 9, 10] + [5, 11, 12]
+        points = np.concatenate((points, [[2, 0, 0], [3, 0, -1], [4, 0, -1], [4, 0, 0], [3, 0, 0.5],
+                                          [3, 0, 2], [2, 0, 2]]))
+        self.topo = topology.MeshTopology(face_counts, face_vertices)
+        self.points = points
+
+    def test_plan(self):
+        result = cleanup.plan(self.topo, self.points)
+        self.assertEqual(sorted(result), sorted(cleanup.STAGES))
+        self.assertEqual(result[cleanup.LAMINA_FACES].tolist(), [2])
+        # the pentagon moves down by the deleted face
+        self.assertEqual(result[cleanup.NGONS].tolist(), [2])
+        self.assertEqual(result[cleanup.NON_MANIFOLD_VERTICES].tolist(), [5])
+        self.assertEqual(result[cleanup.COINCIDENT_VERTICES].tolist(), [2, 6])
+
+    def test_stages(self):
+        result = cleanup.plan(self.topo, self.points, stages=[cleanup.NGONS])
+        self.assertEqual(list(result), [cleanup.NGONS])
+        self.assertEqual(result[cleanup.NGONS].tolist(), [3])
+
+        # non-manifold vertices that do not get split can be merged
+        self.points[11] = self.points[5]
+        result = cleanup.plan(self.topo, self.points, stages=[cleanup.COINCIDENT_VERTICES])
+        self.assertEqual(result[cleanup.COINCIDENT_VERTICES].tolist(), [2, 5, 6, 11])
+        result = cleanup.plan(self.topo, self.points)
+        self.assertEqual(result[cleanup.COINCIDENT_VERTICES].tolist(), [2, 6, 11])
+
+        self.assertRaises(ValueError, cleanup.plan, self.topo, self.points, ['unknown'])
+
+    def test_format(self):
+        counts = {cleanup.LAMINA_FACES: 1, cleanup.COINCIDENT_VERTICES: 2}
+        timings = {cleanup.ANALYSIS: 0.5, cleanup.LAMINA_FACES: 0.25, cleanup.COINCIDENT_VERTICES: 0.125}
+        self.assertEqual(cleanup.format_report(counts, timings),
+                         'Lamina: 1  Merged: 2  (Analysis: 0.500s  Lamina: 0.250s  Merged: 0.125s)')
+
+
+if __name__ == '__main__':
+    unittest.main()
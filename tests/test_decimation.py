@@ -0,0 +1,77 @@
+'''
+Tests for the quadric error decimation.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import decimation
+import topology
+from test_bvh import create_sphere
+from test_topology import create_grid
+
+
+class TestDecimation(unittest.TestCase):
+
+    def setUp(self):
+        face_counts, face_vertices, points = create_grid(10, 10)
+        self.points = np.asarray(points, dtype=float)
+        self.triangles, _ = topology.MeshTopology(face_counts, face_vertices).get_fan_triangles()
+
+    def test_quadric_error(self):
+        quadrics = decimation.get_vertex_quadrics(self.points, self.triangles)
+        corners = self.points[self.triangles]
+        crosses = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        normal = crosses[0] / np.linalg.norm(crosses[0])
+        # the points of the grid lie in the planes of their triangles, one unit off them the error is the area around
+        point = np.append(self.points[11], 1.0)
+        self.assertAlmostEqual(point.dot(quadrics[11]).dot(point), 0.0)
+        point[:3] += normal
+        around = (self.triangles == 11).any(axis=1)
+        area = 0.5 * np.linalg.norm(crosses[around], axis=1).sum()
+        self.assertAlmostEqual(point.dot(quadrics[11]).dot(point), area)
+
+    def test_flat_grid(self):
+        border = decimation.get_border_vertices(self.triangles)
+        points, triangles = decimation.decimate(self.points, self.triangles, 40)
+        self.assertLessEqual(len(triangles), 60)
+        # the grid stays flat and keeps its border
+        normal = np.cross(self.points[1] - self.points[0], self.points[11] - self.points[0])
+        self.assertTrue(np.allclose((points - self.points[0]).dot(normal), 0.0))
+        for point in self.points[border]:
+            self.assertTrue(np.isclose(points, point).all(axis=1).any())
+
+    def test_locked_vertices(self):
+        locked = np.arange(40, 50)
+        decimator = decimation.Decimator(self.points, self.triangles, locked_vertices=locked)
+        removed = sum(decimator.iterate(0, chunk_size=5))
+        self.assertEqual(removed, len(self.triangles) - decimator.triangle_count)
+        points, _ = decimator.get_mesh()
+        for point in self.points[locked]:
+            self.assertTrue(np.isclose(points, point).all(axis=1).any())
+
+    def test_sphere_stays_manifold(self):
+        points, triangles = create_sphere(24)
+        result_points, result_triangles = decimation.decimate(points, triangles, len(triangles) // 10,
+                                                              keep_border=False)
+        self.assertLessEqual(len(result_triangles), len(triangles) // 10 + 2)
+        # no edge gets more than two triangles
+        _, counts = decimation.get_edges(result_triangles)
+        self.assertTrue((counts <= 2).all())
+        # the remaining points stay close to the sphere
+        radii = np.linalg.norm(result_points, axis=1)
+        self.assertTrue(((radii > 0.8) & (radii < 1.2)).all())
+
+    def test_face_count(self):
+        self.assertEqual(decimation.get_face_count(100), 100)
+        self.assertEqual(decimation.get_face_count(None, ratio=0.25, triangle_count=200), 50)
+        # a face count wins over a ratio
+        self.assertEqual(decimation.get_face_count(100, ratio=0.25, triangle_count=200), 100)
+        self.assertRaises(ValueError, decimation.get_face_count, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+'''
+Tests for the comparison of meshes with the same topology.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import deviation
+from test_topology import create_grid
+
+
+class TestDeviation(unittest.TestCase):
+
+    def setUp(self):
+        _, _, self.reference = create_grid(4, 3)
+        self.points = np.array(self.reference)
+        self.points[3] += [0, 0.5, 0]
+        self.points[7] += [0.3, 0, 0.4]
+
+    def test_distances(self):
+        distances = deviation.get_distances(self.points, self.reference)
+        self.assertTrue(np.allclose(distances[[3, 7]], [0.5, 0.5]))
+        self.assertEqual(np.count_nonzero(distances), 2)
+        self.assertRaises(ValueError, deviation.get_distances, self.points[:-1], self.reference)
+
+    def test_statistics(self):
+        distances = deviation.get_distances(self.points, self.reference)
+        maximum, mean, rms = deviation.get_statistics(distances)
+        self.assertAlmostEqual(maximum, 0.5)
+        self.assertAlmostEqual(mean, 1.0 / 20)
+        self.assertAlmostEqual(rms, np.sqrt(0.5 / 20))
+        self.assertEqual(deviation.get_statistics(np.zeros(0)), (0.0, 0.0, 0.0))
+        self.assertTrue(deviation.format_statistics(distances).startswith('2 of 20 vertices moved.'))
+
+    def test_colors(self):
+        colors = deviation.get_colors(np.array([0.0, 0.5, 1.0, 2.0]), maximum=1.0)
+        self.assertTrue(np.allclose(colors[:, :3], [[0, 1, 0], [1, 1, 0], [1, 0, 0], [1, 0, 0]]))
+        self.assertTrue(np.allclose(deviation.get_colors(np.zeros(3))[:, :3], [0, 1, 0]))
+
+    def test_color_ids(self):
+        distances = np.array([0.0, 0.5, 1.0, 2.0])
+        colors, color_ids = deviation.get_color_ids(distances, maximum=1.0, levels=5)
+        self.assertEqual(colors.shape, (5, 4))
+        self.assertEqual(color_ids.tolist(), [0, 2, 4, 4])
+        self.assertTrue(np.allclose(colors[color_ids], deviation.get_colors(distances, maximum=1.0)))
+        self.assertEqual(deviation.get_color_ids(np.zeros(3))[1].tolist(), [0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
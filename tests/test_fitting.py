@@ -0,0 +1,53 @@
+'''
+Tests for fitting planes and lines through points.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import fitting
+
+
+class TestFitting(unittest.TestCase):
+
+    def setUp(self):
+        random = np.random.RandomState(0)
+        # a tilted panel: points on the plane through (1, 2, 3) with the normal (1, 1, 0), plus a little noise
+        self.normal = np.array([1.0, 1.0, 0.0]) / np.sqrt(2)
+        u = np.array([1.0, -1.0, 0.0]) / np.sqrt(2)
+        v = np.array([0.0, 0.0, 1.0])
+        coordinates = random.uniform(-1, 1, (200, 2)) * [4, 1]
+        self.points = np.array([1, 2, 3]) + coordinates[:, :1] * u + coordinates[:, 1:] * v
+        self.points += np.outer(random.normal(0, 0.01, 200), self.normal)
+        self.direction = u
+
+    def test_fit_plane(self):
+        origin, normal = fitting.fit_plane(self.points)
+        self.assertAlmostEqual(abs(normal.dot(self.normal)), 1.0, places=4)
+        self.assertTrue(np.allclose(origin, self.points.mean(axis=0)))
+
+        flat = fitting.flatten(self.points, fitting.PLANE)
+        self.assertTrue(np.allclose((flat - origin).dot(normal), 0))
+
+    def test_fit_line(self):
+        origin, direction = fitting.fit_line(self.points)
+        self.assertAlmostEqual(abs(direction.dot(self.direction)), 1.0, places=3)
+
+        line = fitting.flatten(self.points, fitting.LINE)
+        offsets = line - origin
+        self.assertTrue(np.allclose(np.cross(offsets, direction), 0))
+
+    def test_flatten_to_axis(self):
+        flat = fitting.flatten(self.points, fitting.AXIS, axis='z')
+        self.assertTrue(np.allclose(flat[:, 2], self.points[:, 2].mean()))
+        self.assertTrue(np.allclose(flat[:, :2], self.points[:, :2]))
+        self.assertRaises(ValueError, fitting.flatten, self.points, fitting.AXIS, axis='w')
+        self.assertRaises(ValueError, fitting.flatten, self.points, 'sphere')
+        self.assertEqual(len(fitting.flatten(np.zeros((0, 3)))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
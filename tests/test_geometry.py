@@ -0,0 +1,60 @@
+'''
+Tests for the checks of degenerate geometry.
+'''
+import unittest
+
+import pure
+pure.add_fg_tools_to_path()
+
+import geometry
+import topology
+from test_topology import create_cube, create_grid
+
+
+class TestGeometry(unittest.TestCase):
+
+    def setUp(self):
+        face_counts, face_vertices, self.points = create_grid(4, 3)
+        self.topo = topology.MeshTopology(face_counts, face_vertices)
+
+    def test_clean_meshes(self):
+        for topo, points in ((self.topo, self.points),
+                             (topology.MeshTopology(*create_cube()[:2]), create_cube()[2])):
+            mesh_geometry = geometry.MeshGeometry(topo, points)
+            self.assertEqual(mesh_geometry.get_zero_area_faces().tolist(), [])
+            self.assertEqual(mesh_geometry.get_zero_length_edges().tolist(), [])
+            self.assertEqual(mesh_geometry.get_concave_faces().tolist(), [])
+            self.assertEqual(mesh_geometry.get_non_planar_faces().tolist(), [])
+
+    def test_collapsed_edge(self):
+        # the vertex 7 moves onto the vertex 6, so the edge between them has no length
+        self.points[7] = self.points[6]
+        mesh_geometry = geometry.MeshGeometry(self.topo, self.points)
+        self.assertEqual(mesh_geometry.get_zero_length_edges().tolist(), self.topo.find_edges([6], [7]).tolist())
+        self.assertEqual(mesh_geometry.get_zero_area_faces().tolist(), [])
+        # the faces around the edge are triangles now, they are neither concave nor non-planar
+        self.assertEqual(mesh_geometry.get_concave_faces().tolist(), [])
+
+        # a face that collapses into a line has no area
+        self.points[[5, 6], 2] = 0
+        mesh_geometry = geometry.MeshGeometry(self.topo, self.points)
+        self.assertEqual(mesh_geometry.get_zero_area_faces().tolist(), [0])
+
+    def test_concave_faces(self):
+        # the vertex 6 is pushed into the first face, past its diagonal
+        self.points[6] = [0.2, 0, 0.2]
+        mesh_geometry = geometry.MeshGeometry(self.topo, self.points)
+        self.assertEqual(mesh_geometry.get_concave_faces().tolist(), [0])
+        self.assertEqual(mesh_geometry.get_non_planar_faces().tolist(), [])
+
+    def test_non_planar_faces(self):
+        # the vertex 6 is lifted out of the plane of the grid
+        self.points[6, 1] = 0.1
+        mesh_geometry = geometry.MeshGeometry(self.topo, self.points)
+        self.assertEqual(mesh_geometry.get_non_planar_faces().tolist(), [0, 1, 4, 5])
+        self.assertEqual(mesh_geometry.get_non_planar_faces(tolerance=0.1).tolist(), [])
+        self.assertEqual(mesh_geometry.get_concave_faces().tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
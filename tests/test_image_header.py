@@ -0,0 +1,137 @@
+'''
+Tests for the header-only image reader and the texture index.
+'''
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import pure
+pure.add_fg_tools_to_path()
+
+import image_header
+import texture_index
+
+
+def write_png(file_path, width, height, bit_depth=8, color_type=6):
+    with open(file_path, 'wb') as f:
+        f.write(image_header.PNG_SIGNATURE)
+        f.write(struct.pack('>I4sIIBBBBB', 13, b'IHDR', width, height, bit_depth, color_type, 0, 0, 0))
+        f.write(b'\x00' * 100)
+
+
+def write_jpeg(file_path, width, height):
+    with open(file_path, 'wb') as f:
+        f.write(b'\xff\xd8')
+        # an APP0 segment in front of the frame
+        f.write(b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9)
+        f.write(b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, height, width, 3) + b'\x00' * 9)
+
+
+def write_tiff(file_path, width, height, samples=4, bits=16, endian='<'):
+    with open(file_path, 'wb') as f:
+        entries = [(256, 4, 1, width), (257, 4, 1, height), (277, 3, 1, samples), (258, 3, samples, 8 + 2 + 12 * 4 + 4)]
+        f.write((b'II*\x00' if endian == '<' else b'MM\x00*') + struct.pack(endian + 'I', 8))
+        f.write(struct.pack(endian + 'H', len(entries)))
+        for tag, tag_type, count, value in entries:
+            if tag_type == 3 and count == 1:
+                f.write(struct.pack(endian + 'HHIHH', tag, tag_type, count, value, 0))
+            else:
+                f.write(struct.pack(endian + 'HHII', tag, tag_type, count, value))
+        f.write(struct.pack(endian + 'I', 0))
+        f.write(struct.pack(endian + 'H' * samples, *([bits] * samples)))
+
+
+def write_exr(file_path, width, height, pixel_type=1):
+    channels = b''.join(name + b'\x00' + struct.pack('<iB3xii', pixel_type, 0, 1, 1) for name in (b'B', b'G', b'R'))
+    channels += b'\x00'
+    with open(file_path, 'wb') as f:
+        f.write(image_header.EXR_MAGIC + struct.pack('<i', 2))
+        f.write(b'channels\x00chlist\x00' + struct.pack('<i', len(channels)) + channels)
+        f.write(b'compression\x00compression\x00' + struct.pack('<i', 1) + b'\x00')
+        f.write(b'dataWindow\x00box2i\x00' + struct.pack('<iiiii', 16, 0, 0, width - 1, height - 1))
+        f.write(b'\x00')
+
+
+def write_tga(file_path, width, height, pixel_depth=32):
+    with open(file_path, 'wb') as f:
+        f.write(struct.pack('<BBBHHBHHHHBB', 0, 0, 2, 0, 0, 0, 0, 0, width, height, pixel_depth, 8))
+
+
+class TestImageHeader(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def path(self, file_name):
+        return os.path.join(self.folder, file_name)
+
+    def test_png(self):
+        write_png(self.path('a.png'), 640, 480, bit_depth=16, color_type=2)
+        self.assertEqual(image_header.read_header(self.path('a.png')),
+                         {'format': 'png', 'width': 640, 'height': 480, 'channels': 3, 'bit_depth': 16})
+
+    def test_jpeg(self):
+        write_jpeg(self.path('a.jpg'), 1920, 1080)
+        self.assertEqual(image_header.read_header(self.path('a.jpg')),
+                         {'format': 'jpeg', 'width': 1920, 'height': 1080, 'channels': 3, 'bit_depth': 8})
+
+    def test_tiff(self):
+        write_tiff(self.path('a.tif'), 4096, 2048)
+        self.assertEqual(image_header.read_header(self.path('a.tif')),
+                         {'format': 'tiff', 'width': 4096, 'height': 2048, 'channels': 4, 'bit_depth': 16})
+
+        # big-endian, the bit depths of all samples are stored at an offset
+        write_tiff(self.path('b.tif'), 4096, 2048, samples=3, bits=8, endian='>')
+        self.assertEqual(image_header.read_header(self.path('b.tif')),
+                         {'format': 'tiff', 'width': 4096, 'height': 2048, 'channels': 3, 'bit_depth': 8})
+
+    def test_exr(self):
+        write_exr(self.path('a.exr'), 2048, 1024)
+        self.assertEqual(image_header.read_header(self.path('a.exr')),
+                         {'format': 'exr', 'width': 2048, 'height': 1024, 'channels': 3, 'bit_depth': 16})
+
+    def test_tga(self):
+        write_tga(self.path('a.tga'), 512, 256)
+        self.assertEqual(image_header.read_header(self.path('a.tga')),
+                         {'format': 'tga', 'width': 512, 'height': 256, 'channels': 4, 'bit_depth': 8})
+
+    def test_unsupported(self):
+        with open(self.path('a.txt'), 'w') as f:
+            f.write('no image')
+        self.assertIsNone(image_header.read_header(self.path('a.txt')))
+        self.assertIsNone(image_header.read_header(self.path('missing.png')))
+
+    def test_decoded_size(self):
+        header = {'format': 'exr', 'width': 2048, 'height': 1024, 'channels': 3, 'bit_depth': 16}
+        self.assertEqual(image_header.get_decoded_size(header), 2048 * 1024 * 3 * 2)
+        self.assertEqual(image_header.get_decoded_size(header, mipmaps=True), 2048 * 1024 * 3 * 2 * 4 // 3)
+
+    def test_index_caches_by_mtime(self):
+        write_png(self.path('a.png'), 64, 64)
+        write_tga(self.path('b.tga'), 32, 32)
+        index = texture_index.TextureIndex(self.path('index.json'))
+        headers = index.update_folder(self.folder, threads=4)
+        self.assertEqual(len(headers), 2)
+        self.assertEqual(index.get_decoded_size(headers), 64 * 64 * 4 + 32 * 32 * 4)
+
+        index.save()
+        loaded = texture_index.TextureIndex(self.path('index.json'))
+        self.assertEqual(len(loaded), 2)
+
+        # a changed file is read again, an unchanged one is taken from the cache
+        write_png(self.path('a.png'), 128, 128)
+        os.utime(self.path('a.png'), (0, 0))
+        self.assertEqual(loaded.update([self.path('a.png')])[self.path('a.png')]['width'], 128)
+
+        os.remove(self.path('b.tga'))
+        loaded.update([self.path('b.tga')])
+        self.assertNotIn(self.path('b.tga'), loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
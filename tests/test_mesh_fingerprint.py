@@ -0,0 +1,56 @@
+'''
+Tests for the mesh fingerprints that find duplicate meshes.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import mesh_fingerprint
+from test_topology import create_cube, create_grid
+
+
+class TestMeshFingerprint(unittest.TestCase):
+
+    def test_identical_meshes(self):
+        face_counts, face_vertices, points = create_cube()
+        fingerprint = mesh_fingerprint.get_fingerprint(face_counts, face_vertices, points)
+        self.assertEqual(mesh_fingerprint.get_fingerprint(face_counts, face_vertices, points + 1e-7), fingerprint)
+        self.assertEqual(mesh_fingerprint.get_fingerprint(list(face_counts), list(face_vertices), points.tolist()),
+                         fingerprint)
+
+    def test_different_meshes(self):
+        face_counts, face_vertices, points = create_cube()
+        fingerprint = mesh_fingerprint.get_fingerprint(face_counts, face_vertices, points)
+        moved = points.copy()
+        moved[0] += 0.01
+        self.assertNotEqual(mesh_fingerprint.get_fingerprint(face_counts, face_vertices, moved), fingerprint)
+        # the same points with another winding order
+        flipped = np.array(face_vertices).reshape(-1, 4)[:, ::-1].ravel()
+        self.assertNotEqual(mesh_fingerprint.get_fingerprint(face_counts, flipped, points), fingerprint)
+
+        uvs = np.zeros((24, 2))
+        with_uvs = mesh_fingerprint.get_fingerprint(face_counts, face_vertices, points, uvs, np.arange(24))
+        self.assertNotEqual(with_uvs, fingerprint)
+        uvs[3] = 0.5
+        self.assertNotEqual(mesh_fingerprint.get_fingerprint(face_counts, face_vertices, points, uvs, np.arange(24)),
+                            with_uvs)
+
+    def test_group_duplicates(self):
+        cube = create_cube()
+        grid = create_grid(2, 2)
+        meshes = [cube, grid, cube, grid, create_grid(3, 2), cube]
+        fingerprints = mesh_fingerprint.get_fingerprints(meshes, threads=4)
+        groups = mesh_fingerprint.group_duplicates(['a', 'b', 'c', 'd', 'e', 'f'], fingerprints)
+        self.assertEqual(groups, [['a', 'c', 'f'], ['b', 'd']])
+
+    def test_estimate_bytes(self):
+        self.assertEqual(mesh_fingerprint.estimate_bytes(8, 12, 6, 24), 8 * 12 + 12 * 12 + 6 * 4 + 24 * 8)
+        self.assertGreater(mesh_fingerprint.estimate_bytes(8, 12, 6, 24, mesh_fingerprint.MEMORY_BYTES),
+                           mesh_fingerprint.estimate_bytes(8, 12, 6, 24, mesh_fingerprint.FILE_BYTES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+'''
+Tests for the quality checks that run on the raw arrays of meshes.
+'''
+import multiprocessing
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import mesh_qa
+import shared_arrays
+import topology
+from test_topology import create_cube, create_grid
+from test_uv import create_grid_uvs
+
+
+def create_arrays(face_counts, face_vertices, points, normal_ids=None, edge_smooth=None):
+    '''
+    :returns: The arrays of a mesh like mesh_buffer.get_mesh_arrays() returns them, with one UV and one normal per
+              vertex (unless normal ids are given) and soft edges (unless the smoothing of the edges is given).
+    '''
+    topo = topology.MeshTopology(face_counts, face_vertices)
+    face_vertices = np.asarray(face_vertices, dtype=np.int32)
+    return {'points': np.asarray(points, dtype=np.float64),
+            'face_counts': np.asarray(face_counts, dtype=np.int32),
+            'face_vertices': face_vertices,
+            'edge_vertices': topo.edge_vertices,
+            'edge_smooth': np.ones(topo.edge_count, dtype=bool) if edge_smooth is None else np.asarray(edge_smooth),
+            'normal_ids': face_vertices if normal_ids is None else np.asarray(normal_ids, dtype=np.int32),
+            'uvs': np.asarray(points, dtype=np.float32)[:, :2],
+            'uv_counts': np.asarray(face_counts, dtype=np.int32),
+            'uv_ids': face_vertices}
+
+
+class TestMeshQA(unittest.TestCase):
+
+    def test_hard_edges(self):
+        face_counts, face_vertices, points = create_cube()
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        # the check reads the smoothing of the edges, split normals (like locked ones) do not make them hard
+        edge_smooth = np.ones(topo.edge_count, dtype=bool)
+        edge_smooth[[2, 5]] = False
+        arrays = create_arrays(face_counts, face_vertices, points, normal_ids=np.arange(24), edge_smooth=edge_smooth)
+        self.assertEqual(mesh_qa.analyze(arrays, [mesh_qa.HARD_EDGES])[mesh_qa.HARD_EDGES].tolist(), [2, 5])
+
+    def test_analyze(self):
+        face_counts, face_vertices, points = create_grid(4, 3)
+        # split the last quad into two triangles and add a copy of the first face on top of it
+        a, b, c, d = face_vertices[-4:]
+        face_counts = face_counts[:-1] + [3, 3, 4]
+        face_vertices = face_vertices[:-4] + [a, b, c, a, c, d] + face_vertices[:4]
+        arrays = create_arrays(face_counts, face_vertices, points)
+        results = mesh_qa.analyze(arrays, [mesh_qa.TRIANGLES, mesh_qa.NGONS, mesh_qa.LAMINA_FACES])
+        self.assertEqual(results[mesh_qa.TRIANGLES].tolist(), [11, 12])
+        self.assertEqual(results[mesh_qa.NGONS].tolist(), [])
+        self.assertEqual(results[mesh_qa.LAMINA_FACES].tolist(), [0, 13])
+        self.assertRaises(ValueError, mesh_qa.analyze, arrays, ['unknown'])
+
+        pentagon = create_arrays([5], range(5), np.random.RandomState(0).rand(5, 3))
+        self.assertEqual(mesh_qa.analyze(pentagon, [mesh_qa.NGONS])[mesh_qa.NGONS].tolist(), [0])
+
+    def test_uv_seams(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=2)
+        face_counts, face_vertices, points = create_grid(4, 3)
+        arrays = create_arrays(face_counts, face_vertices, points)
+        arrays.update(uvs=uvs, uv_counts=uv_counts, uv_ids=uv_ids)
+        seam_edges = mesh_qa.analyze(arrays, [mesh_qa.UV_SEAMS])[mesh_qa.UV_SEAMS]
+        self.assertEqual(seam_edges.tolist(), sorted(topo.find_edges([2, 7, 12], [7, 12, 17]).tolist()))
+
+    def test_uv_overlaps(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=2)
+        face_counts, face_vertices, points = create_grid(4, 3)
+        arrays = create_arrays(face_counts, face_vertices, points)
+        # the right shell lies on top of the left one
+        uvs[len(uvs) // 2:, 0] -= 2
+        arrays.update(uvs=uvs, uv_counts=uv_counts, uv_ids=uv_ids)
+        results = mesh_qa.analyze(arrays, [mesh_qa.UV_SEAMS, mesh_qa.UV_OVERLAPS])
+        self.assertEqual(results[mesh_qa.UV_OVERLAPS].tolist(), list(range(12)))
+        self.assertEqual(len(results[mesh_qa.UV_SEAMS]), 3)
+
+    def test_worker_processes(self):
+        arrays = [create_arrays(*create_grid(4, 3)), create_arrays(*create_cube(), edge_smooth=np.arange(12) % 3 > 0)]
+        shared = [shared_arrays.SharedArrays.create(mesh) for mesh in arrays]
+        pool = multiprocessing.Pool(2)
+        try:
+            tasks = [[(mesh.handle, tuple(mesh_qa.CHECKS))] for mesh in shared]
+            results = [result for batch in pool.map(mesh_qa.analyze_batch, tasks) for result in batch]
+        finally:
+            pool.close()
+            pool.join()
+            for mesh in shared:
+                mesh.unlink()
+        for mesh, result in zip(arrays, results):
+            expected = mesh_qa.analyze(mesh)
+            self.assertEqual(sorted(result), sorted(expected))
+            for check in expected:
+                self.assertEqual(result[check].tolist(), expected[check].tolist())
+        self.assertEqual(len(results[0][mesh_qa.HARD_EDGES]), 0)
+        self.assertEqual(results[1][mesh_qa.HARD_EDGES].tolist(), [0, 3, 6, 9])
+
+    def test_split_into_batches(self):
+        self.assertEqual(mesh_qa.split_into_batches([], 10), [])
+        self.assertEqual(mesh_qa.split_into_batches([4, 4, 4, 20, 1, 1], 10), [[0, 1], [2], [3], [4, 5]])
+
+
+if __name__ == '__main__':
+    unittest.main()
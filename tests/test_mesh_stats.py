@@ -0,0 +1,87 @@
+'''
+Tests for the mesh topology statistics.
+'''
+import unittest
+
+import pure
+pure.add_fg_tools_to_path()
+
+import mesh_stats
+import topology
+from test_topology import create_cube, create_grid
+
+
+class TestMeshStats(unittest.TestCase):
+
+    def test_face_sizes(self):
+        # a triangle, a quad and a pentagon in a row
+        face_counts = [3, 4, 5]
+        face_vertices = [0, 1, 2, 1, 3, 4, 2, 3, 5, 6, 7, 4]
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        self.assertEqual(mesh_stats.get_statistics(topo), (1, 1, 1, 0, 0))
+
+    def test_closed_mesh(self):
+        face_counts, face_vertices, _ = create_cube()
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        self.assertEqual(mesh_stats.get_statistics(topo), (0, 6, 0, 0, 0))
+
+    def test_lamina_faces(self):
+        face_counts, face_vertices, _ = create_grid(2, 2)
+        # the same quad again with the opposite winding
+        face_counts = face_counts + [4]
+        face_vertices = face_vertices + face_vertices[3::-1]
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        self.assertEqual(mesh_stats.get_lamina_faces(topo).tolist(), [0, 4])
+        self.assertEqual(mesh_stats.get_lamina_duplicates(topo).tolist(), [4])
+
+        # two lamina pairs with the same key, face 1 sorts between the equal faces 0 and 2
+        topo = topology.MeshTopology([3, 3, 3, 3], [0, 2, 4, 0, 1, 5, 4, 2, 0, 5, 1, 0])
+        self.assertEqual(mesh_stats.get_lamina_faces(topo).tolist(), [0, 1, 2, 3])
+        self.assertEqual(mesh_stats.get_lamina_duplicates(topo).tolist(), [2, 3])
+
+        # same vertex sum, count and minimum but different vertices
+        topo = topology.MeshTopology([3, 3, 3], [0, 2, 4, 0, 1, 5, 1, 2, 3])
+        self.assertEqual(len(mesh_stats.get_lamina_faces(topo)), 0)
+
+    def test_non_manifold(self):
+        # three faces on one edge
+        topo = topology.MeshTopology([3, 3, 3], [0, 1, 2, 1, 0, 3, 0, 1, 4])
+        self.assertEqual(mesh_stats.get_non_manifold_edges(topo).tolist(), [int(topo.find_edges([0], [1])[0])])
+        self.assertEqual(mesh_stats.get_non_manifold_vertices(topo).tolist(), [0, 1])
+
+        # two triangles that only share a vertex
+        topo = topology.MeshTopology([3, 3], [0, 1, 2, 0, 3, 4])
+        self.assertEqual(mesh_stats.get_non_manifold_vertices(topo).tolist(), [0])
+
+        # two closed tetrahedra that touch at vertex 0
+        tetrahedron = [0, 2, 1, 0, 3, 2, 0, 1, 3, 1, 2, 3]
+        topo = topology.MeshTopology([3] * 8, tetrahedron + [{0: 0, 1: 4, 2: 5, 3: 6}[v] for v in tetrahedron])
+        self.assertEqual(mesh_stats.get_non_manifold_vertices(topo).tolist(), [0])
+        topo = topology.MeshTopology([3] * 4, tetrahedron)
+        self.assertEqual(len(mesh_stats.get_non_manifold_vertices(topo)), 0)
+
+        # a fan of triangles around a border vertex is manifold
+        topo = topology.MeshTopology([3, 3, 3], [0, 1, 2, 0, 2, 3, 0, 3, 4])
+        self.assertEqual(len(mesh_stats.get_non_manifold_vertices(topo)), 0)
+
+    def test_totals(self):
+        totals = mesh_stats.StatisticsTotals()
+        totals.set('a', (1, 2, 3, 4, 5))
+        totals.set('b', (1, 1, 1, 1, 1))
+        self.assertEqual(totals.total, (2, 3, 4, 5, 6))
+        totals.set('a', (0, 2, 0, 0, 0))
+        self.assertEqual(totals.total, (1, 3, 1, 1, 1))
+        self.assertEqual(totals.get_total(['a', 'unknown']), (0, 2, 0, 0, 0))
+        totals.remove('b')
+        self.assertEqual(totals.total, (0, 2, 0, 0, 0))
+        self.assertEqual(len(totals), 1)
+        totals.clear()
+        self.assertEqual(totals.total, (0, 0, 0, 0, 0))
+
+    def test_format(self):
+        self.assertEqual(mesh_stats.format_statistics((1, 2, 3, 4, 5)),
+                         'Tris: 1  Quads: 2  N-Gons: 3  Lamina: 4  Non-Manifold: 5')
+
+
+if __name__ == '__main__':
+    unittest.main()
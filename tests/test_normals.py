@@ -0,0 +1,88 @@
+'''
+Tests for the face normals and the angles between them.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import normals
+import topology
+from test_topology import create_cube, create_grid
+
+
+class TestNormals(unittest.TestCase):
+
+    def test_face_normals(self):
+        face_counts, face_vertices, points = create_cube()
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        face_normals = normals.get_face_normals(topo, points)
+        # the normals point outwards
+        midpoints = np.array([points[face_vertices[face * 4:face * 4 + 4]].mean(axis=0) for face in range(6)])
+        self.assertTrue(np.allclose(face_normals, midpoints * 2))
+
+        # a face without area gets no normal
+        topo = topology.MeshTopology([3], [0, 1, 2])
+        self.assertTrue(np.allclose(normals.get_face_normals(topo, [[0, 0, 0], [1, 0, 0], [2, 0, 0]]), 0.0))
+
+    def test_edge_angles(self):
+        face_counts, face_vertices, points = create_cube()
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        angles = normals.get_edge_angles(topo, normals.get_face_normals(topo, points))
+        self.assertTrue(np.allclose(angles, 90.0))
+
+        face_counts, face_vertices, points = create_grid(4, 3)
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        self.assertTrue(np.allclose(normals.get_edge_angles(topo, normals.get_face_normals(topo, points)), 0.0))
+
+    def test_sharp_edges(self):
+        face_counts, face_vertices, points = create_grid(4, 3)
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        # the grid is bent up by 45 degrees along x = 2
+        points[:, 1] = np.maximum(points[:, 0] - 2, 0)
+        bend = sorted(topo.find_edges([2, 7, 12], [7, 12, 17]).tolist())
+        self.assertEqual(normals.get_sharp_edges(topo, points, 30.0).tolist(), bend)
+        self.assertEqual(normals.get_sharp_edges(topo, points, 50.0).tolist(), [])
+        self.assertEqual(normals.get_sharp_edges(topo, points, 1.0).tolist(), bend)
+
+    def test_flipped_faces(self):
+        face_counts, face_vertices, points = create_cube()
+        topo = topology.MeshTopology(face_counts, face_vertices)
+        self.assertEqual(normals.get_flipped_faces(topo, points).tolist(), [])
+
+        # the second face is reversed
+        faces = np.array(face_vertices).reshape(6, 4)
+        faces[1] = faces[1, ::-1]
+        topo = topology.MeshTopology(face_counts, faces.ravel())
+        self.assertEqual(normals.get_flipped_faces(topo, points).tolist(), [1])
+
+        # all faces but the first point inwards, even though the first face is the odd one out
+        faces = np.array(face_vertices).reshape(6, 4)
+        faces[1:] = faces[1:, ::-1]
+        topo = topology.MeshTopology(face_counts, faces.ravel())
+        self.assertEqual(normals.get_flipped_faces(topo, points).tolist(), [1, 2, 3, 4, 5])
+
+        # a cube that is inside out gets all its faces reversed
+        faces = np.array(face_vertices).reshape(6, 4)[:, ::-1]
+        topo = topology.MeshTopology(face_counts, faces.ravel())
+        self.assertEqual(normals.get_flipped_faces(topo, points).tolist(), list(range(6)))
+
+    def test_flipped_faces_of_open_parts(self):
+        face_counts, face_vertices, points = create_grid(4, 3)
+        # the faces 0 and 5 are reversed, in a second grid next to the first one all other faces are reversed
+        face_vertices = np.array(face_vertices).reshape(-1, 4)
+        other = face_vertices[:, ::-1] + len(points)
+        face_vertices[[0, 5]] = face_vertices[[0, 5], ::-1]
+        other[[0, 5]] = other[[0, 5], ::-1]
+        topo = topology.MeshTopology(face_counts * 2, np.concatenate((face_vertices, other)).ravel())
+        points = np.concatenate((points, points + [10, 0, 0]))
+
+        flipped, labels = normals.get_relative_winding(topo)
+        self.assertEqual(np.unique(labels).tolist(), [0, 12])
+        self.assertEqual(normals.get_flipped_faces(topo, points).tolist(), [0, 5, 12, 17])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+'''
+Tests for point caches in binary files.
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import point_cache
+from test_topology import create_cube, create_grid
+
+
+class TestPointCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.folder, 'points.bin')
+        face_counts, face_vertices, self.points = create_grid(4, 3)
+        self.signature = point_cache.get_topology_signature(face_counts, face_vertices)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_signature(self):
+        face_counts, face_vertices, _ = create_cube()
+        self.assertNotEqual(point_cache.get_topology_signature(face_counts, face_vertices), self.signature)
+        self.assertEqual(point_cache.get_topology_signature(np.array(face_counts), np.array(face_vertices)),
+                         point_cache.get_topology_signature(face_counts, face_vertices))
+
+    def test_write_read(self):
+        point_cache.write_cache(self.points, self.signature, self.file_path)
+        points, signature = point_cache.read_cache(self.file_path)
+        self.assertEqual(signature, self.signature)
+        self.assertTrue(np.array_equal(points, self.points))
+        self.assertEqual(os.path.getsize(self.file_path), point_cache.HEADER_SIZE + self.points.size * 8)
+        del points
+
+        # overwriting with fewer points shrinks the file
+        point_cache.write_cache(self.points[:5], self.signature, self.file_path)
+        points, _ = point_cache.read_cache(self.file_path)
+        self.assertEqual(points.shape, (5, 3))
+        del points
+
+    def test_invalid_file(self):
+        with open(self.file_path, 'wb') as f:
+            f.write(b'not a point cache')
+        self.assertRaises(ValueError, point_cache.read_cache, self.file_path)
+        self.assertRaises(IOError, point_cache.read_cache, os.path.join(self.folder, 'missing.bin'))
+
+    def test_blend_points(self):
+        cached = self.points + [0, 1, 0]
+        self.assertTrue(np.allclose(point_cache.blend_points(self.points, cached), cached))
+        self.assertTrue(np.allclose(point_cache.blend_points(self.points, cached, weight=0.25),
+                                    self.points + [0, 0.25, 0]))
+        vertices = np.array([1, 3])
+        self.assertTrue(np.allclose(point_cache.blend_points(self.points, cached, vertices, 0.5),
+                                    self.points[vertices] + [0, 0.5, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+'''
+Tests for the Laplacian relax.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import relax
+import topology
+from test_topology import create_grid
+
+
+class TestRelax(unittest.TestCase):
+
+    def setUp(self):
+        face_counts, face_vertices, self.points = create_grid(4, 4)
+        self.topo = topology.MeshTopology(face_counts, face_vertices)
+        self.border = self.topo.get_border_vertices()
+        self.inner = np.setdiff1d(np.arange(self.topo.vertex_count), self.border)
+
+    def test_sparse_matrix(self):
+        matrix = relax.SparseMatrix.from_entries([0, 2, 2, 0], [1, 0, 0, 2], [1.0, 2.0, 3.0, 4.0], (3, 3))
+        dense = np.array([[0, 1, 4], [0, 0, 0], [5, 0, 0]], dtype=float)
+        vectors = np.arange(9, dtype=float).reshape(3, 3)
+        self.assertTrue(np.allclose(matrix.dot(vectors), dense.dot(vectors)))
+        self.assertTrue(np.allclose(matrix.row_sums, dense.sum(axis=1)))
+        self.assertTrue(np.allclose(matrix.take_rows([2, 0]).dot(vectors[:, 0]), dense[[2, 0]].dot(vectors[:, 0])))
+
+    def test_uniform_matrix(self):
+        matrix = relax.get_uniform_matrix(self.topo)
+        self.assertTrue(np.array_equal(matrix.row_sums, self.topo.vertex_valences))
+
+    def test_flat_grid_stays(self):
+        # the inner vertices of a regular grid already are at the average of their neighbours
+        for weights in relax.WEIGHTS:
+            matrix = relax.get_matrix(self.topo, self.points, weights)
+            result = relax.relax(self.points, matrix, self.inner, iterations=5)
+            self.assertTrue(np.allclose(result, self.points), weights)
+        self.assertRaises(ValueError, relax.get_matrix, self.topo, self.points, 'unknown')
+
+    def test_relax_noise(self):
+        noisy = self.points + np.random.RandomState(0).normal(0, 0.1, self.points.shape)
+        noisy[self.border] = self.points[self.border]
+        for weights in relax.WEIGHTS:
+            matrix = relax.get_matrix(self.topo, self.points, weights)
+            result = relax.relax(noisy, matrix, self.inner, iterations=50)
+            # the border is pinned and the inner vertices move back onto the grid
+            self.assertTrue(np.array_equal(result[self.border], noisy[self.border]))
+            self.assertTrue(np.abs(result - self.points).max() < np.abs(noisy - self.points).max() / 10, weights)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+Tests for the render output verifier.
+'''
+import shutil
+import struct
+import tempfile
+import unittest
+
+import pure
+pure.add_fg_tools_to_path()
+
+import render_check
+from test_image_header import write_png, write_tga
+
+
+def write_exr(file_path, width, height, truncate=0):
+    # a scan line EXR with ZIP compression (16 lines per chunk) and one half channel
+    channels = b'Y\x00' + struct.pack('<iB3xii', 1, 0, 1, 1) + b'\x00'
+    header = render_check.image_header.EXR_MAGIC + struct.pack('<i', 2)
+    header += b'channels\x00chlist\x00' + struct.pack('<i', len(channels)) + channels
+    header += b'compression\x00compression\x00' + struct.pack('<i', 1) + b'\x03'
+    header += b'dataWindow\x00box2i\x00' + struct.pack('<iiiii', 16, 0, 0, width - 1, height - 1)
+    header += b'\x00'
+
+    chunk_count = (height + 15) // 16
+    chunk_size = 100
+    first_chunk = len(header) + 8 * chunk_count
+    offsets = [first_chunk + i * (8 + chunk_size) for i in range(chunk_count)]
+    data = header + struct.pack('<{0:d}Q'.format(chunk_count), *offsets)
+    for i in range(chunk_count):
+        data += struct.pack('<ii', i * 16, chunk_size) + b'\x00' * chunk_size
+    with open(file_path, 'wb') as f:
+        f.write(data[:len(data) - truncate])
+
+
+class TestRenderCheck(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp().replace('\\', '/')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def path(self, file_name):
+        return self.folder + '/' + file_name
+
+    def test_find_sequences(self):
+        for frame in (1, 2, 4):
+            write_png(self.path('beauty.{0:04d}.png'.format(frame)), 8, 8)
+        write_png(self.path('other_12.png'), 8, 8)
+        write_png(self.path('notes.txt'), 8, 8)
+        sequences = render_check.find_sequences(self.folder)
+        self.assertEqual(sorted(sequences), [self.path('beauty.####.png'), self.path('other_##.png')])
+        self.assertEqual(sorted(sequences[self.path('beauty.####.png')]), [1, 2, 4])
+
+    def test_sequence_pattern(self):
+        for file_name, name, frame in (('shot-0001.exr', 'shot-', '0001'),
+                                       ('shot-a_-002.exr', 'shot-a_', '-002'),
+                                       ('beauty.-001.exr', 'beauty.', '-001'),
+                                       ('-005.exr', '', '-005'),
+                                       ('name0010.exr', 'name', '0010')):
+            match = render_check.SEQUENCE_PATTERN.match(file_name)
+            self.assertEqual((match.group('name'), match.group('frame')), (name, frame))
+
+        for frame in (1, 2, 3):
+            write_png(self.path('shot-{0:04d}.png'.format(frame)), 8, 8)
+        sequences = render_check.find_sequences(self.folder)
+        self.assertEqual(sorted(sequences[self.path('shot-####.png')]), [1, 2, 3])
+
+    def test_missing_frames(self):
+        self.assertEqual(render_check.get_missing_frames([1, 2, 5]), [3, 4])
+        self.assertEqual(render_check.get_missing_frames([1, 3], frame_range=(1, 7, 2)), [5, 7])
+        self.assertEqual(render_check.get_missing_frames([]), [])
+
+    def test_check_image(self):
+        write_png(self.path('a.png'), 8, 8)
+        self.assertEqual(render_check.check_image(self.path('a.png')), 'truncated')
+        with open(self.path('a.png'), 'ab') as f:
+            f.write(render_check.PNG_TRAILER)
+        self.assertIsNone(render_check.check_image(self.path('a.png')))
+
+        write_tga(self.path('a.tga'), 4, 4)
+        self.assertEqual(render_check.check_image(self.path('a.tga')), 'truncated')
+        with open(self.path('a.tga'), 'ab') as f:
+            f.write(b'\x00' * 4 * 4 * 4)
+        self.assertIsNone(render_check.check_image(self.path('a.tga')))
+
+        write_exr(self.path('a.exr'), 64, 40)
+        self.assertIsNone(render_check.check_image(self.path('a.exr')))
+        write_exr(self.path('b.exr'), 64, 40, truncate=10)
+        self.assertEqual(render_check.check_image(self.path('b.exr')), 'truncated')
+
+        open(self.path('c.exr'), 'w').close()
+        self.assertEqual(render_check.check_image(self.path('c.exr')), 'empty')
+        self.assertEqual(render_check.check_image(self.path('d.exr')), 'missing')
+
+    def test_verify_folder(self):
+        for frame in range(1, 11):
+            if frame != 5:
+                write_exr(self.path('beauty.{0:04d}.exr'.format(frame)), 32, 32, truncate=50 if frame == 7 else 0)
+        open(self.path('beauty.0009.exr'), 'w').close()
+
+        report = render_check.verify_folder(self.folder, frame_range=(1, 12, 1), processes=2)
+        sequence = report[self.path('beauty.####.exr')]
+        self.assertEqual(sequence['count'], 9)
+        self.assertEqual(sequence['missing'], [5, 11, 12])
+        self.assertEqual(sequence['empty'], [self.path('beauty.0009.exr')])
+        self.assertEqual(sequence['truncated'], [self.path('beauty.0007.exr')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+'''
+Tests for the background job scheduler.
+'''
+import threading
+import unittest
+
+import pure
+pure.add_fg_tools_to_path()
+
+import scheduler
+
+
+def add(a, b):
+    return a + b
+
+
+def count_up(steps, log):
+    for step in range(steps):
+        log.append(step)
+        yield step
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.idle_requests = []
+        self.scheduler = scheduler.JobScheduler(threads=2, schedule_idle=self.idle_requests.append)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_thread_job(self):
+        results = []
+        job = self.scheduler.submit(add, args=(1, 2), callback=results.append)
+        self.assertTrue(self.scheduler.run_until_complete(timeout=5))
+        self.assertEqual(job.state, scheduler.DONE)
+        self.assertEqual(job.result, 3)
+        # the callback ran on this (the main) thread
+        self.assertEqual(results, [3])
+        self.assertTrue(self.idle_requests)
+
+    def test_main_thread_generator(self):
+        log = []
+        main_thread = threading.current_thread()
+        threads = []
+        job = self.scheduler.submit_main_thread(count_up, args=(5, log), callback=lambda _: threads.append(
+            threading.current_thread()))
+        self.scheduler.run_main_thread_slice()
+        self.assertTrue(log)
+        self.assertTrue(self.scheduler.run_until_complete(timeout=5))
+        self.assertEqual(log, [0, 1, 2, 3, 4])
+        self.assertEqual(job.result, 4)
+        self.assertEqual(threads, [main_thread])
+
+    def test_slices(self):
+        log = []
+        self.scheduler.slice_seconds = 0
+        self.scheduler.submit_main_thread(count_up, args=(3, log))
+        # a slice that is used up right away still runs one step
+        self.scheduler.run_main_thread_slice()
+        self.assertEqual(log, [0])
+        self.scheduler.run_main_thread_slice()
+        self.assertEqual(log, [0, 1])
+
+    def test_priorities(self):
+        order = []
+        for priority in (scheduler.LOW, scheduler.NORMAL, scheduler.HIGH):
+            self.scheduler.submit_main_thread(order.append, args=(priority,), priority=priority)
+        self.scheduler.run_main_thread_slice()
+        self.assertEqual(order, [scheduler.HIGH, scheduler.NORMAL, scheduler.LOW])
+
+    def test_deduplication(self):
+        order = []
+        first = self.scheduler.submit_main_thread(order.append, args=('a',), priority=scheduler.LOW, key='a')
+        self.scheduler.submit_main_thread(order.append, args=('b',), key='b')
+        # the identical job is not queued again, but gets the higher priority
+        second = self.scheduler.submit_main_thread(order.append, args=('a',), priority=scheduler.HIGH, key='a')
+        self.assertIs(first, second)
+        self.assertEqual(self.scheduler.get_metrics()['main_thread_queue'], 2)
+        self.scheduler.run_until_complete(timeout=5)
+        self.assertEqual(order, ['a', 'b'])
+
+        # without a key the function and its arguments are the key
+        job = self.scheduler.submit_main_thread(add, args=(1, 2))
+        self.assertIs(self.scheduler.submit_main_thread(add, args=(1, 2)), job)
+        self.assertIsNot(self.scheduler.submit_main_thread(add, args=(2, 2)), job)
+
+    def test_cancel(self):
+        log = []
+        job = self.scheduler.submit_main_thread(count_up, args=(5, log))
+        self.scheduler.slice_seconds = 0
+        self.scheduler.run_main_thread_slice()
+        job.cancel()
+        self.scheduler.run_until_complete(timeout=5)
+        self.assertEqual(log, [0])
+        self.assertEqual(job.state, scheduler.CANCELLED)
+
+        pending = self.scheduler.submit_main_thread(log.append, args=('never',))
+        self.scheduler.cancel_all()
+        self.scheduler.run_until_complete(timeout=5)
+        self.assertEqual(pending.state, scheduler.CANCELLED)
+        self.assertNotIn('never', log)
+
+    def test_failure_and_metrics(self):
+        job = self.scheduler.submit(add, args=(1, None))
+        self.scheduler.submit(add, args=(1, 1))
+        self.scheduler.run_until_complete(timeout=5)
+        self.assertEqual(job.state, scheduler.FAILED)
+        self.assertIn('TypeError', job.error)
+
+        metrics = self.scheduler.get_metrics()
+        self.assertEqual((metrics['done'], metrics['failed'], metrics['thread_queue']), (1, 1, 0))
+        self.assertGreaterEqual(metrics['max_latency'], metrics['average_latency'])
+
+
+if __name__ == '__main__':
+    unittest.main()
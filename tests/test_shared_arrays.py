@@ -0,0 +1,61 @@
+'''
+Tests for numpy arrays in shared memory.
+'''
+import multiprocessing
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import shared_arrays
+
+
+def sum_points(handle):
+    with shared_arrays.SharedArrays.attach(handle) as shared:
+        return float(shared['points'].sum())
+
+
+def double_points(handle):
+    with shared_arrays.SharedArrays.attach(handle) as shared:
+        shared['points'][...] *= 2
+
+
+class TestSharedArrays(unittest.TestCase):
+
+    def setUp(self):
+        self.arrays = {'points': np.random.RandomState(0).rand(100, 3),
+                       'face_counts': np.full(7, 4, dtype=np.int32),
+                       'empty': np.zeros(0, dtype=np.int32)}
+        self.shared = shared_arrays.SharedArrays.create(self.arrays)
+
+    def tearDown(self):
+        self.shared.unlink()
+
+    def test_create(self):
+        for name, array in self.arrays.items():
+            self.assertEqual(self.shared[name].dtype, array.dtype)
+            self.assertTrue(np.array_equal(self.shared[name], array))
+        for offset, _, _ in self.shared.layout.values():
+            self.assertEqual(offset % shared_arrays.ALIGNMENT, 0)
+
+    def test_attach(self):
+        attached = shared_arrays.SharedArrays.attach(self.shared.handle)
+        attached['face_counts'][0] = 3
+        self.assertEqual(self.shared['face_counts'][0], 3)
+        attached.close()
+
+    def test_worker_processes(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            self.assertAlmostEqual(pool.apply(sum_points, (self.shared.handle,)), self.arrays['points'].sum())
+            pool.apply(double_points, (self.shared.handle,))
+        finally:
+            pool.close()
+            pool.join()
+        self.assertTrue(np.allclose(self.shared['points'], self.arrays['points'] * 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+'''
+Tests for the spatial hash and the welding of overlapping points.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import spatial
+from test_topology import create_grid
+
+
+def brute_force_pairs(points, tolerance):
+    distances = np.sqrt(((points[:, np.newaxis] - points[np.newaxis]) ** 2).sum(axis=2))
+    first, second = np.nonzero(np.triu(distances <= tolerance, k=1))
+    return sorted(zip(first.tolist(), second.tolist()))
+
+
+class TestSpatialHash(unittest.TestCase):
+
+    def test_find_pairs(self):
+        random = np.random.RandomState(1)
+        points = random.rand(500, 3)
+        for tolerance in (0.02, 0.05, 0.1):
+            pairs = spatial.SpatialHash(points, tolerance).find_pairs()
+            self.assertEqual(sorted(map(tuple, pairs.tolist())), brute_force_pairs(points, tolerance))
+
+    def test_small_tolerance_on_big_points(self):
+        # the cells get bigger than the tolerance, but only the close pair is found
+        points = np.array([[0, 0, 0], [1e7, 0, 0], [1e7, 1e-6, 0], [1e7, 0.5, 0]])
+        spatial_hash = spatial.SpatialHash(points, 1e-5)
+        self.assertGreater(spatial_hash.cell_size, 1e-5)
+        self.assertEqual(spatial_hash.find_pairs(1e-5).tolist(), [[1, 2]])
+        self.assertRaises(ValueError, spatial_hash.find_pairs, spatial_hash.cell_size * 2)
+
+    def test_find_nearest(self):
+        points = np.array([[0, 0, 0], [1, 0, 0], [1.01, 0, 0], [5, 5, 5]])
+        spatial_hash = spatial.SpatialHash(points, 0.1)
+        nearest, counts = spatial_hash.find_nearest([[0.05, 0, 0], [1.009, 0, 0], [3, 3, 3], [-50, 0, 0]])
+        self.assertEqual(nearest.tolist(), [0, 2, -1, -1])
+        self.assertEqual(counts.tolist(), [1, 2, 0, 0])
+
+    def test_find_nearest_with_bigger_cells(self):
+        random = np.random.RandomState(2)
+        points = random.rand(300, 3)
+        queries = points + random.normal(scale=0.02, size=points.shape)
+        distances = np.sqrt(((queries[:, np.newaxis] - points[np.newaxis]) ** 2).sum(axis=2))
+        for cell_size in (0.03, 0.1, 0.5):
+            nearest, counts = spatial.SpatialHash(points, cell_size).find_nearest(queries, 0.03)
+            self.assertEqual(counts.tolist(), (distances <= 0.03).sum(axis=1).tolist())
+            expected = np.where(counts > 0, distances.argmin(axis=1), -1)
+            self.assertEqual(nearest.tolist(), expected.tolist())
+
+    def test_empty(self):
+        self.assertEqual(len(spatial.SpatialHash(np.zeros((0, 3)), 0.1).find_pairs()), 0)
+        self.assertEqual(len(spatial.find_overlapping_points(np.zeros((1, 3)), 0.1)), 0)
+
+    def test_overlapping_points(self):
+        points = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 0.0001], [2, 0, 0], [1, 0, 0]])
+        self.assertEqual(spatial.find_overlapping_points(points, 0.001).tolist(), [0, 1, 2, 4])
+        self.assertEqual(spatial.get_weld_map(points, 0.001).tolist(), [0, 1, 0, 3, 1])
+
+    def test_weld(self):
+        # two 2x1 grids next to each other with a shared border, but separate vertices on it
+        face_counts, face_vertices, points = create_grid(2, 1)
+        shifted = points + [2, 0, 0]
+        face_vertices = np.concatenate((face_vertices, np.array(face_vertices) + len(points)))
+        new_counts, new_face_vertices, new_points, vertex_map = spatial.weld(face_counts * 2,
+                                                                             face_vertices,
+                                                                             np.concatenate((points, shifted)),
+                                                                             0.001)
+        self.assertEqual(len(new_points), len(points) * 2 - 2)
+        self.assertEqual(new_counts.tolist(), [4] * 4)
+        self.assertEqual(vertex_map[len(points)], vertex_map[2])
+        self.assertTrue(np.allclose(new_points[vertex_map], np.concatenate((points, shifted))))
+
+    def test_weld_collapsed_face(self):
+        points = np.array([[0, 0, 0], [1, 0, 0], [1, 0, 1], [0, 0, 1], [0, 0, 1.00001]])
+        new_counts, new_face_vertices, _, _ = spatial.weld([4, 3], [0, 1, 2, 3, 2, 3, 4], points, 0.001)
+        self.assertEqual(new_counts.tolist(), [4])
+        self.assertEqual(new_face_vertices.tolist(), [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+'''
+Tests for the mirror symmetry detection.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import symmetry
+import topology
+from topology import VERTEX, EDGE, FACE
+from test_topology import create_grid
+
+
+def create_symmetric_grid(columns, rows):
+    '''
+    :returns: The topology and the points of a grid that is curved symmetrically along the x-axis but not along the
+              other axes. The plane of symmetry lies at x = columns / 2.
+    '''
+    face_counts, face_vertices, points = create_grid(columns, rows)
+    points[:, 1] = (points[:, 0] - columns / 2.0) ** 2 + points[:, 2] * 0.3
+    return topology.MeshTopology(face_counts, face_vertices), points
+
+
+class TestSymmetry(unittest.TestCase):
+
+    def setUp(self):
+        self.columns, self.rows = 6, 3
+        self.topology, self.points = create_symmetric_grid(self.columns, self.rows)
+
+    def get_vertex(self, x, z):
+        return z * (self.columns + 1) + x
+
+    def test_find_plane(self):
+        axis, center, score = symmetry.find_symmetry_plane(self.points, 0.001)
+        self.assertEqual((axis, center, score), (0, self.columns / 2.0, 1.0))
+
+    def test_vertex_map(self):
+        mirror_map = symmetry.MirrorMap.build(self.topology, self.points, 0.001)
+        self.assertEqual(mirror_map.axis_name, 'x')
+        self.assertEqual(len(mirror_map.unmatched_vertices), 0)
+        self.assertEqual(mirror_map.vertex_map[self.get_vertex(1, 2)], self.get_vertex(5, 2))
+        self.assertEqual(mirror_map.vertex_map[self.get_vertex(3, 1)], self.get_vertex(3, 1))
+
+    def test_topological_fallback(self):
+        # a vertex that moved too far for the spatial hash still gets matched over its neighbours
+        self.points[self.get_vertex(1, 1)] += [0.1, 0.05, 0]
+        mirror_map = symmetry.MirrorMap.build(self.topology, self.points, 0.001, axis=0)
+        self.assertEqual(len(mirror_map.unmatched_vertices), 0)
+        self.assertEqual(mirror_map.vertex_map[self.get_vertex(5, 1)], self.get_vertex(1, 1))
+
+        symmetric = mirror_map.symmetrize(self.points, positive=True)
+        self.assertTrue(np.allclose(symmetric, create_symmetric_grid(self.columns, self.rows)[1]))
+        # the negative side does not change when it is mirrored onto the positive one
+        symmetric = mirror_map.symmetrize(self.points, positive=False)
+        self.assertTrue(np.allclose(symmetric[self.get_vertex(1, 1)], self.points[self.get_vertex(1, 1)]))
+        moved_x = self.points[self.get_vertex(1, 1), 0]
+        self.assertAlmostEqual(symmetric[self.get_vertex(5, 1), 0], self.columns - moved_x)
+
+    def test_mirror_components(self):
+        mirror_map = symmetry.MirrorMap.build(self.topology, self.points, 0.001)
+        self.assertEqual(mirror_map.mirror([self.get_vertex(0, 0)], VERTEX).tolist(), [self.get_vertex(6, 0)])
+        # face 0 is the first face of the first row, its mirror the last one
+        self.assertEqual(mirror_map.mirror([0, 1], FACE).tolist(), [4, 5])
+        edges = self.topology.convert([0], FACE, EDGE)
+        mirrored = mirror_map.mirror(edges, EDGE)
+        self.assertEqual(mirrored.tolist(), self.topology.convert([5], FACE, EDGE).tolist())
+
+    def test_symmetrize_selected_vertices(self):
+        self.points[self.get_vertex(5, 0)] += [0, 1, 0]
+        self.points[self.get_vertex(5, 1)] += [0, 1, 0]
+        mirror_map = symmetry.MirrorMap.build(self.topology, self.points, 0.001, axis=0)
+        symmetric = mirror_map.symmetrize(self.points, positive=False, vertices=[self.get_vertex(5, 0)])
+        self.assertAlmostEqual(symmetric[self.get_vertex(5, 0), 1], self.points[self.get_vertex(1, 0), 1])
+        self.assertAlmostEqual(symmetric[self.get_vertex(5, 1), 1], self.points[self.get_vertex(5, 1), 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+'''
+Tests for the expansion of UDIM, tile and frame tokens in texture paths.
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import pure
+pure.add_fg_tools_to_path()
+
+import texture_tokens
+
+
+class TestTextureTokens(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp().replace('\\', '/')
+        for name in ('diffuse.1001.tif', 'diffuse.1002.tif', 'diffuse.10021.tif', 'diffuse.1001.tif.bak',
+                     'bump.u1_v2.exr', 'seq.0001.exr', 'seq.0002.exr', 'other.1001.tif'):
+            open(os.path.join(self.folder, name), 'wb').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_has_tokens(self):
+        self.assertTrue(texture_tokens.has_tokens('/textures/diffuse.<UDIM>.tif'))
+        self.assertTrue(texture_tokens.has_tokens('/textures/seq.####.exr'))
+        self.assertTrue(texture_tokens.has_tokens('/textures/seq.%04d.exr'))
+        self.assertTrue(texture_tokens.has_tokens('/textures/seq.<f4>.exr'))
+        self.assertFalse(texture_tokens.has_tokens('/textures/diffuse.1001.tif'))
+        # only the file name counts
+        self.assertFalse(texture_tokens.has_tokens('/textures/<UDIM>/diffuse.tif'))
+
+    def test_token_regex(self):
+        regex = texture_tokens.get_token_regex('diffuse.<UDIM>.tif')
+        self.assertTrue(regex.match('diffuse.1001.tif'))
+        self.assertFalse(regex.match('diffuse.10021.tif'))
+        self.assertFalse(regex.match('diffuse.1001.tif.bak'))
+        self.assertFalse(regex.match('diffuseX1001.tif'))
+
+        regex = texture_tokens.get_token_regex('bump.u<u>_v<v>.exr')
+        self.assertTrue(regex.match('bump.u1_v2.exr'))
+        self.assertTrue(texture_tokens.get_token_regex('seq.####.exr').match('seq.12345.exr'))
+
+    def test_expand_path(self):
+        expanded = texture_tokens.expand_path(self.folder + '/diffuse.<UDIM>.tif')
+        self.assertEqual(expanded, [self.folder + '/diffuse.1001.tif', self.folder + '/diffuse.1002.tif'])
+        self.assertEqual(texture_tokens.expand_path(self.folder + '/seq.<f>.exr'),
+                         [self.folder + '/seq.0001.exr', self.folder + '/seq.0002.exr'])
+        self.assertEqual(texture_tokens.expand_path(self.folder + '/bump.u<u>_v<v>.exr'),
+                         [self.folder + '/bump.u1_v2.exr'])
+
+        # paths without tokens are returned as they are, missing folders expand to nothing
+        self.assertEqual(texture_tokens.expand_path(self.folder + '/missing.tif'), [self.folder + '/missing.tif'])
+        self.assertEqual(texture_tokens.expand_path(self.folder + '/missing/diffuse.<UDIM>.tif'), [])
+        self.assertEqual(texture_tokens.expand_path(self.folder + '/missing.<UDIM>.tif'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+'''
+Tests for the CSR mesh topology.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import topology
+from topology import VERTEX, EDGE, FACE
+
+
+def create_grid(columns, rows):
+    '''
+    :returns: The face counts, face vertices and points of a quad grid in the xz-plane with
+              (columns + 1) * (rows + 1) vertices. Vertex (x, z) has the index z * (columns + 1) + x.
+    '''
+    face_vertices = []
+    for z in range(rows):
+        for x in range(columns):
+            first = z * (columns + 1) + x
+            face_vertices += [first, first + 1, first + columns + 2, first + columns + 1]
+    x, z = np.meshgrid(np.arange(columns + 1), np.arange(rows + 1))
+    points = np.column_stack((x.ravel(), np.zeros(x.size), z.ravel())).astype(float)
+    return [4] * (columns * rows), face_vertices, points
+
+
+def create_cube():
+    '''
+    :returns: The face counts, face vertices and points of a unit cube with outward facing normals.
+    '''
+    points = np.array([[-.5, -.5, .5], [.5, -.5, .5], [-.5, .5, .5], [.5, .5, .5],
+                       [-.5, .5, -.5], [.5, .5, -.5], [-.5, -.5, -.5], [.5, -.5, -.5]])
+    face_vertices = [0, 1, 3, 2, 2, 3, 5, 4, 4, 5, 7, 6, 6, 7, 1, 0, 1, 7, 5, 3, 6, 0, 2, 4]
+    return [4] * 6, face_vertices, points
+
+
+class TestTopology(unittest.TestCase):
+
+    def setUp(self):
+        face_counts, face_vertices, _ = create_grid(4, 3)
+        self.grid = topology.MeshTopology(face_counts, face_vertices)
+        face_counts, face_vertices, _ = create_cube()
+        self.cube = topology.MeshTopology(face_counts, face_vertices)
+
+    def find_edge(self, mesh, vertex_a, vertex_b):
+        return int(np.flatnonzero((np.sort(mesh.edge_vertices, axis=1) == sorted([vertex_a, vertex_b])).all(axis=1))[0])
+
+    def test_counts(self):
+        self.assertEqual((self.grid.vertex_count, self.grid.edge_count, self.grid.face_count), (20, 31, 12))
+        self.assertEqual((self.cube.vertex_count, self.cube.edge_count, self.cube.face_count), (8, 12, 6))
+        self.assertTrue((self.cube.edge_face_counts == 2).all())
+        self.assertTrue((self.cube.vertex_valences == 3).all())
+        self.assertEqual(len(self.grid.get_border_edges()), 14)
+        self.assertEqual(len(self.grid.get_border_vertices()), 14)
+
+    def test_given_edge_numbering(self):
+        reversed_edges = self.cube.edge_vertices[::-1]
+        renumbered = topology.MeshTopology(self.cube.face_counts, self.cube.face_vertices, edge_vertices=reversed_edges)
+        self.assertTrue((renumbered.face_edges == 11 - self.cube.face_edges).all())
+
+    def test_convert(self):
+        self.assertEqual(self.grid.convert([0], FACE, VERTEX).tolist(), [0, 1, 5, 6])
+        self.assertEqual(self.grid.convert([6], VERTEX, FACE).tolist(), [0, 1, 4, 5])
+        self.assertEqual(len(self.grid.convert([6], VERTEX, EDGE)), 4)
+        self.assertEqual(self.grid.convert([0, 1, 5, 6], VERTEX, FACE, contained=True).tolist(), [0])
+        self.assertEqual(len(self.grid.convert([0, 1, 5, 6], VERTEX, EDGE, contained=True)), 4)
+        edge = self.find_edge(self.grid, 1, 6)
+        self.assertEqual(self.grid.convert([edge], EDGE, FACE).tolist(), [0, 1])
+        # three edges of face 0 touch all its vertices, but only all four edges contain it
+        edges = [self.find_edge(self.grid, 0, 1), edge, self.find_edge(self.grid, 5, 6)]
+        self.assertEqual(len(self.grid.convert(edges, EDGE, FACE, contained=True)), 0)
+        edges.append(self.find_edge(self.grid, 0, 5))
+        self.assertEqual(self.grid.convert(edges, EDGE, FACE, contained=True).tolist(), [0])
+        self.assertEqual(self.grid.convert([0, 1], FACE, EDGE, contained=True).tolist(),
+                         self.grid.convert([0, 1], FACE, EDGE).tolist())
+        self.assertEqual(len(self.grid.convert([], FACE, VERTEX)), 0)
+
+    def test_grow_shrink(self):
+        self.assertEqual(self.grid.grow([5], FACE).tolist(), [0, 1, 2, 4, 5, 6, 8, 9, 10])
+        self.assertEqual(self.grid.shrink([0, 1, 2, 4, 5, 6, 8, 9, 10], FACE).tolist(), [5])
+        self.assertEqual(self.grid.grow([0], VERTEX).tolist(), [0, 1, 5, 6])
+        self.assertEqual(len(self.grid.grow([0], VERTEX, steps=2)), 9)
+        self.assertEqual(len(self.cube.shrink(np.arange(6), FACE)), 6)
+
+    def test_edge_loop(self):
+        # a horizontal edge inside the grid loops over the whole row
+        loop = self.grid.get_edge_loop(self.find_edge(self.grid, 6, 7))
+        self.assertEqual(sorted(self.grid.convert(loop, EDGE, VERTEX).tolist()), [5, 6, 7, 8, 9])
+        # border edges loop along the border until the corner
+        loop = self.grid.get_edge_loop(self.find_edge(self.grid, 1, 2))
+        self.assertEqual(self.grid.convert(loop, EDGE, VERTEX).tolist(), [0, 1, 2, 3, 4])
+        # a cube has valence 3 vertices only, so no loop continues
+        self.assertEqual(len(self.cube.get_edge_loop(0)), 1)
+
+    def test_edge_ring(self):
+        ring = self.grid.get_edge_ring(self.find_edge(self.grid, 6, 7))
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(self.grid.convert(ring, EDGE, FACE).tolist(), [1, 5, 9])
+        # the ring around a cube is closed
+        ring = self.cube.get_edge_ring(0)
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(len(self.cube.get_edge_rings(np.arange(12))), 12)
+
+    def test_connected_labels(self):
+        labels = topology.get_connected_labels([[3, 4], [4, 1], [6, 7], [7, 5]], 8)
+        self.assertEqual(labels.tolist(), [0, 1, 2, 1, 1, 5, 5, 5])
+        # a long chain in reverse order
+        chain = np.column_stack((np.arange(999, 0, -1), np.arange(998, -1, -1)))
+        self.assertTrue((topology.get_connected_labels(chain, 1000) == 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+'''
+Tests for the UV layout of meshes.
+'''
+import unittest
+
+import numpy as np
+
+import pure
+pure.add_fg_tools_to_path()
+
+import topology
+import uv
+from test_topology import create_grid
+
+
+def create_grid_uvs(columns, rows, split_column=None):
+    '''
+    :returns: The UVs, UV counts and UV ids of a grid like create_grid() makes, with one UV per vertex. If a split
+              column is given, the faces right of it get their own UVs, so the edges of that column are a seam.
+    '''
+    face_counts, face_vertices, points = create_grid(columns, rows)
+    uvs = points[:, [0, 2]]
+    uv_ids = np.array(face_vertices)
+    if split_column is not None:
+        right_faces = np.repeat(np.arange(columns * rows) % columns >= split_column, 4)
+        uv_ids[right_faces] += len(uvs)
+        uvs = np.concatenate((uvs, uvs))
+    return topology.MeshTopology(face_counts, face_vertices), uvs, face_counts, uv_ids
+
+
+class TestUV(unittest.TestCase):
+
+    def test_no_seams(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3)
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        self.assertEqual(len(layout.get_seam_edges()), 0)
+
+    def test_seam_edges(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=2)
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        seam_edges = layout.get_seam_edges()
+        expected = topo.find_edges([2, 7, 12], [7, 12, 17])
+        self.assertEqual(seam_edges.tolist(), sorted(expected.tolist()))
+
+        # the seam edges of chunks add up to the seam edges of the whole mesh
+        chunks = [layout.get_seam_edges(start, min(start + 5, topo.edge_count))
+                  for start in range(0, topo.edge_count, 5)]
+        self.assertEqual(np.concatenate(chunks).tolist(), seam_edges.tolist())
+
+    def test_faces_without_uvs(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=2)
+        # the faces right of the seam lose their UVs
+        uv_counts = np.array(uv_counts)
+        uv_counts[np.arange(12) % 4 >= 2] = 0
+        uv_ids = uv_ids[np.repeat(uv_counts > 0, 4)]
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        self.assertEqual(len(layout.get_seam_edges()), 0)
+
+        self.assertEqual(layout.shells.tolist(), [0, 0, -1, -1] * 3)
+
+    def test_shells(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=1)
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        self.assertEqual(layout.shell_count, 2)
+        self.assertEqual(layout.shells.tolist(), [0, 1, 1, 1] * 3)
+        self.assertEqual(layout.get_shell_faces([0]).tolist(), [0, 4, 8])
+        self.assertTrue(np.allclose(layout.get_shell_areas(), [3, 9]))
+        minimum, maximum = layout.get_shell_bounds()
+        self.assertTrue(np.allclose(minimum, [[0, 0], [1, 0]]))
+        self.assertTrue(np.allclose(maximum, [[1, 3], [4, 3]]))
+
+    def test_texel_densities(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=1)
+        # the right shell is scaled down to a quarter of its area in UV space
+        uvs[len(uvs) // 2:] *= 0.5
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        points = create_grid(4, 3)[2]
+        self.assertTrue(np.allclose(uv.get_face_areas(topo, points), 1.0))
+        self.assertTrue(np.allclose(layout.get_texel_densities(points, 1024), [1024, 512]))
+
+    def test_overlapping_faces(self):
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3, split_column=2)
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        # neighbouring faces and the faces along the seam only touch
+        self.assertEqual(layout.get_overlapping_faces().tolist(), [])
+
+        # the right shell is moved half a face onto the left one
+        uvs[len(uvs) // 2:, 0] -= 0.5
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        self.assertEqual(layout.get_overlapping_faces().tolist(), [1, 2, 5, 6, 9, 10])
+
+        # a vertex in the middle of the shell is pulled over its neighbour, so the faces around it fold
+        topo, uvs, uv_counts, uv_ids = create_grid_uvs(4, 3)
+        uvs[6] += [1.5, 0]
+        layout = uv.UVLayout(topo, uvs, uv_counts, uv_ids)
+        self.assertEqual(layout.get_overlapping_faces().tolist(), [0, 1, 2, 4, 5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()